@@ -0,0 +1,53 @@
+"""Add facilities table for the facility registry
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'facilities',
+        sa.Column('id', sa.Integer(), nullable=False),
+
+        # Owner and the identifier clients send as metadata.facility_id
+        sa.Column('client_id', sa.String(length=50), nullable=False),
+        sa.Column('facility_id', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+
+        # Location and orientation
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('altitude_ft', sa.Float(), nullable=True),
+        sa.Column('target_bearing_deg', sa.Float(), nullable=False, server_default='0'),
+
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), onupdate=sa.text('now()')),
+
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index('ix_facilities_id', 'facilities', ['id'], unique=False)
+    op.create_index(
+        'ix_facilities_client_facility', 'facilities', ['client_id', 'facility_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_facilities_client_facility', table_name='facilities')
+    op.drop_index('ix_facilities_id', table_name='facilities')
+    op.drop_table('facilities')
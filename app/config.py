@@ -24,6 +24,19 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = ""
+    # Shared asyncpg pool: connections each workload may hold at once
+    DB_POOL_AUTH_SIZE: int = 5
+    DB_POOL_ADMIN_SIZE: int = 5
+    DB_POOL_LOGGING_SIZE: int = 2
+    # Connections opened and warmed at startup (asyncpg pool and ORM engine)
+    DB_POOL_MIN_SIZE: int = 4
+    # Seconds to wait for a connection before failing the query
+    DB_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 5.0
+    # Prepared statements cached per connection (0 disables, e.g. behind PgBouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # SQLAlchemy engine pool (ORM sessions)
+    DB_POOL_ORM_SIZE: int = 20
+    DB_POOL_ORM_OVERFLOW: int = 10
 
     # Redis
     REDIS_URL: str = ""
@@ -32,9 +45,22 @@ class Settings(BaseSettings):
     API_KEYS: Dict[str, str] = {}
     ADMIN_KEY_HASH: str = ""
 
-    # Rate Limiting (legacy - kept for backwards compatibility)
+    # Rate Limiting (token bucket; limits for clients without a tier entry)
     RATE_LIMIT_PER_MINUTE: int = 1000
     RATE_LIMIT_BURST: int = 100
+    # Clients that lease blocks of quota into process memory (comma-separated)
+    RATE_LIMIT_LEASE_CLIENTS: str = "inrange_prod,enterprise"
+    # Tokens per lease, and how long a lease may be spent before it is renewed
+    RATE_LIMIT_LEASE_SIZE: int = 50
+    RATE_LIMIT_LEASE_TTL_MS: int = 1000
+
+    # API key lookups cached in-process (admin changes are pushed via Redis pub/sub)
+    API_KEY_CACHE_TTL_SECONDS: int = 60
+    # Unknown keys are cached for a shorter time
+    API_KEY_CACHE_NEGATIVE_TTL_SECONDS: int = 30
+    API_KEY_CACHE_MAX_ENTRIES: int = 10000
+    # Seconds between batched writes of per-key usage counters
+    API_KEY_USAGE_FLUSH_SECONDS: float = 5.0
 
     # URLs - configurable per environment
     BACKEND_URL: str = "http://localhost:8000"  # This API's URL
@@ -45,9 +71,112 @@ class Settings(BaseSettings):
     # Default includes common development URLs; override in Railway environment variables
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173,http://localhost:8000"
 
+    # Physics engine
+    # fused: impact breakdown sub-simulations run as one batch
+    # sequential: each sub-simulation is an independent full run
+    PHYSICS_ENGINE: str = "fused"
+    # Trajectory integrator: legacy-euler (calibrated default), rk4-fixed, adaptive-rk45
+    PHYSICS_INTEGRATOR: str = "legacy-euler"
+    # Tolerance profile (fast/accurate) per api_type for non-legacy integrators
+    PHYSICS_QUALITY_PROFESSIONAL: str = "accurate"
+    PHYSICS_QUALITY_GAMING: str = "fast"
+    # Precomputed lookup table for carry-only sub-simulations (empty = disabled)
+    # Build with: python scripts/build_trajectory_table.py <output.npz>
+    TRAJECTORY_TABLE_PATH: str = ""
+    # Cells whose measured interpolation error exceeds this fall back to simulation
+    TRAJECTORY_TABLE_MAX_ERROR_YARDS: float = 0.5
+    # Memory-mapped elevation grid for coordinate altitudes (empty = sea level)
+    # Build with: python scripts/build_elevation_grid.py <output.gwdem> <srtm tiles>
+    ELEVATION_GRID_PATH: str = ""
+    # Memoization of impact-breakdown sub-simulations on quantized inputs
+    # (entries are per component; full results carry ~15 KB of trajectory points)
+    PHYSICS_MEMO_ENABLED: bool = True
+    PHYSICS_MEMO_MAX_ENTRIES: int = 2048
+    PHYSICS_MEMO_TTL_SECONDS: int = 3600
+    # Where physics runs: inline (on the event loop), thread or process pool
+    PHYSICS_EXECUTOR: str = "thread"
+    PHYSICS_EXECUTOR_WORKERS: int = 4  # 0 = CPU count
+    # Calls allowed to wait for a worker before requests get 503
+    PHYSICS_EXECUTOR_MAX_QUEUE: int = 64
+    # Shots per batched physics call in /calculate/batch (NDJSON flushes per chunk)
+    BATCH_PHYSICS_CHUNK_SIZE: int = 250
+    # Build trajectory responses as plain dicts + orjson instead of pydantic models
+    FAST_RESPONSE_SERIALIZATION: bool = True
+    # Share one computation among concurrent identical breakdown requests
+    PHYSICS_COALESCING_ENABLED: bool = True
+    # Cache for deterministic (override/preset) results: in-process L1 + Redis
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+    RESULT_CACHE_L1_MAX_ENTRIES: int = 1024
+    RESULT_CACHE_L1_TTL_SECONDS: int = 300
+    RESULT_CACHE_MAX_VALUE_BYTES: int = 262144
+    # Shots a /sessions/ws connection may queue before the server stops reading
+    SESSION_MAX_PENDING_SHOTS: int = 32
+    # admin_request_logs rows buffered in memory (beyond this they are dropped)
+    REQUEST_LOG_QUEUE_SIZE: int = 10000
+    # Rows per COPY, and the longest a row waits before being written
+    REQUEST_LOG_BATCH_SIZE: int = 500
+    REQUEST_LOG_FLUSH_INTERVAL_MS: int = 1000
+    # Seconds between upserts of aggregated api_usage counts (lost on a crash)
+    USAGE_FLUSH_SECONDS: float = 5.0
+    # request_logs rows buffered between flushes (beyond this they are dropped)
+    USAGE_MAX_PENDING_LOGS: int = 10000
+
+    # Weather provider: "weatherapi" (WeatherAPI.com) or "replay" (local stand-in
+    # for benchmarks and load tests; never calls the upstream)
+    WEATHER_PROVIDER: str = "weatherapi"
+    # Replay provider: recorded current.json responses (JSON lines, from
+    # scripts/record_weather.py); empty = synthetic observations
+    WEATHER_REPLAY_PATH: str = ""
+    # Replay provider: median and 99th percentile delay per call, share of calls
+    # that fail, and the random seed
+    WEATHER_REPLAY_LATENCY_MS: float = 150.0
+    WEATHER_REPLAY_LATENCY_P99_MS: float = 900.0
+    WEATHER_REPLAY_ERROR_RATE: float = 0.0
+    WEATHER_REPLAY_SEED: int = 0
+
     # Weather API
     WEATHER_API_KEY: str = ""
     WEATHER_API_BASE_URL: str = "https://api.weatherapi.com/v1"
+    # Pooled WeatherAPI.com client: calls in flight at once (also the connection limit)
+    WEATHER_HTTP_MAX_CONCURRENCY: int = 20
+    # Seconds per attempt, and for a whole call including queueing and retries
+    WEATHER_HTTP_TIMEOUT_SECONDS: float = 2.5
+    WEATHER_HTTP_BUDGET_SECONDS: float = 4.0
+    # Retries of timeouts, connection errors, 429 and 5xx (jittered exponential backoff)
+    WEATHER_HTTP_RETRIES: int = 2
+    WEATHER_HTTP_BACKOFF_SECONDS: float = 0.2
+    # Consecutive failed calls that open the circuit breaker, and seconds it stays open
+    WEATHER_BREAKER_FAILURES: int = 5
+    WEATHER_BREAKER_RESET_SECONDS: float = 30.0
+    # Weather cache (in-process L1 + Redis), keyed by normalized location
+    WEATHER_CACHE_ENABLED: bool = True
+    WEATHER_CACHE_L1_MAX_ENTRIES: int = 2048
+    # Seconds an observation is served without asking WeatherAPI.com again
+    WEATHER_CACHE_TTL_SECONDS: int = 300
+    # Seconds past the TTL it is still served while a background refresh runs
+    WEATHER_CACHE_STALE_SECONDS: int = 600
+    # Seconds past the TTL it is served instead of an error if WeatherAPI.com fails
+    WEATHER_CACHE_STALE_IF_ERROR_SECONDS: int = 3600
+    # Decimal places coordinates are rounded to for the cache key (2 = ~1 km)
+    WEATHER_CACHE_COORD_DIGITS: int = 2
+    # Hourly forecasts (forecast planner): seconds served as-is, and again as
+    # long while a background refresh runs; locations kept in process
+    WEATHER_FORECAST_CACHE_TTL_SECONDS: int = 1800
+    WEATHER_FORECAST_CACHE_MAX_ENTRIES: int = 512
+    # WeatherAPI.com plan limits, counted across replicas in Redis (0 = no limit)
+    WEATHER_QUOTA_PER_MINUTE: int = 0
+    WEATHER_QUOTA_PER_DAY: int = 33000
+    # Share of a limit at which cache TTLs start to stretch, and the stretch at the limit
+    WEATHER_QUOTA_SOFT_FRACTION: float = 0.8
+    WEATHER_QUOTA_MAX_TTL_MULTIPLIER: float = 6.0
+    # Seconds between re-reads of the fleet's counts
+    WEATHER_QUOTA_REFRESH_SECONDS: float = 5.0
+    # Facility registry: seconds between reloads of the facilities table and
+    # weather refreshes for every active facility (keep below the cache TTL)
+    FACILITY_WEATHER_REFRESH_SECONDS: float = 120.0
+    # Facilities whose weather is fetched at once during a refresh
+    FACILITY_PREFETCH_CONCURRENCY: int = 8
 
     # Sentry
     SENTRY_DSN: str = ""
@@ -66,6 +195,11 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    @property
+    def rate_limit_lease_clients_list(self) -> List[str]:
+        """Parse RATE_LIMIT_LEASE_CLIENTS as comma-separated list."""
+        return [c.strip() for c in self.RATE_LIMIT_LEASE_CLIENTS.split(",") if c.strip()]
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,9 +1,24 @@
 """
 Database Configuration
 
-Async PostgreSQL connection using SQLAlchemy 2.0.
+Async PostgreSQL access:
+- SQLAlchemy 2.0 engine/sessions for the ORM models
+- One shared asyncpg pool for raw queries (API key auth, admin dashboard,
+  request logs), split into per-workload budgets so one workload cannot
+  exhaust the connections another needs
+
+Both are opened and warmed during app startup (init_db_pools), so the
+first requests after a deploy do not pay for connection setup. The hot
+auth query is run once on every new pool connection, which leaves it in
+asyncpg's per-connection prepared statement cache.
 """
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
@@ -23,8 +38,8 @@ if settings.DATABASE_URL:
     engine = create_async_engine(
         db_url,
         echo=settings.DEBUG,
-        pool_size=20,
-        max_overflow=10,
+        pool_size=settings.DB_POOL_ORM_SIZE,
+        max_overflow=settings.DB_POOL_ORM_OVERFLOW,
     )
 
     AsyncSessionLocal = async_sessionmaker(
@@ -35,6 +50,225 @@ if settings.DATABASE_URL:
 
 Base = declarative_base()
 
+# Seconds between attempts to open the asyncpg pool after a failure
+POOL_RETRY_SECONDS = 5
+
+# Queries run on every new pool connection to prime its statement cache
+_warm_queries: List[Tuple[str, tuple]] = []
+
+
+def register_warm_query(query: str, *args: Any) -> None:
+    """Run query (with harmless args) on each new pool connection."""
+    _warm_queries.append((query, args))
+
+
+def asyncpg_dsn(url: str) -> str:
+    """DATABASE_URL in the form asyncpg accepts."""
+    if url.startswith("postgresql+asyncpg://"):
+        return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return url
+
+
+async def _init_connection(conn) -> None:
+    from app.middleware.logging_config import logger
+
+    for query, args in _warm_queries:
+        try:
+            await conn.fetch(query, *args)
+        except Exception as e:
+            logger.warning(f"Failed to warm query on new connection: {str(e)}")
+
+
+class PoolWorkload:
+    """
+    One workload's share of the pool: at most `budget` connections at once.
+
+    Requests beyond the budget wait for a slot; the wait is timed and
+    reported, and gives up after DB_POOL_ACQUIRE_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, pool: "asyncpg.Pool", name: str, budget: int):
+        self.pool = pool
+        self.name = name
+        self.budget = budget
+        self._slots = asyncio.Semaphore(budget)
+
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.acquires = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator["asyncpg.Connection"]:
+        """Borrow a connection within this workload's budget."""
+        start = time.perf_counter()
+        timeout = settings.DB_POOL_ACQUIRE_TIMEOUT_SECONDS
+        if not self._slots.locked():
+            await self._slots.acquire()  # Free slot: returns without yielding
+        else:
+            self.waited += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+
+        try:
+            remaining = max(0.001, timeout - (time.perf_counter() - start))
+            async with self.pool.acquire(timeout=remaining) as conn:
+                wait_ms = (time.perf_counter() - start) * 1000
+                self.acquires += 1
+                self.wait_ms_total += wait_ms
+                self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+                self.in_use += 1
+                self.peak_in_use = max(self.peak_in_use, self.in_use)
+                try:
+                    yield conn
+                finally:
+                    self.in_use -= 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "budget": self.budget,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "saturation": round(self.in_use / self.budget, 4) if self.budget else 0.0,
+            "acquires": self.acquires,
+            "waited": self.waited,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": round(self.wait_ms_total / self.acquires, 3) if self.acquires else 0.0,
+            "wait_ms_max": round(self.wait_ms_max, 3),
+        }
+
+
+class DatabasePools:
+    """The shared asyncpg pool and its workloads."""
+
+    def __init__(self, pool: "asyncpg.Pool", budgets: Dict[str, int]):
+        self.pool = pool
+        self.workloads = {
+            name: PoolWorkload(pool, name, budget) for name, budget in budgets.items()
+        }
+
+    def workload(self, name: str) -> PoolWorkload:
+        return self.workloads[name]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "max_size": self.pool.get_max_size(),
+            "workloads": {name: w.stats() for name, w in self.workloads.items()},
+        }
+
+
+def pool_budgets() -> Dict[str, int]:
+    """Connections each workload may hold at once."""
+    return {
+        "auth": settings.DB_POOL_AUTH_SIZE,
+        "admin": settings.DB_POOL_ADMIN_SIZE,
+        "logging": settings.DB_POOL_LOGGING_SIZE,
+    }
+
+
+# Pools instance (opened by init_db_pools, or lazily on first use)
+_db_pools: Optional[DatabasePools] = None
+_db_pools_lock: Optional[asyncio.Lock] = None
+_db_pools_failed_at: Optional[float] = None
+
+
+async def get_db_pools() -> Optional[DatabasePools]:
+    """
+    Get the shared pools, opening them if startup did not.
+
+    Returns None if the database is not configured or cannot be reached
+    (graceful degradation; another attempt is made after a few seconds).
+    """
+    global _db_pools, _db_pools_lock, _db_pools_failed_at
+
+    if _db_pools is not None or not settings.DATABASE_URL:
+        return _db_pools
+    if _db_pools_failed_at is not None and time.monotonic() - _db_pools_failed_at < POOL_RETRY_SECONDS:
+        return None
+
+    if _db_pools_lock is None:
+        _db_pools_lock = asyncio.Lock()
+    async with _db_pools_lock:
+        if _db_pools is not None:
+            return _db_pools
+        budgets = pool_budgets()
+        max_size = sum(budgets.values())
+        try:
+            pool = await asyncpg.create_pool(
+                asyncpg_dsn(settings.DATABASE_URL),
+                min_size=min(settings.DB_POOL_MIN_SIZE, max_size),
+                max_size=max_size,
+                statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                init=_init_connection,
+            )
+        except Exception as e:
+            from app.middleware.logging_config import logger
+
+            _db_pools_failed_at = time.monotonic()
+            logger.warning(f"Database pool not available: {str(e)}")
+            return None
+        _db_pools = DatabasePools(pool, budgets)
+    return _db_pools
+
+
+async def get_db_workload(name: str) -> Optional[PoolWorkload]:
+    """Get one workload's view of the shared pool (None without a database)."""
+    pools = await get_db_pools()
+    return pools.workload(name) if pools is not None else None
+
+
+async def _warm_engine(connections: int) -> None:
+    """Open ORM connections up front so the first sessions reuse them."""
+    conns = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    for conn in conns:
+        await conn.close()
+
+
+async def init_db_pools() -> None:
+    """Open and warm the asyncpg pool and the ORM engine's pool."""
+    if not settings.DATABASE_URL:
+        return
+    start = time.perf_counter()
+    pools = await get_db_pools()
+    if engine is not None:
+        await _warm_engine(min(settings.DB_POOL_MIN_SIZE, settings.DB_POOL_ORM_SIZE))
+    if pools is not None:
+        from app.middleware.logging_config import logger
+
+        logger.info(
+            "Database pools ready",
+            connections=pools.pool.get_size(),
+            budgets=pool_budgets(),
+            warmup_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+
+
+def get_db_pool_stats() -> Dict[str, Any]:
+    """Counters for metrics endpoints."""
+    stats: Dict[str, Any] = {"pool": _db_pools.stats() if _db_pools is not None else None}
+    if engine is not None:
+        stats["orm"] = {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+        }
+    return stats
+
 
 async def get_db():
     """Dependency to get database session."""
@@ -59,6 +293,10 @@ async def init_db():
 
 
 async def close_db():
-    """Close database connection."""
+    """Close database connections."""
+    global _db_pools
+    if _db_pools is not None:
+        await _db_pools.pool.close()
+        _db_pools = None
     if engine is not None:
         await engine.dispose()
@@ -7,11 +7,9 @@ Production-ready with authentication, rate limiting, and usage tracking.
 
 from contextlib import asynccontextmanager
 from datetime import datetime
-import time
-import uuid
 
 from pathlib import Path
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -19,11 +17,21 @@ from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 import sentry_sdk
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import init_db, init_db_pools, close_db
 from app.redis_client import init_redis, close_redis
-from app.routers import trajectory, conditions, health, admin, admin_dashboard, api_key_requests, contact, gaming
+from app.services.trajectory_table import load_trajectory_table
+from app.services.elevation import load_elevation_grid
+from app.services.facilities import init_facility_registry, close_facility_registry
+from app.services.executor import init_physics_executor, close_physics_executor
+from app.services.api_keys import init_api_key_cache, close_api_key_cache
+from app.services.request_log import close_request_log_writer
+from app.services.usage import close_usage_aggregator
+from app.services.weather_cache import close_weather_cache
+from app.services.weather_client import init_weather_client, close_weather_client
+from app.routers import trajectory, conditions, health, admin, admin_dashboard, api_key_requests, contact, gaming, sessions
 from app.middleware.authentication import AuthMiddleware
 from app.middleware.rate_limiting import RateLimitMiddleware
+from app.middleware.request_context import RequestContextMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.errors import setup_exception_handlers
 from app.middleware.logging_config import setup_logging, logger
@@ -56,6 +64,8 @@ async def lifespan(app: FastAPI):
     try:
         await init_db()
         logger.info("Database initialized")
+        # Open and warm the connection pools before taking traffic
+        await init_db_pools()
     except Exception as e:
         logger.warning(f"Database not available: {str(e)}")
 
@@ -66,10 +76,35 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Redis not available: {str(e)}")
 
+    # Load precomputed trajectory lookup table (optional, falls back to simulation)
+    load_trajectory_table()
+
+    # Map the offline elevation grid (optional, altitude falls back to sea level)
+    load_elevation_grid()
+
+    # Start and warm up the physics worker pool
+    await init_physics_executor()
+
+    # Listen for API key changes made on other instances
+    await init_api_key_cache()
+
+    # Open the pooled WeatherAPI.com client
+    await init_weather_client()
+
+    # Load registered facilities and keep their weather current
+    await init_facility_registry()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Golf Weather API")
+    close_physics_executor()
+    await close_facility_registry()
+    await close_weather_cache()
+    await close_weather_client()
+    await close_request_log_writer()
+    await close_usage_aggregator()
+    await close_api_key_cache()
     await close_redis()
     await close_db()
 
@@ -110,79 +145,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Custom middleware (order matters: security headers, then auth, then rate limiting)
+# Custom middleware, all pure ASGI (order matters: request context, security
+# headers, then auth, then rate limiting)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(RequestContextMiddleware)
 
 # Setup error handlers
 setup_exception_handlers(app)
 
 
-# Request ID and logging middleware
-@app.middleware("http")
-async def add_request_context(request: Request, call_next):
-    """Add request ID and log all requests."""
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    start_time = time.time()
-
-    response = await call_next(request)
-
-    # Add headers
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-API-Version"] = settings.VERSION
-
-    # Log request
-    latency_ms = (time.time() - start_time) * 1000
-    client_id = getattr(request.state, "client_id", "anonymous")
-    api_key_id = getattr(request.state, "api_key_id", None)
-
-    logger.info(
-        "Request completed",
-        request_id=request_id,
-        method=request.method,
-        path=request.url.path,
-        status=response.status_code,
-        latency_ms=round(latency_ms, 2),
-        client=client_id,
-    )
-
-    # Log to database for API requests (skip admin, health, static files)
-    path = request.url.path
-    if (api_key_id or client_id != "anonymous") and not path.startswith(("/admin", "/docs", "/redoc", "/openapi")):
-        try:
-            from app.routers.admin_dashboard import get_admin_db_pool
-            pool = await get_admin_db_pool()
-            if pool:
-                # Get client IP
-                client_ip = request.client.host if request.client else None
-                forwarded = request.headers.get("x-forwarded-for")
-                if forwarded:
-                    client_ip = forwarded.split(",")[0].strip()
-
-                async with pool.acquire() as conn:
-                    await conn.execute(
-                        """
-                        INSERT INTO admin_request_logs
-                        (api_key_id, client_name, endpoint, method, status_code, latency_ms, request_ip, user_agent)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                        """,
-                        api_key_id,
-                        client_id if client_id != "anonymous" else None,
-                        path,
-                        request.method,
-                        response.status_code,
-                        round(latency_ms, 2),
-                        client_ip,
-                        request.headers.get("user-agent", "")[:500]
-                    )
-        except Exception as e:
-            logger.warning(f"Failed to log request to database: {str(e)}")
-
-    return response
-
-
 # Include routers
 app.include_router(health.router, prefix="/api/v1", tags=["Health"])
 app.include_router(trajectory.router, prefix="/api/v1", tags=["Trajectory"])
@@ -192,6 +165,7 @@ app.include_router(admin_dashboard.router, tags=["Admin Dashboard"])
 app.include_router(api_key_requests.router, tags=["API Key Requests"])
 app.include_router(contact.router, tags=["Contact"])
 app.include_router(gaming.router, prefix="/api/v1/gaming", tags=["Gaming"])
+app.include_router(sessions.router, prefix="/api/v1", tags=["Sessions"])
 
 # Legacy routes (for backwards compatibility)
 app.include_router(trajectory.router, prefix="/v1", tags=["Trajectory (Legacy)"])
@@ -5,12 +5,13 @@ Validates X-API-Key header against stored hashes.
 Checks both environment variables and database.
 """
 
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 import hashlib
-import asyncpg
 from app.config import settings
+from app.database import get_db_workload, register_warm_query
+from app.services.api_keys import MISSING, ApiKeyRecord, get_api_key_cache
 
 # Paths that don't require X-API-Key authentication
 # (admin routes have their own authentication)
@@ -35,115 +36,120 @@ PUBLIC_PATHS = [
     "/api/v1/gaming/stock-distances", # Stock distances (read-only reference)
 ]
 
-# Database connection pool for API key lookups
-_auth_db_pool = None
+# Hot query: primed on every pool connection (see app.database)
+API_KEY_LOOKUP_QUERY = """
+    SELECT id, client_name, tier, status FROM admin_api_keys
+    WHERE key_hash = $1
+"""
+register_warm_query(API_KEY_LOOKUP_QUERY, "")
 
 
 async def get_auth_db_pool():
-    """Get or create database connection pool for auth."""
-    global _auth_db_pool
-    if _auth_db_pool is None:
-        db_url = settings.DATABASE_URL
-        if db_url:
-            if db_url.startswith("postgresql+asyncpg://"):
-                db_url = db_url.replace("postgresql+asyncpg://", "postgresql://")
-            try:
-                _auth_db_pool = await asyncpg.create_pool(db_url, min_size=1, max_size=5)
-            except Exception:
-                pass
-    return _auth_db_pool
+    """Get the auth workload of the shared database pool (None without a database)."""
+    return await get_db_workload("auth")
 
 
 async def check_database_key(key_hash: str) -> tuple:
-    """Check if API key exists in database and is active. Returns (client_name, api_key_id) or (None, None)."""
-    pool = await get_auth_db_pool()
-    if not pool:
+    """
+    Check if API key exists in database and is active. Returns (client_name, api_key_id) or (None, None).
+
+    Lookups are cached (see app.services.api_keys); usage counters are
+    buffered and written in batches.
+    """
+    cache = get_api_key_cache()
+    record = cache.get(key_hash)
+
+    if record is MISSING:
+        pool = await get_auth_db_pool()
+        if not pool:
+            return None, None
+
+        generation = cache.generation
+        try:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(API_KEY_LOOKUP_QUERY, key_hash)
+        except Exception:
+            return None, None
+
+        record = ApiKeyRecord(row["id"], row["client_name"], row["tier"], row["status"]) if row else None
+        cache.set(key_hash, record, generation)
+
+    if record is None or not record.active:
         return None, None
 
-    try:
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT id, client_name FROM admin_api_keys
-                WHERE key_hash = $1 AND status = 'active'
-                """,
-                key_hash
-            )
-            if row:
-                # Update last_used and request counters
-                await conn.execute(
-                    """
-                    UPDATE admin_api_keys
-                    SET last_used_at = NOW(),
-                        requests_today = requests_today + 1,
-                        total_requests = total_requests + 1
-                    WHERE id = $1
-                    """,
-                    row["id"]
-                )
-                return row["client_name"], row["id"]
-    except Exception:
-        pass
-
-    return None, None
-
-
-class AuthMiddleware(BaseHTTPMiddleware):
+    # Update last_used and request counters (flushed in batches)
+    cache.record_usage(record.id)
+    return record.client_name, record.id
+
+
+async def authenticate_api_key(api_key: str) -> tuple:
+    """
+    Resolve a raw API key to its client.
+
+    Checks environment variable keys first, then the database.
+    Returns (client_name, api_key_id) or (None, None).
+    """
+    # Hash the provided key
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+
+    # Check against environment variable keys first
+    for client, stored_hash in settings.API_KEYS.items():
+        if key_hash == stored_hash:
+            return client, None
+
+    # If not found in env vars, check database
+    return await check_database_key(key_hash)
+
+
+def _auth_error(code: str, message: str) -> JSONResponse:
+    return JSONResponse(status_code=401, content={"error": {"code": code, "message": message}})
+
+
+class AuthMiddleware:
     """Middleware to authenticate API requests using X-API-Key header."""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Skip auth for public paths
-        path = request.url.path
+        path = scope["path"]
         if any(path == p or path.startswith(p + "/") for p in PUBLIC_PATHS):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Skip auth for website pages (non-API paths)
         # Only require auth for /api/* and /v1/* endpoints
         if not path.startswith(("/api/", "/v1/")):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Get API key from header
-        api_key = request.headers.get("X-API-Key")
+        api_key = Headers(scope=scope).get("X-API-Key")
 
         if not api_key:
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "error": {
-                        "code": "MISSING_API_KEY",
-                        "message": "API key is required. Include X-API-Key header.",
-                    }
-                },
+            response = _auth_error(
+                "MISSING_API_KEY", "API key is required. Include X-API-Key header."
             )
+            await response(scope, receive, send)
+            return
 
-        # Hash the provided key
-        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-
-        # Check against environment variable keys first
-        client_id = None
-        api_key_id = None
-        for client, stored_hash in settings.API_KEYS.items():
-            if key_hash == stored_hash:
-                client_id = client
-                break
-
-        # If not found in env vars, check database
-        if not client_id:
-            client_id, api_key_id = await check_database_key(key_hash)
+        client_id, api_key_id = await authenticate_api_key(api_key)
 
         if not client_id:
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "error": {
-                        "code": "INVALID_API_KEY",
-                        "message": "The API key provided is invalid or expired.",
-                    }
-                },
+            response = _auth_error(
+                "INVALID_API_KEY", "The API key provided is invalid or expired."
             )
+            await response(scope, receive, send)
+            return
 
         # Store client ID and API key ID in request state for logging and rate limiting
-        request.state.client_id = client_id
-        request.state.api_key_id = api_key_id
+        state = scope.setdefault("state", {})
+        state["client_id"] = client_id
+        state["api_key_id"] = api_key_id
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
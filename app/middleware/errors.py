@@ -14,6 +14,8 @@ from app.config import settings
 
 def setup_exception_handlers(app: FastAPI):
     """Register exception handlers for the FastAPI app."""
+    # Imported here: the services package logs through app.middleware
+    from app.services.executor import PhysicsOverloadedError
 
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -36,6 +38,20 @@ def setup_exception_handlers(app: FastAPI):
             },
         )
 
+    @app.exception_handler(PhysicsOverloadedError)
+    async def physics_overloaded_handler(request: Request, exc: PhysicsOverloadedError):
+        """Shed load when the physics worker queue is full."""
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "PHYSICS_OVERLOADED",
+                    "message": "The service is busy. Please retry shortly.",
+                }
+            },
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         request: Request, exc: RequestValidationError
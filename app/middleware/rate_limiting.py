@@ -1,15 +1,27 @@
 """
 Rate Limiting Middleware
 
-Uses Redis for distributed rate limiting with sliding window.
+Uses Redis for distributed rate limiting with a token bucket per client:
+the bucket holds up to the client's burst allowance and refills at its
+per-minute limit. Every check is one atomic Lua script call (EVALSHA), so
+concurrent replicas never over-admit.
+
+High-volume clients lease blocks of tokens from their bucket into process
+memory and spend them locally; most of their requests never touch Redis.
+Leased tokens are already debited from the shared bucket, so replicas
+cannot over-admit either; unused tokens are returned with the next lease.
 """
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Dict, Optional, Tuple
+import math
 import time
 
 from app.config import settings
+from app.middleware.logging_config import logger
 
 # Paths excluded from rate limiting
 EXCLUDED_PATHS = ["/", "/docs", "/redoc", "/openapi.json"]
@@ -23,17 +35,314 @@ RATE_LIMITS = {
     "inrange_prod": 20000,
     "inrange_test": 1000,
     "admin": 10000,
-    "default": 1000,
+    "default": settings.RATE_LIMIT_PER_MINUTE,
+}
+
+# Requests a client may make back-to-back before being held to its
+# per-minute rate (token bucket capacity, ~6 seconds of traffic)
+RATE_LIMIT_BURSTS = {
+    "free": 10,
+    "standard": 100,
+    "professional": 500,
+    "enterprise": 2000,
+    "inrange_prod": 2000,
+    "inrange_test": 100,
+    "admin": 1000,
+    "default": settings.RATE_LIMIT_BURST,
 }
 
+# Token bucket check. One call refills the bucket from Redis' clock (shared
+# by all replicas), adds back any refunded tokens and takes up to `want`
+# tokens, granting nothing unless at least `need` fit above `floor`.
+#
+# KEYS[1]: bucket hash
+# ARGV: refill rate (tokens/second), capacity, want, need, floor, refund
+# Returns: {granted, tokens left (string), seconds until `need` would fit}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local need = tonumber(ARGV[4])
+local floor = tonumber(ARGV[5])
+local refund = tonumber(ARGV[6])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + refund + math.max(0, now - ts) * rate)
+
+local granted = math.min(want, math.floor(tokens - floor))
+if granted < need then
+    granted = 0
+end
+tokens = tokens - granted
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - floor) / rate) + 1)
+
+local retry_after = 0
+if granted == 0 then
+    retry_after = math.max(1, math.ceil((need + floor - tokens) / rate))
+end
+return {granted, tostring(tokens), retry_after}
+"""
+
+
+def _rate_limit_exceeded(rate_limit: int, ttl: int, message: str) -> HTTPException:
+    """Build the 429 error returned when a client is over its limit."""
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": {
+                "code": "RATE_LIMIT_EXCEEDED",
+                "message": message,
+                "retry_after": ttl,
+            }
+        },
+        headers={
+            "X-RateLimit-Limit": str(rate_limit),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + ttl),
+            "Retry-After": str(ttl),
+        },
+    )
+
+
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    __slots__ = ("allowed", "limit", "remaining", "retry_after", "reset")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, retry_after: int, reset: int):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.retry_after = retry_after
+        self.reset = reset
+
+
+class QuotaLease:
+    """Tokens taken from a client's bucket, spent in this process."""
+
+    __slots__ = ("tokens", "bucket_tokens", "expires_at")
+
+    def __init__(self, tokens: int, bucket_tokens: float, expires_at: float):
+        self.tokens = tokens
+        self.bucket_tokens = bucket_tokens
+        self.expires_at = expires_at
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter backed by one Redis script call per check.
+
+    Clients listed in RATE_LIMIT_LEASE_CLIENTS take RATE_LIMIT_LEASE_SIZE
+    tokens at a time and spend them locally until the lease runs out or
+    expires (RATE_LIMIT_LEASE_TTL_MS); leftovers are refunded with the next
+    lease request, in the same script call.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, QuotaLease] = {}
+        self._script = None
+        self._script_client = None
+
+        self.checks = 0
+        self.redis_calls = 0
+        self.lease_hits = 0
+        self.leases_granted = 0
+        self.denied = 0
+        self.errors = 0
+
+    @staticmethod
+    def limits_for(client_id: str) -> Tuple[int, int]:
+        """(requests per minute, burst) for a client."""
+        return (
+            RATE_LIMITS.get(client_id, RATE_LIMITS["default"]),
+            RATE_LIMIT_BURSTS.get(client_id, RATE_LIMIT_BURSTS["default"]),
+        )
+
+    async def _take(
+        self,
+        redis_client,
+        client_id: str,
+        want: int,
+        need: int,
+        floor: int = 0,
+        refund: int = 0,
+    ) -> Tuple[int, float, int]:
+        """Run the bucket script; returns (granted, tokens left, retry after)."""
+        if self._script_client is not redis_client:
+            self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = redis_client
+
+        rate_limit, burst = self.limits_for(client_id)
+        self.redis_calls += 1
+        granted, tokens, retry_after = await self._script(
+            keys=[f"ratelimit:{client_id}"],
+            args=[rate_limit / 60, burst, want, need, floor, refund],
+        )
+        return int(granted), float(tokens), int(retry_after)
+
+    def _decision(self, client_id: str, granted: int, tokens: float, retry_after: int) -> RateLimitDecision:
+        rate_limit, burst = self.limits_for(client_id)
+        remaining = max(0, int(tokens))
+        # Reset: when the bucket would be full again
+        refill_seconds = math.ceil(max(0.0, burst - tokens) * 60 / rate_limit)
+        if not granted:
+            self.denied += 1
+        return RateLimitDecision(
+            allowed=bool(granted),
+            limit=rate_limit,
+            remaining=remaining,
+            retry_after=retry_after,
+            reset=int(time.time()) + refill_seconds,
+        )
+
+    async def check(self, redis_client, client_id: str) -> RateLimitDecision:
+        """Admit one request (raises if Redis fails)."""
+        self.checks += 1
+        if client_id not in settings.rate_limit_lease_clients_list:
+            granted, tokens, retry_after = await self._take(redis_client, client_id, 1, 1)
+            return self._decision(client_id, granted, tokens, retry_after)
+
+        now = time.monotonic()
+        lease = self._leases.get(client_id)
+        if lease is not None and lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            self.lease_hits += 1
+            return self._decision(client_id, 1, lease.bucket_tokens + lease.tokens, 0)
+
+        # Take the lease out before awaiting so its leftovers are refunded once
+        refund = self._leases.pop(client_id).tokens if lease is not None else 0
+        try:
+            granted, tokens, retry_after = await self._take(
+                redis_client, client_id, max(1, settings.RATE_LIMIT_LEASE_SIZE), 1, refund=refund
+            )
+        except Exception:
+            if refund:
+                self._leases.setdefault(client_id, lease)
+            raise
+        if granted:
+            self.leases_granted += 1
+            current = self._leases.get(client_id)
+            if current is not None:
+                # Another request leased concurrently; pool the tokens
+                current.tokens += granted - 1
+            else:
+                self._leases[client_id] = QuotaLease(
+                    tokens=granted - 1,
+                    bucket_tokens=tokens,
+                    expires_at=now + settings.RATE_LIMIT_LEASE_TTL_MS / 1000,
+                )
+        return self._decision(client_id, granted, tokens + max(0, granted - 1), retry_after)
+
+    async def charge(self, redis_client, client_id: str, count: int) -> RateLimitDecision:
+        """
+        Charge `count` requests at once (raises if Redis fails).
+
+        A charge may take the bucket below zero, borrowing up to one minute
+        of future quota, so a batch within the per-minute limit is never
+        rejected just for being larger than the burst. Requests are then
+        refused until the debt is refilled.
+        """
+        self.checks += 1
+        lease = self._leases.get(client_id)
+        if lease is not None and lease.tokens >= count and time.monotonic() < lease.expires_at:
+            lease.tokens -= count
+            self.lease_hits += 1
+            return self._decision(client_id, count, lease.bucket_tokens + lease.tokens, 0)
+
+        rate_limit, _ = self.limits_for(client_id)
+        granted, tokens, retry_after = await self._take(
+            redis_client, client_id, count, count, floor=-rate_limit
+        )
+        return self._decision(client_id, granted, tokens, retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "checks": self.checks,
+            "redis_calls": self.redis_calls,
+            "lease_hits": self.lease_hits,
+            "lease_hit_rate": round(self.lease_hits / self.checks, 4) if self.checks else 0.0,
+            "leases_granted": self.leases_granted,
+            "active_leases": len(self._leases),
+            "denied": self.denied,
+            "errors": self.errors,
+        }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter (created lazily)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Counters for metrics endpoints."""
+    return get_rate_limiter().stats()
+
+
+async def charge_rate_limit(client_id: str, count: int) -> None:
+    """
+    Charge additional requests against a client's rate limit.
+
+    The middleware already counted the HTTP request itself; endpoints that do
+    the work of several requests (e.g. batch calculation) call this with the
+    extra amount. A rejected charge consumes no quota and raises a 429.
+    """
+    if count <= 0:
+        return
+
+    from app.redis_client import get_redis_client
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+
+    limiter = get_rate_limiter()
+    try:
+        decision = await limiter.charge(redis_client, client_id, count)
+    except Exception as e:
+        # If Redis fails, allow request through (graceful degradation)
+        limiter.errors += 1
+        logger.warning(f"Rate limit charge failed: {str(e)}")
+        return
+
+    if not decision.allowed:
+        raise _rate_limit_exceeded(
+            decision.limit,
+            decision.retry_after,
+            f"Rate limit exceeded. Limit: {decision.limit}/minute, "
+            f"remaining: {decision.remaining}.",
+        )
+
+
+class RateLimitMiddleware:
     """Middleware to enforce rate limits using Redis."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Skip rate limiting for excluded paths
-        if any(request.url.path.startswith(path) for path in EXCLUDED_PATHS):
-            return await call_next(request)
+        path = scope["path"]
+        if any(path == p or path.startswith(p + "/") for p in EXCLUDED_PATHS):
+            await self.app(scope, receive, send)
+            return
 
         # Import here to avoid circular imports
         from app.redis_client import get_redis_client
@@ -42,64 +351,47 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         # If Redis is not available, skip rate limiting (graceful degradation)
         if redis_client is None:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Get client ID (set by auth middleware)
-        client_id = getattr(request.state, "client_id", "anonymous")
-
-        # Get rate limit for this client
-        rate_limit = RATE_LIMITS.get(client_id, RATE_LIMITS["default"])
-
-        # Redis key for this client's rate limit window
-        current_minute = int(time.time() // 60)
-        redis_key = f"ratelimit:{client_id}:{current_minute}"
+        client_id = scope.get("state", {}).get("client_id", "anonymous")
 
+        limiter = get_rate_limiter()
         try:
-            # Increment counter
-            current_count = await redis_client.incr(redis_key)
-
-            # Set expiry on first request in window
-            if current_count == 1:
-                await redis_client.expire(redis_key, 60)
-
-            # Check if over limit
-            if current_count > rate_limit:
-                # Get TTL for reset time
-                ttl = await redis_client.ttl(redis_key)
-                if ttl < 0:
-                    ttl = 60
-
-                raise HTTPException(
-                    status_code=429,
-                    detail={
-                        "error": {
-                            "code": "RATE_LIMIT_EXCEEDED",
-                            "message": f"Rate limit exceeded. Limit: {rate_limit}/minute.",
-                            "retry_after": ttl,
-                        }
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(rate_limit),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(int(time.time()) + ttl),
-                        "Retry-After": str(ttl),
-                    },
-                )
-
-            # Process request
-            response = await call_next(request)
+            decision = await limiter.check(redis_client, client_id)
+        except Exception as e:
+            # If Redis fails, allow request through (graceful degradation)
+            limiter.errors += 1
+            logger.warning(f"Rate limit check failed: {str(e)}")
+            await self.app(scope, receive, send)
+            return
 
-            # Add rate limit headers
-            response.headers["X-RateLimit-Limit"] = str(rate_limit)
-            response.headers["X-RateLimit-Remaining"] = str(
-                max(0, rate_limit - current_count)
+        if not decision.allowed:
+            exc = _rate_limit_exceeded(
+                decision.limit,
+                decision.retry_after,
+                f"Rate limit exceeded. Limit: {decision.limit}/minute.",
+            )
+            response = JSONResponse(
+                status_code=exc.status_code, content=exc.detail, headers=exc.headers
             )
-            response.headers["X-RateLimit-Reset"] = str(current_minute * 60 + 60)
+            await response(scope, receive, send)
+            return
 
-            return response
+        # Add rate limit headers
+        rate_limit_headers = (
+            ("X-RateLimit-Limit", str(decision.limit)),
+            ("X-RateLimit-Remaining", str(decision.remaining)),
+            ("X-RateLimit-Reset", str(decision.reset)),
+        )
 
-        except HTTPException:
-            raise
-        except Exception:
-            # If Redis fails, allow request through (graceful degradation)
-            return await call_next(request)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers:
+                    headers[name] = value
+            await send(message)
+
+        # Process request
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,104 @@
+"""
+Request Context Middleware
+
+Assigns every request an ID, adds the X-Request-ID / X-API-Version headers,
+logs completed requests and queues authenticated API requests for
+admin_request_logs (written in batches, see app.services.request_log).
+"""
+
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.services.request_log import get_request_log_writer
+
+# Paths not recorded in admin_request_logs
+UNLOGGED_PATH_PREFIXES = ("/admin", "/docs", "/redoc", "/openapi")
+
+
+class RequestContextMiddleware:
+    """Add request ID and log all requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        start_time = time.time()
+        status_code = None
+        latency_ms = None
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code, latency_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                latency_ms = (time.time() - start_time) * 1000
+
+                # Add headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-API-Version"] = settings.VERSION
+            await send(message)
+
+        await self.app(scope, receive, send_with_context)
+
+        # The response has been sent; log it
+        if status_code is None:
+            return
+        client_id = state.get("client_id", "anonymous")
+        api_key_id = state.get("api_key_id")
+        path = scope["path"]
+
+        logger.info(
+            "Request completed",
+            request_id=request_id,
+            method=scope["method"],
+            path=path,
+            status=status_code,
+            latency_ms=round(latency_ms, 2),
+            client=client_id,
+        )
+
+        # Log to database for API requests (skip admin, health, static files)
+        if (api_key_id or client_id != "anonymous") and not path.startswith(UNLOGGED_PATH_PREFIXES):
+            self._enqueue_log(scope, path, client_id, api_key_id, status_code, latency_ms)
+
+    def _enqueue_log(
+        self,
+        scope: Scope,
+        path: str,
+        client_id: str,
+        api_key_id,
+        status_code: int,
+        latency_ms: float,
+    ) -> None:
+        headers = Headers(scope=scope)
+
+        # Get client IP
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            client_ip = forwarded.split(",")[0].strip()
+
+        # Written in batches by a background task
+        get_request_log_writer().enqueue(
+            api_key_id,
+            client_id if client_id != "anonymous" else None,
+            path,
+            scope["method"],
+            status_code,
+            round(latency_ms, 2),
+            client_ip,
+            headers.get("user-agent", "")[:500],
+        )
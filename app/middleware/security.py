@@ -4,8 +4,10 @@ Security Middleware
 Adds security headers and implements security best practices.
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import List, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
 
@@ -23,27 +25,21 @@ def build_csp_connect_src() -> str:
     return " ".join(sources)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
+def build_security_headers() -> List[Tuple[str, str]]:
+    """Headers added to every response (HSTS is added separately for HTTPS)."""
+    # Content Security Policy - uses CORS origins from environment
+    csp_connect_src = build_csp_connect_src()
+    return [
         # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
+        ("X-Content-Type-Options", "nosniff"),
         # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
+        ("X-Frame-Options", "DENY"),
         # XSS Protection (legacy, but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
+        ("X-XSS-Protection", "1; mode=block"),
         # Referrer Policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Content Security Policy - uses CORS origins from environment
-        csp_connect_src = build_csp_connect_src()
-        response.headers["Content-Security-Policy"] = (
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+        (
+            "Content-Security-Policy",
             "default-src 'self'; "
             "script-src 'self' 'unsafe-inline' https://accounts.google.com https://cdn.tailwindcss.com https://cdn.jsdelivr.net; "
             "style-src 'self' 'unsafe-inline' https://accounts.google.com https://cdn.jsdelivr.net https://fonts.googleapis.com; "
@@ -51,19 +47,39 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "font-src 'self' https://fonts.gstatic.com; "
             f"connect-src {csp_connect_src}; "
             "frame-src https://accounts.google.com; "
-            "frame-ancestors 'none';"
-        )
+            "frame-ancestors 'none';",
+        ),
+        # Permissions Policy (restrict browser features)
+        ("Permissions-Policy", "geolocation=(), microphone=(), camera=(), payment=()"),
+    ]
 
-        # HSTS (only in production)
-        # Note: Railway handles HTTPS, but we add this for extra security
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
 
-        # Permissions Policy (restrict browser features)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), payment=()"
-        )
+# HSTS (only in production)
+# Note: Railway handles HTTPS, but we add this for extra security
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload")
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.headers = build_security_headers()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers_to_add = self.headers
+        if scope.get("scheme") == "https":
+            headers_to_add = [*headers_to_add, HSTS_HEADER]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in headers_to_add:
+                    headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -126,3 +126,25 @@ class Lead(Base):
     __table_args__ = (
         Index("ix_leads_source_status", "source", "status"),
     )
+
+
+class Facility(Base):
+    """Registered facility: where it is and which way its bays face."""
+
+    __tablename__ = "facilities"
+
+    id = Column(Integer, primary_key=True, index=True)
+    client_id = Column(String(50), nullable=False)  # Owning API client
+    facility_id = Column(String(100), nullable=False)  # metadata.facility_id sent by the client
+    name = Column(String(255), nullable=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    altitude_ft = Column(Float, nullable=True)  # None = elevation grid / weather lookup
+    target_bearing_deg = Column(Float, nullable=False, default=0)  # Compass bearing bays face
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_facilities_client_facility", "client_id", "facility_id", unique=True),
+    )
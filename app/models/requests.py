@@ -1,12 +1,25 @@
 from pydantic import BaseModel, Field, model_validator
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+
+from app.constants import VALID_CLUBS
+
+# Largest number of shots accepted by POST /api/v1/calculate/batch
+MAX_BATCH_SHOTS = 2000
+
+# Most forecast hours and shots per POST /api/v1/forecast/trajectory
+MAX_FORECAST_HOURS = 48
+MAX_FORECAST_SHOTS = 20
+
+# Altitude range accepted by the physics engine (feet)
+MIN_ALTITUDE_FT = -500
+MAX_ALTITUDE_FT = 15000
 
 
 class ShotMetadata(BaseModel):
     """Optional metadata for enterprise integrations (launch monitors, etc.)"""
     facility_id: Optional[str] = Field(
         default=None,
-        description="Your facility/location identifier"
+        description="Your facility/location identifier (a registered facility supplies weather when no location or conditions_override is sent)"
     )
     bay_number: Optional[int] = Field(
         default=None, ge=1, le=100,
@@ -46,6 +59,10 @@ class ShotMetadata(BaseModel):
     )
 
 
+def _facility_id(metadata: Optional[ShotMetadata]) -> Optional[str]:
+    return metadata.facility_id if metadata is not None else None
+
+
 class ShotData(BaseModel):
     ball_speed_mph: float = Field(
         ..., gt=0, le=220, description="Ball speed in mph"
@@ -86,7 +103,7 @@ class WeatherConditions(BaseModel):
         description="Temperature in Fahrenheit (extended range -40 to 130 for gaming)"
     )
     altitude_ft: float = Field(
-        default=0, ge=-500, le=15000,
+        default=0, ge=MIN_ALTITUDE_FT, le=MAX_ALTITUDE_FT,
         description="Altitude in feet (extended range for high altitude gaming)"
     )
     humidity_pct: float = Field(
@@ -185,10 +202,12 @@ class CalculateRequest(BaseModel):
     Supports:
     - GPS coordinate-based weather (location with lat/lng)
     - Custom weather conditions (conditions_override)
+    - A registered facility (metadata.facility_id)
 
     Priority:
     - If conditions_override provided, uses custom conditions
     - If location provided (and no override), fetches real weather
+    - Otherwise uses the registered facility's weather
     """
     # Shot parameters (flat, not nested)
     ball_speed: float = Field(
@@ -231,13 +250,206 @@ class CalculateRequest(BaseModel):
     @model_validator(mode='after')
     def validate_weather_source(self):
         """Ensure at least one weather source is provided."""
-        if not self.conditions_override and not self.location:
+        if not self.conditions_override and not self.location and not _facility_id(self.metadata):
+            raise ValueError(
+                "Either location, conditions_override or metadata.facility_id required"
+            )
+        return self
+
+
+class BatchShot(BaseModel):
+    """One shot in a batch calculation request (same flat fields as CalculateRequest)."""
+    ball_speed: float = Field(
+        ..., gt=0, le=220,
+        description="Ball speed in mph"
+    )
+    launch_angle: float = Field(
+        ..., ge=-10, le=60,
+        description="Launch angle in degrees"
+    )
+    spin_rate: float = Field(
+        ..., ge=0, le=15000,
+        description="Total spin rate in RPM"
+    )
+    spin_axis: float = Field(
+        default=0, ge=-90, le=90,
+        description="Spin axis tilt in degrees (negative = draw, positive = fade)"
+    )
+    direction: float = Field(
+        default=0, ge=-45, le=45,
+        description="Initial direction relative to target line"
+    )
+    conditions_override: Optional[ProfessionalConditionsOverride] = Field(
+        default=None,
+        description="Per-shot conditions (takes precedence over the batch-level conditions)"
+    )
+    metadata: Optional[ShotMetadata] = Field(
+        default=None,
+        description="Optional enterprise metadata, echoed back with this shot's result"
+    )
+
+
+class CalculateBatchRequest(BaseModel):
+    """
+    Batch professional trajectory calculation request.
+
+    Conditions for each shot come from, in priority order:
+    - The shot's own conditions_override
+    - The batch-level conditions_override
+    - Real weather for the batch-level location (fetched once)
+    - The weather of the shot's registered facility (metadata.facility_id)
+    """
+    shots: List[BatchShot] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SHOTS,
+        description=f"Shots to calculate (1-{MAX_BATCH_SHOTS}); results are returned in this order"
+    )
+    location: Optional[CoordinateLocation] = Field(
+        default=None,
+        description="GPS coordinates for weather lookup, shared by all shots"
+    )
+    conditions_override: Optional[ProfessionalConditionsOverride] = Field(
+        default=None,
+        description="Custom weather conditions shared by all shots (takes precedence over location)"
+    )
+
+    @model_validator(mode='after')
+    def validate_weather_source(self):
+        """Ensure every shot has a weather source."""
+        if self.conditions_override or self.location:
+            return self
+        missing = [
+            i for i, shot in enumerate(self.shots)
+            if not shot.conditions_override and not _facility_id(shot.metadata)
+        ]
+        if missing:
             raise ValueError(
-                "Either location or conditions_override required"
+                "Either location, conditions_override or metadata.facility_id required "
+                f"(shots without conditions: {missing[:10]})"
             )
         return self
 
 
+class SessionConfig(BaseModel):
+    """
+    Session-level settings for the /api/v1/sessions/ws channel.
+
+    Conditions are pinned for every shot in the session unless a shot
+    carries its own conditions_override. Without location or
+    conditions_override, metadata.facility_id pins the registered
+    facility's weather. Metadata is the default for every shot (shot
+    metadata fields take precedence).
+    """
+    location: Optional[CoordinateLocation] = Field(
+        default=None,
+        description="GPS coordinates for weather lookup (fetched once for the session)"
+    )
+    conditions_override: Optional[ProfessionalConditionsOverride] = Field(
+        default=None,
+        description="Custom weather conditions for the session (takes precedence over location)"
+    )
+    metadata: Optional[ShotMetadata] = Field(
+        default=None,
+        description="Default metadata for the session (facility_id, bay_number, session_id, ...)"
+    )
+
+
+class ForecastShot(BaseModel):
+    """
+    One shot of a forecast plan: a club (stock numbers for the request's
+    handicap) or explicit launch parameters, which take precedence.
+    """
+    label: Optional[str] = Field(
+        default=None, max_length=64,
+        description="Column label in the response (defaults to the club, else shot_<n>)"
+    )
+    club: Optional[str] = Field(
+        default=None,
+        description=f"Stock club: {', '.join(VALID_CLUBS)}"
+    )
+    ball_speed: Optional[float] = Field(default=None, gt=0, le=220, description="Ball speed in mph")
+    launch_angle: Optional[float] = Field(default=None, ge=-10, le=60, description="Launch angle in degrees")
+    spin_rate: Optional[float] = Field(default=None, ge=0, le=15000, description="Total spin rate in RPM")
+    spin_axis: float = Field(
+        default=0, ge=-90, le=90,
+        description="Spin axis tilt in degrees (negative = draw, positive = fade)"
+    )
+    direction: float = Field(
+        default=0, ge=-45, le=45,
+        description="Initial direction relative to target line"
+    )
+
+    @model_validator(mode='after')
+    def validate_shot_source(self):
+        """Ensure the shot is a known club or fully specified."""
+        if self.club is not None and self.club not in VALID_CLUBS:
+            raise ValueError(f"Invalid club '{self.club}'. Valid clubs: {', '.join(VALID_CLUBS)}")
+        explicit = (self.ball_speed, self.launch_angle, self.spin_rate)
+        if self.club is None and None in explicit:
+            raise ValueError("Either club or ball_speed, launch_angle and spin_rate required")
+        return self
+
+
+class ForecastTrajectoryRequest(BaseModel):
+    """
+    Hourly trajectory plan: every shot under every forecast hour.
+
+    Weather comes from the hourly forecast for `location` (city) or
+    `coordinates`, fetched once per location and cached.
+    """
+    location: Optional[LocationQuery] = Field(default=None, description="City for the forecast")
+    coordinates: Optional[CoordinateLocation] = Field(
+        default=None, description="GPS coordinates for the forecast (takes precedence over location)"
+    )
+    hours: int = Field(
+        default=12, ge=1, le=MAX_FORECAST_HOURS,
+        description=f"Forecast hours from the current hour on (1-{MAX_FORECAST_HOURS})"
+    )
+    shots: List[ForecastShot] = Field(
+        ..., min_length=1, max_length=MAX_FORECAST_SHOTS,
+        description=f"Clubs or shots to plan (1-{MAX_FORECAST_SHOTS}); the response columns"
+    )
+    handicap: int = Field(
+        default=10, ge=0, le=36,
+        description="Handicap whose stock numbers are used for clubs"
+    )
+    target_bearing_deg: Optional[float] = Field(
+        default=None, ge=0, lt=360,
+        description="Compass bearing of the shot; forecast winds are made relative to it "
+                    "(omit to use the compass direction as the relative direction)"
+    )
+
+    @model_validator(mode='after')
+    def validate_weather_source(self):
+        """Ensure a forecast location is provided."""
+        if not self.location and not self.coordinates:
+            raise ValueError("Either location or coordinates required")
+        return self
+
+
+class FacilityRegistration(BaseModel):
+    """A facility registered through PUT /api/v1/admin/facilities/{client_id}/{facility_id}."""
+    name: Optional[str] = Field(default=None, max_length=255, description="Display name")
+    latitude: float = Field(..., ge=-90, le=90, description="Latitude of the hitting bays")
+    longitude: float = Field(..., ge=-180, le=180, description="Longitude of the hitting bays")
+    altitude_ft: Optional[float] = Field(
+        default=None, ge=MIN_ALTITUDE_FT, le=MAX_ALTITUDE_FT,
+        description="Altitude in feet (omit to use the elevation grid / weather lookup)"
+    )
+    target_bearing_deg: float = Field(
+        default=0, ge=0, lt=360,
+        description="Compass bearing from the bays to the targets (0 = north, 90 = east)"
+    )
+
+
+class SessionShot(BatchShot):
+    """A shot sent over the session channel."""
+    shot_id: Optional[str] = Field(
+        default=None,
+        max_length=128,
+        description="Client correlation ID, echoed back with the result"
+    )
+
+
 class TrajectoryRequest(BaseModel):
     shot: ShotData
     conditions: WeatherConditions
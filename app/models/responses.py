@@ -85,6 +85,8 @@ class ConditionsUsed(BaseModel):
     pressure_inhg: float
     conditions_text: Optional[str] = None
     fetched_at: Optional[datetime] = None
+    observed_at: Optional[datetime] = None
+    observation_age_seconds: Optional[int] = None
 
 
 class TrajectoryResponse(BaseModel):
@@ -106,6 +108,9 @@ class ConditionsResponse(BaseModel):
     pressure_inhg: float
     conditions_text: str
     fetched_at: datetime
+    # When WeatherAPI.com made the observation, and how long ago that was
+    observed_at: Optional[datetime] = None
+    observation_age_seconds: Optional[int] = None
 
 
 # ============================================================================
@@ -147,6 +152,8 @@ class DualConditionsUsed(BaseModel):
     pressure: DualPressure
     conditions_text: Optional[str] = None
     fetched_at: Optional[datetime] = None
+    observed_at: Optional[datetime] = None
+    observation_age_seconds: Optional[int] = None
 
 
 class DualTrajectoryResponse(BaseModel):
@@ -158,10 +165,11 @@ class DualTrajectoryResponse(BaseModel):
     additional API calls.
     """
     adjusted: DualAdjustedResults
-    baseline: DualAdjustedResults
-    impact_breakdown: DualImpactBreakdown
-    equivalent_calm_distance: DualDistance
-    trajectory_points: List[DualTrajectoryPoint]
+    # Omitted when not selected with include=
+    baseline: Optional[DualAdjustedResults] = None
+    impact_breakdown: Optional[DualImpactBreakdown] = None
+    equivalent_calm_distance: Optional[DualDistance] = None
+    trajectory_points: Optional[List[DualTrajectoryPoint]] = None
     conditions_used: Optional[DualConditionsUsed] = None
     units_preference: str = "imperial"  # Indicates client's stated preference
 
@@ -181,6 +189,9 @@ class DualConditionsResponse(BaseModel):
     pressure: DualPressure
     conditions_text: str
     fetched_at: datetime
+    # When WeatherAPI.com made the observation, and how long ago that was
+    observed_at: Optional[datetime] = None
+    observation_age_seconds: Optional[int] = None
     units_preference: str = "imperial"  # Indicates client's stated preference
 
 
@@ -248,10 +259,11 @@ class GamingTrajectoryResponse(BaseModel):
     - Stock carry distance for comparison
     """
     adjusted: DualAdjustedResults
-    baseline: DualAdjustedResults
-    impact_breakdown: DualImpactBreakdown
-    equivalent_calm_distance: DualDistance
-    trajectory_points: List[DualTrajectoryPoint]
+    # Omitted when not selected with include=
+    baseline: Optional[DualAdjustedResults] = None
+    impact_breakdown: Optional[DualImpactBreakdown] = None
+    equivalent_calm_distance: Optional[DualDistance] = None
+    trajectory_points: Optional[List[DualTrajectoryPoint]] = None
     conditions_used: GamingConditionsUsed
     units_preference: str = "imperial"
 
@@ -285,7 +297,7 @@ class EnterpriseRecommendations(BaseModel):
 
 class EnterpriseConditions(BaseModel):
     """Conditions used in enterprise response."""
-    source: str  # "real-time" or "override"
+    source: str  # "real-time", "override" or "facility"
     temperature_f: float
     wind_speed_mph: float
     wind_direction_deg: float
@@ -324,15 +336,44 @@ class EnterpriseTrajectoryResponse(BaseModel):
     trajectory: EnterpriseTrajectory
 
     # Analysis breakdown
-    analysis: EnterpriseAnalysis
+    analysis: Optional[EnterpriseAnalysis] = None
 
     # Human-readable insights
-    insights: List[str]
+    insights: Optional[List[str]] = None
 
     # Recommendations
-    recommendations: EnterpriseRecommendations
+    recommendations: Optional[EnterpriseRecommendations] = None
 
     # Include full dual-unit data for clients that want it
     adjusted: Optional[DualAdjustedResults] = None
     baseline: Optional[DualAdjustedResults] = None
     impact_breakdown: Optional[DualImpactBreakdown] = None
+
+
+# ============================================================================
+# FORECAST PLANNER MODELS
+# Compact hour x shot matrices (rows = hours, columns = shots), in yards
+# ============================================================================
+
+
+class ForecastHourConditions(BaseModel):
+    """Forecast conditions, one value per hour."""
+    temperature_f: List[float]
+    wind_speed_mph: List[float]
+    wind_direction_deg: List[float]  # Relative to the target line if target_bearing_deg was sent
+    humidity_pct: List[float]
+    pressure_inhg: List[float]
+    conditions_text: List[str]
+
+
+class ForecastTrajectoryResponse(BaseModel):
+    """Response of POST /api/v1/forecast/trajectory."""
+    location: Optional[str] = None
+    altitude_ft: float
+    fetched_at: datetime
+    hours: List[str]  # UTC start of each forecast hour (ISO 8601)
+    shots: List[str]  # Column labels
+    conditions: ForecastHourConditions
+    carry_yards: List[List[float]]
+    total_yards: List[List[float]]
+    lateral_drift_yards: List[List[float]]
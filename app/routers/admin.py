@@ -6,12 +6,32 @@ Requires admin API key.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Header
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from typing import Optional
 import hashlib
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
 from app.config import settings
-from app.services.usage import UsageService
-from app.database import get_db
+from app.models.database import Facility
+from app.models.requests import FacilityRegistration
+from app.middleware.rate_limiting import get_rate_limit_stats
+from app.services.usage import UsageService, get_usage_aggregator
+from app.services.physics import get_breakdown_memo_stats
+from app.services.coalescing import get_coalescing_stats
+from app.services.executor import get_physics_executor
+from app.services.result_cache import get_result_cache
+from app.services.weather_cache import get_forecast_cache, get_weather_cache
+from app.services.weather_client import get_weather_client
+from app.services.weather_quota import get_weather_quota
+from app.services.weather_providers import get_weather_provider
+from app.services.elevation import get_elevation_stats
+from app.services.facilities import get_facility_registry
+from app.services.sessions import get_session_stats
+from app.services.api_keys import get_api_key_cache
+from app.services.request_log import get_request_log_writer
+from app.database import get_db, get_db_pool_stats
 
 router = APIRouter()
 
@@ -160,3 +180,144 @@ async def list_api_keys(admin=Depends(verify_admin_key)):
         "clients": list(settings.API_KEYS.keys()),
         "count": len(settings.API_KEYS),
     }
+
+
+@router.get("/metrics")
+async def get_metrics(admin=Depends(verify_admin_key)):
+    """
+    In-process performance counters (caches, memoization, weather and
+    forecast caches, provider, upstream client and quota, elevation grid,
+    facility registry, sessions, rate limiter, API key cache, request log
+    writer, usage aggregator, database pools).
+
+    Requires admin API key.
+    """
+    return {
+        "physics_memo": get_breakdown_memo_stats(),
+        "physics_executor": get_physics_executor().stats(),
+        "physics_coalescing": get_coalescing_stats(),
+        "result_cache": get_result_cache().stats(),
+        "weather_cache": get_weather_cache().stats(),
+        "forecast_cache": get_forecast_cache().stats(),
+        "weather_provider": get_weather_provider().stats(),
+        "weather_client": get_weather_client().stats(),
+        "weather_quota": get_weather_quota().stats(),
+        "elevation": get_elevation_stats(),
+        "facilities": get_facility_registry().stats(),
+        "sessions": get_session_stats(),
+        "rate_limiter": get_rate_limit_stats(),
+        "api_key_cache": get_api_key_cache().stats(),
+        "request_log": get_request_log_writer().stats(),
+        "usage": get_usage_aggregator().stats(),
+        "database": get_db_pool_stats(),
+    }
+
+
+DATABASE_NOT_CONFIGURED = {
+    "error": {
+        "code": "DATABASE_NOT_CONFIGURED",
+        "message": "Database is not configured. Facility registry unavailable.",
+    }
+}
+
+
+def _facility_dict(facility: Facility) -> dict:
+    return {
+        "client_id": facility.client_id,
+        "facility_id": facility.facility_id,
+        "name": facility.name,
+        "latitude": facility.latitude,
+        "longitude": facility.longitude,
+        "altitude_ft": facility.altitude_ft,
+        "target_bearing_deg": facility.target_bearing_deg,
+        "is_active": facility.is_active,
+    }
+
+
+@router.get("/facilities")
+async def list_facilities(
+    client_id: Optional[str] = None,
+    db=Depends(get_db),
+    admin=Depends(verify_admin_key),
+):
+    """
+    List registered facilities (optionally for one client).
+
+    Requires admin API key.
+    """
+    if db is None:
+        raise HTTPException(status_code=503, detail=DATABASE_NOT_CONFIGURED)
+
+    query = select(Facility).order_by(Facility.client_id, Facility.facility_id)
+    if client_id:
+        query = query.where(Facility.client_id == client_id)
+    result = await db.execute(query)
+    facilities = [_facility_dict(f) for f in result.scalars().all()]
+
+    return {"facilities": facilities, "count": len(facilities)}
+
+
+@router.put("/facilities/{client_id}/{facility_id}")
+async def register_facility(
+    client_id: str,
+    facility_id: str,
+    registration: FacilityRegistration,
+    db=Depends(get_db),
+    admin=Depends(verify_admin_key),
+):
+    """
+    Register or update a facility (and reactivate it if it was removed).
+
+    Requests from client_id sending metadata.facility_id get this
+    facility's weather. Other instances pick the change up on their next
+    registry reload (FACILITY_WEATHER_REFRESH_SECONDS).
+
+    Requires admin API key.
+    """
+    if db is None:
+        raise HTTPException(status_code=503, detail=DATABASE_NOT_CONFIGURED)
+
+    values = registration.model_dump()
+    stmt = insert(Facility).values(
+        client_id=client_id, facility_id=facility_id, is_active=True, **values
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["client_id", "facility_id"],
+        set_={**values, "is_active": True, "updated_at": datetime.utcnow()},
+    )
+    await db.execute(stmt)
+    await db.commit()
+    await get_facility_registry().reload()
+
+    return {"client_id": client_id, "facility_id": facility_id, "is_active": True, **values}
+
+
+@router.delete("/facilities/{client_id}/{facility_id}")
+async def remove_facility(
+    client_id: str,
+    facility_id: str,
+    db=Depends(get_db),
+    admin=Depends(verify_admin_key),
+):
+    """
+    Deactivate a facility (its row is kept; PUT reactivates it).
+
+    Requires admin API key.
+    """
+    if db is None:
+        raise HTTPException(status_code=503, detail=DATABASE_NOT_CONFIGURED)
+
+    result = await db.execute(
+        select(Facility).where(
+            Facility.client_id == client_id, Facility.facility_id == facility_id
+        )
+    )
+    facility = result.scalar_one_or_none()
+    if facility is None:
+        raise HTTPException(status_code=404, detail=f"Facility '{facility_id}' is not registered")
+
+    facility.is_active = False
+    await db.commit()
+    await get_facility_registry().reload()
+
+    return {"client_id": client_id, "facility_id": facility_id, "is_active": False}
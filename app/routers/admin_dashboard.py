@@ -13,11 +13,11 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-import asyncpg
 import io
 import csv
 
-from app.config import settings
+from app.database import get_db_workload
+from app.services.api_keys import invalidate_api_key
 
 # ============================================
 # CONFIGURATION
@@ -37,18 +37,9 @@ RATE_LIMITS = {
 # DATABASE CONNECTION
 # ============================================
 
-_admin_db_pool = None
-
 async def get_admin_db_pool():
-    """Get or create database connection pool for admin dashboard."""
-    global _admin_db_pool
-    if _admin_db_pool is None:
-        db_url = settings.DATABASE_URL
-        if db_url.startswith("postgresql+asyncpg://"):
-            db_url = db_url.replace("postgresql+asyncpg://", "postgresql://")
-        if db_url:
-            _admin_db_pool = await asyncpg.create_pool(db_url, min_size=1, max_size=5)
-    return _admin_db_pool
+    """Get the admin workload of the shared database pool (None without a database)."""
+    return await get_db_workload("admin")
 
 # ============================================
 # AUTHENTICATION
@@ -343,6 +334,8 @@ async def update_api_key_status(
         if result == "UPDATE 0":
             raise HTTPException(status_code=404, detail="API key not found")
 
+    await invalidate_api_key(key_id)
+
     return {"message": f"API key status updated to {request.status}"}
 
 @router.patch("/api-keys/{key_id}/tier")
@@ -364,6 +357,8 @@ async def update_api_key_tier(
         if result == "UPDATE 0":
             raise HTTPException(status_code=404, detail="API key not found")
 
+    await invalidate_api_key(key_id)
+
     return {"message": f"API key tier updated to {request.tier}", "new_rate_limit": RATE_LIMITS[request.tier]}
 
 @router.delete("/api-keys/{key_id}")
@@ -384,6 +379,8 @@ async def revoke_api_key(
         if result == "UPDATE 0":
             raise HTTPException(status_code=404, detail="API key not found")
 
+    await invalidate_api_key(key_id)
+
     return {"message": "API key revoked successfully"}
 
 # ============================================
@@ -51,6 +51,8 @@ def build_dual_conditions_response(weather: dict, units: str) -> DualConditionsR
         ),
         conditions_text=weather["conditions_text"],
         fetched_at=weather["fetched_at"],
+        observed_at=weather.get("observed_at"),
+        observation_age_seconds=weather.get("observation_age_seconds"),
         units_preference=units,
     )
 
@@ -5,7 +5,7 @@ Endpoints for gaming-enhanced trajectory calculations and weather presets.
 Supports entertainment venues like Topgolf, Drive Shack, Five Iron.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from typing import Optional
 from datetime import datetime
 
@@ -22,7 +22,10 @@ from app.models.responses import (
     DualDistance,
     DualTrajectoryPoint,
 )
-from app.services.physics import calculate_impact_breakdown
+from app.config import settings
+from app.services.coalescing import run_impact_breakdown
+from app.services.physics import get_engine_fingerprint
+from app.services.result_cache import cached_response, result_cache_key, store_response
 from app.services.weather import fetch_weather_by_city
 from app.constants.gaming import (
     WEATHER_PRESETS,
@@ -31,6 +34,16 @@ from app.constants.gaming import (
     VALID_CLUBS,
 )
 from app.utils.conversions import UnitConverter, validate_units_param
+from app.utils.serialization import (
+    DUAL_CORE_FIELDS,
+    DUAL_FIELD_PARTS,
+    INCLUDE_DESCRIPTION,
+    TrustedJSONResponse,
+    breakdown_parts_for,
+    build_dual_results_payload,
+    dumps_json,
+    validate_include_param,
+)
 
 
 router = APIRouter()
@@ -125,6 +138,9 @@ async def calculate_gaming_trajectory(
         default="imperial",
         description="Preferred unit system: 'imperial' or 'metric'. Response includes both.",
     ),
+    include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
+    fields: Optional[str] = Query(default=None, description="Alias of `include`"),
+    if_none_match: Optional[str] = Header(default=None),
 ) -> GamingTrajectoryResponse:
     """
     Calculate golf ball trajectory with gaming enhancements.
@@ -154,13 +170,40 @@ async def calculate_gaming_trajectory(
     - Low (6-12): Single-digit to low double-digit
     - Mid (13-20): Average amateur golfer
     - High (21-36): Beginner to high handicapper
+
+    **Field selection:** `include` (or `fields`) limits the response to the
+    named fields: any of `baseline`, `impact_breakdown`,
+    `equivalent_calm_distance`, `trajectory_points` (`adjusted`,
+    `conditions_used` and `units_preference` are always returned). Only the
+    simulations the selected fields need are run.
+
+    **Caching:** Results for `conditions_override` and `preset` requests are
+    deterministic and cached. Responses carry an `ETag`; send it back in
+    `If-None-Match` to get a `304 Not Modified`.
     """
-    # Validate units parameter
+    # Validate units and field selection parameters
     try:
         validated_units = validate_units_param(units)
+        selected = validate_include_param(
+            include if include is not None else fields, DUAL_FIELD_PARTS, DUAL_CORE_FIELDS
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # Override and preset requests are pure functions of their input
+    cache_key = None
+    if settings.RESULT_CACHE_ENABLED and (request.conditions_override or request.preset):
+        cache_key = result_cache_key(
+            "gaming_trajectory",
+            get_engine_fingerprint("gaming"),
+            request=request,
+            units=validated_units,
+            include=sorted(selected) if selected is not None else None,
+        )
+        cached = await cached_response(cache_key, if_none_match)
+        if cached is not None:
+            return cached
+
     # Determine shot parameters
     shot_data = request.shot
     handicap_tier = None
@@ -274,7 +317,9 @@ async def calculate_gaming_trajectory(
         )
 
     # Calculate trajectory with gaming physics (smart capping for extreme conditions)
-    result = calculate_impact_breakdown(shot, conditions, api_type="gaming")
+    result = await run_impact_breakdown(
+        shot, conditions, api_type="gaming", parts=breakdown_parts_for(selected, DUAL_FIELD_PARTS)
+    )
 
     # Build conditions used response
     conditions_used = GamingConditionsUsed(
@@ -294,6 +339,17 @@ async def calculate_gaming_trajectory(
         conditions_text=conditions_text,
     )
 
+    if cache_key is not None:
+        return await store_response(
+            cache_key,
+            dumps_json(
+                build_dual_results_payload(result, conditions_used, validated_units, selected)
+            ),
+        )
+    if settings.FAST_RESPONSE_SERIALIZATION or selected is not None:
+        return TrustedJSONResponse(
+            build_dual_results_payload(result, conditions_used, validated_units, selected)
+        )
     return build_gaming_trajectory_response(result, conditions_used, validated_units)
 
 
@@ -0,0 +1,305 @@
+"""
+Sessions Router
+
+WebSocket channel for launch-monitor bays: authenticate once, pin
+session-level conditions, then stream shots in and results out.
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.config import settings
+from app.middleware.authentication import authenticate_api_key
+from app.middleware.logging_config import logger
+from app.middleware.rate_limiting import charge_rate_limit
+from app.models.requests import SessionConfig, SessionShot, ShotData, ShotMetadata
+from app.routers.trajectory import (
+    ENTERPRISE_BREAKDOWN_PARTS,
+    build_enterprise_response,
+    conditions_from_override,
+    facility_conditions,
+    fetch_location_conditions,
+)
+from app.services.executor import PhysicsOverloadedError, run_physics
+from app.services.physics import calculate_impact_breakdown_batch
+from app.services.sessions import ShotSession, register_session, unregister_session
+
+router = APIRouter()
+
+# Close code for authentication failures (RFC 6455 "policy violation")
+WS_POLICY_VIOLATION = 1008
+
+
+def _error_message(code: str, message: str, shot_id: Optional[str] = None, **extra) -> str:
+    """Serialize an error frame."""
+    error = {"code": code, "message": message, **extra}
+    return json.dumps({"type": "error", "shot_id": shot_id, "error": error})
+
+
+def _validation_details(exc: ValidationError) -> list:
+    """Field errors in the same shape as the HTTP validation handler."""
+    return [
+        {
+            "field": ".".join(str(loc) for loc in error["loc"]),
+            "message": error["msg"],
+            "type": error["type"],
+        }
+        for error in exc.errors()
+    ]
+
+
+def _http_error(exc: HTTPException, shot_id: Optional[str] = None) -> str:
+    """Convert an HTTPException raised by a shared helper into an error frame."""
+    if isinstance(exc.detail, dict) and "error" in exc.detail:
+        error = exc.detail["error"]
+        return _error_message(error["code"], error["message"], shot_id)
+    return _error_message(f"HTTP_{exc.status_code}", str(exc.detail), shot_id)
+
+
+def _internal_error(exc: Exception) -> HTTPException:
+    """An unexpected failure, worded like the HTTP error handler's 500s."""
+    if settings.ENVIRONMENT == "production":
+        message = "An unexpected error occurred. Please try again."
+    else:
+        message = str(exc)
+    return HTTPException(status_code=500, detail={"error": {
+        "code": "INTERNAL_ERROR", "message": message,
+    }})
+
+
+def _merge_metadata(
+    default: Optional[ShotMetadata], shot: Optional[ShotMetadata]
+) -> Optional[ShotMetadata]:
+    """Shot metadata fields override the session defaults."""
+    if default is None:
+        return shot
+    if shot is None:
+        return default
+    return ShotMetadata(**{**default.model_dump(), **shot.model_dump(exclude_none=True)})
+
+
+@router.websocket("/sessions/ws")
+async def shot_session(websocket: WebSocket):
+    """
+    Launch-monitor session channel.
+
+    Authenticate with the `X-API-Key` header (or `?api_key=` for clients
+    that cannot set headers). All frames are JSON objects with a `type`:
+
+    Client → server:
+    - `configure`: `{"type": "configure", "conditions_override": {...} | "location": {...},
+      "metadata": {...}}` pins conditions and default metadata for the session
+      (with neither, a registered `metadata.facility_id` pins that facility's weather)
+    - `shot`: `{"type": "shot", "shot_id": "...", "ball_speed": ..., "launch_angle": ...,
+      "spin_rate": ..., ...}` (same fields as `/calculate`; a shot's own
+      `conditions_override` takes precedence over the pinned conditions)
+    - `stats`: request this session's counters
+
+    Server → client:
+    - `ready`, `configured`, `result` (`{"shot_id", "result"}` where result is
+      the `/calculate` response), `stats`, `error` (`{"shot_id", "error"}`)
+
+    Shots queued at once are computed together through the batched physics
+    engine. When `SESSION_MAX_PENDING_SHOTS` shots are waiting, the server stops
+    reading from the socket until results go out (backpressure). Each shot
+    counts as one request against the rate limit.
+    """
+    api_key = websocket.headers.get("X-API-Key") or websocket.query_params.get("api_key")
+    await websocket.accept()
+
+    if not api_key:
+        await websocket.send_text(_error_message(
+            "MISSING_API_KEY", "API key is required. Include X-API-Key header."
+        ))
+        await websocket.close(code=WS_POLICY_VIOLATION)
+        return
+
+    client_id, _ = await authenticate_api_key(api_key)
+    if not client_id:
+        await websocket.send_text(_error_message(
+            "INVALID_API_KEY", "The API key provided is invalid or expired."
+        ))
+        await websocket.close(code=WS_POLICY_VIOLATION)
+        return
+
+    session = ShotSession(client_id, settings.SESSION_MAX_PENDING_SHOTS)
+    register_session(session)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=session.max_pending)
+    send_lock = asyncio.Lock()
+
+    # Pinned session state
+    pinned = None  # (WeatherConditions, conditions_info)
+    default_metadata: Optional[ShotMetadata] = None
+
+    async def send(text: str) -> None:
+        async with send_lock:
+            await websocket.send_text(text)
+
+    async def process_shots() -> None:
+        """Drain the queue in batches and send results in arrival order."""
+        chunk_size = max(1, settings.BATCH_PHYSICS_CHUNK_SIZE)
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < chunk_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            session.batches += 1
+
+            failure = None
+            try:
+                await charge_rate_limit(client_id, len(batch))
+                results = await run_physics(
+                    calculate_impact_breakdown_batch,
+                    [(shot, conditions) for _, _, shot, conditions, _, _ in batch],
+                    api_type="professional",
+                    parts=ENTERPRISE_BREAKDOWN_PARTS,
+                )
+            except HTTPException as e:
+                failure = e
+            except PhysicsOverloadedError:
+                failure = HTTPException(status_code=503, detail={"error": {
+                    "code": "PHYSICS_OVERLOADED",
+                    "message": "The service is busy. Please retry shortly.",
+                }})
+            except Exception as e:
+                # Answer the batch and keep draining; a dead worker would
+                # leave the reader blocked on a full queue
+                logger.error(f"Session {session.id} batch failed: {str(e)}")
+                failure = _internal_error(e)
+
+            for index, (received_at, shot_id, _, _, conditions_info, metadata) in enumerate(batch):
+                if failure is not None:
+                    await send(_http_error(failure, shot_id))
+                    session.shot_done(received_at, ok=False)
+                    continue
+                try:
+                    response = build_enterprise_response(results[index], conditions_info, metadata)
+                except Exception as e:
+                    logger.error(f"Session {session.id} response failed: {str(e)}")
+                    await send(_http_error(_internal_error(e), shot_id))
+                    session.shot_done(received_at, ok=False)
+                    continue
+                await send(
+                    '{"type":"result","shot_id":%s,"result":%s}'
+                    % (json.dumps(shot_id), response.model_dump_json())
+                )
+                session.shot_done(received_at, ok=True)
+
+    worker = asyncio.create_task(process_shots())
+    try:
+        await send(json.dumps({
+            "type": "ready",
+            "session_id": session.id,
+            "client_id": client_id,
+            "max_pending": session.max_pending,
+        }))
+
+        while True:
+            text = await websocket.receive_text()
+            received_at = time.perf_counter()
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("frame must be a JSON object")
+            except ValueError as e:
+                await send(_error_message("INVALID_MESSAGE", f"Invalid JSON frame: {e}"))
+                continue
+
+            message_type = message.pop("type", None)
+
+            if message_type == "shot":
+                try:
+                    shot_request = SessionShot(**message)
+                except ValidationError as e:
+                    session.errors += 1
+                    await send(_error_message(
+                        "VALIDATION_ERROR", "Shot validation failed",
+                        message.get("shot_id") if isinstance(message.get("shot_id"), str) else None,
+                        details=_validation_details(e),
+                    ))
+                    continue
+
+                if shot_request.conditions_override:
+                    conditions, conditions_info = conditions_from_override(
+                        shot_request.conditions_override
+                    )
+                elif pinned is not None:
+                    conditions, conditions_info = pinned
+                else:
+                    session.errors += 1
+                    await send(_error_message(
+                        "CONDITIONS_REQUIRED",
+                        "Send a configure frame or include conditions_override with the shot",
+                        shot_request.shot_id,
+                    ))
+                    continue
+
+                shot = ShotData(
+                    ball_speed_mph=shot_request.ball_speed,
+                    launch_angle_deg=shot_request.launch_angle,
+                    spin_rate_rpm=shot_request.spin_rate,
+                    spin_axis_deg=shot_request.spin_axis,
+                    direction_deg=shot_request.direction,
+                )
+                metadata = _merge_metadata(default_metadata, shot_request.metadata)
+                session.shot_queued()
+                # Blocks (and stops reading the socket) while the queue is full
+                await queue.put(
+                    (received_at, shot_request.shot_id, shot, conditions, conditions_info, metadata)
+                )
+
+            elif message_type == "configure":
+                try:
+                    config = SessionConfig(**message)
+                    if config.conditions_override:
+                        new_pinned = conditions_from_override(config.conditions_override)
+                    elif config.location:
+                        new_pinned = await fetch_location_conditions(config.location)
+                    elif config.metadata and config.metadata.facility_id:
+                        new_pinned = await facility_conditions(client_id, config.metadata.facility_id)
+                    else:
+                        new_pinned = pinned
+                except ValidationError as e:
+                    await send(_error_message(
+                        "VALIDATION_ERROR", "Session configuration failed",
+                        details=_validation_details(e),
+                    ))
+                    continue
+                except HTTPException as e:
+                    await send(_http_error(e))
+                    continue
+
+                pinned = new_pinned
+                if config.metadata is not None:
+                    default_metadata = config.metadata
+                    session.metadata = config.metadata.model_dump()
+                if pinned is not None:
+                    session.conditions_source = pinned[1]["source"]
+                await send(json.dumps({
+                    "type": "configured",
+                    "conditions": pinned[1] if pinned else None,
+                    "metadata": session.metadata,
+                }))
+
+            elif message_type == "stats":
+                await send(json.dumps({"type": "stats", "stats": session.stats()}))
+
+            else:
+                await send(_error_message(
+                    "UNKNOWN_MESSAGE_TYPE",
+                    "Frame type must be one of: configure, shot, stats",
+                ))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker.cancel()
+        try:
+            await worker
+        except (asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+            pass
+        unregister_session(session)
@@ -6,9 +6,11 @@ Supports both imperial and metric units (dual-unit responses).
 Includes enterprise integration features for launch monitor platforms.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, FrozenSet, Literal, Optional, List, Tuple
 from datetime import datetime
+import json
 import uuid
 
 from app.models.requests import (
@@ -17,7 +19,13 @@ from app.models.requests import (
     TrajectoryCourseRequest,
     WeatherConditions,
     CalculateRequest,
+    CalculateBatchRequest,
     ConditionsOverride,
+    ForecastShot,
+    ForecastTrajectoryRequest,
+    CoordinateLocation,
+    ProfessionalConditionsOverride,
+    ShotMetadata,
 )
 from app.models.responses import (
     TrajectoryResponse,
@@ -41,19 +49,68 @@ from app.models.responses import (
     EnterpriseAnalysis,
     EnterpriseEffects,
     EnterpriseRecommendations,
+    ForecastHourConditions,
+    ForecastTrajectoryResponse,
 )
 from app.models.requests import ShotData
-from app.services.physics import calculate_impact_breakdown
-from app.services.weather import fetch_weather_by_city, fetch_weather_by_coords
+from app.config import settings
+from app.constants import get_stock_parameters
+from app.middleware.rate_limiting import charge_rate_limit
+from app.services.coalescing import run_impact_breakdown
+from app.services.physics import calculate_impact_breakdown_batch, get_engine_fingerprint
+from app.services.result_cache import (
+    cached_response,
+    cached_value,
+    etag_for,
+    etag_matches,
+    result_cache_key,
+    store_response,
+)
+from app.services.executor import PhysicsOverloadedError, run_physics
+from app.services.weather import (
+    fetch_forecast_by_city,
+    fetch_forecast_by_coords,
+    fetch_weather_by_city,
+    fetch_weather_by_coords,
+)
 from app.services.courses import get_course_location
+from app.services.facilities import get_facility_registry
 from app.utils.conversions import (
     UnitConverter,
+    compass_to_relative_wind,
     validate_units_param,
 )
+from app.utils.serialization import (
+    DUAL_CORE_FIELDS,
+    DUAL_FIELD_PARTS,
+    INCLUDE_DESCRIPTION,
+    TrustedJSONResponse,
+    breakdown_parts_for,
+    build_dual_results_payload,
+    dumps_json,
+    validate_include_param,
+)
 
 
 router = APIRouter()
 
+# Optional fields of the /calculate response, mapped to the
+# calculate_impact_breakdown() parts each needs (it never returns
+# trajectory points, so they are never recorded)
+ENTERPRISE_FIELD_PARTS = {
+    "analysis": ("baseline", "impact_breakdown"),
+    "insights": ("impact_breakdown",),
+    "recommendations": ("baseline",),
+    "baseline": ("baseline",),
+    "impact_breakdown": ("impact_breakdown",),
+}
+ENTERPRISE_CORE_FIELDS = (
+    "request_id", "timestamp", "metadata", "conditions", "trajectory", "adjusted",
+)
+ENTERPRISE_BREAKDOWN_PARTS = breakdown_parts_for(
+    frozenset(ENTERPRISE_FIELD_PARTS), ENTERPRISE_FIELD_PARTS
+)
+
 
 # ============================================================================
 # ENTERPRISE HELPER FUNCTIONS
@@ -265,6 +322,23 @@ def build_dual_trajectory_response(
     )
 
 
+def dual_trajectory_response(
+    physics_result: dict,
+    conditions_used: DualConditionsUsed = None,
+    units_preference: str = "imperial",
+    include: Optional[FrozenSet[str]] = None,
+):
+    """
+    Route response for dual-unit trajectories, via the serializer fast path
+    when enabled (always for field selections, which the models cannot omit).
+    """
+    if settings.FAST_RESPONSE_SERIALIZATION or include is not None:
+        return TrustedJSONResponse(
+            build_dual_results_payload(physics_result, conditions_used, units_preference, include)
+        )
+    return build_dual_trajectory_response(physics_result, conditions_used, units_preference)
+
+
 def build_dual_conditions_used(weather: dict) -> DualConditionsUsed:
     """Build dual-unit conditions used from weather data."""
     return DualConditionsUsed(
@@ -289,6 +363,265 @@ def build_dual_conditions_used(weather: dict) -> DualConditionsUsed:
         ),
         conditions_text=weather["conditions_text"],
         fetched_at=weather["fetched_at"],
+        observed_at=weather.get("observed_at"),
+        observation_age_seconds=weather.get("observation_age_seconds"),
+    )
+
+
+def conditions_from_override(
+    override: ProfessionalConditionsOverride,
+) -> Tuple[WeatherConditions, dict]:
+    """Build physics conditions (and the values echoed back) from a custom override."""
+    conditions_info = {
+        "source": "override",
+        "wind_speed": override.wind_speed,
+        "wind_direction": override.wind_direction,
+        "temperature": override.temperature,
+        "humidity": override.humidity,
+        "altitude": override.altitude,
+        "pressure": override.air_pressure,
+        "location": None,
+    }
+    return _conditions_from_info(conditions_info), conditions_info
+
+
+async def fetch_location_conditions(
+    location: CoordinateLocation,
+) -> Tuple[WeatherConditions, dict]:
+    """Fetch real weather for coordinates and build physics conditions from it."""
+    try:
+        weather = await fetch_weather_by_coords(
+            lat=location.lat,
+            lon=location.lng,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to fetch weather data: {str(e)}",
+        )
+
+    conditions_info = {
+        "source": "real-time",
+        "wind_speed": weather["wind_speed_mph"],
+        "wind_direction": weather["wind_direction_deg"],
+        "temperature": weather["temperature_f"],
+        "humidity": weather["humidity_pct"],
+        "altitude": weather["altitude_ft"],
+        "pressure": weather["pressure_inhg"],
+        "location": {"lat": location.lat, "lng": location.lng},
+    }
+    return _conditions_from_info(conditions_info), conditions_info
+
+
+async def facility_conditions(
+    client_id: str,
+    facility_id: str,
+) -> Tuple[WeatherConditions, dict]:
+    """
+    Build physics conditions from a registered facility's latest weather.
+
+    The compass wind bearing is turned into the direction relative to the
+    facility's target line, and a registered altitude takes precedence
+    over the looked-up one.
+    """
+    try:
+        found = await get_facility_registry().conditions(client_id, facility_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to fetch weather data: {str(e)}",
+        )
+    if found is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Facility '{facility_id}' is not registered",
+        )
+    facility, weather = found
+
+    conditions_info = {
+        "source": "facility",
+        "wind_speed": weather["wind_speed_mph"],
+        "wind_direction": compass_to_relative_wind(
+            weather["wind_direction_deg"], facility.target_bearing_deg
+        ),
+        "temperature": weather["temperature_f"],
+        "humidity": weather["humidity_pct"],
+        "altitude": (
+            facility.altitude_ft if facility.altitude_ft is not None else weather["altitude_ft"]
+        ),
+        "pressure": weather["pressure_inhg"],
+        "location": {"lat": facility.latitude, "lng": facility.longitude},
+    }
+    return _conditions_from_info(conditions_info), conditions_info
+
+
+def _conditions_from_info(conditions_info: dict) -> WeatherConditions:
+    """Convert resolved professional conditions to physics input."""
+    return WeatherConditions(
+        wind_speed_mph=conditions_info["wind_speed"],
+        wind_direction_deg=conditions_info["wind_direction"],
+        temperature_f=conditions_info["temperature"],
+        altitude_ft=conditions_info["altitude"],
+        humidity_pct=conditions_info["humidity"],
+        pressure_inhg=conditions_info["pressure"],
+    )
+
+
+def build_enterprise_response(
+    result: dict,
+    conditions_info: dict,
+    metadata: Optional[ShotMetadata] = None,
+    include: Optional[FrozenSet[str]] = None,
+) -> EnterpriseTrajectoryResponse:
+    """
+    Build an EnterpriseTrajectoryResponse from physics results and the conditions used.
+
+    Optional fields not in include (see ENTERPRISE_FIELD_PARTS) are left as
+    None and not computed; result only needs the parts they map to.
+    """
+    def selected(field: str) -> bool:
+        return include is None or field in include
+
+    wind_speed = conditions_info["wind_speed"]
+    wind_direction = conditions_info["wind_direction"]
+    temperature = conditions_info["temperature"]
+    humidity = conditions_info["humidity"]
+    altitude = conditions_info["altitude"]
+    pressure = conditions_info["pressure"]
+
+    # Extract effects for insights
+    breakdown = result.get("impact_breakdown")
+    effects = None
+    if breakdown is not None:
+        effects = {
+            "wind_effect_yards": breakdown["wind_effect_yards"],
+            "temperature_effect_yards": breakdown["temperature_effect_yards"],
+            "humidity_effect_yards": breakdown["humidity_effect_yards"],
+            "altitude_effect_yards": breakdown["altitude_effect_yards"],
+        }
+
+    # Calculate baseline and adjusted values
+    adjusted_carry = result["adjusted"]["carry_yards"]
+    baseline_carry = total_adjustment = None
+    if "baseline" in result:
+        baseline_carry = result["baseline"]["carry_yards"]
+        total_adjustment = round(adjusted_carry - baseline_carry, 1)
+
+    analysis = None
+    if selected("analysis"):
+        analysis = EnterpriseAnalysis(
+            baseline_carry_yards=round(baseline_carry, 1),
+            adjusted_carry_yards=round(adjusted_carry, 1),
+            total_adjustment_yards=round(total_adjustment, 1),
+            effects=EnterpriseEffects(
+                wind_yards=round(effects["wind_effect_yards"], 1),
+                temperature_yards=round(effects["temperature_effect_yards"], 1),
+                humidity_yards=round(effects["humidity_effect_yards"], 1),
+                altitude_yards=round(effects["altitude_effect_yards"], 1)
+            )
+        )
+
+    # Generate insights
+    insights = None
+    if selected("insights"):
+        insights = generate_insights(
+            wind_speed=wind_speed,
+            wind_direction=wind_direction,
+            temperature=temperature,
+            humidity=humidity,
+            altitude=altitude,
+            effects=effects
+        )
+
+    # Generate recommendations
+    recommendations = None
+    if selected("recommendations"):
+        recommendations = EnterpriseRecommendations(
+            club_suggestion=suggest_club_adjustment(total_adjustment),
+            optimal_launch_angle=calculate_optimal_launch(wind_speed, wind_direction)
+        )
+
+    baseline = None
+    if selected("baseline"):
+        baseline = DualAdjustedResults(
+            carry=build_dual_distance(result["baseline"]["carry_yards"]),
+            total=build_dual_distance(result["baseline"]["total_yards"]),
+            lateral_drift=build_dual_distance(result["baseline"]["lateral_drift_yards"]),
+            apex_height=build_dual_distance(result["baseline"]["apex_height_yards"]),
+            flight_time_seconds=result["baseline"]["flight_time_seconds"],
+            landing_angle_deg=result["baseline"]["landing_angle_deg"],
+        )
+
+    impact_breakdown = None
+    if selected("impact_breakdown"):
+        impact_breakdown = DualImpactBreakdown(
+            wind_effect=build_dual_distance(breakdown["wind_effect_yards"]),
+            wind_lateral=build_dual_distance(breakdown["wind_lateral_yards"]),
+            temperature_effect=build_dual_distance(breakdown["temperature_effect_yards"]),
+            altitude_effect=build_dual_distance(breakdown["altitude_effect_yards"]),
+            humidity_effect=build_dual_distance(breakdown["humidity_effect_yards"]),
+            total_adjustment=build_dual_distance(breakdown["total_adjustment_yards"]),
+        )
+
+    return EnterpriseTrajectoryResponse(
+        request_id=str(uuid.uuid4()),
+        timestamp=datetime.utcnow().isoformat() + "Z",
+
+        # Echo back metadata if provided
+        metadata=metadata.model_dump() if metadata else None,
+
+        # Conditions used
+        conditions=EnterpriseConditions(
+            source=conditions_info["source"],
+            temperature_f=round(temperature, 1),
+            wind_speed_mph=round(wind_speed, 1),
+            wind_direction_deg=round(wind_direction, 1),
+            humidity_percent=round(humidity, 1),
+            pressure_inhg=round(pressure, 2),
+            altitude_ft=round(altitude, 0),
+            location=conditions_info["location"]
+        ),
+
+        # Trajectory results
+        trajectory=EnterpriseTrajectory(
+            carry_distance_yards=round(adjusted_carry, 1),
+            total_distance_yards=round(result["adjusted"]["total_yards"], 1),
+            apex_height_feet=round(result["adjusted"]["apex_height_yards"] * 3, 1),  # yards to feet
+            flight_time_seconds=round(result["adjusted"]["flight_time_seconds"], 2),
+            landing_angle_degrees=round(result["adjusted"]["landing_angle_deg"], 1)
+        ),
+
+        analysis=analysis,
+        insights=insights,
+        recommendations=recommendations,
+
+        # Also include full dual-unit data for comprehensive clients
+        adjusted=DualAdjustedResults(
+            carry=build_dual_distance(result["adjusted"]["carry_yards"]),
+            total=build_dual_distance(result["adjusted"]["total_yards"]),
+            lateral_drift=build_dual_distance(result["adjusted"]["lateral_drift_yards"]),
+            apex_height=build_dual_distance(result["adjusted"]["apex_height_yards"]),
+            flight_time_seconds=result["adjusted"]["flight_time_seconds"],
+            landing_angle_deg=result["adjusted"]["landing_angle_deg"],
+        ),
+        baseline=baseline,
+        impact_breakdown=impact_breakdown,
+    )
+
+
+def enterprise_response(
+    response: EnterpriseTrajectoryResponse,
+    include: Optional[FrozenSet[str]],
+    headers: Optional[dict] = None,
+):
+    """Route response for /calculate, leaving unselected optional fields out."""
+    if include is None:
+        return response
+    return TrustedJSONResponse(
+        response.model_dump(mode="json", exclude=set(ENTERPRISE_FIELD_PARTS).difference(include)),
+        headers=headers,
     )
 
 
@@ -299,6 +632,9 @@ async def calculate_trajectory(
         default="imperial",
         description="Preferred unit system: 'imperial' or 'metric'. Response includes both.",
     ),
+    include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
+    fields: Optional[str] = Query(default=None, description="Alias of `include`"),
+    if_none_match: Optional[str] = Header(default=None),
 ) -> DualTrajectoryResponse:
     """
     Calculate golf ball trajectory with manually provided weather conditions.
@@ -315,15 +651,51 @@ async def calculate_trajectory(
     - `units_preference` in response indicates client's stated preference
 
     Returns adjusted trajectory, baseline comparison, and impact breakdown.
+
+    **Field selection:** `include` (or `fields`) limits the response to the
+    named fields: any of `baseline`, `impact_breakdown`,
+    `equivalent_calm_distance`, `trajectory_points` (`adjusted`,
+    `conditions_used` and `units_preference` are always returned). Only the
+    simulations the selected fields need are run.
+
+    **Caching:** Results are deterministic and cached. Responses carry an
+    `ETag`; send it back in `If-None-Match` to get a `304 Not Modified`.
     """
-    # Validate units parameter
+    # Validate units and field selection parameters
     try:
         validated_units = validate_units_param(units)
+        selected = validate_include_param(
+            include if include is not None else fields, DUAL_FIELD_PARTS, DUAL_CORE_FIELDS
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    result = calculate_impact_breakdown(request.shot, request.conditions, api_type="professional")
-    return build_dual_trajectory_response(result, units_preference=validated_units)
+    cache_key = None
+    if settings.RESULT_CACHE_ENABLED:
+        cache_key = result_cache_key(
+            "trajectory",
+            get_engine_fingerprint("professional"),
+            shot=request.shot,
+            conditions=request.conditions,
+            units=validated_units,
+            include=sorted(selected) if selected is not None else None,
+        )
+        cached = await cached_response(cache_key, if_none_match)
+        if cached is not None:
+            return cached
+
+    result = await run_impact_breakdown(
+        request.shot,
+        request.conditions,
+        api_type="professional",
+        parts=breakdown_parts_for(selected, DUAL_FIELD_PARTS),
+    )
+    if cache_key is not None:
+        return await store_response(
+            cache_key,
+            dumps_json(build_dual_results_payload(result, None, validated_units, selected)),
+        )
+    return dual_trajectory_response(result, units_preference=validated_units, include=selected)
 
 
 @router.post("/trajectory/location", response_model=DualTrajectoryResponse)
@@ -375,10 +747,10 @@ async def calculate_trajectory_by_location(
         pressure_inhg=weather["pressure_inhg"],
     )
 
-    result = calculate_impact_breakdown(request.shot, conditions, api_type="professional")
+    result = await run_impact_breakdown(request.shot, conditions, api_type="professional")
     dual_conditions = build_dual_conditions_used(weather)
 
-    return build_dual_trajectory_response(result, dual_conditions, validated_units)
+    return dual_trajectory_response(result, dual_conditions, validated_units)
 
 
 @router.post("/trajectory/course", response_model=DualTrajectoryResponse)
@@ -442,23 +814,28 @@ async def calculate_trajectory_by_course(
         pressure_inhg=weather["pressure_inhg"],
     )
 
-    result = calculate_impact_breakdown(request.shot, conditions, api_type="professional")
+    result = await run_impact_breakdown(request.shot, conditions, api_type="professional")
 
     # Update weather dict with course altitude before building dual conditions
     weather_with_altitude = weather.copy()
     weather_with_altitude["altitude_ft"] = altitude_ft
     dual_conditions = build_dual_conditions_used(weather_with_altitude)
 
-    return build_dual_trajectory_response(result, dual_conditions, validated_units)
+    return dual_trajectory_response(result, dual_conditions, validated_units)
 
 
 @router.post("/calculate", response_model=EnterpriseTrajectoryResponse)
 async def calculate_trajectory_professional(
     request: CalculateRequest,
+    http_request: Request,
+    response: Response,
     units: Optional[str] = Query(
         default="imperial",
         description="Preferred unit system: 'imperial' or 'metric'. Response includes both.",
     ),
+    include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
+    fields: Optional[str] = Query(default=None, description="Alias of `include`"),
+    if_none_match: Optional[str] = Header(default=None),
 ) -> EnterpriseTrajectoryResponse:
     """
     Professional trajectory calculation endpoint with enterprise integration support.
@@ -466,8 +843,11 @@ async def calculate_trajectory_professional(
     Calculates golf ball trajectory with either:
     - **Real weather** from GPS coordinates (`location` with lat/lng)
     - **Custom conditions** via `conditions_override`
+    - **Facility weather** for a registered `metadata.facility_id` (kept
+      current in memory; wind direction is converted to the facility's
+      target line)
 
-    **Priority:** If `conditions_override` is provided, it takes precedence over `location`.
+    **Priority:** `conditions_override`, then `location`, then the facility.
 
     **Enterprise Metadata (optional):**
     Include metadata for tracking shots across facilities, bays, and players:
@@ -495,12 +875,32 @@ async def calculate_trajectory_professional(
     - `analysis`: Breakdown of environmental effects
     - `insights`: Human-readable explanations
     - `recommendations`: Club and launch angle suggestions
+
+    **Field selection:** `include` (or `fields`) limits the response to the
+    named fields: any of `analysis`, `insights`, `recommendations`,
+    `baseline`, `impact_breakdown` (`request_id`, `timestamp`, `metadata`,
+    `conditions`, `trajectory` and `adjusted` are always returned). Only the
+    simulations the selected fields need are run; `include=trajectory` is
+    the cheapest carry/total lookup.
+
+    **Caching:** With `conditions_override` the physics result is cached and
+    the response carries a weak `ETag` (`request_id` and `timestamp` differ
+    per response); send it back in `If-None-Match` to get a `304 Not Modified`.
     """
-    # Validate units parameter
+    # Validate units and field selection parameters
     try:
         validated_units = validate_units_param(units)
+        selected = validate_include_param(
+            include if include is not None else fields,
+            ENTERPRISE_FIELD_PARTS,
+            ENTERPRISE_CORE_FIELDS,
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    parts = (
+        breakdown_parts_for(selected, ENTERPRISE_FIELD_PARTS)
+        if selected is not None else ENTERPRISE_BREAKDOWN_PARTS
+    )
 
     # Build shot data from flat parameters
     shot = ShotData(
@@ -511,182 +911,284 @@ async def calculate_trajectory_professional(
         direction_deg=request.direction,
     )
 
-    # Variables to track conditions used
-    wind_speed = 0.0
-    wind_direction = 0.0
-    temperature = 70.0
-    humidity = 50.0
-    altitude = 0.0
-    pressure = 29.92
-    source = "override"
-    location_data = None
-
     # Determine weather conditions
     if request.conditions_override:
         # Use custom override conditions
-        override = request.conditions_override
-        wind_speed = override.wind_speed
-        wind_direction = override.wind_direction
-        temperature = override.temperature
-        humidity = override.humidity
-        altitude = override.altitude
-        pressure = override.air_pressure
-        source = "override"
-
-        conditions = WeatherConditions(
-            wind_speed_mph=wind_speed,
-            wind_direction_deg=wind_direction,
-            temperature_f=temperature,
-            altitude_ft=altitude,
-            humidity_pct=humidity,
-            pressure_inhg=pressure,
-        )
-
+        conditions, conditions_info = conditions_from_override(request.conditions_override)
     elif request.location:
         # Fetch real weather from coordinates
-        try:
-            weather = await fetch_weather_by_coords(
-                lat=request.location.lat,
-                lon=request.location.lng,
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=500, detail=str(e))
-        except Exception as e:
-            raise HTTPException(
-                status_code=502,
-                detail=f"Failed to fetch weather data: {str(e)}",
-            )
-
-        wind_speed = weather["wind_speed_mph"]
-        wind_direction = weather["wind_direction_deg"]
-        temperature = weather["temperature_f"]
-        humidity = weather["humidity_pct"]
-        altitude = weather["altitude_ft"]
-        pressure = weather["pressure_inhg"]
-        source = "real-time"
-        location_data = {"lat": request.location.lat, "lng": request.location.lng}
-
-        conditions = WeatherConditions(
-            wind_speed_mph=wind_speed,
-            wind_direction_deg=wind_direction,
-            temperature_f=temperature,
-            altitude_ft=altitude,
-            humidity_pct=humidity,
-            pressure_inhg=pressure,
+        conditions, conditions_info = await fetch_location_conditions(request.location)
+    elif request.metadata and request.metadata.facility_id:
+        # Registered facility weather, served from memory
+        conditions, conditions_info = await facility_conditions(
+            getattr(http_request.state, "client_id", "anonymous"),
+            request.metadata.facility_id,
         )
     else:
         raise HTTPException(
             status_code=400,
-            detail="Either location or conditions_override required"
+            detail="Either location, conditions_override or metadata.facility_id required"
         )
 
     # Calculate trajectory with professional physics
-    result = calculate_impact_breakdown(shot, conditions, api_type="professional")
-
-    # Extract effects for insights
-    breakdown = result["impact_breakdown"]
-    effects = {
-        "wind_effect_yards": breakdown["wind_effect_yards"],
-        "temperature_effect_yards": breakdown["temperature_effect_yards"],
-        "humidity_effect_yards": breakdown["humidity_effect_yards"],
-        "altitude_effect_yards": breakdown["altitude_effect_yards"],
-    }
+    async def compute() -> dict:
+        return await run_impact_breakdown(
+            shot, conditions, api_type="professional", parts=parts
+        )
 
-    # Calculate baseline and adjusted values
-    baseline_carry = result["baseline"]["carry_yards"]
-    adjusted_carry = result["adjusted"]["carry_yards"]
-    total_adjustment = breakdown["total_adjustment_yards"]
+    headers = None
+    if settings.RESULT_CACHE_ENABLED and request.conditions_override:
+        cache_key = result_cache_key(
+            "breakdown",
+            get_engine_fingerprint("professional"),
+            shot=shot,
+            conditions=conditions,
+            parts=sorted(parts),
+            include=sorted(selected) if selected is not None else None,
+        )
+        # The body echoes metadata, which the cached physics does not depend on
+        etag_key = (
+            result_cache_key("calculate", cache_key, metadata=request.metadata)
+            if request.metadata is not None else cache_key
+        )
+        etag = etag_for(etag_key, weak=True)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        headers = {"ETag": etag}
+        result = await cached_value(cache_key, compute)
+    else:
+        result = await compute()
 
-    # Generate insights
-    insights = generate_insights(
-        wind_speed=wind_speed,
-        wind_direction=wind_direction,
-        temperature=temperature,
-        humidity=humidity,
-        altitude=altitude,
-        effects=effects
+    return enterprise_response(
+        build_enterprise_response(result, conditions_info, request.metadata, selected),
+        selected,
+        headers,
     )
 
-    # Generate recommendations
-    club_suggestion = suggest_club_adjustment(total_adjustment)
-    optimal_launch = calculate_optimal_launch(wind_speed, wind_direction)
 
-    # Build enterprise response
-    response = EnterpriseTrajectoryResponse(
-        request_id=str(uuid.uuid4()),
-        timestamp=datetime.utcnow().isoformat() + "Z",
+@router.post(
+    "/calculate/batch",
+    response_model=List[EnterpriseTrajectoryResponse],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def calculate_trajectory_professional_batch(
+    request: CalculateBatchRequest,
+    http_request: Request,
+    format: Literal["json", "ndjson"] = Query(
+        default="json",
+        description="'json' returns one array; 'ndjson' streams one result per line",
+    ),
+):
+    """
+    Calculate many professional trajectories in one request.
 
-        # Echo back metadata if provided
-        metadata=request.metadata.model_dump() if request.metadata else None,
+    Each shot uses its own `conditions_override` if given, otherwise the
+    batch-level `conditions_override`, otherwise real weather for the
+    batch-level `location` (fetched once for the whole batch), otherwise
+    the weather of its registered `metadata.facility_id`.
 
-        # Conditions used
-        conditions=EnterpriseConditions(
-            source=source,
-            temperature_f=round(temperature, 1),
-            wind_speed_mph=round(wind_speed, 1),
-            wind_direction_deg=round(wind_direction, 1),
-            humidity_percent=round(humidity, 1),
-            pressure_inhg=round(pressure, 2),
-            altitude_ft=round(altitude, 0),
-            location=location_data
-        ),
+    Shots are computed together through the batched physics engine and
+    results (same shape as `/calculate`) are returned in input order:
+    - `format=json`: a JSON array
+    - `format=ndjson`: `application/x-ndjson`, one result per line, streamed
+      as each chunk of shots finishes
 
-        # Trajectory results
-        trajectory=EnterpriseTrajectory(
-            carry_distance_yards=round(adjusted_carry, 1),
-            total_distance_yards=round(result["adjusted"]["total_yards"], 1),
-            apex_height_feet=round(result["adjusted"]["apex_height_yards"] * 3, 1),  # yards to feet
-            flight_time_seconds=round(result["adjusted"]["flight_time_seconds"], 2),
-            landing_angle_degrees=round(result["adjusted"]["landing_angle_deg"], 1)
-        ),
+    A batch of N shots counts as N requests against the rate limit.
+    """
+    # The middleware counted this HTTP request; charge the remaining shots
+    client_id = getattr(http_request.state, "client_id", "anonymous")
+    await charge_rate_limit(client_id, len(request.shots) - 1)
 
-        # Analysis
-        analysis=EnterpriseAnalysis(
-            baseline_carry_yards=round(baseline_carry, 1),
-            adjusted_carry_yards=round(adjusted_carry, 1),
-            total_adjustment_yards=round(total_adjustment, 1),
-            effects=EnterpriseEffects(
-                wind_yards=round(effects["wind_effect_yards"], 1),
-                temperature_yards=round(effects["temperature_effect_yards"], 1),
-                humidity_yards=round(effects["humidity_effect_yards"], 1),
-                altitude_yards=round(effects["altitude_effect_yards"], 1)
-            )
-        ),
+    # Resolve shared conditions once
+    shared = None
+    if request.conditions_override:
+        shared = conditions_from_override(request.conditions_override)
+    elif request.location:
+        shared = await fetch_location_conditions(request.location)
+
+    facilities = {}
+    items = []
+    infos = []
+    for batch_shot in request.shots:
+        shot = ShotData(
+            ball_speed_mph=batch_shot.ball_speed,
+            launch_angle_deg=batch_shot.launch_angle,
+            spin_rate_rpm=batch_shot.spin_rate,
+            spin_axis_deg=batch_shot.spin_axis,
+            direction_deg=batch_shot.direction,
+        )
+        if batch_shot.conditions_override:
+            conditions, conditions_info = conditions_from_override(batch_shot.conditions_override)
+        elif shared is not None:
+            conditions, conditions_info = shared
+        else:
+            facility_id = batch_shot.metadata.facility_id
+            if facility_id not in facilities:
+                facilities[facility_id] = await facility_conditions(client_id, facility_id)
+            conditions, conditions_info = facilities[facility_id]
+        items.append((shot, conditions))
+        infos.append(conditions_info)
+
+    chunk_size = max(1, settings.BATCH_PHYSICS_CHUNK_SIZE)
+
+    async def compute_chunk(start: int) -> List[str]:
+        results = await run_physics(
+            calculate_impact_breakdown_batch,
+            items[start:start + chunk_size],
+            api_type="professional",
+            parts=ENTERPRISE_BREAKDOWN_PARTS,
+        )
+        return [
+            build_enterprise_response(
+                result, infos[start + offset], request.shots[start + offset].metadata
+            ).model_dump_json()
+            for offset, result in enumerate(results)
+        ]
+
+    if format == "json":
+        lines = []
+        for start in range(0, len(items), chunk_size):
+            lines.extend(await compute_chunk(start))
+        return Response(
+            content="[" + ",".join(lines) + "]",
+            media_type="application/json",
+        )
 
-        # Insights
-        insights=insights,
+    async def stream_ndjson() -> AsyncIterator[str]:
+        for start in range(0, len(items), chunk_size):
+            try:
+                lines = await compute_chunk(start)
+            except PhysicsOverloadedError:
+                # Headers are already sent; report where the stream stopped
+                yield json.dumps({
+                    "error": {
+                        "code": "PHYSICS_OVERLOADED",
+                        "message": "The service is busy. Please retry the remaining shots shortly.",
+                        "shot_index": start,
+                    }
+                }) + "\n"
+                return
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(stream_ndjson(), media_type="application/x-ndjson")
+
+
+def forecast_shot_data(forecast_shot: ForecastShot, handicap: int) -> ShotData:
+    """Launch parameters of a forecast shot (explicit values override the club's stock ones)."""
+    stock = get_stock_parameters(handicap, forecast_shot.club) if forecast_shot.club else {}
+
+    def pick(value: Optional[float], stock_field: str) -> float:
+        return value if value is not None else stock[stock_field]
+
+    return ShotData(
+        ball_speed_mph=pick(forecast_shot.ball_speed, "ball_speed"),
+        launch_angle_deg=pick(forecast_shot.launch_angle, "launch_angle"),
+        spin_rate_rpm=pick(forecast_shot.spin_rate, "spin"),
+        spin_axis_deg=forecast_shot.spin_axis,
+        direction_deg=forecast_shot.direction,
+    )
 
-        # Recommendations
-        recommendations=EnterpriseRecommendations(
-            club_suggestion=club_suggestion,
-            optimal_launch_angle=optimal_launch
-        ),
 
-        # Also include full dual-unit data for comprehensive clients
-        adjusted=DualAdjustedResults(
-            carry=build_dual_distance(result["adjusted"]["carry_yards"]),
-            total=build_dual_distance(result["adjusted"]["total_yards"]),
-            lateral_drift=build_dual_distance(result["adjusted"]["lateral_drift_yards"]),
-            apex_height=build_dual_distance(result["adjusted"]["apex_height_yards"]),
-            flight_time_seconds=result["adjusted"]["flight_time_seconds"],
-            landing_angle_deg=result["adjusted"]["landing_angle_deg"],
-        ),
-        baseline=DualAdjustedResults(
-            carry=build_dual_distance(result["baseline"]["carry_yards"]),
-            total=build_dual_distance(result["baseline"]["total_yards"]),
-            lateral_drift=build_dual_distance(result["baseline"]["lateral_drift_yards"]),
-            apex_height=build_dual_distance(result["baseline"]["apex_height_yards"]),
-            flight_time_seconds=result["baseline"]["flight_time_seconds"],
-            landing_angle_deg=result["baseline"]["landing_angle_deg"],
-        ),
-        impact_breakdown=DualImpactBreakdown(
-            wind_effect=build_dual_distance(breakdown["wind_effect_yards"]),
-            wind_lateral=build_dual_distance(breakdown["wind_lateral_yards"]),
-            temperature_effect=build_dual_distance(breakdown["temperature_effect_yards"]),
-            altitude_effect=build_dual_distance(breakdown["altitude_effect_yards"]),
-            humidity_effect=build_dual_distance(breakdown["humidity_effect_yards"]),
-            total_adjustment=build_dual_distance(breakdown["total_adjustment_yards"]),
+@router.post("/forecast/trajectory", response_model=ForecastTrajectoryResponse)
+async def plan_forecast_trajectories(
+    request: ForecastTrajectoryRequest,
+) -> ForecastTrajectoryResponse:
+    """
+    Plan how clubs or shots will play over the coming hours.
+
+    Fetches the hourly forecast for `location` (city) or `coordinates` once
+    (cached per location) and computes every shot under every forecast hour
+    in one batched physics pass. Replaces one `/trajectory/location` call
+    per hour per club.
+
+    Shots are either a stock `club` (numbers for `handicap`) or explicit
+    `ball_speed`, `launch_angle` and `spin_rate`. With `target_bearing_deg`
+    the forecast winds are converted to the direction relative to the shot;
+    otherwise the compass direction is used as the relative one, as on
+    `/trajectory/location`.
+
+    **Response:** hour × shot matrices (rows follow `hours`, columns follow
+    `shots`) of `carry_yards`, `total_yards` and `lateral_drift_yards`, plus
+    the conditions of each hour.
+    """
+    shots = [forecast_shot_data(s, request.handicap) for s in request.shots]
+    labels = [
+        s.label or s.club or f"shot_{index + 1}" for index, s in enumerate(request.shots)
+    ]
+
+    try:
+        if request.coordinates:
+            forecast = await fetch_forecast_by_coords(
+                request.coordinates.lat, request.coordinates.lng, request.hours
+            )
+        else:
+            forecast = await fetch_forecast_by_city(
+                request.location.city,
+                request.location.state,
+                request.location.country,
+                request.hours,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to fetch forecast data: {str(e)}",
         )
+    hours = forecast["hours"]
+    if not hours:
+        raise HTTPException(status_code=502, detail="The weather provider returned no forecast hours")
+
+    wind_directions = [
+        compass_to_relative_wind(hour["wind_direction_deg"], request.target_bearing_deg)
+        if request.target_bearing_deg is not None else hour["wind_direction_deg"]
+        for hour in hours
+    ]
+    items = []
+    for hour, wind_direction in zip(hours, wind_directions):
+        conditions = WeatherConditions(
+            wind_speed_mph=hour["wind_speed_mph"],
+            wind_direction_deg=wind_direction,
+            temperature_f=hour["temperature_f"],
+            altitude_ft=forecast["altitude_ft"],
+            humidity_pct=hour["humidity_pct"],
+            pressure_inhg=hour["pressure_inhg"],
+        )
+        items.extend((shot, conditions) for shot in shots)
+
+    # Adjusted flights only (no baseline or breakdown), chunked like /calculate/batch
+    chunk_size = max(1, settings.BATCH_PHYSICS_CHUNK_SIZE)
+    results = []
+    for start in range(0, len(items), chunk_size):
+        results.extend(await run_physics(
+            calculate_impact_breakdown_batch,
+            items[start:start + chunk_size],
+            api_type="professional",
+            parts=(),
+        ))
+
+    def matrix(field: str) -> List[List[float]]:
+        return [
+            [round(results[row + col]["adjusted"][field], 1) for col in range(len(shots))]
+            for row in range(0, len(results), len(shots))
+        ]
+
+    return ForecastTrajectoryResponse(
+        location=forecast["location"],
+        altitude_ft=round(forecast["altitude_ft"], 0),
+        fetched_at=forecast["fetched_at"],
+        hours=[hour["time"] for hour in hours],
+        shots=labels,
+        conditions=ForecastHourConditions(
+            temperature_f=[hour["temperature_f"] for hour in hours],
+            wind_speed_mph=[hour["wind_speed_mph"] for hour in hours],
+            wind_direction_deg=wind_directions,
+            humidity_pct=[hour["humidity_pct"] for hour in hours],
+            pressure_inhg=[hour["pressure_inhg"] for hour in hours],
+            conditions_text=[hour["conditions_text"] for hour in hours],
+        ),
+        carry_yards=matrix("carry_yards"),
+        total_yards=matrix("total_yards"),
+        lateral_drift_yards=matrix("lateral_drift_yards"),
     )
-
-    return response
@@ -0,0 +1,257 @@
+"""
+API Key Cache and Usage Counters
+
+Database-issued API keys are resolved once and cached in-process by key
+hash (including unknown hashes, for a shorter time), so authenticating a
+request normally costs no database round trip. Admin changes to a key
+(status, tier, revocation) invalidate it immediately on every instance via
+Redis pub/sub; without Redis, entries still expire after their TTL.
+
+Per-key usage counters (last_used_at, requests_today, total_requests) are
+accumulated in memory and written in one UPDATE per flush interval instead
+of one UPDATE per request.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.utils.cache import LRUTTLCache
+
+# Redis pub/sub channel carrying the IDs of changed keys
+INVALIDATION_CHANNEL = "apikeys:invalidate"
+
+# Sentinel for "not cached" (None is a cached unknown key)
+MISSING = object()
+
+
+class ApiKeyRecord:
+    """Cached admin_api_keys row."""
+
+    __slots__ = ("id", "client_name", "tier", "status")
+
+    def __init__(self, id: int, client_name: str, tier: str, status: str):
+        self.id = id
+        self.client_name = client_name
+        self.tier = tier
+        self.status = status
+
+    @property
+    def active(self) -> bool:
+        return self.status == "active"
+
+
+class ApiKeyCache:
+    """
+    key_hash -> ApiKeyRecord cache with negative entries, plus buffered
+    usage counters.
+
+    Rows are cached whatever their status (a disabled key is a cached
+    record, not a miss), so invalidating by key ID also covers keys that
+    are re-enabled. Hashes with no row at all are cached as None.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.known = LRUTTLCache(max_entries, ttl_seconds=ttl_seconds, name="api_keys")
+        self.unknown = LRUTTLCache(
+            max_entries, ttl_seconds=negative_ttl_seconds, name="api_keys_negative"
+        )
+        self._hash_by_id: Dict[int, str] = {}
+        # Bumped on every invalidation so a lookup that raced one is not cached
+        self.generation = 0
+
+        self._pending: Dict[int, int] = {}
+        self._last_used: Dict[int, datetime] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+        self.invalidations = 0
+        self.flushes = 0
+        self.flushed_requests = 0
+        self.flush_errors = 0
+
+    def get(self, key_hash: str) -> Any:
+        """Cached record, None for a cached unknown key, or MISSING."""
+        record = self.known.get(key_hash, MISSING)
+        if record is MISSING:
+            record = self.unknown.get(key_hash, MISSING)
+        return record
+
+    def set(self, key_hash: str, record: Optional[ApiKeyRecord], generation: int) -> None:
+        """Cache a lookup made at `generation` (dropped if invalidated since)."""
+        if generation != self.generation:
+            return
+        if record is None:
+            self.unknown.set(key_hash, None)
+        else:
+            self.known.set(key_hash, record)
+            self._hash_by_id[record.id] = key_hash
+
+    def invalidate(self, api_key_id: Optional[int] = None) -> None:
+        """Forget one key (by ID), or every cached entry."""
+        self.generation += 1
+        self.invalidations += 1
+        if api_key_id is None:
+            self.known.clear()
+            self.unknown.clear()
+            self._hash_by_id.clear()
+            return
+        key_hash = self._hash_by_id.pop(api_key_id, None)
+        if key_hash is not None:
+            self.known.delete(key_hash)
+
+    def record_usage(self, api_key_id: int) -> None:
+        """Count one request for a key; written by the next flush."""
+        self._pending[api_key_id] = self._pending.get(api_key_id, 0) + 1
+        self._last_used[api_key_id] = datetime.now(timezone.utc)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            await asyncio.sleep(settings.API_KEY_USAGE_FLUSH_SECONDS)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write pending usage counters in one UPDATE (kept for retry on failure)."""
+        if not self._pending:
+            return
+        pending, last_used = self._pending, self._last_used
+        self._pending, self._last_used = {}, {}
+        ids = list(pending)
+
+        try:
+            from app.middleware.authentication import get_auth_db_pool
+
+            pool = await get_auth_db_pool()
+            if not pool:
+                return
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    UPDATE admin_api_keys AS k
+                    SET last_used_at = u.last_used_at,
+                        requests_today = k.requests_today + u.requests,
+                        total_requests = k.total_requests + u.requests
+                    FROM unnest($1::int[], $2::int[], $3::timestamptz[])
+                        AS u(id, requests, last_used_at)
+                    WHERE k.id = u.id
+                    """,
+                    ids,
+                    [pending[i] for i in ids],
+                    [last_used[i] for i in ids],
+                )
+        except Exception as e:
+            self.flush_errors += 1
+            logger.warning(f"Failed to flush API key usage: {str(e)}")
+            for api_key_id, count in pending.items():
+                self._pending[api_key_id] = self._pending.get(api_key_id, 0) + count
+                self._last_used.setdefault(api_key_id, last_used[api_key_id])
+            return
+
+        self.flushes += 1
+        self.flushed_requests += sum(pending.values())
+
+    async def listen_for_invalidations(self) -> None:
+        """Apply invalidations published by any instance (runs until cancelled)."""
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Changes made while we were not subscribed were missed
+                self.invalidate()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    self.invalidate(int(data) if data != "*" else None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"API key invalidation listener failed: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self) -> None:
+        """Start the invalidation listener (needs a running event loop)."""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.ensure_future(self.listen_for_invalidations())
+
+    async def close(self) -> None:
+        """Stop background tasks and write any pending counters."""
+        for task in (self._listener_task, self._flush_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._listener_task = self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "known": self.known.stats(),
+            "unknown": self.unknown.stats(),
+            "invalidations": self.invalidations,
+            "pending_usage_keys": len(self._pending),
+            "flushes": self.flushes,
+            "flushed_requests": self.flushed_requests,
+            "flush_errors": self.flush_errors,
+        }
+
+
+# Cache instance (created lazily)
+_api_key_cache: Optional[ApiKeyCache] = None
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    """Get the API key cache, creating it from settings on first use."""
+    global _api_key_cache
+
+    if _api_key_cache is None:
+        _api_key_cache = ApiKeyCache(
+            settings.API_KEY_CACHE_MAX_ENTRIES,
+            settings.API_KEY_CACHE_TTL_SECONDS,
+            settings.API_KEY_CACHE_NEGATIVE_TTL_SECONDS,
+        )
+    return _api_key_cache
+
+
+async def invalidate_api_key(api_key_id: int) -> None:
+    """Drop a changed key from this instance's cache and tell the others."""
+    get_api_key_cache().invalidate(api_key_id)
+
+    from app.redis_client import get_redis_client
+
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, str(api_key_id))
+    except Exception as e:
+        logger.warning(f"Failed to publish API key invalidation: {str(e)}")
+
+
+async def init_api_key_cache() -> None:
+    """Start listening for invalidations from other instances."""
+    get_api_key_cache().start()
+
+
+async def close_api_key_cache() -> None:
+    """Stop the listener and flush pending usage counters."""
+    if _api_key_cache is not None:
+        await _api_key_cache.close()
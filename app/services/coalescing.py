@@ -0,0 +1,55 @@
+"""
+Physics Request Coalescing
+
+Identical impact-breakdown requests that arrive together (a whole bay group
+firing the same gaming preset) share one computation on the physics
+executor instead of each taking a worker. Identity is the same canonical
+input hash the result cache uses.
+"""
+
+from typing import Any, Collection, Dict, Optional
+
+from app.config import settings
+from app.models.requests import ShotData, WeatherConditions
+from app.services.executor import run_physics
+from app.services.physics import calculate_impact_breakdown, get_engine_fingerprint
+from app.services.result_cache import result_cache_key
+from app.utils.singleflight import SingleFlight
+
+_breakdown_flight = SingleFlight(name="impact_breakdown")
+
+
+async def run_impact_breakdown(
+    shot: ShotData,
+    conditions: WeatherConditions,
+    api_type: str = "professional",
+    parts: Optional[Collection[str]] = None,
+) -> Dict:
+    """
+    Run calculate_impact_breakdown() on the physics executor, coalescing
+    concurrent identical requests (same inputs and parts).
+
+    The result may be shared with other requests and must not be mutated.
+    """
+    def compute():
+        return run_physics(
+            calculate_impact_breakdown, shot, conditions, api_type=api_type, parts=parts
+        )
+
+    if not settings.PHYSICS_COALESCING_ENABLED:
+        return await compute()
+
+    key = result_cache_key(
+        "breakdown",
+        get_engine_fingerprint(api_type),
+        shot=shot,
+        conditions=conditions,
+        api_type=api_type,
+        parts=sorted(parts) if parts is not None else None,
+    )
+    return await _breakdown_flight.do(key, compute)
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    """Counters for metrics endpoints."""
+    return {"enabled": settings.PHYSICS_COALESCING_ENABLED, **_breakdown_flight.stats()}
@@ -0,0 +1,280 @@
+"""
+Offline Elevation Lookup
+
+Ground elevation from a gridded elevation file built offline with
+scripts/build_elevation_grid.py (from public SRTM/DEM .hgt tiles), so
+coordinate requests get a real altitude without a network call.
+
+The file is memory-mapped read-only. Nothing is read up front: the OS
+pages in the parts of 1x1 degree tiles that lookups touch, and every worker
+process mapping the same file shares those pages through the page cache.
+A lookup is a few index calculations and a bilinear interpolation of four
+int16 samples (microseconds).
+
+File layout (little-endian):
+- 64-byte header (see _HEADER)
+- Tile index: one uint32 per 1x1 degree cell of the bounding box, row by
+  row from lat_min and lon_min; the tile's slot in the data section, or
+  NO_TILE where there is no coverage (e.g. ocean)
+- Tile data: per tile, (cells_per_degree + 1)^2 int16 samples, north row
+  first, west column first (edges are repeated so a lookup never has to
+  cross into a neighbouring tile). Elevation in meters is
+  sample * scale + offset; NODATA marks voids.
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.middleware.logging_config import logger
+
+MAGIC = b"GWDEM\x00"
+
+# Bump when the file layout changes; files with another version are rejected
+ELEVATION_FORMAT_VERSION = 1
+
+# magic, version, cells_per_degree, lat_min, lat_max, lon_min, lon_max,
+# scale, offset, tile_count (padded to HEADER_SIZE)
+_HEADER = struct.Struct("<6sHHhhhhffI")
+HEADER_SIZE = 64
+
+NO_TILE = 0xFFFFFFFF
+NODATA = -32768
+
+METERS_TO_FEET = 3.28084
+
+
+class ElevationGrid:
+    """
+    Read-only view of an elevation file.
+
+    Args:
+        path: File written by write_elevation_grid()
+
+    Raises:
+        ValueError: If the file is not an elevation grid of this format version
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":  # pragma: no cover - all deploy targets are little-endian
+            raise ValueError("Elevation grids are only supported on little-endian hosts")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (
+                magic,
+                version,
+                self.cells_per_degree,
+                self.lat_min,
+                self.lat_max,
+                self.lon_min,
+                self.lon_max,
+                self.scale,
+                self.offset,
+                self.tile_count,
+            ) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an elevation grid")
+            if version != ELEVATION_FORMAT_VERSION:
+                raise ValueError(
+                    f"Elevation grid format {version} does not match "
+                    f"expected {ELEVATION_FORMAT_VERSION}; rebuild the grid"
+                )
+
+            self._lon_tiles = self.lon_max - self.lon_min
+            index_count = (self.lat_max - self.lat_min) * self._lon_tiles
+            self._side = self.cells_per_degree + 1
+            data_start = _data_offset(index_count)
+            data_bytes = self.tile_count * self._side * self._side * 2
+            if len(self._mmap) < data_start + data_bytes:
+                raise ValueError(f"{path} is truncated")
+
+            view = memoryview(self._mmap)
+            self._index = view[HEADER_SIZE:HEADER_SIZE + index_count * 4].cast("I")
+            self._samples = view[data_start:data_start + data_bytes].cast("h")
+        except Exception:
+            self.close()
+            raise
+
+        self.lookups = 0
+        self.no_data = 0
+
+    def elevation_m(self, lat: float, lon: float) -> Optional[float]:
+        """Ground elevation in meters, or None outside coverage or in a void."""
+        self.lookups += 1
+        tile_lat = math.floor(lat)
+        tile_lon = math.floor(lon)
+        if not (self.lat_min <= tile_lat < self.lat_max and self.lon_min <= tile_lon < self.lon_max):
+            self.no_data += 1
+            return None
+        slot = self._index[(tile_lat - self.lat_min) * self._lon_tiles + (tile_lon - self.lon_min)]
+        if slot == NO_TILE:
+            self.no_data += 1
+            return None
+
+        n = self.cells_per_degree
+        side = self._side
+        fy = (tile_lat + 1 - lat) * n  # Rows run north to south
+        fx = (lon - tile_lon) * n
+        row = min(int(fy), n - 1)
+        col = min(int(fx), n - 1)
+        dy = fy - row
+        dx = fx - col
+
+        base = slot * side * side + row * side + col
+        samples = self._samples
+        nw, ne = samples[base], samples[base + 1]
+        sw, se = samples[base + side], samples[base + side + 1]
+        if NODATA in (nw, ne, sw, se):
+            self.no_data += 1
+            return None
+
+        value = (nw * (1 - dx) + ne * dx) * (1 - dy) + (sw * (1 - dx) + se * dx) * dy
+        return value * self.scale + self.offset
+
+    def elevation_ft(self, lat: float, lon: float) -> Optional[float]:
+        """Ground elevation in feet, or None outside coverage or in a void."""
+        meters = self.elevation_m(lat, lon)
+        return meters * METERS_TO_FEET if meters is not None else None
+
+    def close(self) -> None:
+        """Release the mapping (views must not be used afterwards)."""
+        for name in ("_index", "_samples"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "path": self.path,
+            "tiles": self.tile_count,
+            "cells_per_degree": self.cells_per_degree,
+            "file_bytes": len(self._mmap),
+            "lookups": self.lookups,
+            "no_data": self.no_data,
+        }
+
+
+def _data_offset(index_count: int) -> int:
+    """Start of the tile data (aligned to 64 bytes)."""
+    end = HEADER_SIZE + index_count * 4
+    return (end + 63) // 64 * 64
+
+
+def write_elevation_grid(
+    path: str,
+    tiles: Mapping[Tuple[int, int], np.ndarray],
+    cells_per_degree: int,
+    scale: float = 1.0,
+    offset: float = 0.0,
+) -> None:
+    """
+    Quantize and write tiles to an elevation file.
+
+    The file is written next to path and renamed into place, so processes
+    that have the old file mapped keep reading it undisturbed.
+
+    Args:
+        path: Output path
+        tiles: (south latitude, west longitude) -> (cells_per_degree + 1)^2
+            array of elevations in meters, north row first; NaN for voids
+        cells_per_degree: Samples per degree (the grid spacing)
+        scale: Meters per stored unit (quantization step)
+        offset: Meters added after scaling
+    """
+    if not tiles:
+        raise ValueError("No tiles to write")
+    side = cells_per_degree + 1
+    lats = [lat for lat, _ in tiles]
+    lons = [lon for _, lon in tiles]
+    lat_min, lat_max = min(lats), max(lats) + 1
+    lon_min, lon_max = min(lons), max(lons) + 1
+    lon_tiles = lon_max - lon_min
+
+    index = np.full((lat_max - lat_min) * lon_tiles, NO_TILE, dtype="<u4")
+    data = []
+    for slot, key in enumerate(sorted(tiles)):
+        meters = np.asarray(tiles[key], dtype=np.float64)
+        if meters.shape != (side, side):
+            raise ValueError(f"Tile {key} has shape {meters.shape}, expected {(side, side)}")
+        quantized = np.clip(np.round((meters - offset) / scale), NODATA + 1, 32767)
+        quantized[np.isnan(meters)] = NODATA
+        data.append(quantized.astype("<i2"))
+        lat, lon = key
+        index[(lat - lat_min) * lon_tiles + (lon - lon_min)] = slot
+
+    header = _HEADER.pack(
+        MAGIC, ELEVATION_FORMAT_VERSION, cells_per_degree,
+        lat_min, lat_max, lon_min, lon_max, scale, offset, len(data),
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\x00"))
+        f.write(index.tobytes())
+        f.write(b"\x00" * (_data_offset(index.size) - HEADER_SIZE - index.nbytes))
+        for tile in data:
+            f.write(tile.tobytes())
+    os.replace(tmp_path, path)
+
+
+# Loaded grid instance (loaded lazily or at startup)
+_elevation_grid: Optional[ElevationGrid] = None
+_grid_load_attempted = False
+
+
+def load_elevation_grid(path: Optional[str] = None) -> Optional[ElevationGrid]:
+    """
+    Map the configured elevation grid.
+
+    Returns None (and altitude falls back to the city table or sea level)
+    when no grid is configured or the file cannot be loaded.
+    """
+    global _elevation_grid, _grid_load_attempted
+
+    _grid_load_attempted = True
+    path = path or settings.ELEVATION_GRID_PATH
+    if not path:
+        _elevation_grid = None
+        return None
+
+    try:
+        _elevation_grid = ElevationGrid(path)
+        logger.info(
+            "Elevation grid mapped",
+            path=path,
+            tiles=_elevation_grid.tile_count,
+            cells_per_degree=_elevation_grid.cells_per_degree,
+        )
+    except Exception as e:
+        logger.warning(f"Elevation grid not available: {str(e)}")
+        _elevation_grid = None
+
+    return _elevation_grid
+
+
+def get_elevation_grid() -> Optional[ElevationGrid]:
+    """Get the elevation grid, mapping it on first use."""
+    if not _grid_load_attempted:
+        load_elevation_grid()
+    return _elevation_grid
+
+
+def lookup_elevation_ft(lat: float, lon: float) -> Optional[float]:
+    """Ground elevation in feet from the local grid (None if unavailable)."""
+    grid = get_elevation_grid()
+    return grid.elevation_ft(lat, lon) if grid is not None else None
+
+
+def get_elevation_stats() -> Optional[Dict[str, Any]]:
+    """Counters for metrics endpoints (None when no grid is loaded)."""
+    return _elevation_grid.stats() if _elevation_grid is not None else None
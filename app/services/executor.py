@@ -0,0 +1,190 @@
+"""
+Physics Execution Backend
+
+Runs CPU-bound physics calls off the asyncio event loop so health checks,
+auth lookups and Redis calls are not stalled behind a simulation.
+
+Backends (settings.PHYSICS_EXECUTOR):
+- inline: Call directly on the event loop (previous behavior)
+- thread: Thread pool; NumPy sections release the GIL and the loop keeps
+  getting scheduled between simulation steps
+- process: Process pool; full CPU parallelism, each worker keeps its own
+  memo and lookup table
+
+In-flight work (running + queued) is bounded; beyond that, calls fail fast
+with PhysicsOverloadedError, which the API returns as 503.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.middleware.logging_config import logger
+
+EXECUTOR_BACKENDS = ("inline", "thread", "process")
+
+
+class PhysicsOverloadedError(Exception):
+    """Raised when the physics queue is full."""
+
+
+def _warmup() -> None:
+    """
+    Prepare a worker: import the physics engine, load the lookup table and
+    run one small breakdown so the first real request is not slow.
+    """
+    from app.models.requests import ShotData, WeatherConditions
+    from app.services.physics import calculate_impact_breakdown
+
+    calculate_impact_breakdown(
+        ShotData(ball_speed_mph=120, launch_angle_deg=16, spin_rate_rpm=7000),
+        WeatherConditions(wind_speed_mph=5),
+    )
+
+
+def _ready() -> bool:
+    """No-op task used to make sure every worker has started (and warmed up)."""
+    return True
+
+
+class PhysicsExecutor:
+    """
+    Bounded executor for physics calls.
+
+    Args:
+        backend: "inline", "thread" or "process"
+        max_workers: Pool size (0 = CPU count)
+        max_queue: Calls allowed to wait beyond the ones running
+    """
+
+    def __init__(self, backend: str, max_workers: int = 0, max_queue: int = 64):
+        if backend not in EXECUTOR_BACKENDS:
+            raise ValueError(
+                f"Unknown physics executor '{backend}'. "
+                f"Valid executors: {', '.join(EXECUTOR_BACKENDS)}"
+            )
+        self.backend = backend
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._pool: Optional[Executor] = None
+
+        # Only touched from the event loop thread
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self, warmup: bool = True) -> None:
+        """Create the pool and, optionally, warm up every worker (blocking)."""
+        if self.backend == "inline" or self._pool is not None:
+            return
+
+        initializer = _warmup if warmup else None
+        if self.backend == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="physics",
+                initializer=initializer,
+            )
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=initializer
+            )
+
+        if warmup:
+            wait([self._pool.submit(_ready) for _ in range(self.max_workers)])
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the backend and await its result.
+
+        Raises:
+            PhysicsOverloadedError: If max_workers + max_queue calls are
+                already in flight
+        """
+        if self.backend == "inline":
+            return func(*args, **kwargs)
+
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PhysicsOverloadedError(
+                f"Physics queue is full ({self.in_flight} calls in flight)"
+            )
+
+        if self._pool is None:
+            self.start(warmup=False)
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        """Stop the pool (waits for running calls)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "backend": self.backend,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# Executor instance (created lazily or at startup)
+_physics_executor: Optional[PhysicsExecutor] = None
+
+
+def get_physics_executor() -> PhysicsExecutor:
+    """Get the physics executor, creating it from settings on first use."""
+    global _physics_executor
+
+    if _physics_executor is None:
+        _physics_executor = PhysicsExecutor(
+            settings.PHYSICS_EXECUTOR,
+            settings.PHYSICS_EXECUTOR_WORKERS,
+            settings.PHYSICS_EXECUTOR_MAX_QUEUE,
+        )
+    return _physics_executor
+
+
+async def run_physics(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a physics call on the configured backend."""
+    return await get_physics_executor().run(func, *args, **kwargs)
+
+
+async def init_physics_executor() -> PhysicsExecutor:
+    """Create the executor and warm up its workers without blocking the loop."""
+    executor = get_physics_executor()
+    await asyncio.to_thread(executor.start)
+    logger.info(
+        "Physics executor ready",
+        backend=executor.backend,
+        workers=executor.max_workers,
+        max_queue=executor.max_queue,
+    )
+    return executor
+
+
+def close_physics_executor() -> None:
+    """Shut down the executor."""
+    global _physics_executor
+    if _physics_executor is not None:
+        _physics_executor.shutdown()
+        _physics_executor = None
@@ -0,0 +1,286 @@
+"""
+Facility Registry
+
+Clients register their facilities (location, altitude, and the compass
+bearing their bays face) in the facilities table. The registry keeps every
+active facility in memory together with a snapshot of its current weather:
+a background task reloads the table and refreshes the weather of every
+facility every FACILITY_WEATHER_REFRESH_SECONDS, so a request that only
+sends metadata.facility_id is answered from memory without a database
+query or an upstream call.
+
+Weather is refreshed through fetch_weather_by_coords(), so facilities that
+share a location (and other requests for it) share the weather cache and
+its quota governance. A snapshot older than
+WEATHER_CACHE_STALE_IF_ERROR_SECONDS (prefetches kept failing) is not
+served; the request goes through the weather cache like any other. Admin changes reload the registry on the instance
+that made them; other instances pick them up on their next reload.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.models.database import Facility
+from app.services.weather_cache import observation_age_seconds
+
+
+class FacilityRecord:
+    """Cached facilities row."""
+
+    __slots__ = (
+        "client_id", "facility_id", "name", "latitude", "longitude",
+        "altitude_ft", "target_bearing_deg",
+    )
+
+    def __init__(
+        self,
+        client_id: str,
+        facility_id: str,
+        latitude: float,
+        longitude: float,
+        altitude_ft: Optional[float] = None,
+        target_bearing_deg: float = 0.0,
+        name: Optional[str] = None,
+    ):
+        self.client_id = client_id
+        self.facility_id = facility_id
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude_ft = altitude_ft
+        self.target_bearing_deg = target_bearing_deg
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.client_id, self.facility_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FacilityRegistry:
+    """
+    (client_id, facility_id) -> FacilityRecord, plus the latest weather
+    for each facility.
+
+    Args:
+        refresh_seconds: Seconds between reloads and weather refreshes
+        prefetch_concurrency: Facilities whose weather is fetched at once
+        max_snapshot_age_seconds: Oldest weather snapshot served from memory
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float,
+        prefetch_concurrency: int,
+        max_snapshot_age_seconds: float,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.prefetch_concurrency = max(1, prefetch_concurrency)
+        self.max_snapshot_age_seconds = max_snapshot_age_seconds
+        self._facilities: Dict[Tuple[str, str], FacilityRecord] = {}
+        self._weather: Dict[Tuple[str, str], dict] = {}
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+
+        self.reloads = 0
+        self.reload_errors = 0
+        self.refreshes = 0
+        self.prefetch_errors = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.expired_snapshots = 0
+        self.last_refresh_ms: Optional[float] = None
+
+    def get(self, client_id: str, facility_id: str) -> Optional[FacilityRecord]:
+        """The registered facility, or None."""
+        return self._facilities.get((client_id, facility_id))
+
+    def set_facilities(self, records: Iterable[FacilityRecord]) -> None:
+        """
+        Replace the registry.
+
+        Weather snapshots are kept for facilities whose location did not
+        change, and dropped for the rest.
+        """
+        facilities = {record.key: record for record in records}
+        for key in list(self._weather):
+            new, old = facilities.get(key), self._facilities.get(key)
+            if new is None or old is None or (new.latitude, new.longitude) != (old.latitude, old.longitude):
+                del self._weather[key]
+        self._facilities = facilities
+        self._loaded = True
+
+    async def reload(self) -> None:
+        """Reload active facilities from the database (keeps the old registry on failure)."""
+        from app.database import AsyncSessionLocal
+
+        if AsyncSessionLocal is None:
+            self._loaded = True
+            return
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(select(Facility).where(Facility.is_active.is_(True)))
+                rows = result.scalars().all()
+        except Exception as e:
+            self.reload_errors += 1
+            logger.warning(f"Failed to load facilities: {str(e)}")
+            return
+
+        self.set_facilities(
+            FacilityRecord(
+                row.client_id, row.facility_id, row.latitude, row.longitude,
+                row.altitude_ft, row.target_bearing_deg or 0.0, row.name,
+            )
+            for row in rows
+        )
+        self.reloads += 1
+
+    async def refresh_weather(self) -> None:
+        """Fetch current weather for every registered facility."""
+        semaphore = asyncio.Semaphore(self.prefetch_concurrency)
+        start = time.perf_counter()
+
+        async def prefetch(record: FacilityRecord) -> None:
+            async with semaphore:
+                try:
+                    await self._fetch(record)
+                except Exception as e:
+                    # Keep the previous snapshot; requests fall back to it
+                    self.prefetch_errors += 1
+                    logger.warning(
+                        f"Weather prefetch failed for facility {record.facility_id}: {str(e)}"
+                    )
+
+        await asyncio.gather(*(prefetch(record) for record in list(self._facilities.values())))
+        self.refreshes += 1
+        self.last_refresh_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _fetch(self, record: FacilityRecord) -> dict:
+        from app.services.weather import fetch_weather_by_coords
+
+        weather = await fetch_weather_by_coords(record.latitude, record.longitude)
+        # Only keep it if the facility was not moved or removed meanwhile
+        if self._facilities.get(record.key) is record:
+            self._weather[record.key] = weather
+        return weather
+
+    async def conditions(
+        self, client_id: str, facility_id: str
+    ) -> Optional[Tuple[FacilityRecord, dict]]:
+        """
+        The facility and its latest weather, or None if it is not registered.
+
+        Served from memory; only a facility without a snapshot yet (just
+        registered, or every prefetch failed) or with an expired one costs
+        a weather lookup.
+        """
+        self.start()
+        if not self._loaded:
+            await self.reload()
+
+        record = self.get(client_id, facility_id)
+        if record is None:
+            return None
+
+        weather = self._weather.get(record.key)
+        if weather is not None and self._expired(weather):
+            self.expired_snapshots += 1
+            del self._weather[record.key]
+            weather = None
+        if weather is None:
+            self.memory_misses += 1
+            weather = await self._fetch(record)
+        else:
+            self.memory_hits += 1
+        weather = dict(weather)
+        weather["observation_age_seconds"] = observation_age_seconds(weather)
+        return record, weather
+
+    def _expired(self, weather: dict) -> bool:
+        fetched_at = weather.get("fetched_at")
+        if fetched_at is None:
+            return False
+        age = (datetime.utcnow() - fetched_at).total_seconds()
+        return age > self.max_snapshot_age_seconds
+
+    def start(self) -> None:
+        """Start the refresh task on the running loop unless it is already running there."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._closing = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            if not self._loaded:
+                await self.reload()
+            await self.refresh_weather()
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.refresh_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await self.reload()
+
+    async def close(self) -> None:
+        """Stop the refresh task."""
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._closing.set()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "facilities": len(self._facilities),
+            "weather_snapshots": len(self._weather),
+            "refresh_seconds": self.refresh_seconds,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "refreshes": self.refreshes,
+            "last_refresh_ms": self.last_refresh_ms,
+            "prefetch_errors": self.prefetch_errors,
+            "memory_hits": self.memory_hits,
+            "memory_misses": self.memory_misses,
+            "expired_snapshots": self.expired_snapshots,
+        }
+
+
+# Registry instance (created lazily)
+_facility_registry: Optional[FacilityRegistry] = None
+
+
+def get_facility_registry() -> FacilityRegistry:
+    """Get the facility registry, creating it from settings on first use."""
+    global _facility_registry
+
+    if _facility_registry is None:
+        _facility_registry = FacilityRegistry(
+            settings.FACILITY_WEATHER_REFRESH_SECONDS,
+            settings.FACILITY_PREFETCH_CONCURRENCY,
+            settings.WEATHER_CACHE_STALE_IF_ERROR_SECONDS,
+        )
+    return _facility_registry
+
+
+async def init_facility_registry() -> None:
+    """Load the registry and start refreshing facility weather (called on startup)."""
+    registry = get_facility_registry()
+    await registry.reload()
+    registry.start()
+
+
+async def close_facility_registry() -> None:
+    """Stop refreshing facility weather (called on shutdown)."""
+    if _facility_registry is not None:
+        await _facility_registry.close()
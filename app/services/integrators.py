@@ -0,0 +1,318 @@
+"""
+Trajectory Integrators
+
+Pluggable ODE integrators for ball flight. Each integrator advances the
+state (position, velocity) under an acceleration function supplied by the
+physics engine, detects the landing by root-finding y = 0 inside the final
+step, and reports how many steps it took.
+
+Registered modes:
+- rk4-fixed: Classic 4th-order Runge-Kutta with a fixed time step
+- adaptive-rk45: Dormand-Prince 5(4) with error-controlled step size
+
+The legacy fixed-step Euler loop lives in physics.calculate_trajectory()
+itself ("legacy-euler") because the API's empirical calibration was fitted
+to its exact output.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Acceleration as a function of velocity: (vx, vy, vz) -> (ax, ay, az)
+AccelerationFn = Callable[[float, float, float], Tuple[float, float, float]]
+
+# Tolerance profiles selectable per request / per api_type
+QUALITY_PROFILES: Dict[str, Dict[str, float]] = {
+    "fast": {
+        "dt": 0.1,  # rk4-fixed step (s)
+        "rtol": 1e-4,  # adaptive-rk45 relative tolerance
+        "atol": 1e-3,  # adaptive-rk45 absolute tolerance (m, m/s)
+        "max_step": 0.5,  # adaptive-rk45 largest step (s)
+    },
+    "accurate": {
+        "dt": 0.025,
+        "rtol": 1e-7,
+        "atol": 1e-6,
+        "max_step": 0.25,
+    },
+}
+
+# Registry of integrator name -> implementation
+INTEGRATORS: Dict[str, Callable[..., Dict]] = {}
+
+
+def register_integrator(name: str):
+    """Decorator that registers an integrator implementation under a mode name."""
+
+    def decorator(func):
+        INTEGRATORS[name] = func
+        return func
+
+    return decorator
+
+
+def get_quality_profile(quality: str) -> Dict[str, float]:
+    """
+    Look up a tolerance profile by name.
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    try:
+        return QUALITY_PROFILES[quality]
+    except KeyError:
+        raise ValueError(
+            f"Unknown quality '{quality}'. Valid qualities: {', '.join(QUALITY_PROFILES)}"
+        )
+
+
+def _hermite(p0: float, p1: float, m0: float, m1: float, h: float, s: float) -> float:
+    """Cubic Hermite interpolation at fraction s of a step of length h."""
+    s2 = s * s
+    s3 = s2 * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * p0
+        + (s3 - 2 * s2 + s) * h * m0
+        + (-2 * s3 + 3 * s2) * p1
+        + (s3 - s2) * h * m1
+    )
+
+
+def _bisect(func: Callable[[float], float], lo: float, hi: float, iterations: int = 48) -> float:
+    """Find a sign change of func in [lo, hi] (func(lo) >= 0 > func(hi))."""
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        if func(mid) >= 0:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+class _FlightRecorder:
+    """
+    Collects samples, apex and landing from a sequence of accepted steps.
+
+    Each step is described by its start/end time, position, velocity and
+    acceleration; everything in between comes from cubic Hermite
+    interpolation, which needs no extra acceleration evaluations.
+    """
+
+    def __init__(self, sample_interval: Optional[float]):
+        self.sample_interval = sample_interval
+        self.samples: List[Tuple[float, float, float]] = []
+        self.next_sample = sample_interval
+        self.max_height = 0.0
+        self.steps = 0
+        self.landed: Optional[Tuple[float, Tuple[float, ...], Tuple[float, ...]]] = None
+
+    def step(self, t0, h, pos0, vel0, acc0, pos1, vel1, acc1) -> bool:
+        """Record one accepted step. Returns True once the ball has landed."""
+        self.steps += 1
+        end = 1.0
+
+        if pos1[1] < 0:
+            # Landing: root-find y(s) = 0 on the Hermite cubic for this step
+            end = _bisect(
+                lambda s: _hermite(pos0[1], pos1[1], vel0[1], vel1[1], h, s), 0.0, 1.0
+            )
+            landing_pos = tuple(
+                _hermite(pos0[i], pos1[i], vel0[i], vel1[i], h, end) for i in range(3)
+            )
+            landing_vel = tuple(
+                _hermite(vel0[i], vel1[i], acc0[i], acc1[i], h, end) for i in range(3)
+            )
+            self.landed = (t0 + end * h, (landing_pos[0], 0.0, landing_pos[2]), landing_vel)
+
+        # Apex: vertical velocity changes sign inside the step
+        if vel0[1] > 0 and _hermite(vel0[1], vel1[1], acc0[1], acc1[1], h, end) <= 0:
+            s_apex = _bisect(
+                lambda s: _hermite(vel0[1], vel1[1], acc0[1], acc1[1], h, s), 0.0, end
+            )
+            apex = _hermite(pos0[1], pos1[1], vel0[1], vel1[1], h, s_apex)
+            self.max_height = max(self.max_height, apex)
+        if self.landed is None:
+            self.max_height = max(self.max_height, pos1[1])
+
+        if self.sample_interval is not None:
+            t_end = t0 + end * h
+            while self.next_sample < t_end:
+                s = (self.next_sample - t0) / h
+                self.samples.append(
+                    tuple(_hermite(pos0[i], pos1[i], vel0[i], vel1[i], h, s) for i in range(3))
+                )
+                self.next_sample += self.sample_interval
+            if self.landed is not None:
+                self.samples.append(self.landed[1])
+
+        return self.landed is not None
+
+    def result(self, t, pos, vel) -> Dict:
+        """Build the integrator result (landing state if landed, else current state)."""
+        if self.landed is not None:
+            t, pos, vel = self.landed
+        return {
+            "flight_time": t,
+            "position": pos,
+            "velocity": vel,
+            "max_height": self.max_height,
+            "samples": self.samples,
+            "steps": self.steps,
+        }
+
+
+def _derivative(acceleration: AccelerationFn, vel: Tuple[float, float, float]):
+    return acceleration(vel[0], vel[1], vel[2])
+
+
+@register_integrator("rk4-fixed")
+def integrate_rk4_fixed(
+    acceleration: AccelerationFn,
+    velocity: Tuple[float, float, float],
+    quality: Dict[str, float],
+    max_time: float = 15.0,
+    sample_interval: Optional[float] = 0.1,
+) -> Dict:
+    """
+    Integrate a flight with classic fixed-step 4th-order Runge-Kutta.
+
+    Args:
+        acceleration: Acceleration as a function of velocity
+        velocity: Initial velocity (vx, vy, vz) in m/s, starting at the origin
+        quality: Tolerance profile (uses "dt")
+        max_time: Give up after this many seconds of flight
+        sample_interval: Seconds between recorded trajectory samples, or None
+            to skip sampling
+
+    Returns:
+        Dictionary with flight_time, position, velocity (at landing),
+        max_height, samples and steps
+    """
+    dt = quality["dt"]
+    recorder = _FlightRecorder(sample_interval)
+    t = 0.0
+    pos = (0.0, 0.0, 0.0)
+    vel = tuple(velocity)
+    acc = _derivative(acceleration, vel)
+
+    while t < max_time:
+        h = min(dt, max_time - t)
+        v1, a1 = vel, acc
+        v2 = tuple(vel[i] + 0.5 * h * a1[i] for i in range(3))
+        a2 = _derivative(acceleration, v2)
+        v3 = tuple(vel[i] + 0.5 * h * a2[i] for i in range(3))
+        a3 = _derivative(acceleration, v3)
+        v4 = tuple(vel[i] + h * a3[i] for i in range(3))
+        a4 = _derivative(acceleration, v4)
+
+        new_pos = tuple(
+            pos[i] + h / 6 * (v1[i] + 2 * v2[i] + 2 * v3[i] + v4[i]) for i in range(3)
+        )
+        new_vel = tuple(
+            vel[i] + h / 6 * (a1[i] + 2 * a2[i] + 2 * a3[i] + a4[i]) for i in range(3)
+        )
+        new_acc = _derivative(acceleration, new_vel)
+
+        if recorder.step(t, h, pos, vel, acc, new_pos, new_vel, new_acc):
+            break
+        t, pos, vel, acc = t + h, new_pos, new_vel, new_acc
+
+    return recorder.result(t, pos, vel)
+
+
+# Dormand-Prince 5(4) tableau (the dynamics are autonomous, so the c nodes are unused)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+_DP_E = tuple(b5 - b4 for b5, b4 in zip(_DP_B5, _DP_B4))
+
+
+@register_integrator("adaptive-rk45")
+def integrate_adaptive_rk45(
+    acceleration: AccelerationFn,
+    velocity: Tuple[float, float, float],
+    quality: Dict[str, float],
+    max_time: float = 15.0,
+    sample_interval: Optional[float] = 0.1,
+) -> Dict:
+    """
+    Integrate a flight with adaptive Dormand-Prince 5(4).
+
+    Step size grows through the smooth mid-flight phase and shrinks where
+    the local error estimate exceeds rtol/atol. The last stage doubles as
+    the next step's first stage (FSAL), so each accepted step costs six
+    acceleration evaluations.
+
+    Args:
+        acceleration: Acceleration as a function of velocity
+        velocity: Initial velocity (vx, vy, vz) in m/s, starting at the origin
+        quality: Tolerance profile (uses "rtol", "atol", "max_step")
+        max_time: Give up after this many seconds of flight
+        sample_interval: Seconds between recorded trajectory samples, or None
+            to skip sampling
+
+    Returns:
+        Dictionary with flight_time, position, velocity (at landing),
+        max_height, samples and steps
+    """
+    rtol = quality["rtol"]
+    atol = quality["atol"]
+    max_step = quality["max_step"]
+
+    recorder = _FlightRecorder(sample_interval)
+    t = 0.0
+    pos = (0.0, 0.0, 0.0)
+    vel = tuple(velocity)
+    acc = _derivative(acceleration, vel)
+    h = min(max_step, 0.05)
+
+    while t < max_time:
+        h = min(h, max_time - t)
+
+        # Stages: position derivative is velocity, velocity derivative is acceleration.
+        # The last stage is evaluated at the 5th-order solution itself (FSAL).
+        stage_vel = [vel]
+        stage_acc = [acc]
+        for coeffs in _DP_A[1:]:
+            v = tuple(
+                vel[i] + h * sum(c * stage_acc[j][i] for j, c in enumerate(coeffs))
+                for i in range(3)
+            )
+            stage_vel.append(v)
+            stage_acc.append(_derivative(acceleration, v))
+
+        new_pos = tuple(
+            pos[i] + h * sum(b * stage_vel[j][i] for j, b in enumerate(_DP_B5))
+            for i in range(3)
+        )
+        new_vel = stage_vel[6]
+        new_acc = stage_acc[6]
+
+        # Embedded error estimate, scaled per component
+        error = 0.0
+        for i in range(3):
+            pos_err = h * sum(e * stage_vel[j][i] for j, e in enumerate(_DP_E))
+            vel_err = h * sum(e * stage_acc[j][i] for j, e in enumerate(_DP_E))
+            pos_scale = atol + rtol * max(abs(pos[i]), abs(new_pos[i]))
+            vel_scale = atol + rtol * max(abs(vel[i]), abs(new_vel[i]))
+            error = max(error, abs(pos_err) / pos_scale, abs(vel_err) / vel_scale)
+
+        if error > 1.0:
+            h *= max(0.2, 0.9 * error ** -0.2)
+            continue
+
+        if recorder.step(t, h, pos, vel, acc, new_pos, new_vel, new_acc):
+            break
+        t, pos, vel, acc = t + h, new_pos, new_vel, new_acc
+
+        growth = 5.0 if error == 0 else min(5.0, 0.9 * error ** -0.2)
+        h = min(max_step, h * growth)
+
+    return recorder.result(t, pos, vel)
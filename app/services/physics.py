@@ -9,9 +9,16 @@ Calculates golf ball trajectory accounting for:
 """
 
 import math
-from typing import Dict, List, Tuple
+from typing import Collection, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.config import settings
 from app.models.requests import ShotData, WeatherConditions
+from app.services.integrators import INTEGRATORS, get_quality_profile
+from app.services.trajectory_table import get_trajectory_table
+from app.utils.cache import LRUTTLCache
 
 
 # Golf ball constants
@@ -33,6 +40,19 @@ METERS_TO_YARDS = 1.09361
 # Gravity
 GRAVITY = 9.81  # m/s²
 
+# Below this many shots NumPy's per-call overhead outweighs vectorization,
+# so calculate_trajectory_batch() integrates shot by shot instead
+BATCH_VECTORIZE_MIN_SHOTS = 32
+
+# The original fixed-step Euler loop. The empirical calibration (wind,
+# altitude, gaming caps) was fitted to its output, so it stays the default;
+# other modes come from the app.services.integrators registry.
+LEGACY_INTEGRATOR = "legacy-euler"
+
+# Bump whenever a change alters results for the same inputs (calibration,
+# aerodynamic model, breakdown assembly). Cached results are keyed on it.
+PHYSICS_ENGINE_VERSION = "1"
+
 
 def estimate_pressure_at_altitude(altitude_ft: float, sea_level_pressure_inhg: float = 29.92) -> float:
     """
@@ -327,9 +347,12 @@ def calculate_trajectory(
     headwind_mps: float,
     crosswind_mps: float,
     dt: float = 0.01,  # Time step in seconds
+    record_points: bool = True,
+    integrator: str = LEGACY_INTEGRATOR,
+    quality: str = "accurate",
 ) -> Dict:
     """
-    Calculate full trajectory using numerical integration (Euler method).
+    Calculate full trajectory using numerical integration.
 
     Args:
         ball_speed_mph: Initial ball speed in mph
@@ -340,7 +363,15 @@ def calculate_trajectory(
         air_density: Air density in kg/m³
         headwind_mps: Headwind component in m/s (positive = into wind)
         crosswind_mps: Crosswind component in m/s (positive = left-to-right)
-        dt: Time step for integration
+        dt: Time step for integration (legacy-euler only)
+        record_points: If False, skip trajectory point recording (carry-only
+            callers); trajectory_points is then an empty list
+        integrator: "legacy-euler", "rk4-fixed" or "adaptive-rk45"
+            - legacy-euler: Fixed-step Euler, stops on the first step below
+              ground (the calibrated default)
+            - rk4-fixed / adaptive-rk45: Higher-order integrators that
+              root-find the exact landing point
+        quality: Tolerance profile for non-legacy integrators ("fast" or "accurate")
 
     Returns:
         Dictionary with trajectory results:
@@ -351,7 +382,26 @@ def calculate_trajectory(
         - flight_time_seconds: Time in air
         - landing_angle_deg: Descent angle at landing
         - trajectory_points: List of {x, y, z} points
+        - integration_steps: Number of integrator steps taken
+
+    Raises:
+        ValueError: If the integrator or quality is unknown
     """
+    if integrator != LEGACY_INTEGRATOR:
+        return _calculate_trajectory_integrated(
+            ball_speed_mph,
+            launch_angle_deg,
+            spin_rate_rpm,
+            spin_axis_deg,
+            direction_deg,
+            air_density,
+            headwind_mps,
+            crosswind_mps,
+            record_points,
+            integrator,
+            quality,
+        )
+
     # Convert inputs to SI units
     ball_speed_mps = ball_speed_mph * MPH_TO_MPS
     launch_rad = math.radians(launch_angle_deg)
@@ -363,14 +413,28 @@ def calculate_trajectory(
     vy = ball_speed_mps * math.sin(launch_rad)
     vz = ball_speed_mps * math.cos(launch_rad) * math.sin(direction_rad)
 
+    # Spin axis determines lift direction
+    # Pure backspin (axis_deg = 0) creates vertical lift
+    # Side spin (axis_deg = ±90) creates lateral force
+    backspin_ratio = math.cos(spin_axis_rad)
+    sidespin_ratio = math.sin(spin_axis_rad)
+
+    # Loop invariants, kept in the same association order as the per-step
+    # formulas so hoisting them does not change the result
+    spin_surface_speed = spin_rate_rpm / 60 * BALL_RADIUS_M * 2 * math.pi
+    half_rho_area = 0.5 * air_density * BALL_AREA_M2
+
     # Initial position
     x, y, z = 0.0, 0.0, 0.0
 
     # Tracking variables
-    trajectory_points: List[Dict[str, float]] = [{"x": 0, "y": 0, "z": 0}]
+    trajectory_points: List[Dict[str, float]] = (
+        [{"x": 0, "y": 0, "z": 0}] if record_points else []
+    )
     max_height = 0.0
     flight_time = 0.0
     last_point_time = 0.0
+    steps = 0
 
     # Simulation loop - continue until ball hits ground or timeout
     while y >= 0 and flight_time < 15:
@@ -384,28 +448,25 @@ def calculate_trajectory(
         if v_rel < 0.1:
             break
 
-        # Get current coefficients
-        cd = calculate_drag_coefficient(spin_rate_rpm, v_rel)
-        cl = calculate_lift_coefficient(spin_rate_rpm, v_rel)
+        # Get current coefficients (same empirical fits as
+        # calculate_drag_coefficient / calculate_lift_coefficient, inlined)
+        spin_parameter = spin_surface_speed / v_rel
+        cd = min(0.25 + 0.1 * spin_parameter, 0.5)
+        cl = min(0.15 + 0.2 * spin_parameter, 0.4)
 
         # Drag force magnitude: F_drag = 0.5 * rho * A * Cd * v^2
         # Note: v^2 is critical for correct physics - wind effects scale quadratically
-        drag_force = 0.5 * air_density * BALL_AREA_M2 * cd * v_rel * v_rel
+        drag_force = half_rho_area * cd * v_rel * v_rel
 
         # Drag acceleration components (opposite to relative velocity direction)
         # a = F/m, and we need to multiply by unit vector (v_component / v_rel)
-        ax_drag = -drag_force * vx_rel / (BALL_MASS_KG * v_rel)
-        ay_drag = -drag_force * vy / (BALL_MASS_KG * v_rel)
-        az_drag = -drag_force * vz_rel / (BALL_MASS_KG * v_rel)
+        mass_v = BALL_MASS_KG * v_rel
+        ax_drag = -drag_force * vx_rel / mass_v
+        ay_drag = -drag_force * vy / mass_v
+        az_drag = -drag_force * vz_rel / mass_v
 
         # Lift force magnitude: F_lift = 0.5 * rho * A * Cl * v^2
-        lift_force = 0.5 * air_density * BALL_AREA_M2 * cl * v_rel * v_rel
-
-        # Spin axis determines lift direction
-        # Pure backspin (axis_deg = 0) creates vertical lift
-        # Side spin (axis_deg = ±90) creates lateral force
-        backspin_ratio = math.cos(spin_axis_rad)
-        sidespin_ratio = math.sin(spin_axis_rad)
+        lift_force = half_rho_area * cl * v_rel * v_rel
 
         # Lift accelerations (a = F/m)
         ay_lift = lift_force * backspin_ratio / BALL_MASS_KG
@@ -431,9 +492,10 @@ def calculate_trajectory(
             max_height = y
 
         flight_time += dt
+        steps += 1
 
         # Store trajectory point every 0.1 seconds
-        if flight_time - last_point_time >= 0.1:
+        if record_points and flight_time - last_point_time >= 0.1:
             trajectory_points.append(
                 {
                     "x": round(x * METERS_TO_YARDS, 1),
@@ -443,6 +505,132 @@ def calculate_trajectory(
             )
             last_point_time = flight_time
 
+    return _summarize_flight(x, z, max_height, flight_time, vx, vy, trajectory_points, steps)
+
+
+def _make_acceleration(
+    spin_rate_rpm: float,
+    spin_axis_deg: float,
+    air_density: float,
+    headwind_mps: float,
+    crosswind_mps: float,
+):
+    """
+    Build the acceleration function (vx, vy, vz) -> (ax, ay, az) used by the
+    registered integrators. Same force model as calculate_trajectory().
+    """
+    spin_axis_rad = math.radians(spin_axis_deg)
+    backspin_ratio = math.cos(spin_axis_rad)
+    sidespin_ratio = math.sin(spin_axis_rad)
+    spin_surface_speed = spin_rate_rpm / 60 * BALL_RADIUS_M * 2 * math.pi
+    half_rho_area = 0.5 * air_density * BALL_AREA_M2
+
+    def acceleration(vx: float, vy: float, vz: float) -> Tuple[float, float, float]:
+        vx_rel = vx + headwind_mps
+        vz_rel = vz - crosswind_mps
+        v_rel = math.sqrt(vx_rel**2 + vy**2 + vz_rel**2)
+
+        # Stalled ball: aerodynamic forces vanish
+        if v_rel < 0.1:
+            return 0.0, -GRAVITY, 0.0
+
+        spin_parameter = spin_surface_speed / v_rel
+        cd = min(0.25 + 0.1 * spin_parameter, 0.5)
+        cl = min(0.15 + 0.2 * spin_parameter, 0.4)
+
+        drag_per_v = half_rho_area * cd * v_rel / BALL_MASS_KG
+        lift = half_rho_area * cl * v_rel * v_rel / BALL_MASS_KG
+
+        return (
+            -drag_per_v * vx_rel,
+            -drag_per_v * vy + lift * backspin_ratio - GRAVITY,
+            -drag_per_v * vz_rel + lift * sidespin_ratio,
+        )
+
+    return acceleration
+
+
+def _calculate_trajectory_integrated(
+    ball_speed_mph: float,
+    launch_angle_deg: float,
+    spin_rate_rpm: float,
+    spin_axis_deg: float,
+    direction_deg: float,
+    air_density: float,
+    headwind_mps: float,
+    crosswind_mps: float,
+    record_points: bool,
+    integrator: str,
+    quality: str,
+) -> Dict:
+    """Run calculate_trajectory() through a registered (non-legacy) integrator."""
+    integrate = INTEGRATORS.get(integrator)
+    if integrate is None:
+        valid = ", ".join((LEGACY_INTEGRATOR, *INTEGRATORS))
+        raise ValueError(f"Unknown integrator '{integrator}'. Valid integrators: {valid}")
+    profile = get_quality_profile(quality)
+
+    ball_speed_mps = ball_speed_mph * MPH_TO_MPS
+    launch_rad = math.radians(launch_angle_deg)
+    direction_rad = math.radians(direction_deg)
+    velocity = (
+        ball_speed_mps * math.cos(launch_rad) * math.cos(direction_rad),
+        ball_speed_mps * math.sin(launch_rad),
+        ball_speed_mps * math.cos(launch_rad) * math.sin(direction_rad),
+    )
+
+    flight = integrate(
+        _make_acceleration(
+            spin_rate_rpm, spin_axis_deg, air_density, headwind_mps, crosswind_mps
+        ),
+        velocity,
+        profile,
+        max_time=15.0,
+        sample_interval=0.1 if record_points else None,
+    )
+
+    trajectory_points: List[Dict[str, float]] = []
+    if record_points:
+        trajectory_points.append({"x": 0, "y": 0, "z": 0})
+        for x, y, z in flight["samples"]:
+            trajectory_points.append(
+                {
+                    "x": round(x * METERS_TO_YARDS, 1),
+                    "y": round(max(0, y) * METERS_TO_YARDS, 1),
+                    "z": round(z * METERS_TO_YARDS, 1),
+                }
+            )
+
+    x, _, z = flight["position"]
+    vx, vy, _ = flight["velocity"]
+    return _summarize_flight(
+        x,
+        z,
+        flight["max_height"],
+        flight["flight_time"],
+        vx,
+        vy,
+        trajectory_points,
+        flight["steps"],
+    )
+
+
+def _summarize_flight(
+    x: float,
+    z: float,
+    max_height: float,
+    flight_time: float,
+    vx: float,
+    vy: float,
+    trajectory_points: List[Dict[str, float]],
+    steps: int,
+) -> Dict:
+    """
+    Convert the final integrator state into the trajectory result dictionary.
+
+    Shared by the scalar and batch engines so both report identical rounding,
+    landing angle and roll estimates.
+    """
     # Calculate landing angle from final velocity
     landing_speed = math.sqrt(vx**2 + vy**2)
     if landing_speed > 0:
@@ -470,13 +658,455 @@ def calculate_trajectory(
         "flight_time_seconds": round(flight_time, 2),
         "landing_angle_deg": round(landing_angle, 1),
         "trajectory_points": trajectory_points,
+        "integration_steps": steps,
+    }
+
+
+def calculate_trajectory_batch(
+    ball_speed_mph: ArrayLike,
+    launch_angle_deg: ArrayLike,
+    spin_rate_rpm: ArrayLike,
+    spin_axis_deg: ArrayLike,
+    direction_deg: ArrayLike,
+    air_density: ArrayLike,
+    headwind_mps: ArrayLike,
+    crosswind_mps: ArrayLike,
+    dt: float = 0.01,  # Time step in seconds
+    record_points: Union[bool, ArrayLike] = True,
+) -> List[Dict]:
+    """
+    Calculate N trajectories at once using vectorized Euler integration.
+
+    Takes struct-of-arrays inputs (one array per parameter, scalars are
+    broadcast) and advances every shot in lock-step with NumPy. Shots that
+    land, stall or time out drop out of the working set while the rest keep
+    flying.
+
+    The update equations and their order of operations mirror
+    calculate_trajectory() exactly, so results agree with the scalar engine
+    to within the 0.1 yard / 0.01 second reporting precision (in practice
+    they are identical). Batches smaller than BATCH_VECTORIZE_MIN_SHOTS are
+    integrated shot by shot, which is faster at that size.
+
+    Args:
+        ball_speed_mph: Initial ball speeds in mph
+        launch_angle_deg: Launch angles in degrees above horizontal
+        spin_rate_rpm: Total spin rates in RPM
+        spin_axis_deg: Spin axis tilts (-90 to 90, negative = draw spin)
+        direction_deg: Initial directions relative to target line
+        air_density: Air densities in kg/m³
+        headwind_mps: Headwind components in m/s (positive = into wind)
+        crosswind_mps: Crosswind components in m/s (positive = left-to-right)
+        dt: Time step for integration
+        record_points: If False, skip trajectory point recording (carry-only
+            callers); each result then has an empty trajectory_points list.
+            May also be a per-shot boolean array.
+
+    Returns:
+        List of trajectory result dictionaries in input order, each with the
+        same keys as calculate_trajectory()
+    """
+    (
+        ball_speed_mph,
+        launch_angle_deg,
+        spin_rate_rpm,
+        spin_axis_deg,
+        direction_deg,
+        air_density,
+        headwind_mps,
+        crosswind_mps,
+    ) = (
+        np.array(a, dtype=np.float64)
+        for a in np.broadcast_arrays(
+            np.atleast_1d(ball_speed_mph),
+            np.atleast_1d(launch_angle_deg),
+            np.atleast_1d(spin_rate_rpm),
+            np.atleast_1d(spin_axis_deg),
+            np.atleast_1d(direction_deg),
+            np.atleast_1d(air_density),
+            np.atleast_1d(headwind_mps),
+            np.atleast_1d(crosswind_mps),
+        )
+    )
+    n = ball_speed_mph.shape[0]
+    record_mask = np.broadcast_to(np.asarray(record_points, dtype=bool), (n,))
+    if n < BATCH_VECTORIZE_MIN_SHOTS:
+        return [
+            calculate_trajectory(
+                ball_speed_mph=float(ball_speed_mph[i]),
+                launch_angle_deg=float(launch_angle_deg[i]),
+                spin_rate_rpm=float(spin_rate_rpm[i]),
+                spin_axis_deg=float(spin_axis_deg[i]),
+                direction_deg=float(direction_deg[i]),
+                air_density=float(air_density[i]),
+                headwind_mps=float(headwind_mps[i]),
+                crosswind_mps=float(crosswind_mps[i]),
+                dt=dt,
+                record_points=bool(record_mask[i]),
+            )
+            for i in range(n)
+        ]
+
+    # Initial velocity components, computed per shot with the same math calls
+    # as the scalar engine. State is stacked as rows (x = downrange, y = up,
+    # z = lateral) so each physics term is a single NumPy operation.
+    velocity = np.empty((3, n))
+    spin_direction = np.zeros((3, n))
+    for i in range(n):
+        ball_speed_mps = float(ball_speed_mph[i]) * MPH_TO_MPS
+        launch_rad = math.radians(float(launch_angle_deg[i]))
+        direction_rad = math.radians(float(direction_deg[i]))
+        spin_axis_rad = math.radians(float(spin_axis_deg[i]))
+        velocity[0, i] = ball_speed_mps * math.cos(launch_rad) * math.cos(direction_rad)
+        velocity[1, i] = ball_speed_mps * math.sin(launch_rad)
+        velocity[2, i] = ball_speed_mps * math.cos(launch_rad) * math.sin(direction_rad)
+        # Pure backspin (axis_deg = 0) creates vertical lift,
+        # side spin (axis_deg = ±90) creates lateral force
+        spin_direction[1, i] = math.cos(spin_axis_rad)
+        spin_direction[2, i] = math.sin(spin_axis_rad)
+
+    # Headwind adds to relative velocity in x, crosswind subtracts in z
+    wind = np.zeros((3, n))
+    wind[0] = headwind_mps
+    wind[2] = -crosswind_mps
+    gravity = np.array([[0.0], [GRAVITY], [0.0]])
+
+    # Drag (row 0) and lift (row 1) coefficients share one spin-parameter fit:
+    # coefficient = min(base + slope * spin_parameter, cap)
+    coeff_base = np.array([[0.25], [0.15]])
+    coeff_slope = np.array([[0.1], [0.2]])
+    coeff_cap = np.array([[0.5], [0.4]])
+
+    # Per-shot constants (same association order as the scalar formulas)
+    spin_surface_speed = spin_rate_rpm / 60 * BALL_RADIUS_M * 2 * math.pi
+    half_rho_area = 0.5 * air_density * BALL_AREA_M2
+
+    position = np.zeros((3, n))
+    max_height = np.zeros(n)
+
+    # Final state per shot, filled in as shots land and leave the working set
+    final_position = np.zeros((3, n))
+    final_velocity = velocity.copy()
+    final_max_height = np.zeros(n)
+    final_flight_time = np.zeros(n)
+    final_steps = np.zeros(n, dtype=np.int64)
+
+    # Every shot in the working set advances in lock-step, so the clock and
+    # the trajectory point schedule are shared scalars
+    flight_time = 0.0
+    last_point_time = 0.0
+    steps = 0
+    shot_index = np.arange(n)
+    recorded: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def retire(done: np.ndarray) -> None:
+        nonlocal velocity, position, max_height, wind, spin_direction
+        nonlocal spin_surface_speed, half_rho_area, shot_index
+        idx = shot_index[done]
+        final_position[:, idx] = position[:, done]
+        final_velocity[:, idx] = velocity[:, done]
+        final_max_height[idx] = max_height[done]
+        final_flight_time[idx] = flight_time
+        final_steps[idx] = steps
+
+        keep = ~done
+        velocity = velocity[:, keep]
+        position = position[:, keep]
+        max_height = max_height[keep]
+        wind = wind[:, keep]
+        spin_direction = spin_direction[:, keep]
+        spin_surface_speed = spin_surface_speed[keep]
+        half_rho_area = half_rho_area[keep]
+        shot_index = shot_index[keep]
+
+    while shot_index.size:
+        if flight_time >= 15:
+            retire(np.ones(shot_index.size, dtype=bool))
+            break
+
+        relative = velocity + wind
+        v_rel = np.sqrt((relative**2).sum(axis=0))
+
+        # Scalar engine breaks out before updating when the ball stalls
+        if v_rel.min() < 0.1:
+            stalled = v_rel < 0.1
+            retire(stalled)
+            if not shot_index.size:
+                break
+            relative = relative[:, ~stalled]
+            v_rel = v_rel[~stalled]
+
+        spin_parameter = spin_surface_speed / v_rel
+        coefficients = np.minimum(coeff_base + coeff_slope * spin_parameter, coeff_cap)
+
+        # Drag opposes relative velocity, lift follows the spin axis
+        forces = half_rho_area * coefficients * v_rel * v_rel
+        acceleration = (
+            -forces[0] * relative / (BALL_MASS_KG * v_rel)
+            + forces[1] * spin_direction / BALL_MASS_KG
+            - gravity
+        )
+
+        velocity += acceleration * dt
+        position += velocity * dt
+        np.maximum(max_height, position[1], out=max_height)
+        flight_time += dt
+        steps += 1
+
+        if flight_time - last_point_time >= 0.1:
+            recording = record_mask[shot_index]
+            if recording.any():
+                recorded.append((shot_index[recording], position[:, recording]))
+            last_point_time = flight_time
+
+        if position[1].min() < 0:
+            retire(position[1] < 0)
+
+    points_by_shot: List[List[Dict[str, float]]] = [
+        [{"x": 0, "y": 0, "z": 0}] if record else [] for record in record_mask.tolist()
+    ]
+    for idx, points in recorded:
+        for i, xi, yi, zi in zip(idx.tolist(), *points.tolist()):
+            points_by_shot[i].append(
+                {
+                    "x": round(xi * METERS_TO_YARDS, 1),
+                    "y": round(max(0, yi) * METERS_TO_YARDS, 1),
+                    "z": round(zi * METERS_TO_YARDS, 1),
+                }
+            )
+
+    x, _, z = final_position.tolist()
+    vx, vy, _ = final_velocity.tolist()
+    return [
+        _summarize_flight(xi, zi, hi, ti, vxi, vyi, points, si)
+        for xi, zi, hi, ti, vxi, vyi, points, si in zip(
+            x,
+            z,
+            final_max_height.tolist(),
+            final_flight_time.tolist(),
+            vx,
+            vy,
+            points_by_shot,
+            final_steps.tolist(),
+        )
+    ]
+
+
+# Sub-simulations behind calculate_impact_breakdown(). Only "baseline" and
+# "adjusted" are returned in full; the others contribute their carry only.
+BREAKDOWN_VARIANTS = ("baseline", "adjusted", "no_wind", "temperature", "humidity")
+FULL_RESULT_VARIANTS = ("baseline", "adjusted")
+
+# Optional parts of a calculate_impact_breakdown() result. The adjusted
+# result is always computed; sub-simulations only needed for parts that
+# were not selected are skipped.
+BREAKDOWN_PARTS = ("baseline", "impact_breakdown", "trajectory_points")
+
+# Execution strategies for the breakdown sub-simulations
+PHYSICS_ENGINES = ("fused", "sequential")
+
+# Quantization applied to sub-simulation inputs when memoization is on.
+# Inputs are snapped to these steps before simulating, so a memo hit returns
+# exactly what a fresh run would.
+MEMO_SHOT_QUANTA = {
+    "ball_speed_mph": 0.1,
+    "launch_angle_deg": 0.1,
+    "spin_rate_rpm": 10,
+    "spin_axis_deg": 0.1,
+    "direction_deg": 0.1,
+}
+MEMO_DENSITY_QUANTUM = 1e-4  # kg/m³
+MEMO_WIND_QUANTUM = 0.01  # m/s
+
+# One memo per breakdown component (created lazily from settings)
+_memo_caches: Optional[Dict[str, LRUTTLCache]] = None
+
+
+def _breakdown_variants(
+    conditions: WeatherConditions,
+) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Describe the sub-simulations needed to break down a shot's weather effects.
+
+    Args:
+        conditions: Weather conditions
+
+    Returns:
+        Mapping of variant name to (air_density, headwind_mps, crosswind_mps)
+    """
+    # Calculate temperature/humidity/pressure density effect (without altitude)
+    # Altitude effect is applied separately using empirical formula
+    temp_humid_pressure_density = calculate_air_density(
+        conditions.temperature_f,
+        0,  # Sea level - altitude handled separately
+        conditions.humidity_pct,
+        conditions.pressure_inhg,  # Use actual pressure for density calculation
+    )
+    headwind, crosswind = calculate_wind_components(
+        conditions.wind_speed_mph, conditions.wind_direction_deg
+    )
+
+    return {
+        # Baseline trajectory (standard conditions, no wind)
+        "baseline": (STANDARD_AIR_DENSITY, 0, 0),
+        # Trajectory for shape/visualization (physics-based)
+        "adjusted": (temp_humid_pressure_density, headwind, crosswind),
+        # No-wind carry for reference
+        "no_wind": (temp_humid_pressure_density, 0, 0),
+        # Isolate temperature effect only
+        "temperature": (calculate_air_density(conditions.temperature_f, 0, 50, 29.92), 0, 0),
+        # Isolate humidity effect only (typically minimal)
+        "humidity": (calculate_air_density(70, 0, conditions.humidity_pct, 29.92), 0, 0),
+    }
+
+
+def _adjusted_needs_baseline(conditions: WeatherConditions, api_type: str) -> bool:
+    """Whether the adjusted carry depends on the baseline carry (empirical wind)."""
+    if api_type == "professional":
+        return conditions.wind_speed_mph > 0
+    return 40 < conditions.wind_speed_mph <= 100
+
+
+def _select_variants(
+    conditions: WeatherConditions,
+    api_type: str,
+    parts: Optional[FrozenSet[str]],
+) -> Tuple[Dict[str, Tuple[float, float, float]], FrozenSet[str]]:
+    """
+    Pick the sub-simulations a breakdown with the given parts depends on.
+
+    Args:
+        conditions: Weather conditions
+        api_type: "professional" or "gaming"
+        parts: Selected BREAKDOWN_PARTS (None for everything)
+
+    Returns:
+        (variants, record): the _breakdown_variants() subset to simulate and
+        the variant names that need trajectory points
+    """
+    variants = _breakdown_variants(conditions)
+    if parts is None:
+        return variants, frozenset(FULL_RESULT_VARIANTS)
+
+    needed = {"adjusted", "no_wind"}
+    if parts & {"baseline", "impact_breakdown"} or _adjusted_needs_baseline(conditions, api_type):
+        needed.add("baseline")
+    if "impact_breakdown" in parts:
+        needed.update(("temperature", "humidity"))
+    record = frozenset(("adjusted",)) if "trajectory_points" in parts else frozenset()
+    return {name: variant for name, variant in variants.items() if name in needed}, record
+
+
+def _simulate_variants_fused(
+    items: Sequence[Tuple[ShotData, Dict[str, Tuple[float, float, float]], Collection[str]]],
+    integrator: str = LEGACY_INTEGRATOR,
+    quality: str = "accurate",
+) -> List[Dict[str, Dict]]:
+    """
+    Run every variant of every shot through one calculate_trajectory_batch() call.
+
+    Identical sub-simulations (e.g. "adjusted" and "no_wind" on a calm day)
+    are integrated once, and trajectory points are only recorded for the
+    variants named in each item's record set. Rows that are not returned in
+    full are answered from the precomputed lookup table when one is loaded
+    and covers them. The batch engine and table are Euler-only, so other
+    integrators run the deduplicated rows one at a time.
+    """
+    rows: Dict[Tuple[float, ...], int] = {}
+    row_inputs: List[Tuple[float, ...]] = []
+    row_exact: List[bool] = []
+    row_record: List[bool] = []
+    assignments: List[Dict[str, int]] = []
+
+    for shot, variants, record in items:
+        assigned = {}
+        for name, (air_density, headwind, crosswind) in variants.items():
+            row = (
+                shot.ball_speed_mph,
+                shot.launch_angle_deg,
+                shot.spin_rate_rpm,
+                shot.spin_axis_deg,
+                shot.direction_deg,
+                air_density,
+                headwind,
+                crosswind,
+            )
+            index = rows.get(row)
+            if index is None:
+                index = rows[row] = len(row_inputs)
+                row_inputs.append(row)
+                row_exact.append(False)
+                row_record.append(False)
+            if name in FULL_RESULT_VARIANTS:
+                row_exact[index] = True
+            if name in record:
+                row_record[index] = True
+            assigned[name] = index
+        assignments.append(assigned)
+
+    if integrator == LEGACY_INTEGRATOR:
+        results: List[Optional[Dict]] = [None] * len(row_inputs)
+        table = get_trajectory_table()
+        carry_only = [i for i, exact in enumerate(row_exact) if not exact]
+        if table is not None and carry_only:
+            looked_up = table.lookup_many(np.array([row_inputs[i] for i in carry_only]))
+            for i, result in zip(carry_only, looked_up):
+                results[i] = result
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            columns = list(zip(*(row_inputs[i] for i in pending)))
+            simulated = calculate_trajectory_batch(
+                *columns, record_points=[row_record[i] for i in pending]
+            )
+            for i, result in zip(pending, simulated):
+                results[i] = result
+    else:
+        results = [
+            calculate_trajectory(
+                *row, record_points=record_points, integrator=integrator, quality=quality
+            )
+            for row, record_points in zip(row_inputs, row_record)
+        ]
+
+    return [
+        {name: results[index] for name, index in assigned.items()}
+        for assigned in assignments
+    ]
+
+
+def _simulate_variants_sequential(
+    shot: ShotData,
+    variants: Dict[str, Tuple[float, float, float]],
+    integrator: str = LEGACY_INTEGRATOR,
+    quality: str = "accurate",
+) -> Dict[str, Dict]:
+    """Run each variant as an independent full calculate_trajectory() call."""
+    return {
+        name: calculate_trajectory(
+            ball_speed_mph=shot.ball_speed_mph,
+            launch_angle_deg=shot.launch_angle_deg,
+            spin_rate_rpm=shot.spin_rate_rpm,
+            spin_axis_deg=shot.spin_axis_deg,
+            direction_deg=shot.direction_deg,
+            air_density=air_density,
+            headwind_mps=headwind,
+            crosswind_mps=crosswind,
+            integrator=integrator,
+            quality=quality,
+        )
+        for name, (air_density, headwind, crosswind) in variants.items()
     }
 
 
 def calculate_impact_breakdown(
     shot: ShotData,
     conditions: WeatherConditions,
-    api_type: str = "professional"
+    api_type: str = "professional",
+    engine: Optional[str] = None,
+    integrator: Optional[str] = None,
+    quality: Optional[str] = None,
+    parts: Optional[Collection[str]] = None,
 ) -> Dict:
     """
     Calculate how each weather factor affects distance.
@@ -490,62 +1120,288 @@ def calculate_impact_breakdown(
         api_type: "professional" or "gaming"
             - professional: Uses pure physics simulation (shows realistic lift loss)
             - gaming: Uses smart capping for extreme conditions (enhanced for gameplay)
+        engine: "fused" or "sequential" (defaults to settings.PHYSICS_ENGINE)
+            - fused: All sub-simulations run as one batch, carry-only variants
+              skip trajectory point recording
+            - sequential: Each sub-simulation is an independent full run
+        integrator: Integration mode (defaults to settings.PHYSICS_INTEGRATOR,
+            see calculate_trajectory)
+        quality: "fast" or "accurate" tolerance profile (defaults to the
+            api_type's PHYSICS_QUALITY_* setting)
+        parts: Optional parts to compute (see BREAKDOWN_PARTS, default all).
+            Sub-simulations only needed for unselected parts never run, and
+            adjusted trajectory points are only recorded for
+            "trajectory_points". Selected values are identical either way.
 
     Returns:
         Dictionary containing:
-        - baseline: Trajectory results in standard conditions
+        - baseline: Trajectory results in standard conditions (with "baseline")
         - adjusted: Trajectory results in actual conditions
         - impact_breakdown: Individual effects of each weather factor
-        - equivalent_calm_distance_yards: What the shot would go in calm conditions
+          (with "impact_breakdown")
+        - equivalent_calm_distance_yards: What the shot would go in calm
+          conditions (with "baseline")
         - api_type: Which calculation method was used
+        - integration: Integrator, quality and total steps across sub-simulations
     """
-    # Calculate baseline trajectory (standard conditions, no wind)
-    baseline_result = calculate_trajectory(
-        ball_speed_mph=shot.ball_speed_mph,
-        launch_angle_deg=shot.launch_angle_deg,
-        spin_rate_rpm=shot.spin_rate_rpm,
-        spin_axis_deg=shot.spin_axis_deg,
-        direction_deg=shot.direction_deg,
-        air_density=STANDARD_AIR_DENSITY,
-        headwind_mps=0,
-        crosswind_mps=0,
-    )
+    return calculate_impact_breakdown_batch(
+        [(shot, conditions)], api_type, engine, integrator, quality, parts
+    )[0]
+
+
+def calculate_impact_breakdown_batch(
+    items: Sequence[Tuple[ShotData, WeatherConditions]],
+    api_type: str = "professional",
+    engine: Optional[str] = None,
+    integrator: Optional[str] = None,
+    quality: Optional[str] = None,
+    parts: Optional[Collection[str]] = None,
+) -> List[Dict]:
+    """
+    Calculate impact breakdowns for many (shot, conditions) pairs at once.
 
-    # Calculate temperature/humidity/pressure density effect (without altitude)
-    # Altitude effect is applied separately using empirical formula
-    temp_humid_pressure_density = calculate_air_density(
-        conditions.temperature_f,
-        0,  # Sea level - altitude handled separately
-        conditions.humidity_pct,
-        conditions.pressure_inhg,  # Use actual pressure for density calculation
-    )
-    headwind, crosswind = calculate_wind_components(
-        conditions.wind_speed_mph, conditions.wind_direction_deg
-    )
+    With the fused engine every sub-simulation of every pair is integrated in
+    a single calculate_trajectory_batch() call.
+
+    Args:
+        items: Sequence of (shot, conditions) pairs
+        api_type: "professional" or "gaming" (see calculate_impact_breakdown)
+        engine: "fused" or "sequential" (defaults to settings.PHYSICS_ENGINE)
+        integrator: Integration mode (defaults to settings.PHYSICS_INTEGRATOR)
+        quality: Tolerance profile (defaults per api_type from settings)
+        parts: Optional parts to compute (see calculate_impact_breakdown)
+
+    Returns:
+        List of calculate_impact_breakdown() result dictionaries in input order
+    """
+    engine = engine or settings.PHYSICS_ENGINE
+    if engine not in PHYSICS_ENGINES:
+        raise ValueError(
+            f"Unknown physics engine '{engine}'. Valid engines: {', '.join(PHYSICS_ENGINES)}"
+        )
+    if parts is not None:
+        parts = frozenset(parts)
+        unknown = parts.difference(BREAKDOWN_PARTS)
+        if unknown:
+            raise ValueError(
+                f"Unknown breakdown parts: {', '.join(sorted(unknown))}. "
+                f"Valid parts: {', '.join(BREAKDOWN_PARTS)}"
+            )
+    integrator = integrator or settings.PHYSICS_INTEGRATOR
+    quality = quality or get_default_quality(api_type)
+
+    shots = [shot for shot, _ in items]
+    variants = []
+    records = []
+    for _, conditions in items:
+        shot_variants, record = _select_variants(conditions, api_type, parts)
+        variants.append(shot_variants)
+        records.append(record)
+    if settings.PHYSICS_MEMO_ENABLED:
+        simulated = _simulate_variants_memoized(
+            shots, variants, records, engine, integrator, quality
+        )
+    else:
+        simulated = _simulate_variants(shots, variants, records, engine, integrator, quality)
+
+    breakdowns = []
+    for (_, conditions), results in zip(items, simulated):
+        breakdown = _assemble_impact_breakdown(conditions, api_type, results, parts)
+        breakdown["integration"] = {
+            "integrator": integrator,
+            "quality": quality,
+            "steps": sum(result["integration_steps"] for result in results.values()),
+        }
+        breakdowns.append(breakdown)
+    return breakdowns
+
+
+def _simulate_variants(
+    shots: Sequence[ShotData],
+    variants: Sequence[Dict[str, Tuple[float, float, float]]],
+    records: Sequence[Collection[str]],
+    engine: str,
+    integrator: str,
+    quality: str,
+) -> List[Dict[str, Dict]]:
+    """
+    Run the requested variants of each shot with the chosen engine.
+
+    records names, per shot, the variants whose trajectory points are needed
+    (the sequential engine always records them).
+    """
+    if engine == "fused":
+        return _simulate_variants_fused(list(zip(shots, variants, records)), integrator, quality)
+    return [
+        _simulate_variants_sequential(shot, shot_variants, integrator, quality)
+        for shot, shot_variants in zip(shots, variants)
+    ]
+
+
+def _quantize(value: float, quantum: float) -> Tuple[int, float]:
+    """Snap value to a multiple of quantum. Returns (step count, snapped value)."""
+    steps = round(value / quantum)
+    return steps, round(steps * quantum, 10)
+
+
+def _get_memo_caches() -> Dict[str, LRUTTLCache]:
+    global _memo_caches
+    if _memo_caches is None:
+        _memo_caches = {
+            name: LRUTTLCache(
+                settings.PHYSICS_MEMO_MAX_ENTRIES,
+                settings.PHYSICS_MEMO_TTL_SECONDS,
+                name=name,
+            )
+            for name in BREAKDOWN_VARIANTS
+        }
+    return _memo_caches
+
+
+def _simulate_variants_memoized(
+    shots: Sequence[ShotData],
+    variants: Sequence[Dict[str, Tuple[float, float, float]]],
+    records: Sequence[Collection[str]],
+    engine: str,
+    integrator: str,
+    quality: str,
+) -> List[Dict[str, Dict]]:
+    """
+    Serve sub-simulations from the per-component memo, simulating only misses.
+
+    Each component is keyed on exactly the inputs it depends on: the
+    baseline on the shot alone, the temperature variant on the shot plus
+    the temperature's air density, and so on. A repeated shot under a
+    changed sky therefore only recomputes the components that changed.
+    Entries simulated without trajectory points are misses for requests
+    that need them.
+    """
+    caches = _get_memo_caches()
+    simulated: List[Dict[str, Dict]] = []
+    pending_shots: List[ShotData] = []
+    pending_variants: List[Dict[str, Tuple[float, float, float]]] = []
+    pending_records: List[Collection[str]] = []
+    pending_keys: List[Dict[str, Tuple]] = []
+    pending_index: List[int] = []
+
+    for i, (shot, shot_variants, record) in enumerate(zip(shots, variants, records)):
+        shot_key = []
+        shot_update = {}
+        for field, quantum in MEMO_SHOT_QUANTA.items():
+            steps, value = _quantize(getattr(shot, field), quantum)
+            shot_key.append(steps)
+            shot_update[field] = value
+        shot_key = tuple(shot_key)
+
+        results = {}
+        missing = {}
+        missing_keys = {}
+        for name, (air_density, headwind, crosswind) in shot_variants.items():
+            density_steps, air_density = _quantize(air_density, MEMO_DENSITY_QUANTUM)
+            headwind_steps, headwind = _quantize(headwind, MEMO_WIND_QUANTUM)
+            crosswind_steps, crosswind = _quantize(crosswind, MEMO_WIND_QUANTUM)
+            key = (
+                engine,
+                integrator,
+                quality,
+                shot_key,
+                density_steps,
+                headwind_steps,
+                crosswind_steps,
+            )
+            cached = caches[name].get(key)
+            if cached is not None and (name not in record or cached["trajectory_points"]):
+                results[name] = dict(cached)
+            else:
+                missing[name] = (air_density, headwind, crosswind)
+                missing_keys[name] = key
+
+        simulated.append(results)
+        if missing:
+            pending_shots.append(shot.model_copy(update=shot_update))
+            pending_variants.append(missing)
+            pending_records.append(record)
+            pending_keys.append(missing_keys)
+            pending_index.append(i)
+
+    if pending_shots:
+        computed = _simulate_variants(
+            pending_shots, pending_variants, pending_records, engine, integrator, quality
+        )
+        for i, keys, results in zip(pending_index, pending_keys, computed):
+            for name, result in results.items():
+                caches[name].set(keys[name], result)
+                simulated[i][name] = dict(result)
+
+    return simulated
+
+
+def get_breakdown_memo_stats() -> Dict:
+    """Hit/miss counters of the breakdown sub-simulation memo, per component."""
+    return {
+        "enabled": settings.PHYSICS_MEMO_ENABLED,
+        "components": {name: cache.stats() for name, cache in _get_memo_caches().items()},
+    }
+
+
+def clear_breakdown_memo() -> None:
+    """Drop all memoized sub-simulations and reset counters."""
+    for cache in _get_memo_caches().values():
+        cache.clear()
 
-    # Calculate trajectory for shape/visualization (physics-based)
-    physics_adjusted = calculate_trajectory(
-        ball_speed_mph=shot.ball_speed_mph,
-        launch_angle_deg=shot.launch_angle_deg,
-        spin_rate_rpm=shot.spin_rate_rpm,
-        spin_axis_deg=shot.spin_axis_deg,
-        direction_deg=shot.direction_deg,
-        air_density=temp_humid_pressure_density,
-        headwind_mps=headwind,
-        crosswind_mps=crosswind,
+
+def get_default_quality(api_type: str) -> str:
+    """Tolerance profile configured for an api_type ("professional" or "gaming")."""
+    if api_type == "gaming":
+        return settings.PHYSICS_QUALITY_GAMING
+    return settings.PHYSICS_QUALITY_PROFESSIONAL
+
+
+def get_engine_fingerprint(api_type: str) -> str:
+    """
+    Identify everything besides the inputs that determines a breakdown result.
+
+    Covers the engine version, engine/integrator/quality selection, memo
+    quantization and the loaded lookup table, so cached results from another
+    configuration are never reused.
+    """
+    table = get_trajectory_table()
+    table_id = (
+        f"{table.metadata.get('built_at')}@{settings.TRAJECTORY_TABLE_MAX_ERROR_YARDS}"
+        if table is not None else "none"
     )
+    return "|".join((
+        PHYSICS_ENGINE_VERSION,
+        settings.PHYSICS_ENGINE,
+        settings.PHYSICS_INTEGRATOR,
+        get_default_quality(api_type),
+        f"memo={int(settings.PHYSICS_MEMO_ENABLED)}",
+        f"table={table_id}",
+    ))
+
 
-    # Calculate no-wind carry for reference
-    no_wind_carry = calculate_trajectory(
-        ball_speed_mph=shot.ball_speed_mph,
-        launch_angle_deg=shot.launch_angle_deg,
-        spin_rate_rpm=shot.spin_rate_rpm,
-        spin_axis_deg=shot.spin_axis_deg,
-        direction_deg=shot.direction_deg,
-        air_density=temp_humid_pressure_density,
-        headwind_mps=0,
-        crosswind_mps=0,
-    )["carry_yards"]
+def _assemble_impact_breakdown(
+    conditions: WeatherConditions,
+    api_type: str,
+    results: Dict[str, Dict],
+    parts: Optional[FrozenSet[str]] = None,
+) -> Dict:
+    """
+    Combine the simulated variants into the impact breakdown result.
+
+    Args:
+        conditions: Weather conditions
+        api_type: "professional" or "gaming"
+        results: Trajectory result per variant name (see BREAKDOWN_VARIANTS;
+            only those _select_variants() picked for parts)
+        parts: Selected BREAKDOWN_PARTS (None for everything)
+
+    Returns:
+        The calculate_impact_breakdown() result dictionary
+    """
+    baseline_result = results.get("baseline")
+    physics_adjusted = results["adjusted"]
+    no_wind_carry = results["no_wind"]["carry_yards"]
 
     # Apply empirical altitude effect
     # Industry benchmark: ~1.2% distance gain per 1,000 ft altitude
@@ -559,8 +1415,11 @@ def calculate_impact_breakdown(
     if api_type == "professional":
         # Professional API: Use empirical wind formula (TrackMan benchmarks)
         # This ensures accurate wind effects matching industry data
+        # The baseline is not simulated in calm air unless selected; the
+        # empirical effect is zero whatever its carry
+        baseline_carry = baseline_result["carry_yards"] if baseline_result is not None else 0.0
         empirical_effect, empirical_lateral = calculate_empirical_wind_effect(
-            baseline_result["carry_yards"],
+            baseline_carry,
             conditions.wind_speed_mph,
             conditions.wind_direction_deg,
         )
@@ -608,57 +1467,45 @@ def calculate_impact_breakdown(
     adjusted_result["total_yards"] = round(adjusted_carry * (physics_adjusted["total_yards"] / physics_adjusted["carry_yards"]) if physics_adjusted["carry_yards"] > 0 else adjusted_carry * 1.15, 1)
     adjusted_result["lateral_drift_yards"] = round(wind_lateral_drift, 1)
 
-    # Wind effect for breakdown
-    wind_effect = wind_distance_effect
-    wind_lateral = wind_lateral_drift
-
-    # Isolate temperature effect only
-    temp_density = calculate_air_density(conditions.temperature_f, 0, 50, 29.92)
-    temp_result = calculate_trajectory(
-        ball_speed_mph=shot.ball_speed_mph,
-        launch_angle_deg=shot.launch_angle_deg,
-        spin_rate_rpm=shot.spin_rate_rpm,
-        spin_axis_deg=shot.spin_axis_deg,
-        direction_deg=shot.direction_deg,
-        air_density=temp_density,
-        headwind_mps=0,
-        crosswind_mps=0,
-    )
-    temp_effect = temp_result["carry_yards"] - baseline_result["carry_yards"]
+    include_baseline = parts is None or "baseline" in parts
+    include_breakdown = parts is None or "impact_breakdown" in parts
 
-    # Isolate altitude effect using empirical formula
-    # Industry benchmark: ~1.2% distance gain per 1,000 ft altitude
-    # This matches TrackMan, Titleist, and USGA published data
-    alt_effect = baseline_result["carry_yards"] * (conditions.altitude_ft / 1000) * ALTITUDE_GAIN_PER_1000FT
-
-    # Isolate humidity effect only (typically minimal)
-    humid_density = calculate_air_density(70, 0, conditions.humidity_pct, 29.92)
-    humid_result = calculate_trajectory(
-        ball_speed_mph=shot.ball_speed_mph,
-        launch_angle_deg=shot.launch_angle_deg,
-        spin_rate_rpm=shot.spin_rate_rpm,
-        spin_axis_deg=shot.spin_axis_deg,
-        direction_deg=shot.direction_deg,
-        air_density=humid_density,
-        headwind_mps=0,
-        crosswind_mps=0,
-    )
-    humid_effect = humid_result["carry_yards"] - baseline_result["carry_yards"]
+    breakdown = {}
+    if include_baseline:
+        breakdown["baseline"] = baseline_result
+    breakdown["adjusted"] = adjusted_result
 
-    # Total adjustment
-    total_adjustment = adjusted_result["carry_yards"] - baseline_result["carry_yards"]
+    if include_breakdown:
+        # Wind effect for breakdown
+        wind_effect = wind_distance_effect
+        wind_lateral = wind_lateral_drift
 
-    return {
-        "baseline": baseline_result,
-        "adjusted": adjusted_result,
-        "impact_breakdown": {
+        # Isolate temperature effect only
+        temp_result = results["temperature"]
+        temp_effect = temp_result["carry_yards"] - baseline_result["carry_yards"]
+
+        # Isolate altitude effect using empirical formula
+        # Industry benchmark: ~1.2% distance gain per 1,000 ft altitude
+        # This matches TrackMan, Titleist, and USGA published data
+        alt_effect = baseline_result["carry_yards"] * (conditions.altitude_ft / 1000) * ALTITUDE_GAIN_PER_1000FT
+
+        # Isolate humidity effect only (typically minimal)
+        humid_result = results["humidity"]
+        humid_effect = humid_result["carry_yards"] - baseline_result["carry_yards"]
+
+        # Total adjustment
+        total_adjustment = adjusted_result["carry_yards"] - baseline_result["carry_yards"]
+
+        breakdown["impact_breakdown"] = {
             "wind_effect_yards": round(wind_effect, 1),
             "wind_lateral_yards": round(wind_lateral, 1),
             "temperature_effect_yards": round(temp_effect, 1),
             "altitude_effect_yards": round(alt_effect, 1),
             "humidity_effect_yards": round(humid_effect, 1),
             "total_adjustment_yards": round(total_adjustment, 1),
-        },
-        "equivalent_calm_distance_yards": baseline_result["carry_yards"],
-        "api_type": api_type,
-    }
+        }
+
+    if include_baseline:
+        breakdown["equivalent_calm_distance_yards"] = baseline_result["carry_yards"]
+    breakdown["api_type"] = api_type
+    return breakdown
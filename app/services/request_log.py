@@ -0,0 +1,184 @@
+"""
+Buffered Request Log Writer
+
+Requests append a compact row to an in-memory buffer; a background task
+writes the buffer to admin_request_logs with COPY every
+REQUEST_LOG_BATCH_SIZE rows or REQUEST_LOG_FLUSH_INTERVAL_MS, whichever
+comes first. No database round trip happens on the request path.
+
+The buffer is bounded (REQUEST_LOG_QUEUE_SIZE): when the database cannot
+keep up, new rows are dropped and counted rather than growing memory or
+slowing requests down. Pending rows are written on shutdown.
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.database import get_db_workload
+from app.middleware.logging_config import logger
+
+REQUEST_LOG_COLUMNS = (
+    "api_key_id",
+    "client_name",
+    "endpoint",
+    "method",
+    "status_code",
+    "latency_ms",
+    "request_ip",
+    "user_agent",
+    "created_at",
+)
+
+
+class RequestLogWriter:
+    """
+    Bounded buffer of admin_request_logs rows with a batching writer task.
+
+    Args:
+        max_queue: Rows buffered before new rows are dropped
+        batch_size: Rows per COPY (and the fill level that triggers a flush)
+        flush_interval_ms: Longest a row waits before being written
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval_ms: int):
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self._buffer: deque = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._closing = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    def enqueue(
+        self,
+        api_key_id: Optional[int],
+        client_name: Optional[str],
+        endpoint: str,
+        method: str,
+        status_code: int,
+        latency_ms: float,
+        request_ip: Optional[str],
+        user_agent: str,
+    ) -> bool:
+        """Buffer one row (must be called on the event loop). False if dropped."""
+        if len(self._buffer) >= self.max_queue:
+            self.dropped += 1
+            return False
+        self._buffer.append((
+            api_key_id,
+            client_name,
+            endpoint,
+            method,
+            status_code,
+            latency_ms,
+            request_ip,
+            user_agent,
+            datetime.now(timezone.utc),
+        ))
+        self.enqueued += 1
+
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._batch_ready = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        elif len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def _run(self) -> None:
+        # Runs while there is something to write; enqueue() restarts it
+        while self._buffer:
+            if len(self._buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    # Interval elapsed: write the partial batch too
+                    await self.flush()
+                    continue
+            self._batch_ready.clear()
+            if self._closing:
+                await self.flush()
+                return
+            while len(self._buffer) >= self.batch_size:
+                await self._write(self._take(self.batch_size))
+
+    def _take(self, n: int) -> list:
+        return [self._buffer.popleft() for _ in range(min(n, len(self._buffer)))]
+
+    async def flush(self) -> None:
+        """Write every buffered row, batch_size rows per COPY."""
+        while self._buffer:
+            await self._write(self._take(self.batch_size))
+
+    async def _write(self, rows: list) -> None:
+        try:
+            pool = await get_db_workload("logging")
+            if not pool:
+                return
+            async with pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    "admin_request_logs", records=rows, columns=REQUEST_LOG_COLUMNS
+                )
+        except Exception as e:
+            self.write_errors += 1
+            self.dropped += len(rows)
+            logger.warning(f"Failed to write request logs: {str(e)}")
+            return
+        self.batches += 1
+        self.written += len(rows)
+
+    async def close(self) -> None:
+        """Wake the writer, let it drain the buffer, then write any stragglers."""
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._closing = True
+            self._batch_ready.set()
+            try:
+                await task
+            except Exception:
+                pass
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "queued": len(self._buffer),
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+        }
+
+
+# Writer instance (created lazily)
+_request_log_writer: Optional[RequestLogWriter] = None
+
+
+def get_request_log_writer() -> RequestLogWriter:
+    """Get the request log writer, creating it from settings on first use."""
+    global _request_log_writer
+
+    if _request_log_writer is None:
+        _request_log_writer = RequestLogWriter(
+            settings.REQUEST_LOG_QUEUE_SIZE,
+            settings.REQUEST_LOG_BATCH_SIZE,
+            settings.REQUEST_LOG_FLUSH_INTERVAL_MS,
+        )
+    return _request_log_writer
+
+
+async def close_request_log_writer() -> None:
+    """Write pending request logs (called on shutdown)."""
+    if _request_log_writer is not None:
+        await _request_log_writer.close()
@@ -0,0 +1,244 @@
+"""
+Content-Addressed Result Cache
+
+Requests with conditions_override or a gaming preset are pure functions of
+their input. Their results are cached under a SHA-256 of the canonical
+request (shot, conditions, api_type, units, endpoint) plus the physics
+engine fingerprint, so a calibration or configuration change never serves
+stale numbers.
+
+Two levels:
+- L1: in-process LRU with TTL (per worker)
+- L2: Redis, shared by all instances (skipped if Redis is not configured)
+
+Values are stored as encoded JSON bytes. The same digest is the ETag, so a
+client that already holds the result can get a 304 without any lookup.
+"""
+
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.responses import Response
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.utils.cache import LRUTTLCache
+from app.utils.serialization import dumps_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# Bump when the key format or stored value layout changes
+RESULT_CACHE_FORMAT = 1
+
+REDIS_KEY_PREFIX = "resultcache"
+
+# Floats are rounded before hashing so 150 and 150.0000000001 share a key
+_KEY_FLOAT_DIGITS = 6
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form of a key part: sorted dicts, rounded floats, no -0.0."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float):
+        return round(value, _KEY_FLOAT_DIGITS) + 0.0
+    if hasattr(value, "model_dump"):
+        return _normalize(value.model_dump())
+    return value
+
+
+def result_cache_key(namespace: str, fingerprint: str, **parts: Any) -> str:
+    """
+    SHA-256 hex digest identifying a deterministic result.
+
+    Args:
+        namespace: Endpoint/result kind (different shapes never collide)
+        fingerprint: Engine fingerprint (see get_engine_fingerprint)
+        **parts: Inputs (pydantic models, dicts or scalars)
+    """
+    canonical = {
+        "format": RESULT_CACHE_FORMAT,
+        "namespace": namespace,
+        "engine": fingerprint,
+        "parts": _normalize(parts),
+    }
+    return hashlib.sha256(dumps_json(canonical)).hexdigest()
+
+
+def etag_for(key: str, weak: bool = False) -> str:
+    """ETag header value for a cache key (weak if the body varies per response)."""
+    tag = f'"{key[:32]}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode a cached value."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResultCache:
+    """
+    L1 (in-process) + L2 (Redis) byte cache.
+
+    Redis failures are logged and treated as misses; the cache never fails
+    a request.
+    """
+
+    def __init__(self, l1_max_entries: int, ttl_seconds: int, max_value_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_value_bytes = max_value_bytes
+        self.l1 = LRUTTLCache(
+            l1_max_entries,
+            ttl_seconds=min(ttl_seconds, settings.RESULT_CACHE_L1_TTL_SECONDS),
+            name="result_cache_l1",
+        )
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self.oversized = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for key, promoting Redis hits into L1."""
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            cached = await redis_client.get(f"{REDIS_KEY_PREFIX}:{key}")
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Result cache read failed", error=str(e))
+            return None
+
+        if cached is None:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        value = cached.encode("utf-8") if isinstance(cached, str) else cached
+        self.l1.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Store bytes under key in both levels (oversized values are skipped)."""
+        if len(value) > self.max_value_bytes:
+            self.oversized += 1
+            return
+        self.l1.set(key, value)
+
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.set(
+                f"{REDIS_KEY_PREFIX}:{key}", value.decode("utf-8"), ex=self.ttl_seconds
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Result cache write failed", error=str(e))
+
+    def clear(self) -> None:
+        """Drop L1 entries and reset counters (Redis entries expire on their own)."""
+        self.l1.clear()
+        self.redis_hits = self.redis_misses = self.redis_errors = self.oversized = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "enabled": settings.RESULT_CACHE_ENABLED,
+            "ttl_seconds": self.ttl_seconds,
+            "l1": self.l1.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "redis_errors": self.redis_errors,
+            "oversized": self.oversized,
+        }
+
+
+# Cache instance (created lazily)
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the result cache, creating it from settings on first use."""
+    global _result_cache
+
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            settings.RESULT_CACHE_L1_MAX_ENTRIES,
+            settings.RESULT_CACHE_TTL_SECONDS,
+            settings.RESULT_CACHE_MAX_VALUE_BYTES,
+        )
+    return _result_cache
+
+
+async def cached_response(key: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """
+    Answer a deterministic request from the cache if possible.
+
+    Returns a 304 if the client already holds this result, the cached body
+    on a hit, or None (compute, then call store_response()).
+    """
+    etag = etag_for(key)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    body = await get_result_cache().get(key)
+    if body is None:
+        return None
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "X-Cache": "HIT"},
+    )
+
+
+async def store_response(key: str, body: bytes) -> Response:
+    """Cache a freshly computed JSON body and return it with its ETag."""
+    await get_result_cache().set(key, body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag_for(key), "X-Cache": "MISS"},
+    )
+
+
+async def cached_value(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached JSON value for key, computing and storing it on a miss."""
+    cache = get_result_cache()
+    data = await cache.get(key)
+    if data is not None:
+        return loads_json(data)
+    value = await compute()
+    await cache.set(key, dumps_json(value))
+    return value
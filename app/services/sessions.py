@@ -0,0 +1,117 @@
+"""
+Shot Session Tracking
+
+Per-connection state and counters for the /api/v1/sessions/ws channel.
+Sessions register on connect and unregister on disconnect; admin metrics
+report the live ones plus process-wide totals.
+"""
+
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Latency samples kept per session for percentile reporting
+LATENCY_WINDOW = 256
+
+
+class ShotSession:
+    """
+    One connected launch-monitor bay.
+
+    Args:
+        client_id: Authenticated client name
+        max_pending: Shots allowed to queue before the socket stops being read
+    """
+
+    def __init__(self, client_id: str, max_pending: int):
+        self.id = str(uuid.uuid4())
+        self.client_id = client_id
+        self.max_pending = max_pending
+        self.connected_at = time.time()
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.conditions_source: Optional[str] = None
+
+        self.shots_received = 0
+        self.results_sent = 0
+        self.errors = 0
+        self.pending = 0
+        self.peak_pending = 0
+        self.batches = 0
+        self._latencies_ms: deque = deque(maxlen=LATENCY_WINDOW)
+        self._latency_max_ms = 0.0
+
+    def shot_queued(self) -> None:
+        """Count a shot accepted into the queue."""
+        self.shots_received += 1
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+
+    def shot_done(self, received_at: float, ok: bool) -> None:
+        """Count a shot answered (result or error), timed from receipt."""
+        self.pending -= 1
+        if ok:
+            self.results_sent += 1
+        else:
+            self.errors += 1
+        latency_ms = (time.perf_counter() - received_at) * 1000
+        self._latencies_ms.append(latency_ms)
+        self._latency_max_ms = max(self._latency_max_ms, latency_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints and the client's stats message."""
+        latencies = sorted(self._latencies_ms)
+        metadata = self.metadata or {}
+        return {
+            "session_id": self.id,
+            "client_id": self.client_id,
+            "facility_id": metadata.get("facility_id"),
+            "bay_number": metadata.get("bay_number"),
+            "client_session_id": metadata.get("session_id"),
+            "conditions_source": self.conditions_source,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            "shots_received": self.shots_received,
+            "results_sent": self.results_sent,
+            "errors": self.errors,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "max_pending": self.max_pending,
+            "batches": self.batches,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+                "max": round(self._latency_max_ms, 2),
+            },
+        }
+
+
+# Live sessions by ID, plus totals for sessions that have closed
+_sessions: Dict[str, ShotSession] = {}
+_totals = {"opened": 0, "closed": 0, "shots": 0, "errors": 0}
+
+
+def register_session(session: ShotSession) -> None:
+    """Track a newly connected session."""
+    _sessions[session.id] = session
+    _totals["opened"] += 1
+
+
+def unregister_session(session: ShotSession) -> None:
+    """Stop tracking a session and fold its counters into the totals."""
+    if _sessions.pop(session.id, None) is not None:
+        _totals["closed"] += 1
+        _totals["shots"] += session.shots_received
+        _totals["errors"] += session.errors
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """Live sessions and process-wide totals for metrics endpoints."""
+    live = [session.stats() for session in _sessions.values()]
+    return {
+        "active": len(live),
+        "opened": _totals["opened"],
+        "closed": _totals["closed"],
+        "shots": _totals["shots"] + sum(s["shots_received"] for s in live),
+        "errors": _totals["errors"] + sum(s["errors"] for s in live),
+        "sessions": live,
+    }
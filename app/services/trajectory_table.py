@@ -0,0 +1,395 @@
+"""
+Precomputed Trajectory Lookup Table
+
+An offline-built N-dimensional grid of calculate_trajectory() outputs
+(carry, total, lateral drift, apex, flight time, landing angle) answered by
+multilinear interpolation.
+
+The table is built with scripts/build_trajectory_table.py, which also
+measures the interpolation error at the midpoint of every grid cell. At
+lookup time a query falls back to full simulation (lookup returns None)
+when it lies outside the grid or inside a cell whose measured error exceeds
+the configured threshold.
+
+Axes with a single grid value are fixed: queries must match that value
+exactly (e.g. direction_deg = 0 in the default build).
+"""
+
+import json
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.middleware.logging_config import logger
+
+# Bump when the file layout or the physics behind it changes; tables built
+# with another version are ignored at load time.
+TABLE_FORMAT_VERSION = 1
+
+# Input axes in calculate_trajectory() argument order
+TABLE_AXES = (
+    "ball_speed_mph",
+    "launch_angle_deg",
+    "spin_rate_rpm",
+    "spin_axis_deg",
+    "direction_deg",
+    "air_density",
+    "headwind_mps",
+    "crosswind_mps",
+)
+
+# Interpolated outputs (keys of the calculate_trajectory() result)
+TABLE_OUTPUTS = (
+    "carry_yards",
+    "total_yards",
+    "lateral_drift_yards",
+    "apex_height_yards",
+    "flight_time_seconds",
+    "landing_angle_deg",
+)
+
+# Distance outputs used for the per-cell error threshold
+DISTANCE_OUTPUTS = ("carry_yards", "total_yards", "lateral_drift_yards", "apex_height_yards")
+
+# Default build grid, covering the bulk of real launch monitor traffic.
+# Carry is most curved along headwind, spin axis and launch angle, so those
+# axes get the finest spacing.
+DEFAULT_GRID: Dict[str, Sequence[float]] = {
+    "ball_speed_mph": np.arange(70, 191, 10),
+    "launch_angle_deg": np.arange(6, 31, 2),
+    "spin_rate_rpm": np.arange(1500, 9501, 1000),
+    "spin_axis_deg": np.arange(-30, 31, 7.5),
+    "direction_deg": [0.0],
+    "air_density": [0.95, 1.125, 1.30],
+    "headwind_mps": np.arange(-15, 15.1, 2.5),
+    "crosswind_mps": [-10.0, 0.0, 10.0],
+}
+
+
+class TrajectoryTable:
+    """
+    Multilinear interpolation over a precomputed trajectory grid.
+
+    Attributes:
+        axes: Grid values per input axis (TABLE_AXES order)
+        values: Outputs at every grid point, shape grid + (len(TABLE_OUTPUTS),)
+        cell_error: Max distance-output interpolation error (yards) measured
+            at each cell midpoint, shape (len(axis) - 1 for interpolated axes)
+        metadata: Build information (format version, creation time, grid)
+    """
+
+    def __init__(
+        self,
+        axes: Sequence[np.ndarray],
+        values: np.ndarray,
+        cell_error: np.ndarray,
+        metadata: Optional[Dict] = None,
+    ):
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        self.metadata = metadata or {}
+
+        # Single-value axes are fixed; drop them from the interpolation grid
+        self.fixed = {
+            i: float(axis[0]) for i, axis in enumerate(self.axes) if axis.size == 1
+        }
+        self.interp_dims = [i for i, axis in enumerate(self.axes) if axis.size > 1]
+        # float32 keeps the full grid compact; outputs are reported to 0.1 yard
+        self.values = np.asarray(values, dtype=np.float32).reshape(
+            [self.axes[i].size for i in self.interp_dims] + [len(TABLE_OUTPUTS)]
+        )
+        self.cell_error = np.asarray(cell_error, dtype=np.float32)
+
+        # Corner offsets of a cell: (dims, 2**dims) array of 0/1
+        dims = len(self.interp_dims)
+        self._corners = np.indices((2,) * dims).reshape(dims, -1)
+
+        # Plain-list copies of the interpolated axes for the scalar lookup path
+        self._axis_lists = [self.axes[i].tolist() for i in self.interp_dims]
+
+    def interpolate(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolate outputs for many query points at once.
+
+        Args:
+            points: Array of shape (N, len(TABLE_AXES))
+
+        Returns:
+            Tuple of (outputs, valid): outputs has shape (N, len(TABLE_OUTPUTS));
+            valid is False for points outside the grid or off a fixed axis
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        valid = np.ones(points.shape[0], dtype=bool)
+        for i, value in self.fixed.items():
+            valid &= points[:, i] == value
+
+        base = np.empty((points.shape[0], len(self.interp_dims)), dtype=np.intp)
+        frac = np.empty((points.shape[0], len(self.interp_dims)))
+        for k, i in enumerate(self.interp_dims):
+            axis = self.axes[i]
+            column = points[:, i]
+            valid &= (column >= axis[0]) & (column <= axis[-1])
+            cell = np.clip(np.searchsorted(axis, column, side="right") - 1, 0, axis.size - 2)
+            base[:, k] = cell
+            frac[:, k] = (column - axis[cell]) / (axis[cell + 1] - axis[cell])
+        np.clip(frac, 0.0, 1.0, out=frac)
+
+        # Gather all 2**dims cell corners in one indexing operation, then
+        # weight each by the product of its per-axis fractions
+        index = base[:, :, None] + self._corners[None]
+        corners = self.values[tuple(index[:, k, :] for k in range(index.shape[1]))]
+        weights = np.where(self._corners.T[None] == 1, frac[:, None, :], 1 - frac[:, None, :]).prod(
+            axis=2
+        )
+        outputs = np.einsum("nc,nco->no", weights, corners)
+
+        return outputs, valid
+
+    def cell_errors(self, points: np.ndarray) -> np.ndarray:
+        """Measured midpoint error (yards) of the cells containing each point."""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        cells = []
+        for i in self.interp_dims:
+            axis = self.axes[i]
+            cells.append(
+                np.clip(np.searchsorted(axis, points[:, i], side="right") - 1, 0, axis.size - 2)
+            )
+        return self.cell_error[tuple(cells)]
+
+    def lookup_many(
+        self, points: np.ndarray, max_error_yards: Optional[float] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Interpolate trajectory summaries for many query points.
+
+        Args:
+            points: Array of shape (N, len(TABLE_AXES)) in calculate_trajectory()
+                argument order
+            max_error_yards: Reject cells whose measured error exceeds this
+                (defaults to settings.TRAJECTORY_TABLE_MAX_ERROR_YARDS)
+
+        Returns:
+            One entry per point: a dictionary with the calculate_trajectory()
+            keys (empty trajectory_points, zero integration_steps), or None if
+            that point must fall back to full simulation
+        """
+        if max_error_yards is None:
+            max_error_yards = settings.TRAJECTORY_TABLE_MAX_ERROR_YARDS
+
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        outputs, valid = self.interpolate(points)
+        valid &= self.cell_errors(points) <= max_error_yards
+
+        results: List[Optional[Dict]] = []
+        for row, ok in zip(outputs.tolist(), valid.tolist()):
+            if not ok:
+                results.append(None)
+                continue
+            result = {
+                name: round(value, 2 if name == "flight_time_seconds" else 1)
+                for name, value in zip(TABLE_OUTPUTS, row)
+            }
+            result["trajectory_points"] = []
+            result["integration_steps"] = 0
+            results.append(result)
+        return results
+
+    def lookup(
+        self,
+        ball_speed_mph: float,
+        launch_angle_deg: float,
+        spin_rate_rpm: float,
+        spin_axis_deg: float,
+        direction_deg: float,
+        air_density: float,
+        headwind_mps: float,
+        crosswind_mps: float,
+        max_error_yards: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """
+        Interpolate a single trajectory summary (see lookup_many).
+
+        Uses a scalar path that contracts the 2**dims cell block one axis at
+        a time, which avoids the gather overhead of the batch path.
+        """
+        point = (
+            ball_speed_mph,
+            launch_angle_deg,
+            spin_rate_rpm,
+            spin_axis_deg,
+            direction_deg,
+            air_density,
+            headwind_mps,
+            crosswind_mps,
+        )
+        for i, value in self.fixed.items():
+            if point[i] != value:
+                return None
+
+        cells = []
+        fractions = []
+        for i, axis in zip(self.interp_dims, self._axis_lists):
+            value = point[i]
+            if not axis[0] <= value <= axis[-1]:
+                return None
+            cell = min(bisect_right(axis, value) - 1, len(axis) - 2)
+            cells.append(cell)
+            fractions.append((value - axis[cell]) / (axis[cell + 1] - axis[cell]))
+
+        if max_error_yards is None:
+            max_error_yards = settings.TRAJECTORY_TABLE_MAX_ERROR_YARDS
+        if self.cell_error[tuple(cells)] > max_error_yards:
+            return None
+
+        block = self.values[tuple(slice(cell, cell + 2) for cell in cells)]
+        for fraction in fractions:
+            block = block[0] + fraction * (block[1] - block[0])
+
+        result = {
+            name: round(value, 2 if name == "flight_time_seconds" else 1)
+            for name, value in zip(TABLE_OUTPUTS, block.tolist())
+        }
+        result["trajectory_points"] = []
+        result["integration_steps"] = 0
+        return result
+
+    def save(self, path: str) -> None:
+        """Write the table to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            format_version=np.array(TABLE_FORMAT_VERSION),
+            metadata=np.array(json.dumps(self.metadata)),
+            values=self.values,
+            cell_error=self.cell_error,
+            **{f"axis_{name}": axis for name, axis in zip(TABLE_AXES, self.axes)},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TrajectoryTable":
+        """
+        Read a table written by save().
+
+        Raises:
+            ValueError: If the file was built with another format version
+        """
+        with np.load(path) as data:
+            version = int(data["format_version"])
+            if version != TABLE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Trajectory table format {version} does not match "
+                    f"expected {TABLE_FORMAT_VERSION}; rebuild the table"
+                )
+            return cls(
+                axes=[data[f"axis_{name}"] for name in TABLE_AXES],
+                values=data["values"],
+                cell_error=data["cell_error"],
+                metadata=json.loads(str(data["metadata"])),
+            )
+
+
+def _simulate_grid(points: np.ndarray, chunk_size: int) -> np.ndarray:
+    """Run calculate_trajectory_batch() over (N, len(TABLE_AXES)) inputs."""
+    from app.services.physics import calculate_trajectory_batch
+
+    outputs = np.empty((points.shape[0], len(TABLE_OUTPUTS)))
+    for start in range(0, points.shape[0], chunk_size):
+        chunk = points[start:start + chunk_size]
+        results = calculate_trajectory_batch(*chunk.T, record_points=False)
+        outputs[start:start + chunk_size] = [
+            [result[name] for name in TABLE_OUTPUTS] for result in results
+        ]
+    return outputs
+
+
+def build_trajectory_table(
+    grid: Optional[Dict[str, Sequence[float]]] = None,
+    chunk_size: int = 20000,
+) -> Tuple[TrajectoryTable, np.ndarray]:
+    """
+    Simulate every grid point and measure interpolation error per cell.
+
+    Args:
+        grid: Grid values per axis name (defaults to DEFAULT_GRID)
+        chunk_size: Shots per calculate_trajectory_batch() call
+
+    Returns:
+        Tuple of (table, midpoint_errors) where midpoint_errors holds the
+        absolute error of every output at every cell midpoint, shape
+        cells + (len(TABLE_OUTPUTS),)
+    """
+    grid = grid or DEFAULT_GRID
+    axes = [np.unique(np.asarray(grid[name], dtype=np.float64)) for name in TABLE_AXES]
+
+    mesh = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(TABLE_AXES))
+    values = _simulate_grid(mesh, chunk_size)
+
+    # Interpolation is exact at grid points, so measure it at cell midpoints
+    midpoint_axes = [
+        (axis[:-1] + axis[1:]) / 2 if axis.size > 1 else axis for axis in axes
+    ]
+    midpoints = np.stack(np.meshgrid(*midpoint_axes, indexing="ij"), axis=-1).reshape(
+        -1, len(TABLE_AXES)
+    )
+    simulated = _simulate_grid(midpoints, chunk_size)
+
+    metadata = {
+        "format_version": TABLE_FORMAT_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "grid": {name: axis.tolist() for name, axis in zip(TABLE_AXES, axes)},
+    }
+    table = TrajectoryTable(axes, values, np.zeros(0), metadata)
+    errors = np.empty_like(simulated)
+    for start in range(0, midpoints.shape[0], chunk_size):
+        interpolated, _ = table.interpolate(midpoints[start:start + chunk_size])
+        errors[start:start + chunk_size] = np.abs(interpolated - simulated[start:start + chunk_size])
+
+    distance_columns = [TABLE_OUTPUTS.index(name) for name in DISTANCE_OUTPUTS]
+    interp_shape = tuple(axes[i].size - 1 for i in table.interp_dims)
+    table.cell_error = errors[:, distance_columns].max(axis=1).reshape(interp_shape)
+    table.metadata["max_error_yards"] = float(table.cell_error.max()) if errors.size else 0.0
+
+    return table, errors.reshape(interp_shape + (len(TABLE_OUTPUTS),))
+
+
+# Loaded table instance (loaded lazily or at startup)
+_trajectory_table: Optional[TrajectoryTable] = None
+_table_load_attempted = False
+
+
+def load_trajectory_table(path: Optional[str] = None) -> Optional[TrajectoryTable]:
+    """
+    Load the configured lookup table.
+
+    Returns None (and full simulation is used) when no table is configured or
+    the file cannot be loaded.
+    """
+    global _trajectory_table, _table_load_attempted
+
+    _table_load_attempted = True
+    path = path or settings.TRAJECTORY_TABLE_PATH
+    if not path:
+        _trajectory_table = None
+        return None
+
+    try:
+        _trajectory_table = TrajectoryTable.load(path)
+        logger.info(
+            "Trajectory table loaded",
+            path=path,
+            grid_points=int(np.prod(_trajectory_table.values.shape[:-1])),
+            max_error_yards=_trajectory_table.metadata.get("max_error_yards"),
+        )
+    except Exception as e:
+        logger.warning(f"Trajectory table not available: {str(e)}")
+        _trajectory_table = None
+
+    return _trajectory_table
+
+
+def get_trajectory_table() -> Optional[TrajectoryTable]:
+    """Get the lookup table, loading it on first use."""
+    if not _table_load_attempted:
+        load_trajectory_table()
+    return _trajectory_table
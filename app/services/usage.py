@@ -4,15 +4,185 @@ Usage Tracking Service
 Tracks API usage for billing and analytics.
 """
 
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.dialects.postgresql import insert
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
+from app.config import settings
+from app.middleware.logging_config import logger
 from app.models.database import APIUsage, RequestLog
 
 
+class UsageAggregator:
+    """
+    Per-process accumulator for api_usage and request_logs.
+
+    Requests add to in-memory totals per (client, endpoint, day); every
+    USAGE_FLUSH_SECONDS the deltas are upserted in one statement and the
+    buffered request logs inserted, in one transaction. A crash loses at
+    most one interval of counts; a failed write keeps the deltas (and up to
+    USAGE_MAX_PENDING_LOGS log rows) for the next flush.
+    """
+
+    def __init__(self, flush_seconds: float, max_pending_logs: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending_logs = max_pending_logs
+        # (client_id, endpoint, date) -> [request_count, error_count, total_latency_ms]
+        self._totals: Dict[Tuple[str, str, date], list] = {}
+        self._logs: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+
+        self.recorded = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.dropped_logs = 0
+
+    def record(
+        self,
+        client_id: str,
+        endpoint: str,
+        method: str,
+        status_code: int,
+        latency_ms: float,
+        request_id: str,
+    ) -> None:
+        """Count one request (must be called on the event loop)."""
+        totals = self._totals.setdefault((client_id, endpoint, date.today()), [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += 1 if status_code >= 400 else 0
+        totals[2] += latency_ms
+
+        if len(self._logs) < self.max_pending_logs:
+            self._logs.append({
+                "request_id": request_id,
+                "client_id": client_id,
+                "endpoint": endpoint,
+                "method": method,
+                "status_code": status_code,
+                "latency_ms": latency_ms,
+            })
+        else:
+            self.dropped_logs += 1
+        self.recorded += 1
+
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._closing = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        # Runs while there is something to write; record() restarts it
+        while self._totals or self._logs:
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+            if self._closing.is_set():
+                return
+
+    async def flush(self) -> None:
+        """Upsert accumulated totals and insert buffered request logs."""
+        from app.database import AsyncSessionLocal
+
+        if not self._totals and not self._logs:
+            return
+        totals, logs = self._totals, self._logs
+        self._totals, self._logs = {}, []
+        if AsyncSessionLocal is None:
+            return
+
+        try:
+            async with AsyncSessionLocal() as session:
+                if totals:
+                    stmt = insert(APIUsage).values([
+                        {
+                            "client_id": client_id,
+                            "endpoint": endpoint,
+                            "date": day,
+                            "request_count": count,
+                            "error_count": errors,
+                            "total_latency_ms": latency,
+                        }
+                        for (client_id, endpoint, day), (count, errors, latency) in totals.items()
+                    ])
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["client_id", "endpoint", "date"],
+                        set_={
+                            "request_count": APIUsage.request_count + stmt.excluded.request_count,
+                            "error_count": APIUsage.error_count + stmt.excluded.error_count,
+                            "total_latency_ms": APIUsage.total_latency_ms + stmt.excluded.total_latency_ms,
+                            "updated_at": datetime.utcnow(),
+                        },
+                    )
+                    await session.execute(stmt)
+                if logs:
+                    await session.execute(insert(RequestLog), logs)
+                await session.commit()
+        except Exception as e:
+            # Keep the counts for the next flush
+            self.flush_errors += 1
+            logger.warning(f"Failed to flush usage: {str(e)}")
+            for key, (count, errors, latency) in totals.items():
+                current = self._totals.setdefault(key, [0, 0, 0.0])
+                current[0] += count
+                current[1] += errors
+                current[2] += latency
+            room = max(0, self.max_pending_logs - len(self._logs))
+            self.dropped_logs += max(0, len(logs) - room)
+            self._logs[:0] = logs[:room]
+            return
+
+        self.flushes += 1
+
+    async def close(self) -> None:
+        """Let the flush task finish its last write, then write anything left."""
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._closing.set()
+            try:
+                await task
+            except Exception:
+                pass
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "recorded": self.recorded,
+            "pending_totals": len(self._totals),
+            "pending_logs": len(self._logs),
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "dropped_logs": self.dropped_logs,
+        }
+
+
+# Aggregator instance (created lazily)
+_usage_aggregator: Optional[UsageAggregator] = None
+
+
+def get_usage_aggregator() -> UsageAggregator:
+    """Get the usage aggregator, creating it from settings on first use."""
+    global _usage_aggregator
+
+    if _usage_aggregator is None:
+        _usage_aggregator = UsageAggregator(
+            settings.USAGE_FLUSH_SECONDS, settings.USAGE_MAX_PENDING_LOGS
+        )
+    return _usage_aggregator
+
+
+async def close_usage_aggregator() -> None:
+    """Write pending usage (called on shutdown)."""
+    if _usage_aggregator is not None:
+        await _usage_aggregator.close()
+
+
 class UsageService:
     """Service for tracking and querying API usage."""
 
@@ -30,49 +200,15 @@ class UsageService:
     ):
         """Track a single API request.
 
-        Updates daily aggregates and logs individual request.
+        Counts go to the in-process aggregator, which upserts daily totals
+        and writes the individual request logs in batches.
         """
         if self.db is None:
             return
 
-        today = date.today()
-        is_error = status_code >= 400
-
-        try:
-            # Upsert daily usage stats
-            stmt = insert(APIUsage).values(
-                client_id=client_id,
-                endpoint=endpoint,
-                date=today,
-                request_count=1,
-                error_count=1 if is_error else 0,
-                total_latency_ms=latency_ms,
-            ).on_conflict_do_update(
-                index_elements=["client_id", "endpoint", "date"],
-                set_={
-                    "request_count": APIUsage.request_count + 1,
-                    "error_count": APIUsage.error_count + (1 if is_error else 0),
-                    "total_latency_ms": APIUsage.total_latency_ms + latency_ms,
-                    "updated_at": datetime.utcnow(),
-                },
-            )
-            await self.db.execute(stmt)
-
-            # Log individual request
-            log = RequestLog(
-                request_id=request_id,
-                client_id=client_id,
-                endpoint=endpoint,
-                method=method,
-                status_code=status_code,
-                latency_ms=latency_ms,
-            )
-            self.db.add(log)
-
-            await self.db.commit()
-        except Exception:
-            # Don't fail the request if tracking fails
-            await self.db.rollback()
+        get_usage_aggregator().record(
+            client_id, endpoint, method, status_code, latency_ms, request_id
+        )
 
     async def get_client_usage(
         self,
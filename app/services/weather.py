@@ -1,18 +1,33 @@
 """
 Weather Service
 
-Fetches current weather conditions from WeatherAPI.com
+Fetches current weather conditions and hourly forecasts from the
+configured provider (WeatherAPI.com by default, see
+app.services.weather_providers), through the weather cache (see
+app.services.weather_cache).
 """
 
 from datetime import datetime
-from typing import Optional
-
-import httpx
+from typing import List, Optional
 
 from app.config import settings
+from app.models.requests import MAX_ALTITUDE_FT, MAX_FORECAST_HOURS, MIN_ALTITUDE_FT
+from app.services.elevation import lookup_elevation_ft
+from app.services.weather_cache import (
+    cached_forecast,
+    cached_weather,
+    city_cache_key,
+    coords_cache_key,
+    forecast_cache_key,
+)
+from app.services.weather_providers import WeatherObservation, current_hour_epoch, get_weather_provider
+
 
+WEATHER_API_BASE = settings.WEATHER_API_BASE_URL
 
-WEATHER_API_BASE = "https://api.weatherapi.com/v1"
+# Forecast hours fetched per location (and cached): the most a request can
+# ask for, plus slack for hours that pass while the forecast is cached
+FORECAST_FETCH_HOURS = MAX_FORECAST_HOURS + 2
 
 
 # City altitude lookup (feet above sea level)
@@ -73,11 +88,24 @@ def get_city_altitude(
     return CITY_ALTITUDES.get(key, 0)
 
 
+def _grid_altitude_ft(lat: float, lon: float) -> float:
+    """
+    Altitude from the local elevation grid, or 0 (sea level) if unavailable.
+
+    Clamped to the range the physics engine accepts (the Dead Sea shore
+    is below it).
+    """
+    altitude_ft = lookup_elevation_ft(lat, lon)
+    if altitude_ft is None:
+        return 0
+    return round(min(max(altitude_ft, MIN_ALTITUDE_FT), MAX_ALTITUDE_FT), 1)
+
+
 async def fetch_weather_by_city(
     city: str, state: Optional[str] = None, country: str = "US"
 ) -> dict:
     """
-    Fetch current weather from WeatherAPI.com
+    Fetch current weather from the configured provider (cached per location)
 
     Args:
         city: City name
@@ -88,62 +116,33 @@ async def fetch_weather_by_city(
         Dictionary with weather conditions
 
     Raises:
-        httpx.HTTPStatusError: If API request fails
-        ValueError: If API key is not configured
+        httpx.HTTPStatusError: If API request is rejected
+        WeatherUnavailableError: If the API is failing or the breaker is open
+        ValueError: If the provider is not configured (API key, WEATHER_PROVIDER)
     """
-    if not settings.WEATHER_API_KEY:
-        raise ValueError("WEATHER_API_KEY is not configured")
-
-    # Build location query string
-    location_parts = [city]
-    if state:
-        location_parts.append(state)
-    if country:
-        location_parts.append(country)
-    location = ",".join(location_parts)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{WEATHER_API_BASE}/current.json",
-            params={
-                "key": settings.WEATHER_API_KEY,
-                "q": location,
-                "aqi": "no",
-            },
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    current = data["current"]
-    location_data = data["location"]
-
-    # Get altitude (WeatherAPI doesn't provide elevation)
-    altitude_ft = get_city_altitude(city, state, country)
+    return await cached_weather(
+        city_cache_key(city, state, country),
+        lambda: _fetch_current_by_city(city, state, country),
+    )
 
-    # Build formatted location string
-    location_str = location_data["name"]
-    if location_data.get("region"):
-        location_str += f", {location_data['region']}"
-    if location_data.get("country"):
-        location_str += f", {location_data['country']}"
 
-    return {
-        "location": location_str,
-        "wind_speed_mph": current["wind_mph"],
-        "wind_direction_deg": current["wind_degree"],
-        "temperature_f": current["temp_f"],
-        "altitude_ft": altitude_ft,
-        "humidity_pct": current["humidity"],
-        "pressure_inhg": current["pressure_in"],
-        "conditions_text": current["condition"]["text"],
-        "fetched_at": datetime.utcnow(),
-    }
+async def _fetch_current_by_city(
+    city: str, state: Optional[str], country: Optional[str]
+) -> dict:
+    observation = await get_weather_provider().current_by_city(city, state, country)
+
+    # Get altitude (providers don't report elevation): the city table,
+    # else the elevation grid at the point the provider resolved the city to
+    altitude_ft = get_city_altitude(city, state, country)
+    if not altitude_ft and observation.latitude is not None and observation.longitude is not None:
+        altitude_ft = _grid_altitude_ft(observation.latitude, observation.longitude)
+
+    return observation.to_weather(altitude_ft)
 
 
 async def fetch_weather_by_coords(lat: float, lon: float) -> dict:
     """
-    Fetch current weather by coordinates.
+    Fetch current weather by coordinates (cached per rounded location).
 
     Args:
         lat: Latitude
@@ -152,42 +151,109 @@ async def fetch_weather_by_coords(lat: float, lon: float) -> dict:
     Returns:
         Dictionary with weather conditions
     """
-    if not settings.WEATHER_API_KEY:
-        raise ValueError("WEATHER_API_KEY is not configured")
-
-    location = f"{lat},{lon}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{WEATHER_API_BASE}/current.json",
-            params={
-                "key": settings.WEATHER_API_KEY,
-                "q": location,
-                "aqi": "no",
-            },
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    current = data["current"]
-    location_data = data["location"]
-
-    # Build formatted location string
-    location_str = location_data["name"]
-    if location_data.get("region"):
-        location_str += f", {location_data['region']}"
-    if location_data.get("country"):
-        location_str += f", {location_data['country']}"
+    weather = await cached_weather(
+        coords_cache_key(lat, lon),
+        lambda: _fetch_current_by_coords(lat, lon),
+    )
+    # Elevation of the requested point, not of the rounded cache location
+    weather["altitude_ft"] = _grid_altitude_ft(lat, lon)
+    return weather
+
+
+async def _fetch_current_by_coords(lat: float, lon: float) -> dict:
+    observation = await get_weather_provider().current_by_coords(lat, lon)
+    # Altitude is filled in per exact point by fetch_weather_by_coords
+    return observation.to_weather(0)
+
 
+def _forecast_payload(
+    observations: List[WeatherObservation], altitude_ft: float
+) -> dict:
+    """Cacheable forecast dict (hour times as ISO strings and epochs)."""
+    location = observations[0].location if observations else None
     return {
-        "location": location_str,
-        "wind_speed_mph": current["wind_mph"],
-        "wind_direction_deg": current["wind_degree"],
-        "temperature_f": current["temp_f"],
-        "altitude_ft": 0,  # Would need elevation API for accurate altitude
-        "humidity_pct": current["humidity"],
-        "pressure_inhg": current["pressure_in"],
-        "conditions_text": current["condition"]["text"],
+        "location": location,
+        "altitude_ft": altitude_ft,
         "fetched_at": datetime.utcnow(),
+        "hours": [
+            {
+                "time": o.observed_at.isoformat() + "Z",
+                "time_epoch": int((o.observed_at - datetime(1970, 1, 1)).total_seconds()),
+                "wind_speed_mph": o.wind_speed_mph,
+                "wind_direction_deg": o.wind_direction_deg,
+                "temperature_f": o.temperature_f,
+                "humidity_pct": o.humidity_pct,
+                "pressure_inhg": o.pressure_inhg,
+                "conditions_text": o.conditions_text,
+            }
+            for o in observations
+        ],
     }
+
+
+def _upcoming(forecast: dict, hours: int) -> dict:
+    """Drop hours that passed while the forecast was cached and keep the first `hours`."""
+    start = current_hour_epoch()
+    forecast["hours"] = [h for h in forecast["hours"] if h["time_epoch"] >= start][:hours]
+    return forecast
+
+
+async def fetch_forecast_by_city(
+    city: str, state: Optional[str] = None, country: str = "US", hours: int = 12
+) -> dict:
+    """
+    Fetch the hourly forecast for a city (cached per location).
+
+    Args:
+        city: City name
+        state: State or region (optional)
+        country: Country code
+        hours: Hours from the current hour on (at most MAX_FORECAST_HOURS)
+
+    Returns:
+        Dictionary with location, altitude_ft, fetched_at and hours (one
+        dict of conditions per hour, with time in UTC)
+    """
+    forecast = await cached_forecast(
+        forecast_cache_key(city_cache_key(city, state, country)),
+        lambda: _fetch_forecast_by_city(city, state, country),
+    )
+    return _upcoming(forecast, hours)
+
+
+async def _fetch_forecast_by_city(
+    city: str, state: Optional[str], country: Optional[str]
+) -> dict:
+    observations = await get_weather_provider().forecast_by_city(
+        city, state, country, FORECAST_FETCH_HOURS
+    )
+    altitude_ft = get_city_altitude(city, state, country)
+    if not altitude_ft and observations and observations[0].latitude is not None:
+        altitude_ft = _grid_altitude_ft(observations[0].latitude, observations[0].longitude)
+    return _forecast_payload(observations, altitude_ft)
+
+
+async def fetch_forecast_by_coords(lat: float, lon: float, hours: int = 12) -> dict:
+    """
+    Fetch the hourly forecast by coordinates (cached per rounded location).
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        hours: Hours from the current hour on (at most MAX_FORECAST_HOURS)
+
+    Returns:
+        Same shape as fetch_forecast_by_city()
+    """
+    forecast = await cached_forecast(
+        forecast_cache_key(coords_cache_key(lat, lon)),
+        lambda: _fetch_forecast_by_coords(lat, lon),
+    )
+    # Elevation of the requested point, not of the rounded cache location
+    forecast["altitude_ft"] = _grid_altitude_ft(lat, lon)
+    return _upcoming(forecast, hours)
+
+
+async def _fetch_forecast_by_coords(lat: float, lon: float) -> dict:
+    observations = await get_weather_provider().forecast_by_coords(lat, lon, FORECAST_FETCH_HOURS)
+    return _forecast_payload(observations, 0)
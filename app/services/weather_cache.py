@@ -0,0 +1,359 @@
+"""
+Weather Cache
+
+Current conditions change slowly compared with how often they are asked
+for, so observations from WeatherAPI.com are cached per location:
+
+- L1: in-process LRU (per worker)
+- L2: Redis, shared by all instances (skipped if Redis is not configured)
+
+Keys are normalized locations: city/state/country lowercased with
+whitespace collapsed, coordinates rounded to WEATHER_CACHE_COORD_DIGITS.
+They include the weather provider, so a replay instance sharing Redis
+never serves its observations as real ones.
+
+An entry is served as-is for WEATHER_CACHE_TTL_SECONDS. For
+WEATHER_CACHE_STALE_SECONDS after that it is still served, while one
+background refresh per key fetches a new observation
+(stale-while-revalidate). Beyond that the request waits for the upstream,
+but if the upstream fails an entry up to WEATHER_CACHE_STALE_IF_ERROR_SECONDS
+past its TTL is served instead of an error (stale-if-error).
+
+Concurrent fetches of one location in this process (a facility's bays all
+asking at once, or a miss racing a background refresh) share a single
+upstream call. When the quota governor (app.services.weather_quota)
+reports the upstream plan limit getting close, the TTL is stretched, and
+at the limit any kept entry is served rather than calling the upstream.
+
+Every weather dict served gets observed_at (when WeatherAPI.com last
+updated the observation) and observation_age_seconds.
+
+Hourly forecasts are cached the same way in a second instance with their
+own TTL (WEATHER_FORECAST_CACHE_TTL_SECONDS, also the stale window).
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.services.weather_quota import WeatherQuotaGovernor, get_weather_quota
+from app.utils.cache import LRUTTLCache
+from app.utils.singleflight import SingleFlight
+
+# Bump when the key format or stored value layout changes
+WEATHER_CACHE_FORMAT = 2
+
+REDIS_KEY_PREFIX = "weather"
+
+# Weather dict fields holding datetimes (stored as ISO strings in Redis)
+_DATETIME_FIELDS = ("fetched_at", "observed_at")
+
+
+def _normalize_part(value: Optional[str]) -> str:
+    return " ".join(value.lower().split()) if value else ""
+
+
+def forecast_cache_key(location_key: str) -> str:
+    """Cache key for the hourly forecast of a city_cache_key / coords_cache_key location."""
+    return f"forecast:{location_key}"
+
+
+def city_cache_key(city: str, state: Optional[str], country: Optional[str]) -> str:
+    """Cache key for a city lookup ("Las  Vegas, NV" and "las vegas, nv" share one)."""
+    parts = (_normalize_part(city), _normalize_part(state), _normalize_part(country))
+    return f"v{WEATHER_CACHE_FORMAT}:{settings.WEATHER_PROVIDER}:city:" + "|".join(parts)
+
+
+def coords_cache_key(lat: float, lon: float) -> str:
+    """Cache key for a coordinate lookup (rounded so nearby points share one)."""
+    digits = settings.WEATHER_CACHE_COORD_DIGITS
+    return (
+        f"v{WEATHER_CACHE_FORMAT}:{settings.WEATHER_PROVIDER}:coords:"
+        f"{round(lat, digits) + 0.0},{round(lon, digits) + 0.0}"
+    )
+
+
+def _encode(entry: Dict[str, Any]) -> str:
+    weather = dict(entry["weather"])
+    for field in _DATETIME_FIELDS:
+        if isinstance(weather.get(field), datetime):
+            weather[field] = weather[field].isoformat()
+    return json.dumps({"stored_at": entry["stored_at"], "weather": weather})
+
+
+def _decode(data: str) -> Dict[str, Any]:
+    entry = json.loads(data)
+    weather = entry["weather"]
+    for field in _DATETIME_FIELDS:
+        if weather.get(field):
+            weather[field] = datetime.fromisoformat(weather[field])
+    return entry
+
+
+def observation_age_seconds(weather: dict) -> Optional[int]:
+    """Seconds since the observation was made (None if the time is unknown)."""
+    observed_at = weather.get("observed_at")
+    if observed_at is None:
+        return None
+    return max(0, int((datetime.utcnow() - observed_at).total_seconds()))
+
+
+class WeatherCache:
+    """
+    L1 (in-process) + L2 (Redis) cache of weather observations.
+
+    Redis failures are logged and treated as misses; the cache never fails
+    a request the upstream could have answered.
+
+    Args:
+        l1_max_entries: Locations kept in process
+        ttl_seconds: Seconds an entry is fresh
+        stale_seconds: Seconds past the TTL it is served while refreshing
+        stale_if_error_seconds: Seconds past the TTL it is served if the upstream fails
+        quota: Governor whose TTL multiplier stretches freshness near the plan limit
+        name: Prefix of the L1 and coalescing counter names
+    """
+
+    def __init__(
+        self,
+        l1_max_entries: int,
+        ttl_seconds: int,
+        stale_seconds: int,
+        stale_if_error_seconds: int,
+        quota: Optional[WeatherQuotaGovernor] = None,
+        name: str = "weather",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.stale_if_error_seconds = max(stale_if_error_seconds, stale_seconds)
+        self.quota = quota
+        # Entries are kept for as long as any window may still serve them,
+        # with the TTL stretched as far as the quota governor may stretch it
+        max_multiplier = quota.max_ttl_multiplier if quota is not None else 1.0
+        self.retention_seconds = int(ttl_seconds * max_multiplier) + self.stale_if_error_seconds
+        self.l1 = LRUTTLCache(
+            l1_max_entries, ttl_seconds=self.retention_seconds, name=f"{name}_cache_l1"
+        )
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._flights = SingleFlight(f"{name}_upstream")
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.stale_if_error_hits = 0
+        self.misses = 0
+        self.quota_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.upstream_errors = 0
+        self.redis_errors = 0
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Return the weather for key, calling fetch() when nothing usable is cached.
+
+        Raises whatever fetch() raises when there is no entry to fall back on.
+        """
+        entry = await self._lookup(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            ttl = self.ttl_seconds
+            if self.quota is not None:
+                ttl *= await self.quota.ttl_multiplier()
+            if age < ttl:
+                self.fresh_hits += 1
+                return self._serve(entry)
+            if age >= self.retention_seconds:
+                entry = None  # L1 and Redis clocks disagree; treat as gone
+            elif self.quota is not None and self.quota.exhausted():
+                self.quota_hits += 1
+                return self._serve(entry)
+            elif age < ttl + self.stale_seconds:
+                self.stale_hits += 1
+                self._revalidate(key, fetch)
+                return self._serve(entry)
+        self.misses += 1
+
+        try:
+            fresh = await self._flights.do(key, lambda: self._fetch_and_store(key, fetch))
+        except Exception as e:
+            self.upstream_errors += 1
+            if entry is None:
+                raise
+            self.stale_if_error_hits += 1
+            logger.warning(f"Serving stale weather for {key}: {str(e)}")
+            return self._serve(entry)
+
+        return self._serve(fresh)
+
+    def _serve(self, entry: Dict[str, Any]) -> dict:
+        weather = dict(entry["weather"])
+        weather["observation_age_seconds"] = observation_age_seconds(weather)
+        return weather
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> None:
+        """Start a background refresh of key unless one is already running."""
+        loop = asyncio.get_running_loop()
+        task = self._refreshing.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        task = loop.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._refreshing.get(key) is task:
+            del self._refreshing[key]
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> None:
+        self.refreshes += 1
+        try:
+            await self._flights.do(key, lambda: self._fetch_and_store(key, fetch))
+        except Exception as e:
+            self.refresh_errors += 1
+            self.upstream_errors += 1
+            logger.warning(f"Weather refresh failed for {key}: {str(e)}")
+
+    async def _fetch_and_store(
+        self, key: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> Dict[str, Any]:
+        """One upstream call for key (shared by concurrent callers), then store it."""
+        return await self._store(key, await fetch())
+
+    async def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, promoting Redis hits into L1."""
+        entry = self.l1.get(key)
+        if entry is not None:
+            return entry
+
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            cached = await redis_client.get(f"{REDIS_KEY_PREFIX}:{key}")
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Weather cache read failed: {str(e)}")
+            return None
+        if cached is None:
+            return None
+
+        entry = _decode(cached)
+        self.l1.set(key, entry)
+        return entry
+
+    async def _store(self, key: str, weather: dict) -> Dict[str, Any]:
+        """Store a freshly fetched observation in both levels."""
+        entry = {"stored_at": time.time(), "weather": weather}
+        self.l1.set(key, entry)
+
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    f"{REDIS_KEY_PREFIX}:{key}", _encode(entry), ex=self.retention_seconds
+                )
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Weather cache write failed: {str(e)}")
+        return entry
+
+    async def close(self) -> None:
+        """Cancel background refreshes still running on this loop."""
+        loop = asyncio.get_running_loop()
+        tasks = [t for t in self._refreshing.values() if not t.done() and t.get_loop() is loop]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def clear(self) -> None:
+        """Drop L1 entries (Redis entries expire on their own)."""
+        self.l1.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "enabled": settings.WEATHER_CACHE_ENABLED,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "stale_if_error_seconds": self.stale_if_error_seconds,
+            "l1": self.l1.stats(),
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "stale_if_error_hits": self.stale_if_error_hits,
+            "misses": self.misses,
+            "quota_hits": self.quota_hits,
+            "upstream_coalescing": self._flights.stats(),
+            "refreshes": self.refreshes,
+            "refreshing": len(self._refreshing),
+            "refresh_errors": self.refresh_errors,
+            "upstream_errors": self.upstream_errors,
+            "redis_errors": self.redis_errors,
+        }
+
+
+# Cache instances (created lazily)
+_weather_cache: Optional[WeatherCache] = None
+_forecast_cache: Optional[WeatherCache] = None
+
+
+def get_weather_cache() -> WeatherCache:
+    """Get the weather cache, creating it from settings on first use."""
+    global _weather_cache
+
+    if _weather_cache is None:
+        _weather_cache = WeatherCache(
+            settings.WEATHER_CACHE_L1_MAX_ENTRIES,
+            settings.WEATHER_CACHE_TTL_SECONDS,
+            settings.WEATHER_CACHE_STALE_SECONDS,
+            settings.WEATHER_CACHE_STALE_IF_ERROR_SECONDS,
+            quota=get_weather_quota(),
+        )
+    return _weather_cache
+
+
+def get_forecast_cache() -> WeatherCache:
+    """Get the hourly forecast cache, creating it from settings on first use."""
+    global _forecast_cache
+
+    if _forecast_cache is None:
+        ttl = settings.WEATHER_FORECAST_CACHE_TTL_SECONDS
+        _forecast_cache = WeatherCache(
+            settings.WEATHER_FORECAST_CACHE_MAX_ENTRIES,
+            ttl,
+            ttl,
+            settings.WEATHER_CACHE_STALE_IF_ERROR_SECONDS,
+            quota=get_weather_quota(),
+            name="forecast",
+        )
+    return _forecast_cache
+
+
+async def cached_weather(key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+    """Weather for key through the cache (or straight from fetch() if disabled)."""
+    if not settings.WEATHER_CACHE_ENABLED:
+        weather = dict(await fetch())
+        weather["observation_age_seconds"] = observation_age_seconds(weather)
+        return weather
+    return await get_weather_cache().get(key, fetch)
+
+
+async def cached_forecast(key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+    """Forecast for key through the forecast cache (or straight from fetch() if disabled)."""
+    if not settings.WEATHER_CACHE_ENABLED:
+        return dict(await fetch())
+    return await get_forecast_cache().get(key, fetch)
+
+
+async def close_weather_cache() -> None:
+    """Stop background refreshes (called on shutdown)."""
+    for cache in (_weather_cache, _forecast_cache):
+        if cache is not None:
+            await cache.close()
@@ -0,0 +1,323 @@
+"""
+Weather HTTP Client
+
+One long-lived httpx client for WeatherAPI.com, opened at startup and
+closed on shutdown, so calls reuse keep-alive connections instead of
+paying DNS, TCP and TLS setup every time.
+
+Around it:
+- Bounded concurrency: at most WEATHER_HTTP_MAX_CONCURRENCY calls in
+  flight; the rest wait within their time budget.
+- Time budget: a call (including waits and retries) gives up after
+  WEATHER_HTTP_BUDGET_SECONDS; each attempt gets at most
+  WEATHER_HTTP_TIMEOUT_SECONDS of it.
+- Retries: connection errors, timeouts, 429 and 5xx are retried (all
+  calls are GETs) up to WEATHER_HTTP_RETRIES times, with full-jitter
+  exponential backoff.
+- Circuit breaker: after WEATHER_BREAKER_FAILURES consecutive failed
+  calls, calls fail immediately for WEATHER_BREAKER_RESET_SECONDS, then one
+  trial call decides whether to close it again.
+
+Client errors (bad location, bad key) are returned to the caller as
+before and do not count against the upstream.
+
+Every attempt is counted by the quota governor (app.services.weather_quota),
+since each one counts against the plan limit.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.services.weather_quota import WeatherQuotaGovernor, get_weather_quota
+
+# Latency samples kept for percentiles in stats()
+_LATENCY_SAMPLES = 512
+
+
+class WeatherUnavailableError(Exception):
+    """WeatherAPI.com cannot be reached within the call's budget."""
+
+
+class CircuitOpenError(WeatherUnavailableError):
+    """The circuit breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after `failure_threshold` failures in a row;
+    open -> half-open after `reset_seconds`, letting a single trial call
+    through; its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.opened = 0
+        self.short_circuited = 0
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "closed":
+            return
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.short_circuited += 1
+        raise CircuitOpenError("Weather service circuit breaker is open")
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+                logger.warning(f"Weather circuit breaker opened after {self.failures} failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a trial call that finished without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+def _retryable(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class WeatherClient:
+    """
+    Pooled, bounded, retrying client for WeatherAPI.com.
+
+    The underlying httpx client belongs to the event loop it was opened
+    on; it is reopened if used from another loop (tests run one per case).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int,
+        timeout_seconds: float,
+        budget_seconds: float,
+        retries: int,
+        backoff_seconds: float,
+        breaker: CircuitBreaker,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        quota: Optional[WeatherQuotaGovernor] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.budget_seconds = budget_seconds
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.breaker = breaker
+        self.transport = transport
+        self.quota = quota
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.in_flight = 0
+        self.calls = 0
+        self.attempts = 0
+        self.retried = 0
+        self.failures = 0
+        self.client_errors = 0
+        self.budget_exhausted = 0
+        self.errors: Dict[str, int] = {}
+        self._latencies_ms: deque = deque(maxlen=_LATENCY_SAMPLES)
+        self.latency_ms_max = 0.0
+
+    def _open(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._http is not None and self._loop is loop:
+            return
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            transport=self.transport,
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._loop = loop
+
+    async def get_json(self, path: str, params: Dict[str, Any]) -> Any:
+        """
+        GET path and return the decoded JSON body.
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            WeatherUnavailableError: Upstream failing or too slow within the budget
+            httpx.HTTPStatusError: Upstream rejected the request (4xx)
+        """
+        self.breaker.allow()
+        try:
+            self._open()
+            self.calls += 1
+            deadline = time.monotonic() + self.budget_seconds
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.budget_seconds)
+            except asyncio.TimeoutError:
+                self._fail("queue_timeout")
+                raise WeatherUnavailableError("Too many weather requests in flight")
+
+            self.in_flight += 1
+            try:
+                return await self._get_with_retries(path, params, deadline)
+            finally:
+                self.in_flight -= 1
+                self._slots.release()
+        finally:
+            self.breaker.release()
+
+    async def _get_with_retries(self, path: str, params: Dict[str, Any], deadline: float) -> Any:
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.budget_exhausted += 1
+                self._fail("budget_exhausted")
+                raise WeatherUnavailableError("Weather request exceeded its time budget")
+
+            self.attempts += 1
+            if self.quota is not None:
+                await self.quota.record_call()
+            start = time.perf_counter()
+            error: Optional[str] = None
+            timeout = min(self.timeout_seconds, remaining)
+            try:
+                # httpx timeouts apply per connect/read; wait_for caps the whole attempt
+                response = await asyncio.wait_for(
+                    self._http.get(path, params=params, timeout=timeout), timeout
+                )
+            except (httpx.TimeoutException, asyncio.TimeoutError):
+                error = "timeout"
+            except httpx.TransportError:
+                error = "connect"
+            else:
+                self._record_latency(start)
+                if not _retryable(response):
+                    if response.is_error:
+                        self.client_errors += 1
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                error = f"http_{response.status_code}"
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+            if attempt >= self.retries:
+                self._fail(None)
+                raise WeatherUnavailableError(f"Weather service unavailable ({error})")
+            attempt += 1
+            self.retried += 1
+            # Full jitter: anywhere up to the exponential step, within the budget
+            delay = random.uniform(0, self.backoff_seconds * 2 ** (attempt - 1))
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+    def _fail(self, error: Optional[str]) -> None:
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+        self.failures += 1
+        self.breaker.record_failure()
+
+    def _record_latency(self, start: float) -> None:
+        latency_ms = (time.perf_counter() - start) * 1000
+        self._latencies_ms.append(latency_ms)
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+
+    async def close(self) -> None:
+        """Close pooled connections (on the loop that opened them)."""
+        if self._http is not None and self._loop is asyncio.get_running_loop():
+            await self._http.aclose()
+        self._http = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retried": self.retried,
+            "failures": self.failures,
+            "client_errors": self.client_errors,
+            "budget_exhausted": self.budget_exhausted,
+            "errors": dict(self.errors),
+            "latency_ms_p50": percentile(0.50),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": round(self.latency_ms_max, 3),
+            "breaker": self.breaker.stats(),
+        }
+
+
+# Client instance (opened by init_weather_client, or lazily on first use)
+_weather_client: Optional[WeatherClient] = None
+
+
+def get_weather_client() -> WeatherClient:
+    """Get the weather client, creating it from settings on first use."""
+    global _weather_client
+
+    if _weather_client is None:
+        _weather_client = WeatherClient(
+            settings.WEATHER_API_BASE_URL,
+            settings.WEATHER_HTTP_MAX_CONCURRENCY,
+            settings.WEATHER_HTTP_TIMEOUT_SECONDS,
+            settings.WEATHER_HTTP_BUDGET_SECONDS,
+            settings.WEATHER_HTTP_RETRIES,
+            settings.WEATHER_HTTP_BACKOFF_SECONDS,
+            CircuitBreaker(settings.WEATHER_BREAKER_FAILURES, settings.WEATHER_BREAKER_RESET_SECONDS),
+            quota=get_weather_quota(),
+        )
+    return _weather_client
+
+
+async def init_weather_client() -> None:
+    """Open the pooled client on the serving loop (called on startup)."""
+    get_weather_client()._open()
+
+
+async def close_weather_client() -> None:
+    """Close pooled connections (called on shutdown)."""
+    if _weather_client is not None:
+        await _weather_client.close()
@@ -0,0 +1,451 @@
+"""
+Weather Providers
+
+Pluggable sources of current conditions. Every provider returns a
+WeatherObservation (units and fields normalized), and app.services.weather
+adds altitude and caching on top, so the rest of the API never sees a
+provider's response shape.
+
+Registered providers (selected with WEATHER_PROVIDER):
+- weatherapi: WeatherAPI.com through the pooled weather client
+- replay: local stand-in serving recorded WeatherAPI.com responses
+  (WEATHER_REPLAY_PATH, written by scripts/record_weather.py) or synthetic
+  observations, with configurable latency and error rate. For benchmarks
+  and load tests on machines that must not call (or pay for) the real
+  upstream.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.middleware.logging_config import logger
+from app.services.weather_client import WeatherUnavailableError, get_weather_client
+
+# Synthetic observations change this often (WeatherAPI.com updates about every 15 minutes)
+SYNTHETIC_UPDATE_SECONDS = 900
+
+# z-score of the 99th percentile, for the replay latency distribution
+_Z99 = 2.326
+
+
+class WeatherObservation:
+    """Current conditions at one place, in the units the physics engine uses."""
+
+    __slots__ = (
+        "location", "wind_speed_mph", "wind_direction_deg", "temperature_f",
+        "humidity_pct", "pressure_inhg", "conditions_text", "observed_at",
+        "latitude", "longitude",
+    )
+
+    def __init__(
+        self,
+        location: str,
+        wind_speed_mph: float,
+        wind_direction_deg: float,
+        temperature_f: float,
+        humidity_pct: float,
+        pressure_inhg: float,
+        conditions_text: str,
+        observed_at: Optional[datetime] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ):
+        self.location = location
+        self.wind_speed_mph = wind_speed_mph
+        self.wind_direction_deg = wind_direction_deg
+        self.temperature_f = temperature_f
+        self.humidity_pct = humidity_pct
+        self.pressure_inhg = pressure_inhg
+        self.conditions_text = conditions_text
+        self.observed_at = observed_at  # Naive UTC
+        self.latitude = latitude  # Point the provider resolved the query to
+        self.longitude = longitude
+
+    def to_weather(self, altitude_ft: float) -> dict:
+        """The weather dict served by app.services.weather."""
+        return {
+            "location": self.location,
+            "wind_speed_mph": self.wind_speed_mph,
+            "wind_direction_deg": self.wind_direction_deg,
+            "temperature_f": self.temperature_f,
+            "altitude_ft": altitude_ft,
+            "humidity_pct": self.humidity_pct,
+            "pressure_inhg": self.pressure_inhg,
+            "conditions_text": self.conditions_text,
+            "fetched_at": datetime.utcnow(),
+            "observed_at": self.observed_at,
+        }
+
+
+class WeatherProvider:
+    """Interface of a weather source."""
+
+    name = "base"
+
+    async def current_by_city(
+        self, city: str, state: Optional[str], country: Optional[str]
+    ) -> WeatherObservation:
+        """Current conditions for a city."""
+        raise NotImplementedError
+
+    async def current_by_coords(self, lat: float, lon: float) -> WeatherObservation:
+        """Current conditions at coordinates."""
+        raise NotImplementedError
+
+    async def forecast_by_city(
+        self, city: str, state: Optional[str], country: Optional[str], hours: int
+    ) -> List[WeatherObservation]:
+        """Hourly forecast for a city from the current hour (observed_at = valid time)."""
+        raise NotImplementedError
+
+    async def forecast_by_coords(self, lat: float, lon: float, hours: int) -> List[WeatherObservation]:
+        """Hourly forecast at coordinates from the current hour (observed_at = valid time)."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        return {"provider": self.name}
+
+
+def _weatherapi_location(location_data: dict) -> str:
+    location_str = location_data["name"]
+    if location_data.get("region"):
+        location_str += f", {location_data['region']}"
+    if location_data.get("country"):
+        location_str += f", {location_data['country']}"
+    return location_str
+
+
+def _weatherapi_observation(
+    values: dict, location_data: dict, epoch: Optional[int]
+) -> WeatherObservation:
+    return WeatherObservation(
+        location=_weatherapi_location(location_data),
+        wind_speed_mph=values["wind_mph"],
+        wind_direction_deg=values["wind_degree"],
+        temperature_f=values["temp_f"],
+        humidity_pct=values["humidity"],
+        pressure_inhg=values["pressure_in"],
+        conditions_text=values["condition"]["text"],
+        observed_at=datetime.utcfromtimestamp(epoch) if epoch is not None else None,
+        latitude=location_data.get("lat"),
+        longitude=location_data.get("lon"),
+    )
+
+
+def parse_weatherapi_current(data: dict) -> WeatherObservation:
+    """Normalize a WeatherAPI.com current.json response."""
+    current = data["current"]
+    return _weatherapi_observation(current, data["location"], current.get("last_updated_epoch"))
+
+
+def parse_weatherapi_forecast(data: dict) -> List[WeatherObservation]:
+    """Normalize the hours of a WeatherAPI.com forecast.json response."""
+    return [
+        _weatherapi_observation(hour, data["location"], hour["time_epoch"])
+        for day in data["forecast"]["forecastday"]
+        for hour in day["hour"]
+    ]
+
+
+def current_hour_epoch() -> int:
+    """Start of the current UTC hour."""
+    return int(time.time() // 3600 * 3600)
+
+
+def upcoming_hours(observations: List[WeatherObservation], hours: int) -> List[WeatherObservation]:
+    """The first `hours` forecast hours from the current hour on."""
+    start = datetime.utcfromtimestamp(current_hour_epoch())
+    return [o for o in observations if o.observed_at >= start][:hours]
+
+
+def city_query(city: str, state: Optional[str], country: Optional[str]) -> str:
+    """WeatherAPI.com q= value for a city ("Denver,CO,US")."""
+    return ",".join(part for part in (city, state, country) if part)
+
+
+class WeatherAPIProvider(WeatherProvider):
+    """
+    WeatherAPI.com current conditions.
+
+    Calls go through the pooled client (app.services.weather_client), which
+    applies timeouts, retries, the circuit breaker and quota counting.
+    """
+
+    name = "weatherapi"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    async def _get(self, path: str, params: dict) -> dict:
+        if not self.api_key:
+            raise ValueError("WEATHER_API_KEY is not configured")
+        return await get_weather_client().get_json(
+            path, params={"key": self.api_key, "aqi": "no", **params}
+        )
+
+    async def _current(self, query: str) -> WeatherObservation:
+        return parse_weatherapi_current(await self._get("/current.json", {"q": query}))
+
+    async def _forecast(self, query: str, hours: int) -> List[WeatherObservation]:
+        # Days are local to the location and start today, so ask for one more
+        data = await self._get(
+            "/forecast.json", {"q": query, "days": hours // 24 + 2, "alerts": "no"}
+        )
+        return upcoming_hours(parse_weatherapi_forecast(data), hours)
+
+    async def current_by_city(
+        self, city: str, state: Optional[str], country: Optional[str]
+    ) -> WeatherObservation:
+        return await self._current(city_query(city, state, country))
+
+    async def current_by_coords(self, lat: float, lon: float) -> WeatherObservation:
+        return await self._current(f"{lat},{lon}")
+
+    async def forecast_by_city(
+        self, city: str, state: Optional[str], country: Optional[str], hours: int
+    ) -> List[WeatherObservation]:
+        return await self._forecast(city_query(city, state, country), hours)
+
+    async def forecast_by_coords(self, lat: float, lon: float, hours: int) -> List[WeatherObservation]:
+        return await self._forecast(f"{lat},{lon}", hours)
+
+
+class ReplayWeatherProvider(WeatherProvider):
+    """
+    Local stand-in for the upstream.
+
+    With recordings, a coordinate query gets the nearest recorded
+    observation and a city query the recording with that city name (or,
+    failing that, one picked deterministically from the name); forecasts
+    repeat it for every hour. Without recordings, observations are
+    synthesized deterministically per location and SYNTHETIC_UPDATE_SECONDS
+    window. Either way observed_at is the time of the call (or the
+    forecast hour), so observations look current.
+
+    Each call waits a lognormal delay with the given median and 99th
+    percentile, then fails with WeatherUnavailableError with probability
+    error_rate. The quota governor does not count replayed calls.
+
+    Args:
+        recordings: Parsed recorded observations (empty for synthetic ones)
+        latency_ms: Median delay per call
+        latency_p99_ms: 99th percentile delay per call
+        error_rate: Share of calls that fail (0-1)
+        seed: Seed for delays, failures and synthetic observations
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        recordings: List[WeatherObservation],
+        latency_ms: float,
+        latency_p99_ms: float,
+        error_rate: float,
+        seed: int = 0,
+    ):
+        self.recordings = recordings
+        self.latency_ms = max(0.0, latency_ms)
+        self.latency_sigma = (
+            math.log(latency_p99_ms / latency_ms) / _Z99
+            if latency_ms > 0 and latency_p99_ms > latency_ms else 0.0
+        )
+        self.error_rate = min(max(error_rate, 0.0), 1.0)
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+        self.calls = 0
+        self.injected_errors = 0
+        self.total_delay_ms = 0.0
+
+    @classmethod
+    def load_recordings(cls, path: str) -> List[WeatherObservation]:
+        """Read recorded WeatherAPI.com current.json responses (one JSON object per line)."""
+        recordings = []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    recordings.append(parse_weatherapi_current(json.loads(line)))
+        return recordings
+
+    async def _simulate_upstream(self) -> None:
+        self.calls += 1
+        delay_ms = self.latency_ms
+        if delay_ms and self.latency_sigma:
+            delay_ms *= math.exp(self._rng.gauss(0.0, self.latency_sigma))
+        self.total_delay_ms += delay_ms
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.injected_errors += 1
+            raise WeatherUnavailableError("Injected upstream error (replay provider)")
+
+    def _city_source(self, city: str, state: Optional[str], country: Optional[str]) -> tuple:
+        """(recording or None, synthetic key, location, lat, lon) for a city."""
+        name = " ".join(city.lower().split())
+        if self.recordings:
+            for recording in self.recordings:
+                if recording.location.split(",")[0].lower() == name:
+                    return recording, None, None, None, None
+            index = zlib.crc32(name.encode()) % len(self.recordings)
+            return self.recordings[index], None, None, None, None
+        query = city_query(city, state, country)
+        return None, f"city:{query.lower()}", query, None, None
+
+    def _coords_source(self, lat: float, lon: float) -> tuple:
+        """(recording or None, synthetic key, location, lat, lon) for coordinates."""
+        if self.recordings:
+            scale = math.cos(math.radians(lat)) ** 2
+
+            def distance(recording: WeatherObservation) -> float:
+                if recording.latitude is None or recording.longitude is None:
+                    return math.inf
+                return (recording.latitude - lat) ** 2 + scale * (recording.longitude - lon) ** 2
+
+            return min(self.recordings, key=distance), None, None, None, None
+        # Same resolution as the weather cache keys, so one cache entry = one observation
+        digits = settings.WEATHER_CACHE_COORD_DIGITS
+        lat_r, lon_r = round(lat, digits), round(lon, digits)
+        return None, f"coords:{lat_r},{lon_r}", f"Replay {lat_r}, {lon_r}", lat, lon
+
+    def _observe(
+        self,
+        recording: Optional[WeatherObservation],
+        key: Optional[str],
+        location: Optional[str],
+        lat: Optional[float],
+        lon: Optional[float],
+        at: float,
+    ) -> WeatherObservation:
+        """The observation valid at epoch `at` (recorded ones are replayed as-is)."""
+        if recording is not None:
+            observation = WeatherObservation(
+                *(getattr(recording, name) for name in WeatherObservation.__slots__)
+            )
+            observation.observed_at = datetime.utcfromtimestamp(at)
+            return observation
+
+        window = int(at // SYNTHETIC_UPDATE_SECONDS)
+        rng = random.Random(zlib.crc32(f"{self.seed}:{key}:{window}".encode()))
+        # Warmest mid-afternoon local (solar) time
+        solar_hour = (at / 3600 + (lon or 0.0) / 15) % 24
+        diurnal = 8 * math.sin(2 * math.pi * (solar_hour - 9) / 24)
+        return WeatherObservation(
+            location=location,
+            wind_speed_mph=round(rng.weibullvariate(9.0, 2.0), 1),
+            wind_direction_deg=rng.randrange(360),
+            temperature_f=round(
+                85 - 0.6 * abs(lat if lat is not None else 35.0) + diurnal + rng.gauss(0, 4), 1
+            ),
+            humidity_pct=rng.randint(20, 95),
+            pressure_inhg=round(rng.gauss(29.92, 0.2), 2),
+            conditions_text=rng.choice(("Sunny", "Clear", "Partly cloudy", "Overcast", "Light rain")),
+            observed_at=datetime.utcfromtimestamp(at),
+            latitude=lat,
+            longitude=lon,
+        )
+
+    def _hourly(self, source: tuple, hours: int) -> List[WeatherObservation]:
+        start = current_hour_epoch()
+        return [self._observe(*source, start + 3600 * hour) for hour in range(hours)]
+
+    async def current_by_city(
+        self, city: str, state: Optional[str], country: Optional[str]
+    ) -> WeatherObservation:
+        await self._simulate_upstream()
+        return self._observe(*self._city_source(city, state, country), time.time())
+
+    async def current_by_coords(self, lat: float, lon: float) -> WeatherObservation:
+        await self._simulate_upstream()
+        return self._observe(*self._coords_source(lat, lon), time.time())
+
+    async def forecast_by_city(
+        self, city: str, state: Optional[str], country: Optional[str], hours: int
+    ) -> List[WeatherObservation]:
+        await self._simulate_upstream()
+        return self._hourly(self._city_source(city, state, country), hours)
+
+    async def forecast_by_coords(self, lat: float, lon: float, hours: int) -> List[WeatherObservation]:
+        await self._simulate_upstream()
+        return self._hourly(self._coords_source(lat, lon), hours)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.name,
+            "recordings": len(self.recordings),
+            "calls": self.calls,
+            "injected_errors": self.injected_errors,
+            "mean_delay_ms": round(self.total_delay_ms / self.calls, 1) if self.calls else None,
+        }
+
+
+# Registry of provider name -> factory building it from settings
+WEATHER_PROVIDERS: Dict[str, Callable[[], WeatherProvider]] = {}
+
+
+def register_weather_provider(name: str):
+    """Decorator that registers a provider factory under a WEATHER_PROVIDER name."""
+
+    def decorator(factory):
+        WEATHER_PROVIDERS[name] = factory
+        return factory
+
+    return decorator
+
+
+@register_weather_provider("weatherapi")
+def _weatherapi_provider() -> WeatherProvider:
+    return WeatherAPIProvider(settings.WEATHER_API_KEY)
+
+
+@register_weather_provider("replay")
+def _replay_provider() -> WeatherProvider:
+    recordings = []
+    if settings.WEATHER_REPLAY_PATH:
+        recordings = ReplayWeatherProvider.load_recordings(settings.WEATHER_REPLAY_PATH)
+    logger.info(
+        "Replay weather provider enabled",
+        recordings=len(recordings),
+        latency_ms=settings.WEATHER_REPLAY_LATENCY_MS,
+        error_rate=settings.WEATHER_REPLAY_ERROR_RATE,
+    )
+    return ReplayWeatherProvider(
+        recordings,
+        settings.WEATHER_REPLAY_LATENCY_MS,
+        settings.WEATHER_REPLAY_LATENCY_P99_MS,
+        settings.WEATHER_REPLAY_ERROR_RATE,
+        settings.WEATHER_REPLAY_SEED,
+    )
+
+
+# Provider instance (created lazily)
+_weather_provider: Optional[WeatherProvider] = None
+
+
+def get_weather_provider() -> WeatherProvider:
+    """
+    Get the configured provider, creating it on first use.
+
+    Raises:
+        ValueError: If WEATHER_PROVIDER names no registered provider
+    """
+    global _weather_provider
+
+    if _weather_provider is None:
+        try:
+            factory = WEATHER_PROVIDERS[settings.WEATHER_PROVIDER]
+        except KeyError:
+            raise ValueError(
+                f"Unknown WEATHER_PROVIDER '{settings.WEATHER_PROVIDER}'. "
+                f"Valid providers: {', '.join(WEATHER_PROVIDERS)}"
+            )
+        _weather_provider = factory()
+    return _weather_provider
@@ -0,0 +1,179 @@
+"""
+Weather Upstream Quota Governor
+
+Counts calls to WeatherAPI.com per minute and per UTC day in Redis, so
+every replica sees the fleet's total against the plan limits
+(WEATHER_QUOTA_PER_MINUTE, WEATHER_QUOTA_PER_DAY). Without Redis the
+counts are per process.
+
+The weather cache asks for a TTL multiplier before deciding whether an
+entry is still fresh. Below WEATHER_QUOTA_SOFT_FRACTION of either limit it
+is 1; from there it rises linearly to WEATHER_QUOTA_MAX_TTL_MULTIPLIER at
+the limit, so entries are refetched less often as the cap gets closer.
+At the limit, cached entries are served for as long as they are kept
+instead of calling the upstream.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.middleware.logging_config import logger
+
+REDIS_KEY_PREFIX = "weatherquota"
+
+
+def _windows(now: float) -> Tuple[str, str]:
+    """Minute and UTC-day window ids for a wall-clock time."""
+    return str(int(now // 60)), time.strftime("%Y%m%d", time.gmtime(now))
+
+
+class WeatherQuotaGovernor:
+    """
+    Fleet-wide upstream call counters and the TTL stretch derived from them.
+
+    Args:
+        per_minute: Upstream calls allowed per minute (0 = no limit)
+        per_day: Upstream calls allowed per UTC day (0 = no limit)
+        soft_fraction: Share of a limit at which TTLs start to stretch
+        max_ttl_multiplier: TTL multiplier at (and beyond) a limit
+        refresh_seconds: How often counts are re-read from Redis between calls
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int,
+        soft_fraction: float,
+        max_ttl_multiplier: float,
+        refresh_seconds: float,
+    ):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.soft_fraction = min(max(soft_fraction, 0.0), 0.999)
+        self.max_ttl_multiplier = max(1.0, max_ttl_multiplier)
+        self.refresh_seconds = refresh_seconds
+
+        # Latest known counts, with the windows they belong to
+        self._minute: Tuple[str, int] = ("", 0)
+        self._day: Tuple[str, int] = ("", 0)
+        self._read_at = 0.0
+
+        self.calls = 0
+        self.redis_errors = 0
+
+    async def record_call(self) -> None:
+        """Count one upstream call (never raises)."""
+        self.calls += 1
+        now = time.time()
+        minute, day = _windows(now)
+
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            self._minute = (minute, self._count(self._minute, minute) + 1)
+            self._day = (day, self._count(self._day, day) + 1)
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.incr(f"{REDIS_KEY_PREFIX}:m:{minute}")
+            pipe.expire(f"{REDIS_KEY_PREFIX}:m:{minute}", 120)
+            pipe.incr(f"{REDIS_KEY_PREFIX}:d:{day}")
+            pipe.expire(f"{REDIS_KEY_PREFIX}:d:{day}", 2 * 86400)
+            minute_count, _, day_count, _ = await pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Weather quota count failed: {str(e)}")
+            return
+        self._minute = (minute, int(minute_count))
+        self._day = (day, int(day_count))
+        self._read_at = now
+
+    async def _refresh(self, now: float) -> None:
+        """Re-read fleet counts if the local snapshot is older than refresh_seconds."""
+        if now - self._read_at < self.refresh_seconds:
+            return
+        from app.redis_client import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        self._read_at = now
+        minute, day = _windows(now)
+        try:
+            minute_count, day_count = await redis_client.mget(
+                f"{REDIS_KEY_PREFIX}:m:{minute}", f"{REDIS_KEY_PREFIX}:d:{day}"
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Weather quota read failed: {str(e)}")
+            return
+        self._minute = (minute, int(minute_count or 0))
+        self._day = (day, int(day_count or 0))
+
+    @staticmethod
+    def _count(snapshot: Tuple[str, int], window: str) -> int:
+        return snapshot[1] if snapshot[0] == window else 0
+
+    def utilization(self, now: Optional[float] = None) -> float:
+        """Highest share of a limit used in the current windows."""
+        minute, day = _windows(time.time() if now is None else now)
+        used = 0.0
+        if self.per_minute > 0:
+            used = max(used, self._count(self._minute, minute) / self.per_minute)
+        if self.per_day > 0:
+            used = max(used, self._count(self._day, day) / self.per_day)
+        return used
+
+    def multiplier_for(self, utilization: float) -> float:
+        """TTL multiplier for a utilization (1 below the soft fraction)."""
+        if utilization <= self.soft_fraction:
+            return 1.0
+        progress = min(1.0, (utilization - self.soft_fraction) / (1.0 - self.soft_fraction))
+        return 1.0 + progress * (self.max_ttl_multiplier - 1.0)
+
+    async def ttl_multiplier(self) -> float:
+        """Factor to stretch cache TTLs by, given current upstream usage."""
+        now = time.time()
+        await self._refresh(now)
+        return self.multiplier_for(self.utilization(now))
+
+    def exhausted(self) -> bool:
+        """True once either limit has been reached in its current window."""
+        return self.utilization() >= 1.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        now = time.time()
+        minute, day = _windows(now)
+        utilization = self.utilization(now)
+        return {
+            "per_minute_limit": self.per_minute,
+            "per_day_limit": self.per_day,
+            "minute_calls": self._count(self._minute, minute),
+            "day_calls": self._count(self._day, day),
+            "utilization": round(utilization, 4),
+            "ttl_multiplier": round(self.multiplier_for(utilization), 3),
+            "calls_recorded": self.calls,
+            "redis_errors": self.redis_errors,
+        }
+
+
+# Governor instance (created lazily)
+_weather_quota: Optional[WeatherQuotaGovernor] = None
+
+
+def get_weather_quota() -> WeatherQuotaGovernor:
+    """Get the quota governor, creating it from settings on first use."""
+    global _weather_quota
+
+    if _weather_quota is None:
+        _weather_quota = WeatherQuotaGovernor(
+            settings.WEATHER_QUOTA_PER_MINUTE,
+            settings.WEATHER_QUOTA_PER_DAY,
+            settings.WEATHER_QUOTA_SOFT_FRACTION,
+            settings.WEATHER_QUOTA_MAX_TTL_MULTIPLIER,
+            settings.WEATHER_QUOTA_REFRESH_SECONDS,
+        )
+    return _weather_quota
@@ -162,6 +162,8 @@ def convert_conditions_to_dual_unit(conditions: Dict[str, Any]) -> Dict[str, Any
         "pressure": create_dual_pressure(conditions["pressure_inhg"]),
         "conditions_text": conditions.get("conditions_text"),
         "fetched_at": conditions.get("fetched_at"),
+        "observed_at": conditions.get("observed_at"),
+        "observation_age_seconds": conditions.get("observation_age_seconds"),
     }
 
 
@@ -220,3 +222,23 @@ def validate_units_param(units: str) -> str:
             f"Valid values are: {', '.join(VALID_UNITS)}"
         )
     return units_lower
+
+
+def compass_to_relative_wind(wind_from_deg: float, target_bearing_deg: float) -> float:
+    """
+    Convert a compass wind direction to the target-relative direction the
+    physics engine expects.
+
+    Weather reports give the compass bearing the wind blows FROM; the
+    engine measures it from the target line (0 = headwind; 90 =
+    left-to-right, i.e. from the golfer's left; 180 = tailwind; 270 =
+    right-to-left), so compass angles are mirrored.
+
+    Args:
+        wind_from_deg: Compass bearing the wind comes from
+        target_bearing_deg: Compass bearing from the hitting position to the target
+
+    Returns:
+        Relative wind direction in [0, 360)
+    """
+    return (target_bearing_deg - wind_from_deg) % 360
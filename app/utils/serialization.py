@@ -0,0 +1,183 @@
+"""
+Response Serialization Fast Path
+
+Trajectory responses carry one dual-unit point per trajectory sample.
+Building them as pydantic models (three DualDistance instances per point)
+and letting FastAPI validate and serialize them again through
+response_model costs more than the JSON itself. The builders here produce
+the same document as plain dicts, and TrustedJSONResponse encodes it with
+orjson, skipping response_model. They also serve include= field
+selections, which leave unselected fields out of the document.
+
+Output is byte-for-byte identical to the pydantic path: every numeric
+field is coerced to float exactly as the models would, and nested models
+(conditions) are dumped with model_dump(mode="json").
+"""
+
+import json
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.utils.conversions import UnitConverter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """Encode content exactly as FastAPI's JSONResponse would."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class TrustedJSONResponse(Response):
+    """
+    JSON response for content already shaped like the route's response_model.
+
+    Returning a Response skips FastAPI's response_model validation, so only
+    use this with payloads from the builders below.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+# Optional fields of the dual-unit trajectory responses, mapped to the
+# calculate_impact_breakdown() parts each needs. adjusted, conditions_used
+# and units_preference are always returned.
+DUAL_FIELD_PARTS: Dict[str, Tuple[str, ...]] = {
+    "baseline": ("baseline",),
+    "impact_breakdown": ("impact_breakdown",),
+    "equivalent_calm_distance": ("baseline",),
+    "trajectory_points": ("trajectory_points",),
+}
+DUAL_CORE_FIELDS = ("adjusted", "conditions_used", "units_preference")
+
+INCLUDE_DESCRIPTION = (
+    "Comma-separated response fields to return (default: all). Fields that "
+    "are not selected are never computed, so e.g. `include=adjusted` only "
+    "runs the simulations behind the adjusted carry and total."
+)
+
+
+def validate_include_param(
+    include: Optional[str],
+    field_parts: Mapping[str, Sequence[str]],
+    core_fields: Sequence[str] = (),
+) -> Optional[FrozenSet[str]]:
+    """
+    Validate an include= field selection (comma-separated field names).
+
+    Core fields are always returned and may be named without effect.
+    Returns None when no selection was made (every field), otherwise the
+    selected optional fields, or raises ValueError.
+    """
+    if include is None:
+        return None
+
+    selected = {name.strip().lower() for name in include.split(",") if name.strip()}
+    unknown = selected.difference(field_parts).difference(core_fields)
+    if unknown:
+        raise ValueError(
+            f"Invalid include field(s): {', '.join(sorted(unknown))}. "
+            f"Valid fields are: {', '.join([*core_fields, *field_parts])}"
+        )
+    return frozenset(selected.intersection(field_parts))
+
+
+def breakdown_parts_for(
+    include: Optional[FrozenSet[str]],
+    field_parts: Mapping[str, Sequence[str]],
+) -> Optional[FrozenSet[str]]:
+    """calculate_impact_breakdown() parts needed for a validated selection."""
+    if include is None:
+        return None
+    return frozenset(part for name in include for part in field_parts[name])
+
+
+_YARDS_TO_METERS = UnitConverter.YARDS_TO_METERS
+
+
+def dual_distance(yards: float) -> Dict[str, float]:
+    """Dual-unit distance dict (same values as build_dual_distance)."""
+    return {
+        "yards": float(round(yards, 1)),
+        "meters": float(round(yards * _YARDS_TO_METERS, 1)),
+    }
+
+
+def _dual_results(results: dict) -> Dict[str, Any]:
+    return {
+        "carry": dual_distance(results["carry_yards"]),
+        "total": dual_distance(results["total_yards"]),
+        "lateral_drift": dual_distance(results["lateral_drift_yards"]),
+        "apex_height": dual_distance(results["apex_height_yards"]),
+        "flight_time_seconds": float(results["flight_time_seconds"]),
+        "landing_angle_deg": float(results["landing_angle_deg"]),
+    }
+
+
+def _dual_points(points: List[dict]) -> List[Dict[str, Dict[str, float]]]:
+    return [
+        {
+            "x": dual_distance(p["x"]),
+            "y": dual_distance(p["y"]),
+            "z": dual_distance(p["z"]),
+        }
+        for p in points
+    ]
+
+
+def build_dual_results_payload(
+    physics_result: dict,
+    conditions_used: Optional[BaseModel],
+    units_preference: str,
+    include: Optional[FrozenSet[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Plain-dict equivalent of DualTrajectoryResponse / GamingTrajectoryResponse.
+
+    Args:
+        physics_result: Result of calculate_impact_breakdown() computed with
+            at least the parts include needs
+        conditions_used: DualConditionsUsed or GamingConditionsUsed (or None)
+        units_preference: Client's stated unit preference
+        include: Selected DUAL_FIELD_PARTS fields (None for all)
+    """
+    payload: Dict[str, Any] = {"adjusted": _dual_results(physics_result["adjusted"])}
+    if include is None or "baseline" in include:
+        payload["baseline"] = _dual_results(physics_result["baseline"])
+    if include is None or "impact_breakdown" in include:
+        breakdown = physics_result["impact_breakdown"]
+        payload["impact_breakdown"] = {
+            "wind_effect": dual_distance(breakdown["wind_effect_yards"]),
+            "wind_lateral": dual_distance(breakdown["wind_lateral_yards"]),
+            "temperature_effect": dual_distance(breakdown["temperature_effect_yards"]),
+            "altitude_effect": dual_distance(breakdown["altitude_effect_yards"]),
+            "humidity_effect": dual_distance(breakdown["humidity_effect_yards"]),
+            "total_adjustment": dual_distance(breakdown["total_adjustment_yards"]),
+        }
+    if include is None or "equivalent_calm_distance" in include:
+        payload["equivalent_calm_distance"] = dual_distance(
+            physics_result["equivalent_calm_distance_yards"]
+        )
+    if include is None or "trajectory_points" in include:
+        payload["trajectory_points"] = _dual_points(physics_result["adjusted"]["trajectory_points"])
+    payload["conditions_used"] = (
+        conditions_used.model_dump(mode="json") if conditions_used is not None else None
+    )
+    payload["units_preference"] = units_preference
+    return payload
@@ -0,0 +1,69 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent calls with the same key share one computation: the first caller
+starts it, later callers await the same result. Nothing is kept once the
+computation finishes (that is what caches are for); this only collapses
+bursts of identical work that arrive before any cache entry exists.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async computations.
+
+    The shared computation runs as its own task, so a caller that gives up
+    (client disconnect) does not cancel it for the others. Results are
+    shared between callers and must be treated as read-only.
+
+    Args:
+        name: Label reported in stats()
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+        self.peak_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return func()'s result, sharing one call among concurrent callers of key."""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.peak_waiters = max(self.peak_waiters, self._waiters[key])
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            self._waiters.pop(key, None)
+        # Mark the exception as retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for metrics endpoints."""
+        calls = self.leaders + self.coalesced
+        return {
+            "name": self.name,
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+            "peak_waiters": self.peak_waiters,
+        }
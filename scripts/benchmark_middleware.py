@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request overhead of the API's middleware stack.
+
+Mounts a trivial authenticated endpoint (GET /api/v1/bench returning a
+small JSON object) on two apps: one bare, one with the same middleware,
+in the same order, as app.main. Both are driven in-process through the
+ASGI interface (no sockets, no test client), so the difference is the
+time the middleware adds to each request.
+
+Request logging is filtered out (as with LOG_LEVEL=WARNING) so terminal
+output does not dominate the numbers. Without REDIS_URL and DATABASE_URL
+the rate limiter and request log skip their I/O, which is what this
+measures: the wrapper cost, not Redis or Postgres latency.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_API_KEY = "golf_benchmark_key"
+os.environ.setdefault(
+    "APIKEY_BENCHMARK", hashlib.sha256(BENCH_API_KEY.encode()).hexdigest()
+)
+
+import structlog  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.main import app as api_app  # noqa: E402
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/v1/bench",
+    "raw_path": b"/api/v1/bench",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [
+        (b"host", b"localhost"),
+        (b"user-agent", b"benchmark"),
+        (b"x-api-key", BENCH_API_KEY.encode()),
+    ],
+    "client": ("127.0.0.1", 50000),
+    "server": ("localhost", 80),
+}
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    """Trivial endpoint app, optionally with app.main's middleware and handlers."""
+    bench = FastAPI()
+
+    @bench.get("/api/v1/bench")
+    async def bench_endpoint():
+        return {"ok": True}
+
+    if with_middleware:
+        bench.user_middleware = list(api_app.user_middleware)
+        bench.exception_handlers = dict(api_app.exception_handlers)
+    return bench
+
+
+async def call(app) -> int:
+    """Run one request through the ASGI app and return its status code."""
+    status = 0
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            await asyncio.sleep(3600)
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(SCOPE, headers=list(SCOPE["headers"])), receive, send)
+    return status
+
+
+async def measure(app, requests: int) -> float:
+    """Mean microseconds per request over a run of sequential requests."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int, rounds: int) -> None:
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    bare = build_app(with_middleware=False)
+    stacked = build_app(with_middleware=True)
+
+    for app in (bare, stacked):
+        status = await call(app)
+        if status != 200:
+            raise SystemExit(f"Benchmark endpoint returned {status}")
+        await measure(app, requests // 10 or 1)  # warm up
+
+    bare_us, stacked_us = [], []
+    for _ in range(rounds):
+        bare_us.append(await measure(bare, requests))
+        stacked_us.append(await measure(stacked, requests))
+
+    bare_median = statistics.median(bare_us)
+    stacked_median = statistics.median(stacked_us)
+    print("Middleware: " + ", ".join(m.cls.__name__ for m in api_app.user_middleware))
+    print(f"Requests:   {requests} x {rounds} rounds (median of rounds)")
+    print(f"Bare app:   {bare_median:8.1f} us/request")
+    print(f"With stack: {stacked_median:8.1f} us/request")
+    print(f"Overhead:   {stacked_median - bare_median:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per app")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds))
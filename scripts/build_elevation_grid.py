@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Build the memory-mapped elevation grid from SRTM .hgt tiles.
+
+Reads 1x1 degree SRTM tiles (SRTM1 3601x3601 or SRTM3 1201x1201 samples,
+big-endian int16 meters, as distributed by NASA/USGS EarthExplorer and
+mirrors such as viewfinderpanoramas.org; plain .hgt or zipped .hgt.zip),
+resamples each to --cells-per-degree, quantizes to --scale meters and
+writes one file for app/services/elevation.py.
+
+Usage:
+    python scripts/build_elevation_grid.py <output.gwdem> <tile or dir>... \\
+        [--cells-per-degree 120] [--scale 1.0]
+
+Example:
+    python scripts/build_elevation_grid.py data/elevation.gwdem srtm/
+
+Then set ELEVATION_GRID_PATH=data/elevation.gwdem. At 120 cells per
+degree (~900 m spacing) each tile takes 29 KB; the contiguous US is
+about 30 MB.
+"""
+
+import argparse
+import io
+import math
+import os
+import re
+import sys
+import time
+import zipfile
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.elevation import write_elevation_grid  # noqa: E402
+
+# SRTM void marker
+HGT_VOID = -32768
+
+TILE_NAME = re.compile(r"([NS])(\d{2})([EW])(\d{3})\.hgt", re.IGNORECASE)
+
+
+def parse_tile_name(name: str) -> Tuple[int, int]:
+    """(south latitude, west longitude) of a tile from its SRTM file name."""
+    match = TILE_NAME.search(os.path.basename(name))
+    if not match:
+        raise ValueError(f"Not an SRTM tile name: {name}")
+    ns, lat, ew, lon = match.groups()
+    return (
+        int(lat) * (1 if ns.upper() == "N" else -1),
+        int(lon) * (1 if ew.upper() == "E" else -1),
+    )
+
+
+def read_hgt(data: bytes) -> np.ndarray:
+    """Decode an .hgt payload into a square float array (NaN for voids)."""
+    side = math.isqrt(len(data) // 2)
+    if side * side * 2 != len(data):
+        raise ValueError(f"Unexpected .hgt size: {len(data)} bytes")
+    samples = np.frombuffer(data, dtype=">i2").reshape(side, side)
+    meters = samples.astype(np.float64)
+    meters[samples == HGT_VOID] = np.nan
+    return meters
+
+
+def resample(meters: np.ndarray, cells_per_degree: int) -> np.ndarray:
+    """Nearest-sample resampling to (cells_per_degree + 1)^2, keeping both edges."""
+    positions = np.round(np.linspace(0, meters.shape[0] - 1, cells_per_degree + 1)).astype(int)
+    return meters[np.ix_(positions, positions)]
+
+
+def iter_tiles(paths: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, .hgt bytes) for every tile in the given files and directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            entries = sorted(os.path.join(path, name) for name in os.listdir(path))
+            yield from iter_tiles([e for e in entries if TILE_NAME.search(os.path.basename(e))])
+        elif path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if TILE_NAME.search(name):
+                        yield name, archive.read(name)
+        else:
+            with io.open(path, "rb") as f:
+                yield path, f.read()
+
+
+def build_tiles(paths: List[str], cells_per_degree: int) -> Dict[Tuple[int, int], np.ndarray]:
+    """Read and resample every tile found under paths."""
+    tiles = {}
+    for name, data in iter_tiles(paths):
+        tiles[parse_tile_name(name)] = resample(read_hgt(data), cells_per_degree)
+    return tiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the elevation grid from SRTM tiles")
+    parser.add_argument("output", help="Output .gwdem path")
+    parser.add_argument("inputs", nargs="+", help=".hgt / .hgt.zip files or directories of them")
+    parser.add_argument("--cells-per-degree", type=int, default=120, help="Grid spacing (default 120)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Quantization step in meters")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tiles = build_tiles(args.inputs, args.cells_per_degree)
+    if not tiles:
+        parser.error("no SRTM tiles found")
+    voids = sum(int(np.isnan(t).sum()) for t in tiles.values())
+    print(f"Read {len(tiles)} tiles in {time.perf_counter() - start:.1f}s ({voids:,} void samples)")
+
+    write_elevation_grid(args.output, tiles, args.cells_per_degree, scale=args.scale)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
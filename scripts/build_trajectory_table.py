@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed trajectory lookup table.
+
+Simulates every point of the grid in app/services/trajectory_table.py,
+measures the interpolation error at every cell midpoint, prints the max
+error per region (ball speed band x launch angle band) and writes the
+table to an .npz file.
+
+Usage:
+    python scripts/build_trajectory_table.py <output.npz> [--coarse]
+
+Example:
+    python scripts/build_trajectory_table.py data/trajectory_table.npz
+
+Then set TRAJECTORY_TABLE_PATH=data/trajectory_table.npz.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services.trajectory_table import (  # noqa: E402
+    DEFAULT_GRID,
+    DISTANCE_OUTPUTS,
+    TABLE_AXES,
+    TABLE_OUTPUTS,
+    build_trajectory_table,
+)
+
+# Small grid for development and smoke tests (builds in a few seconds)
+COARSE_GRID = {
+    "ball_speed_mph": np.arange(80, 181, 25),
+    "launch_angle_deg": np.arange(6, 31, 6),
+    "spin_rate_rpm": np.arange(2000, 8001, 2000),
+    "spin_axis_deg": [0.0],
+    "direction_deg": [0.0],
+    "air_density": [1.0, 1.3],
+    "headwind_mps": [-10.0, 0.0, 10.0],
+    "crosswind_mps": [0.0],
+}
+
+
+def print_region_report(table, errors: np.ndarray) -> None:
+    """Print max interpolation error per ball speed x launch angle region."""
+    speed_axis = table.axes[TABLE_AXES.index("ball_speed_mph")]
+    launch_axis = table.axes[TABLE_AXES.index("launch_angle_deg")]
+    speed_dim = table.interp_dims.index(TABLE_AXES.index("ball_speed_mph"))
+    launch_dim = table.interp_dims.index(TABLE_AXES.index("launch_angle_deg"))
+
+    # Move speed/launch to the front and reduce everything else
+    per_region = np.moveaxis(errors, (speed_dim, launch_dim), (0, 1))
+    per_region = per_region.reshape(per_region.shape[0], per_region.shape[1], -1, len(TABLE_OUTPUTS))
+    per_region = per_region.max(axis=2)
+
+    columns = [TABLE_OUTPUTS.index(name) for name in DISTANCE_OUTPUTS]
+    header = f"{'speed (mph)':>14} {'launch (deg)':>14}" + "".join(
+        f" {name.replace('_yards', ''):>10}" for name in DISTANCE_OUTPUTS
+    ) + f" {'time (s)':>10} {'angle':>8}"
+    print(header)
+    print("-" * len(header))
+    for i in range(per_region.shape[0]):
+        for j in range(per_region.shape[1]):
+            row = per_region[i, j]
+            print(
+                f"{speed_axis[i]:>6.0f}-{speed_axis[i + 1]:<7.0f}"
+                f"{launch_axis[j]:>6.0f}-{launch_axis[j + 1]:<7.0f}"
+                + "".join(f" {row[c]:>10.2f}" for c in columns)
+                + f" {row[TABLE_OUTPUTS.index('flight_time_seconds')]:>10.3f}"
+                + f" {row[TABLE_OUTPUTS.index('landing_angle_deg')]:>8.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the trajectory lookup table")
+    parser.add_argument("output", help="Output .npz path")
+    parser.add_argument("--coarse", action="store_true", help="Use the small development grid")
+    args = parser.parse_args()
+
+    grid = COARSE_GRID if args.coarse else DEFAULT_GRID
+    grid_points = int(np.prod([len(grid[name]) for name in TABLE_AXES]))
+    print(f"Building trajectory table: {grid_points:,} grid points")
+
+    start = time.perf_counter()
+    table, errors = build_trajectory_table(grid)
+    elapsed = time.perf_counter() - start
+
+    print(f"Simulated grid and cell midpoints in {elapsed:.1f}s")
+    print()
+    print("Max interpolation error per region (yards unless noted):")
+    print_region_report(table, errors)
+
+    threshold = settings.TRAJECTORY_TABLE_MAX_ERROR_YARDS
+    usable = float((table.cell_error <= threshold).mean()) * 100
+    print()
+    print(f"Overall max distance error: {table.metadata['max_error_yards']:.2f} yards")
+    print(f"Cells within {threshold} yard threshold: {usable:.1f}%")
+
+    table.save(args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
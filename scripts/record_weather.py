@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Record WeatherAPI.com observations for the replay weather provider.
+
+Fetches current.json for each location and appends the raw responses, one
+JSON object per line, to the output file. Point WEATHER_REPLAY_PATH at it
+and set WEATHER_PROVIDER=replay to serve them back without the upstream.
+
+Usage:
+    python scripts/record_weather.py <output.jsonl> <location>... [--repeat N --interval S]
+
+Locations are anything WeatherAPI.com accepts as q= ("Denver,CO,US",
+"39.74,-104.99", ...). Uses WEATHER_API_KEY from the environment / .env.
+
+Example:
+    python scripts/record_weather.py data/weather_replay.jsonl \\
+        "Denver,CO,US" "Phoenix,AZ,US" "33.75,-84.39"
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+
+
+def record(output: str, locations, repeat: int = 1, interval: float = 0) -> int:
+    """Append one response per location per round; returns how many were written."""
+    written = 0
+    with httpx.Client(base_url=settings.WEATHER_API_BASE_URL, timeout=10) as client, \
+            open(output, "a") as f:
+        for round_number in range(repeat):
+            if round_number:
+                time.sleep(interval)
+            for location in locations:
+                response = client.get(
+                    "/current.json",
+                    params={"key": settings.WEATHER_API_KEY, "q": location, "aqi": "no"},
+                )
+                if response.status_code != 200:
+                    print(f"{location}: HTTP {response.status_code}, skipped")
+                    continue
+                f.write(json.dumps(response.json()) + "\n")
+                written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record observations for the replay provider")
+    parser.add_argument("output", help="JSON lines file to append to")
+    parser.add_argument("locations", nargs="+", help="WeatherAPI.com q= values")
+    parser.add_argument("--repeat", type=int, default=1, help="Rounds to record (default 1)")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between rounds")
+    args = parser.parse_args()
+
+    if not settings.WEATHER_API_KEY:
+        parser.error("WEATHER_API_KEY is not configured")
+
+    written = record(args.output, args.locations, args.repeat, args.interval)
+    print(f"Wrote {written} observations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
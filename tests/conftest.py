@@ -7,6 +7,7 @@ because settings are loaded at import time.
 
 import os
 import hashlib
+import math
 
 # Set up a test API key for testing purposes
 # This MUST happen before any app imports
@@ -36,3 +37,31 @@ def setup_test_environment():
         os.environ.pop("APIKEY_TEST_CLIENT", None)
     else:
         os.environ["APIKEY_TEST_CLIENT"] = original_value
+
+
+class TokenBucketRedis:
+    """
+    Redis stand-in for the rate limiter: runs TOKEN_BUCKET_SCRIPT's
+    arithmetic in Python with the clock stopped (buckets never refill).
+    """
+
+    def __init__(self, fail=False):
+        self.buckets = {}
+        self.calls = 0
+        self.fail = fail
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            self.calls += 1
+            if self.fail:
+                raise ConnectionError("redis down")
+            rate, capacity, want, need, floor, refund = (float(a) for a in args)
+            tokens = min(capacity, self.buckets.get(keys[0], capacity) + refund)
+            granted = min(want, math.floor(tokens - floor))
+            if granted < need:
+                granted = 0
+            self.buckets[keys[0]] = tokens - granted
+            retry_after = 0 if granted else max(1, math.ceil((need + floor - tokens) / rate))
+            return [int(granted), str(tokens - granted), retry_after]
+
+        return run
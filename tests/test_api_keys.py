@@ -0,0 +1,213 @@
+"""
+Tests for the API key cache, invalidation and buffered usage counters.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.middleware import authentication
+from app.middleware.authentication import check_database_key
+from app.services import api_keys
+from app.services.api_keys import ApiKeyCache, get_api_key_cache, invalidate_api_key
+
+client = TestClient(app)
+
+DB_KEY = "golf_database_issued_key"
+DB_KEY_HASH = hashlib.sha256(DB_KEY.encode()).hexdigest()
+
+CALCULATE_BODY = {
+    "ball_speed": 150,
+    "launch_angle": 12,
+    "spin_rate": 3000,
+    "conditions_override": {
+        "wind_speed": 5,
+        "wind_direction": 0,
+        "temperature": 70,
+        "humidity": 50,
+        "altitude": 0,
+        "air_pressure": 29.92,
+    },
+}
+
+
+class FakeConnection:
+    """Records queries against an in-memory admin_api_keys table."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def fetchrow(self, query, key_hash):
+        self.db.selects += 1
+        return self.db.rows.get(key_hash)
+
+    async def execute(self, query, *args):
+        if self.db.fail_writes:
+            raise ConnectionError("database down")
+        self.db.updates.append(args)
+        return "UPDATE 1"
+
+
+class FakePool:
+    """Just enough of an asyncpg pool for authentication."""
+
+    def __init__(self):
+        self.rows = {
+            DB_KEY_HASH: {"id": 7, "client_name": "bay_group", "tier": "standard", "status": "active"},
+        }
+        self.selects = 0
+        self.updates = []
+        self.fail_writes = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Fresh key cache backed by a fake database, with flushing left to the test."""
+    pool = FakePool()
+
+    async def get_pool():
+        return pool
+
+    monkeypatch.setattr(authentication, "get_auth_db_pool", get_pool)
+    monkeypatch.setattr(api_keys, "_api_key_cache", ApiKeyCache(100, 60, 30))
+    monkeypatch.setattr(settings, "API_KEY_USAGE_FLUSH_SECONDS", 3600)
+    return pool
+
+
+class TestKeyLookups:
+    """Tests for cached key resolution."""
+
+    def test_lookups_cached(self, db):
+        """Repeated requests should hit the database once and not update per request."""
+        async def scenario():
+            return [await check_database_key(DB_KEY_HASH) for _ in range(5)]
+
+        assert asyncio.run(scenario()) == [("bay_group", 7)] * 5
+        assert db.selects == 1
+        assert db.updates == []
+
+    def test_unknown_key_cached(self, db):
+        """Unknown keys should be remembered instead of queried every time."""
+        async def scenario():
+            return [await check_database_key("0" * 64) for _ in range(3)]
+
+        assert asyncio.run(scenario()) == [(None, None)] * 3
+        assert db.selects == 1
+
+    def test_invalidation_picks_up_status_change(self, db):
+        """A disabled key should be rejected until it is re-enabled and invalidated."""
+        db.rows[DB_KEY_HASH]["status"] = "disabled"
+
+        async def scenario():
+            rejected = await check_database_key(DB_KEY_HASH)
+            db.rows[DB_KEY_HASH]["status"] = "active"
+            still_cached = await check_database_key(DB_KEY_HASH)
+            await invalidate_api_key(7)
+            return rejected, still_cached, await check_database_key(DB_KEY_HASH)
+
+        rejected, still_cached, accepted = asyncio.run(scenario())
+        assert rejected == (None, None)
+        assert still_cached == (None, None)
+        assert accepted == ("bay_group", 7)
+
+    def test_lookup_racing_invalidation_not_cached(self, db):
+        """A row read before an invalidation should not be cached after it."""
+        cache = get_api_key_cache()
+        generation = cache.generation
+        cache.invalidate(7)
+        cache.set(DB_KEY_HASH, api_keys.ApiKeyRecord(7, "bay_group", "standard", "active"), generation)
+        assert cache.get(DB_KEY_HASH) is api_keys.MISSING
+
+    def test_database_key_authenticates_request(self, db):
+        """Database-issued keys should pass the auth middleware."""
+        response = client.post(
+            "/api/v1/calculate", json=CALCULATE_BODY, headers={"X-API-Key": DB_KEY}
+        )
+        assert response.status_code == 200
+        assert db.selects == 1
+
+
+class TestUsageFlush:
+    """Tests for buffered usage counters."""
+
+    def test_counters_flushed_in_one_update(self, db):
+        """Usage for many requests should be written as one aggregated UPDATE."""
+        async def scenario():
+            for _ in range(4):
+                await check_database_key(DB_KEY_HASH)
+            await get_api_key_cache().flush()
+
+        asyncio.run(scenario())
+        assert len(db.updates) == 1
+        ids, counts, last_used = db.updates[0]
+        assert ids == [7]
+        assert counts == [4]
+        assert get_api_key_cache().stats()["flushed_requests"] == 4
+
+    def test_failed_flush_keeps_counters(self, db):
+        """Counters should survive a failed write and go out with the next flush."""
+        async def scenario():
+            await check_database_key(DB_KEY_HASH)
+            db.fail_writes = True
+            await get_api_key_cache().flush()
+            await check_database_key(DB_KEY_HASH)
+            db.fail_writes = False
+            await get_api_key_cache().flush()
+
+        asyncio.run(scenario())
+        assert [args[1] for args in db.updates] == [[2]]
+        assert get_api_key_cache().stats()["flush_errors"] == 1
+
+
+class TestInvalidationListener:
+    """Tests for pub/sub invalidation."""
+
+    def test_published_ids_invalidate(self, db, monkeypatch):
+        """Messages on the channel should drop the named key."""
+        class FakePubSub:
+            async def subscribe(self, channel):
+                assert channel == api_keys.INVALIDATION_CHANNEL
+
+            async def listen(self):
+                yield {"type": "subscribe", "data": 1}
+                yield {"type": "message", "data": "7"}
+                raise asyncio.CancelledError
+
+            async def aclose(self):
+                pass
+
+        class FakeRedis:
+            def pubsub(self):
+                return FakePubSub()
+
+        import app.redis_client
+
+        monkeypatch.setattr(app.redis_client, "get_redis_client", lambda: FakeRedis())
+        cache = get_api_key_cache()
+
+        async def scenario():
+            await check_database_key(DB_KEY_HASH)
+            with pytest.raises(asyncio.CancelledError):
+                await cache.listen_for_invalidations()
+            await check_database_key(DB_KEY_HASH)
+
+        asyncio.run(scenario())
+        # Subscribing clears everything, the message drops key 7 again
+        assert cache.invalidations == 2
+        assert db.selects == 2
@@ -0,0 +1,55 @@
+"""
+Tests for the in-process LRU/TTL cache.
+"""
+
+from app.utils import cache as cache_module
+from app.utils.cache import LRUTTLCache
+
+
+class TestLRUTTLCache:
+    """Tests for LRUTTLCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Lookups should be counted as hits or misses."""
+        cache = LRUTTLCache(10, name="test")
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry should be evicted when full."""
+        cache = LRUTTLCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        """Entries older than the TTL should be treated as misses."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = LRUTTLCache(10, ttl_seconds=60)
+        cache.set("a", 1)
+        now[0] += 59
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_clear_resets(self):
+        """clear() should drop entries and counters."""
+        cache = LRUTTLCache(10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
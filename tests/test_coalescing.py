@@ -0,0 +1,160 @@
+"""
+Tests for single-flight coalescing of physics requests.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.models.requests import ShotData, WeatherConditions
+from app.services import coalescing
+from app.services.coalescing import get_coalescing_stats, run_impact_breakdown
+from app.services.physics import calculate_impact_breakdown
+from app.utils.singleflight import SingleFlight
+
+SHOT = ShotData(ball_speed_mph=120, launch_angle_deg=16, spin_rate_rpm=7000)
+CONDITIONS = WeatherConditions(wind_speed_mph=65, wind_direction_deg=180)
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight utility."""
+
+    def test_concurrent_identical_calls_share_one(self):
+        """Concurrent callers of one key should share a single computation."""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": 42}
+
+        async def scenario():
+            return await asyncio.gather(*(flight.do("k", compute) for _ in range(20)))
+
+        results = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert all(r == {"value": 42} for r in results)
+        stats = flight.stats()
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 19
+        assert stats["peak_waiters"] == 20
+        assert stats["in_flight"] == 0
+
+    def test_different_keys_not_coalesced(self):
+        """Different keys should compute independently."""
+        flight = SingleFlight()
+
+        async def scenario():
+            return await asyncio.gather(
+                flight.do("a", lambda: asyncio.sleep(0.01, "a")),
+                flight.do("b", lambda: asyncio.sleep(0.01, "b")),
+            )
+
+        assert asyncio.run(scenario()) == ["a", "b"]
+        assert flight.stats()["coalesced"] == 0
+
+    def test_nothing_retained_after_completion(self):
+        """Once finished, the next call should compute again."""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        async def scenario():
+            return [await flight.do("k", compute), await flight.do("k", compute)]
+
+        assert asyncio.run(scenario()) == [1, 2]
+
+    def test_errors_reach_every_caller(self):
+        """An exception should propagate to all coalesced callers."""
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def scenario():
+            return await asyncio.gather(
+                *(flight.do("k", compute) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        """A caller that goes away should not cancel the shared computation."""
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0.005)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(scenario()) == "done"
+
+
+class TestBreakdownCoalescing:
+    """Tests for run_impact_breakdown."""
+
+    @pytest.fixture
+    def counted(self, monkeypatch):
+        calls = []
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return calculate_impact_breakdown(*args, **kwargs)
+
+        monkeypatch.setattr(coalescing, "calculate_impact_breakdown", counting)
+        return calls
+
+    def test_burst_runs_once(self, counted, monkeypatch):
+        """A burst of identical requests should run the physics once."""
+        monkeypatch.setattr(settings, "PHYSICS_COALESCING_ENABLED", True)
+        before = get_coalescing_stats()["coalesced"]
+
+        async def scenario():
+            return await asyncio.gather(
+                *(run_impact_breakdown(SHOT, CONDITIONS, api_type="gaming") for _ in range(12))
+            )
+
+        results = asyncio.run(scenario())
+        assert len(counted) == 1
+        assert all(r is results[0] for r in results)
+        assert results[0] == calculate_impact_breakdown(SHOT, CONDITIONS, api_type="gaming")
+        assert get_coalescing_stats()["coalesced"] - before == 11
+
+    def test_api_type_not_shared(self, counted, monkeypatch):
+        """Gaming and professional requests for the same shot must not coalesce."""
+        monkeypatch.setattr(settings, "PHYSICS_COALESCING_ENABLED", True)
+
+        async def scenario():
+            return await asyncio.gather(
+                run_impact_breakdown(SHOT, CONDITIONS, api_type="gaming"),
+                run_impact_breakdown(SHOT, CONDITIONS, api_type="professional"),
+            )
+
+        asyncio.run(scenario())
+        assert len(counted) == 2
+
+    def test_disabled(self, counted, monkeypatch):
+        """With coalescing off every request should compute."""
+        monkeypatch.setattr(settings, "PHYSICS_COALESCING_ENABLED", False)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(run_impact_breakdown(SHOT, CONDITIONS) for _ in range(3))
+            )
+
+        asyncio.run(scenario())
+        assert len(counted) == 3
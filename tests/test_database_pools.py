@@ -0,0 +1,118 @@
+"""
+Tests for the shared database pool and its workload budgets.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app import database
+from app.database import DatabasePools, PoolWorkload, get_db_pools
+
+
+class FakePool:
+    """asyncpg pool stand-in with unlimited connections."""
+
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, timeout=None):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                pool.acquired += 1
+                return object()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+    def get_size(self):
+        return 3
+
+    def get_idle_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 12
+
+
+class TestPoolWorkload:
+    """Tests for per-workload connection budgets."""
+
+    def test_budget_limits_concurrent_connections(self):
+        """A workload should never hold more connections than its budget."""
+        workload = PoolWorkload(FakePool(), "auth", budget=2)
+        peak = 0
+
+        async def query():
+            nonlocal peak
+            async with workload.acquire():
+                peak = max(peak, workload.in_use)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(*(query() for _ in range(6)))
+
+        asyncio.run(scenario())
+        stats = workload.stats()
+        assert peak == 2
+        assert stats["acquires"] == 6
+        assert stats["waited"] == 4
+        assert stats["in_use"] == 0
+        assert stats["wait_ms_max"] > 5
+
+    def test_acquire_times_out_when_budget_exhausted(self, monkeypatch):
+        """Waiting beyond the acquire timeout should raise and be counted."""
+        monkeypatch.setattr(settings, "DB_POOL_ACQUIRE_TIMEOUT_SECONDS", 0.02)
+        workload = PoolWorkload(FakePool(), "admin", budget=1)
+
+        async def scenario():
+            async with workload.acquire():
+                with pytest.raises(asyncio.TimeoutError):
+                    async with workload.acquire():
+                        pass
+
+        asyncio.run(scenario())
+        assert workload.stats()["timeouts"] == 1
+
+    def test_workloads_do_not_share_budgets(self):
+        """A saturated workload should not hold back another one."""
+        pools = DatabasePools(FakePool(), {"admin": 1, "auth": 1})
+
+        async def scenario():
+            async with pools.workload("admin").acquire():
+                async with pools.workload("auth").acquire():
+                    return pools.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["workloads"]["admin"]["saturation"] == 1.0
+        assert stats["workloads"]["auth"]["waited"] == 0
+        assert stats["max_size"] == 12
+
+
+class TestPoolSetup:
+    """Tests for pool creation and warm-up."""
+
+    def test_no_database_configured(self, monkeypatch):
+        """Without DATABASE_URL there should be no pool."""
+        monkeypatch.setattr(settings, "DATABASE_URL", "")
+        assert asyncio.run(get_db_pools()) is None
+
+    def test_auth_query_warmed_on_new_connections(self):
+        """New connections should run the registered hot queries."""
+        from app.middleware.authentication import API_KEY_LOOKUP_QUERY
+
+        class Connection:
+            def __init__(self):
+                self.queries = []
+
+            async def fetch(self, query, *args):
+                self.queries.append((query, args))
+
+        conn = Connection()
+        asyncio.run(database._init_connection(conn))
+        assert (API_KEY_LOOKUP_QUERY, ("",)) in conn.queries
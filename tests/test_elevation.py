@@ -0,0 +1,195 @@
+"""
+Tests for the memory-mapped elevation grid and its build tool.
+
+tests/fixtures/elevation_sample.gwdem covers N39W105 and N39W106 (around
+Denver) at 12 cells per degree. It was built with
+scripts/build_elevation_grid.py from synthetic SRTM tiles of the plane
+_plane_m() below, with one void sample at 39.5N 105.5W.
+"""
+
+import asyncio
+import importlib.util
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app import redis_client
+from tests.conftest import TEST_API_KEY
+
+from app.main import app
+from app.services import elevation, weather, weather_cache, weather_providers
+from app.services.elevation import ElevationGrid, load_elevation_grid, write_elevation_grid
+from app.services.weather_providers import ReplayWeatherProvider
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "elevation_sample.gwdem")
+
+_spec = importlib.util.spec_from_file_location(
+    "build_elevation_grid",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "scripts", "build_elevation_grid.py"),
+)
+build_elevation_grid = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_elevation_grid)
+
+
+def _plane_m(lat, lon):
+    return 1610 + 800 * (-104.99 - lon) + 50 * (lat - 39.74)
+
+
+def _write_hgt(path, south, west, side=121):
+    lats = south + 1 - np.arange(side) / (side - 1)
+    lons = west + np.arange(side) / (side - 1)
+    samples = np.round(_plane_m(lats[:, None], lons[None, :])).astype(">i2")
+    samples.tofile(path)
+
+
+@pytest.fixture
+def grid():
+    """The bundled fixture grid."""
+    grid = ElevationGrid(FIXTURE)
+    yield grid
+    grid.close()
+
+
+class TestElevationGrid:
+    """Tests for lookups."""
+
+    def test_denver(self, grid):
+        """Downtown Denver should sit at about 1610 m (5283 ft)."""
+        assert grid.elevation_m(39.74, -104.99) == pytest.approx(1610, abs=1)
+        assert grid.elevation_ft(39.74, -104.99) == pytest.approx(5283, abs=4)
+
+    def test_bilinear_between_samples(self, grid):
+        """Points between samples should interpolate (exact on a plane, up to quantization)."""
+        rng = np.random.default_rng(7)
+        for lat, lon in zip(rng.uniform(39.0, 39.99, 50), rng.uniform(-104.99, -104.0, 50)):
+            assert grid.elevation_m(lat, lon) == pytest.approx(_plane_m(lat, lon), abs=1)
+
+    def test_tile_edges(self, grid):
+        """The shared edge of two tiles should agree from both sides."""
+        west = grid.elevation_m(39.5, -105.0000001)
+        east = grid.elevation_m(39.5, -105.0)
+        assert west == pytest.approx(east, abs=0.01)
+
+    def test_no_coverage(self, grid):
+        """Outside the tiles, or next to a void, there is no answer."""
+        assert grid.elevation_m(40.5, -105.0) is None
+        assert grid.elevation_m(39.5, -107.0) is None
+        assert grid.elevation_m(39.51, -105.49) is None
+        assert grid.stats()["no_data"] == 3
+
+    def test_rejects_other_files(self, tmp_path):
+        """A file that is not a grid should not load."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\x00" * 128)
+        with pytest.raises(ValueError):
+            ElevationGrid(str(path))
+        assert load_elevation_grid(str(path)) is None
+
+    def test_missing_tiles_in_bounding_box(self, tmp_path):
+        """Tiles absent from a sparse bounding box should report no coverage."""
+        path = str(tmp_path / "sparse.gwdem")
+        tile = np.full((3, 3), 100.0)
+        write_elevation_grid(path, {(10, 10): tile, (12, 12): tile * 2}, cells_per_degree=2)
+        grid = ElevationGrid(path)
+        assert grid.elevation_m(10.5, 10.5) == 100.0
+        assert grid.elevation_m(12.5, 12.5) == 200.0
+        assert grid.elevation_m(11.5, 11.5) is None
+        grid.close()
+
+
+class TestBuildTool:
+    """Tests for scripts/build_elevation_grid.py."""
+
+    def test_tile_names(self):
+        """SRTM names should map to the tile's south-west corner."""
+        assert build_elevation_grid.parse_tile_name("N39W105.hgt") == (39, -105)
+        assert build_elevation_grid.parse_tile_name("s34e151.HGT") == (-34, 151)
+
+    def test_builds_from_plain_and_zipped_tiles(self, tmp_path):
+        """Plain and zipped .hgt tiles should produce a grid matching the source."""
+        _write_hgt(tmp_path / "N39W105.hgt", 39, -105)
+        _write_hgt(tmp_path / "N39W106.hgt", 39, -106)
+        with zipfile.ZipFile(tmp_path / "N39W106.hgt.zip", "w") as archive:
+            archive.write(tmp_path / "N39W106.hgt", "N39W106.hgt")
+        os.remove(tmp_path / "N39W106.hgt")
+
+        tiles = build_elevation_grid.build_tiles(
+            [str(tmp_path / "N39W105.hgt"), str(tmp_path / "N39W106.hgt.zip")], 24
+        )
+        assert sorted(tiles) == [(39, -106), (39, -105)]
+        assert tiles[(39, -105)].shape == (25, 25)
+
+        path = str(tmp_path / "out.gwdem")
+        write_elevation_grid(path, tiles, 24)
+        grid = ElevationGrid(path)
+        assert grid.elevation_m(39.3, -105.7) == pytest.approx(_plane_m(39.3, -105.7), abs=1)
+        grid.close()
+
+
+class TestCoordinateWeather:
+    """Tests for altitude in coordinate weather."""
+
+    def test_altitude_from_grid(self, grid, monkeypatch):
+        """Coordinate weather should carry the grid elevation of the exact point."""
+        monkeypatch.setattr(elevation, "_elevation_grid", grid)
+        monkeypatch.setattr(elevation, "_grid_load_attempted", True)
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+        monkeypatch.setattr(
+            weather_cache, "_weather_cache", weather_cache.WeatherCache(10, 300, 600, 3600)
+        )
+
+        async def fetch(lat, lon):
+            return {"altitude_ft": 0, "wind_speed_mph": 5.0}
+
+        monkeypatch.setattr(weather, "_fetch_current_by_coords", fetch)
+
+        async def scenario():
+            denver = await weather.fetch_weather_by_coords(39.74, -104.99)
+            # Same cache entry (rounded coordinates), different point
+            nearby = await weather.fetch_weather_by_coords(39.741, -104.994)
+            offshore = await weather.fetch_weather_by_coords(20.0, -150.0)
+            return denver, nearby, offshore
+
+        denver, nearby, offshore = asyncio.run(scenario())
+        assert denver["altitude_ft"] == pytest.approx(5283, abs=4)
+        assert nearby["altitude_ft"] > denver["altitude_ft"]
+        assert offshore["altitude_ft"] == 0
+
+    def test_altitude_clamped_to_engine_range(self, tmp_path, monkeypatch):
+        """Points outside the engine's altitude range should be clamped, not fail."""
+        path = str(tmp_path / "extremes.gwdem")
+        write_elevation_grid(
+            path,
+            # Dead Sea shore and the Himalaya
+            {(31, 35): np.full((3, 3), -420.0), (27, 86): np.full((3, 3), 8800.0)},
+            cells_per_degree=2,
+        )
+        grid = ElevationGrid(path)
+        monkeypatch.setattr(elevation, "_elevation_grid", grid)
+        monkeypatch.setattr(elevation, "_grid_load_attempted", True)
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+        monkeypatch.setattr(
+            weather_cache, "_weather_cache", weather_cache.WeatherCache(10, 300, 600, 3600)
+        )
+        monkeypatch.setattr(
+            weather_providers, "_weather_provider", ReplayWeatherProvider([], 0, 0, 0)
+        )
+
+        response = TestClient(app).post(
+            "/api/v1/calculate",
+            json={
+                "ball_speed": 150, "launch_angle": 12, "spin_rate": 3000,
+                "location": {"lat": 31.5, "lng": 35.5},
+            },
+            headers={"X-API-Key": TEST_API_KEY},
+        )
+        assert response.status_code == 200
+        assert response.json()["conditions"]["altitude_ft"] == -500
+
+        everest = asyncio.run(weather.fetch_weather_by_coords(27.5, 86.5))
+        assert everest["altitude_ft"] == 15000
+        grid.close()
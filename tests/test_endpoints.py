@@ -2,12 +2,15 @@
 Tests for API endpoints.
 """
 
+import hashlib
+
 import pytest
 from fastapi.testclient import TestClient
 
 # Import test API key from conftest (this also sets up the env var)
 from tests.conftest import TEST_API_KEY
 
+from app.config import settings
 from app.main import app
 
 
@@ -370,3 +373,22 @@ class TestValidation:
             },
         )
         assert response.status_code == 422
+
+
+class TestAdminMetricsEndpoint:
+    """Tests for GET /api/v1/admin/metrics."""
+
+    def test_requires_admin_key(self):
+        """Metrics should not be served without an admin key."""
+        response = client.get("/api/v1/admin/metrics")
+        assert response.status_code == 403
+
+    def test_reports_physics_memo(self, monkeypatch):
+        """Metrics should include per-component memo counters."""
+        admin_key = "admin_key_for_unit_tests_only"
+        monkeypatch.setattr(settings, "ADMIN_KEY_HASH", hashlib.sha256(admin_key.encode()).hexdigest())
+        response = client.get("/api/v1/admin/metrics", headers={"X-Admin-Key": admin_key})
+        assert response.status_code == 200
+        components = response.json()["physics_memo"]["components"]
+        assert set(components) == {"baseline", "adjusted", "no_wind", "temperature", "humidity"}
+        assert "hits" in components["baseline"]
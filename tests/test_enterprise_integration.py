@@ -7,6 +7,8 @@ Tests the enhanced /api/v1/calculate endpoint with:
 - Backward compatibility (requests without metadata still work)
 """
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from tests.conftest import TEST_API_KEY
@@ -486,3 +488,146 @@ class TestDualUnitData:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+BATCH_CONDITIONS = {
+    "wind_speed": 10,
+    "wind_direction": 0,
+    "temperature": 72,
+    "humidity": 50,
+    "altitude": 0,
+    "air_pressure": 29.92
+}
+
+
+class TestBatchCalculate:
+    """Tests for the /api/v1/calculate/batch endpoint."""
+
+    def _shots(self, count):
+        return [
+            {"ball_speed": 120 + i, "launch_angle": 14, "spin_rate": 6000,
+             "metadata": {"player_id": f"p{i}"}}
+            for i in range(count)
+        ]
+
+    def test_json_array_in_input_order(self):
+        """Results should come back as an array in input order."""
+        response = client.post(
+            "/api/v1/calculate/batch",
+            headers=AUTH_HEADERS,
+            json={"shots": self._shots(5), "conditions_override": BATCH_CONDITIONS}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["metadata"]["player_id"] for item in data] == [f"p{i}" for i in range(5)]
+        carries = [item["trajectory"]["carry_distance_yards"] for item in data]
+        assert carries == sorted(carries)
+
+    def test_ndjson_stream(self, monkeypatch):
+        """NDJSON should return one result per line across chunks."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "BATCH_PHYSICS_CHUNK_SIZE", 2)
+
+        response = client.post(
+            "/api/v1/calculate/batch?format=ndjson",
+            headers=AUTH_HEADERS,
+            json={"shots": self._shots(5), "conditions_override": BATCH_CONDITIONS}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [item["metadata"]["player_id"] for item in lines] == [f"p{i}" for i in range(5)]
+
+    def test_matches_single_calculate(self):
+        """Each batch result should match the single-shot endpoint."""
+        shot = {"ball_speed": 150, "launch_angle": 12, "spin_rate": 3000, "spin_axis": 5}
+        single = client.post(
+            "/api/v1/calculate",
+            headers=AUTH_HEADERS,
+            json={**shot, "conditions_override": BATCH_CONDITIONS}
+        ).json()
+        batch = client.post(
+            "/api/v1/calculate/batch",
+            headers=AUTH_HEADERS,
+            json={"shots": [shot], "conditions_override": BATCH_CONDITIONS}
+        ).json()
+
+        for key in ("conditions", "trajectory", "analysis", "insights", "recommendations",
+                    "adjusted", "baseline", "impact_breakdown"):
+            assert batch[0][key] == single[key]
+
+    def test_per_shot_override_wins(self):
+        """A shot's own conditions should take precedence over the shared ones."""
+        shots = self._shots(2)
+        shots[1]["conditions_override"] = {**BATCH_CONDITIONS, "wind_speed": 25, "wind_direction": 180}
+        response = client.post(
+            "/api/v1/calculate/batch",
+            headers=AUTH_HEADERS,
+            json={"shots": shots, "conditions_override": BATCH_CONDITIONS}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["conditions"]["wind_speed_mph"] == 10
+        assert data[1]["conditions"]["wind_speed_mph"] == 25
+
+    def test_per_shot_only(self):
+        """Shots may each carry their own conditions with no shared source."""
+        shots = self._shots(2)
+        for shot in shots:
+            shot["conditions_override"] = BATCH_CONDITIONS
+        response = client.post(
+            "/api/v1/calculate/batch", headers=AUTH_HEADERS, json={"shots": shots}
+        )
+        assert response.status_code == 200
+
+    def test_missing_conditions_rejected(self):
+        """Shots without any weather source should fail validation."""
+        shots = self._shots(2)
+        shots[0]["conditions_override"] = BATCH_CONDITIONS
+        response = client.post(
+            "/api/v1/calculate/batch", headers=AUTH_HEADERS, json={"shots": shots}
+        )
+        assert response.status_code == 422
+
+    def test_too_many_shots_rejected(self):
+        """Batches above the maximum size should fail validation."""
+        from app.models.requests import MAX_BATCH_SHOTS
+
+        response = client.post(
+            "/api/v1/calculate/batch",
+            headers=AUTH_HEADERS,
+            json={"shots": self._shots(MAX_BATCH_SHOTS + 1), "conditions_override": BATCH_CONDITIONS}
+        )
+        assert response.status_code == 422
+
+    def test_batch_counts_against_rate_limit(self, monkeypatch):
+        """A batch of N shots should consume N requests of quota."""
+        import app.redis_client as redis_module
+        from app.middleware import rate_limiting
+        from app.middleware.rate_limiting import RATE_LIMIT_BURSTS, RATE_LIMITS, RateLimiter
+        from tests.conftest import TokenBucketRedis
+
+        fake = TokenBucketRedis()
+        monkeypatch.setattr(redis_module, "get_redis_client", lambda: fake)
+        monkeypatch.setattr(rate_limiting, "_rate_limiter", RateLimiter())
+        monkeypatch.setitem(RATE_LIMITS, "default", 6)
+        monkeypatch.setitem(RATE_LIMIT_BURSTS, "default", 6)
+
+        def used():
+            return 6 - sum(fake.buckets.values())
+
+        body = {"shots": self._shots(4), "conditions_override": BATCH_CONDITIONS}
+        first = client.post("/api/v1/calculate/batch", headers=AUTH_HEADERS, json=body)
+        assert first.status_code == 200
+        assert used() == 4
+
+        # 9 more would go beyond a minute of borrowed quota; the extra shots
+        # are not charged
+        body = {"shots": self._shots(9), "conditions_override": BATCH_CONDITIONS}
+        second = client.post("/api/v1/calculate/batch", headers=AUTH_HEADERS, json=body)
+        assert second.status_code == 429
+        assert second.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+        assert used() == 5
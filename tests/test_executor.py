@@ -0,0 +1,120 @@
+"""
+Tests for the physics execution backend.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.models.requests import ShotData, WeatherConditions
+from app.services import executor as executor_module
+from app.services.executor import PhysicsExecutor, PhysicsOverloadedError
+from app.services.physics import calculate_impact_breakdown
+
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+SHOT = ShotData(ball_speed_mph=120, launch_angle_deg=16, spin_rate_rpm=7000)
+CONDITIONS = WeatherConditions(wind_speed_mph=10, wind_direction_deg=45)
+
+
+class TestPhysicsExecutor:
+    """Tests for PhysicsExecutor backends and queue bounds."""
+
+    @pytest.mark.parametrize("backend", ["inline", "thread", "process"])
+    def test_backends_match_direct_call(self, backend):
+        """Every backend should return the same result as a direct call."""
+        executor = PhysicsExecutor(backend, max_workers=2)
+        executor.start()
+        try:
+            result = asyncio.run(executor.run(calculate_impact_breakdown, SHOT, CONDITIONS))
+        finally:
+            executor.shutdown()
+        assert result == calculate_impact_breakdown(SHOT, CONDITIONS)
+
+    def test_unknown_backend_rejected(self):
+        """An unknown backend name should raise ValueError."""
+        with pytest.raises(ValueError):
+            PhysicsExecutor("gpu")
+
+    def test_full_queue_rejects(self):
+        """Calls beyond max_workers + max_queue should fail fast."""
+        executor = PhysicsExecutor("thread", max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = asyncio.ensure_future(executor.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(PhysicsOverloadedError):
+                await executor.run(sum, [1, 2])
+            release.set()
+            await blocked
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["peak_in_flight"] == 1
+
+    def test_event_loop_stays_responsive(self):
+        """Cheap coroutines should keep running while physics is busy."""
+        executor = PhysicsExecutor("thread", max_workers=2)
+        executor.start()
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            task = asyncio.ensure_future(ticker())
+            await asyncio.gather(
+                *(executor.run(calculate_impact_breakdown, SHOT, CONDITIONS, engine="sequential")
+                  for _ in range(4))
+            )
+            task.cancel()
+            return ticks
+
+        try:
+            ticks = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert ticks > 1
+
+
+class TestOverloadResponse:
+    """Tests for the 503 returned when the physics queue is full."""
+
+    def test_returns_503(self, monkeypatch):
+        """A full physics queue should surface as 503 with Retry-After."""
+
+        class FullExecutor(PhysicsExecutor):
+            async def run(self, func, *args, **kwargs):
+                raise PhysicsOverloadedError("full")
+
+        monkeypatch.setattr(executor_module, "_physics_executor", FullExecutor("inline"))
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        response = client.post(
+            "/api/v1/trajectory",
+            headers=AUTH_HEADERS,
+            json={
+                "shot": {"ball_speed_mph": 150, "launch_angle_deg": 12, "spin_rate_rpm": 3000},
+                "conditions": {},
+            },
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"]["code"] == "PHYSICS_OVERLOADED"
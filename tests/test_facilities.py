@@ -0,0 +1,259 @@
+"""
+Tests for the facility registry and facility-based weather.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.services import facilities
+from app.services.facilities import FacilityRecord, FacilityRegistry
+from app.utils.conversions import compass_to_relative_wind
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+SHOT = {"ball_speed": 150, "launch_angle": 12, "spin_rate": 3000}
+
+
+class FakeWeather:
+    """Stands in for fetch_weather_by_coords; counts calls."""
+
+    def __init__(self, wind_direction_deg=270.0, fail=False):
+        self.calls = 0
+        self.wind_direction_deg = wind_direction_deg
+        self.fail = fail
+        self.age_seconds = 0
+
+    async def fetch(self, lat, lon):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {
+            "location": f"{lat},{lon}",
+            "wind_speed_mph": 10.0,
+            "wind_direction_deg": self.wind_direction_deg,
+            "temperature_f": 70.0,
+            "humidity_pct": 50.0,
+            "altitude_ft": 1000.0,
+            "pressure_inhg": 29.92,
+            "conditions_text": "Sunny",
+            "fetched_at": datetime.utcnow() - timedelta(seconds=self.age_seconds),
+            "observed_at": datetime.utcnow() - timedelta(seconds=self.age_seconds),
+        }
+
+
+def _registry(*records):
+    registry = FacilityRegistry(
+        refresh_seconds=3600, prefetch_concurrency=4, max_snapshot_age_seconds=3600
+    )
+    registry.set_facilities(records)
+    return registry
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake weather lookups."""
+    from app.services import weather
+
+    fake = FakeWeather()
+    monkeypatch.setattr(weather, "fetch_weather_by_coords", fake.fetch)
+    return fake
+
+
+class TestRelativeWind:
+    """Tests for compass to target-relative wind conversion."""
+
+    def test_conversion(self):
+        """Wind from the direction the bays face is a headwind."""
+        assert compass_to_relative_wind(270, 270) == 0
+        assert compass_to_relative_wind(90, 270) == 180
+        assert compass_to_relative_wind(10, 350) == 340
+
+    def test_crosswind_sides(self):
+        """Wind from the golfer's left is left-to-right (90), from the right 270."""
+        # Bays facing west: south is on the left, north on the right
+        assert compass_to_relative_wind(180, 270) == 90
+        assert compass_to_relative_wind(0, 270) == 270
+
+
+class TestRegistry:
+    """Tests for the in-memory registry."""
+
+    def test_served_from_memory_after_refresh(self, upstream):
+        """After a refresh, lookups should not call the upstream."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+
+        async def scenario():
+            await registry.refresh_weather()
+            for _ in range(5):
+                found = await registry.conditions("acme", "range_1")
+            await registry.close()
+            return found
+
+        record, weather = asyncio.run(scenario())
+        assert record.facility_id == "range_1"
+        assert weather["wind_speed_mph"] == 10.0
+        assert weather["observation_age_seconds"] is not None
+        assert upstream.calls == 1
+        assert registry.stats()["memory_hits"] == 5
+
+    def test_scoped_by_client(self, upstream):
+        """Another client's facility ID should not resolve."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+
+        async def scenario():
+            found = await registry.conditions("other", "range_1")
+            await registry.close()
+            return found
+
+        assert asyncio.run(scenario()) is None
+
+    def test_missing_snapshot_fetched_once(self, upstream):
+        """A facility without a snapshot yet should be fetched and then kept."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+        registry.start = lambda: None  # No background refresh
+
+        async def scenario():
+            await registry.conditions("acme", "range_1")
+            await registry.conditions("acme", "range_1")
+
+        asyncio.run(scenario())
+        assert upstream.calls == 1
+        assert registry.stats()["memory_misses"] == 1
+
+    def test_failed_prefetch_keeps_snapshot(self, upstream):
+        """A failed refresh should leave the previous weather in place."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+
+        async def scenario():
+            await registry.refresh_weather()
+            upstream.fail = True
+            await registry.refresh_weather()
+            found = await registry.conditions("acme", "range_1")
+            await registry.close()
+            return found
+
+        assert asyncio.run(scenario()) is not None
+        assert registry.stats()["prefetch_errors"] == 1
+
+    def test_expired_snapshot_not_served(self, upstream):
+        """A snapshot past the stale-if-error window should go back to the weather lookup."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+        registry.start = lambda: None
+        upstream.age_seconds = 7200
+        asyncio.run(registry.refresh_weather())
+
+        # Lookup fails too (past its own stale-if-error window): an error, not old weather
+        upstream.fail = True
+        with pytest.raises(RuntimeError):
+            asyncio.run(registry.conditions("acme", "range_1"))
+
+        upstream.fail = False
+        upstream.age_seconds = 0
+        record, weather = asyncio.run(registry.conditions("acme", "range_1"))
+        assert weather["observation_age_seconds"] < 60
+        assert upstream.calls == 3
+        assert registry.stats()["expired_snapshots"] == 1
+
+    def test_moved_facility_drops_snapshot(self, upstream):
+        """Changing a facility's location should discard its old weather."""
+        registry = _registry(FacilityRecord("acme", "range_1", 33.75, -84.39))
+        asyncio.run(registry.refresh_weather())
+        registry.set_facilities([FacilityRecord("acme", "range_1", 40.0, -105.0)])
+        assert registry.stats()["weather_snapshots"] == 0
+
+
+class TestFacilityEndpoints:
+    """Tests for facility_id requests on /calculate."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch, upstream):
+        registry = _registry(
+            FacilityRecord("test_client", "range_1", 33.75, -84.39, altitude_ft=320.0,
+                           target_bearing_deg=270.0),
+        )
+        registry.start = lambda: None
+        monkeypatch.setattr(facilities, "_facility_registry", registry)
+        return registry
+
+    def test_calculate_with_facility_id(self, registry):
+        """metadata.facility_id alone should supply the conditions."""
+        response = client.post(
+            "/api/v1/calculate",
+            json={**SHOT, "metadata": {"facility_id": "range_1", "bay_number": 3}},
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 200
+        conditions = response.json()["conditions"]
+        assert conditions["source"] == "facility"
+        # West wind, bays facing west: straight into the golfer's face
+        assert conditions["wind_direction_deg"] == 0
+        assert conditions["altitude_ft"] == 320.0
+        assert conditions["location"] == {"lat": 33.75, "lng": -84.39}
+
+    def test_facility_crosswind_drift(self, registry, upstream):
+        """A wind from the golfer's left should push the ball right."""
+        # Bays face west, so a south wind comes from the left
+        upstream.wind_direction_deg = 180.0
+        response = client.post(
+            "/api/v1/calculate",
+            json={**SHOT, "metadata": {"facility_id": "range_1"}},
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["conditions"]["wind_direction_deg"] == 90
+        assert data["adjusted"]["lateral_drift"]["yards"] > 0
+
+    def test_unknown_facility(self, registry):
+        """An unregistered facility should be a 404."""
+        response = client.post(
+            "/api/v1/calculate",
+            json={**SHOT, "metadata": {"facility_id": "nowhere"}},
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 404
+
+    def test_no_weather_source(self):
+        """Without location, override or facility the request is invalid."""
+        response = client.post(
+            "/api/v1/calculate",
+            json={**SHOT, "metadata": {"bay_number": 3}},
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 422
+
+    def test_batch_with_facility_id(self, registry, upstream):
+        """Batch shots should resolve their facility once."""
+        response = client.post(
+            "/api/v1/calculate/batch",
+            json={"shots": [{**SHOT, "metadata": {"facility_id": "range_1"}}] * 3},
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 200
+        assert [r["conditions"]["source"] for r in response.json()] == ["facility"] * 3
+        assert upstream.calls == 1
+
+
+class TestFacilityAdmin:
+    """Tests for the facility admin endpoints."""
+
+    @pytest.mark.parametrize("altitude_ft", [-1000, 15001])
+    def test_rejects_out_of_range_altitude(self, monkeypatch, altitude_ft):
+        """Altitudes the physics engine cannot use should be refused at registration."""
+        admin_key = "admin_key_for_unit_tests_only"
+        monkeypatch.setattr(settings, "ADMIN_KEY_HASH", hashlib.sha256(admin_key.encode()).hexdigest())
+        response = client.put(
+            "/api/v1/admin/facilities/acme/range_1",
+            json={"latitude": 31.5, "longitude": 35.5, "altitude_ft": altitude_ft},
+            headers={"X-Admin-Key": admin_key},
+        )
+        assert response.status_code == 422
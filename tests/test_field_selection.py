@@ -0,0 +1,240 @@
+"""
+Tests for include=/fields= response field selection.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.models.requests import ShotData, WeatherConditions
+from app.services import physics
+from app.services.physics import calculate_impact_breakdown
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+SHOT = ShotData(ball_speed_mph=150, launch_angle_deg=12, spin_rate_rpm=3000)
+WINDY = WeatherConditions(
+    wind_speed_mph=10,
+    wind_direction_deg=30,
+    temperature_f=85,
+    humidity_pct=65,
+    altitude_ft=3000,
+    pressure_inhg=29.92,
+)
+CALM = WINDY.model_copy(update={"wind_speed_mph": 0})
+
+OVERRIDE = {
+    "wind_speed": 10,
+    "wind_direction": 30,
+    "temperature": 85,
+    "humidity": 65,
+    "altitude": 3000,
+    "air_pressure": 29.92,
+}
+TRAJECTORY_BODY = {
+    "shot": SHOT.model_dump(),
+    "conditions": WINDY.model_dump(),
+}
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    """Compute every response instead of answering from the result cache."""
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def simulated_rows(monkeypatch):
+    """Record how many trajectories each fused batch integrates."""
+    rows = []
+    original = physics.calculate_trajectory_batch
+
+    def counting(*columns, **kwargs):
+        rows.append(len(columns[0]))
+        return original(*columns, **kwargs)
+
+    monkeypatch.setattr(settings, "PHYSICS_MEMO_ENABLED", False)
+    monkeypatch.setattr(physics, "calculate_trajectory_batch", counting)
+    return rows
+
+
+def _shape(result: dict) -> dict:
+    """Adjusted result without the per-run fields."""
+    return {
+        k: v for k, v in result.items() if k not in ("trajectory_points", "integration_steps")
+    }
+
+
+class TestBreakdownParts:
+    """Tests for calculate_impact_breakdown(parts=...)."""
+
+    @pytest.mark.parametrize("api_type", ["professional", "gaming"])
+    @pytest.mark.parametrize("wind_speed", [0, 10, 60, 120])
+    def test_selection_never_changes_values(self, api_type, wind_speed):
+        """Selected values should be identical to the full breakdown's."""
+        conditions = WINDY.model_copy(update={"wind_speed_mph": wind_speed})
+        full = calculate_impact_breakdown(SHOT, conditions, api_type)
+
+        lean = calculate_impact_breakdown(SHOT, conditions, api_type, parts=())
+        assert set(lean) == {"adjusted", "api_type", "integration"}
+        assert _shape(lean["adjusted"]) == _shape(full["adjusted"])
+
+        with_breakdown = calculate_impact_breakdown(
+            SHOT, conditions, api_type, parts=("impact_breakdown",)
+        )
+        assert with_breakdown["impact_breakdown"] == full["impact_breakdown"]
+        assert "baseline" not in with_breakdown
+
+    def test_unselected_variants_not_simulated(self, simulated_rows):
+        """Carry-only requests should skip the temperature/humidity variants."""
+        calculate_impact_breakdown(SHOT, WINDY)
+        calculate_impact_breakdown(SHOT, WINDY, parts=())
+        calculate_impact_breakdown(SHOT, CALM, parts=())
+        # Full: 5 variants; windy carry-only: baseline, adjusted, no_wind;
+        # calm carry-only: adjusted and no_wind coincide, no baseline needed
+        assert simulated_rows == [5, 3, 1]
+
+    def test_points_only_when_selected(self, monkeypatch):
+        """Adjusted trajectory points should only be recorded for trajectory_points."""
+        monkeypatch.setattr(settings, "PHYSICS_MEMO_ENABLED", False)
+        lean = calculate_impact_breakdown(SHOT, WINDY, parts=())
+        with_points = calculate_impact_breakdown(SHOT, WINDY, parts=("trajectory_points",))
+        assert lean["adjusted"]["trajectory_points"] == []
+        assert len(with_points["adjusted"]["trajectory_points"]) > 10
+
+    def test_memo_entry_without_points_not_reused_for_points(self, monkeypatch):
+        """A memoized run without points should not answer a request for points."""
+        monkeypatch.setattr(settings, "PHYSICS_MEMO_ENABLED", True)
+        shot = SHOT.model_copy(update={"ball_speed_mph": 143.7})
+        calculate_impact_breakdown(shot, WINDY, parts=())
+        with_points = calculate_impact_breakdown(shot, WINDY, parts=("trajectory_points",))
+        assert len(with_points["adjusted"]["trajectory_points"]) > 10
+
+    def test_unknown_part_rejected(self):
+        """Unknown parts should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown breakdown parts"):
+            calculate_impact_breakdown(SHOT, WINDY, parts=("insights",))
+
+
+class TestTrajectoryInclude:
+    """Tests for include= on /trajectory and gaming /trajectory."""
+
+    def test_carry_only_response(self):
+        """include=adjusted should return only the core fields, with full-response values."""
+        full = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY).json()
+        response = client.post(
+            "/api/v1/trajectory?include=adjusted", headers=AUTH_HEADERS, json=TRAJECTORY_BODY
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"adjusted", "conditions_used", "units_preference"}
+        assert data["adjusted"] == full["adjusted"]
+
+    def test_fields_alias(self):
+        """fields= should select fields like include=."""
+        response = client.post(
+            "/api/v1/trajectory?fields=baseline,equivalent_calm_distance",
+            headers=AUTH_HEADERS,
+            json=TRAJECTORY_BODY,
+        )
+        data = response.json()
+        assert "baseline" in data
+        assert data["equivalent_calm_distance"]["yards"] == data["baseline"]["carry"]["yards"]
+        assert "trajectory_points" not in data
+        assert "impact_breakdown" not in data
+
+    def test_invalid_field_rejected(self):
+        """Unknown field names should return 400."""
+        response = client.post(
+            "/api/v1/trajectory?include=adjusted,insights", headers=AUTH_HEADERS, json=TRAJECTORY_BODY
+        )
+        assert response.status_code == 400
+        assert "insights" in response.json()["error"]["message"]
+
+    def test_gaming_trajectory_points_only(self):
+        """Gaming requests should honour include= as well."""
+        body = {"shot": SHOT.model_dump(), "conditions_override": OVERRIDE}
+        response = client.post(
+            "/api/v1/gaming/trajectory?include=trajectory_points", headers=AUTH_HEADERS, json=body
+        )
+        data = response.json()
+        assert set(data) == {"adjusted", "trajectory_points", "conditions_used", "units_preference"}
+        assert len(data["trajectory_points"]) > 10
+        assert data["conditions_used"]["source"] == "override"
+
+
+class TestCalculateInclude:
+    """Tests for include= on /calculate."""
+
+    BODY = {
+        "ball_speed": 150,
+        "launch_angle": 12,
+        "spin_rate": 3000,
+        "conditions_override": OVERRIDE,
+    }
+
+    def test_trajectory_only(self):
+        """include=trajectory should drop analysis, insights and recommendations."""
+        full = client.post("/api/v1/calculate", headers=AUTH_HEADERS, json=self.BODY).json()
+        data = client.post(
+            "/api/v1/calculate?include=trajectory", headers=AUTH_HEADERS, json=self.BODY
+        ).json()
+
+        assert set(data) == {
+            "request_id", "timestamp", "metadata", "conditions", "trajectory", "adjusted",
+        }
+        assert data["trajectory"] == full["trajectory"]
+
+    def test_selected_fields_match_full_response(self):
+        """Selected optional fields should equal the full response's."""
+        full = client.post("/api/v1/calculate", headers=AUTH_HEADERS, json=self.BODY).json()
+        data = client.post(
+            "/api/v1/calculate?include=recommendations,analysis",
+            headers=AUTH_HEADERS,
+            json=self.BODY,
+        ).json()
+
+        assert data["recommendations"] == full["recommendations"]
+        assert data["analysis"] == full["analysis"]
+        assert "insights" not in data
+        assert "baseline" not in data
+
+    def test_etag_kept_with_selection(self, monkeypatch):
+        """Field-selected override responses should still carry an ETag."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+        response = client.post(
+            "/api/v1/calculate?include=insights", headers=AUTH_HEADERS, json=self.BODY
+        )
+        etag = response.headers["ETag"]
+        assert response.json()["insights"]
+
+        repeat = client.post(
+            "/api/v1/calculate?include=insights",
+            headers={**AUTH_HEADERS, "If-None-Match": etag},
+            json=self.BODY,
+        )
+        assert repeat.status_code == 304
+
+    def test_etag_differs_per_selection(self, monkeypatch):
+        """Different selections have different bodies, so they must not share an ETag."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+        insights = client.post(
+            "/api/v1/calculate?include=insights", headers=AUTH_HEADERS, json=self.BODY
+        )
+        breakdown = client.post(
+            "/api/v1/calculate?include=impact_breakdown", headers=AUTH_HEADERS, json=self.BODY
+        )
+        assert insights.headers["ETag"] != breakdown.headers["ETag"]
+
+        other = client.post(
+            "/api/v1/calculate?include=impact_breakdown",
+            headers={**AUTH_HEADERS, "If-None-Match": insights.headers["ETag"]},
+            json=self.BODY,
+        )
+        assert other.status_code == 200
+        assert "impact_breakdown" in other.json()
@@ -0,0 +1,192 @@
+"""
+Tests for the hourly forecast trajectory planner (/api/v1/forecast/trajectory).
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import redis_client
+from tests.conftest import TEST_API_KEY
+
+from app.main import app
+from app.models.requests import ShotData, WeatherConditions
+from app.services import weather, weather_cache, weather_providers
+from app.services.physics import calculate_impact_breakdown
+from app.services.weather_client import CircuitBreaker, WeatherClient
+from app.services.weather_providers import (
+    ReplayWeatherProvider,
+    WeatherAPIProvider,
+    WeatherObservation,
+)
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+DENVER = {"lat": 39.74, "lng": -104.99}
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Instant replay provider with fresh in-process caches."""
+    monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+    monkeypatch.setattr(
+        weather_cache, "_weather_cache", weather_cache.WeatherCache(10, 300, 600, 3600)
+    )
+    monkeypatch.setattr(
+        weather_cache, "_forecast_cache",
+        weather_cache.WeatherCache(10, 1800, 1800, 3600, name="forecast"),
+    )
+    provider = ReplayWeatherProvider([], 0, 0, 0)
+    monkeypatch.setattr(weather_providers, "_weather_provider", provider)
+    return provider
+
+
+def _plan(**body):
+    return client.post("/api/v1/forecast/trajectory", json=body, headers=AUTH_HEADERS)
+
+
+class TestForecastEndpoint:
+    """Tests for the planner response."""
+
+    def test_matrix_shape(self, replay):
+        """Rows should follow the hours and columns the shots."""
+        response = _plan(
+            coordinates=DENVER,
+            hours=12,
+            shots=[
+                {"club": "driver"},
+                {"club": "7_iron", "label": "7i"},
+                {"ball_speed": 120, "launch_angle": 18, "spin_rate": 7000},
+            ],
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["hours"]) == 12
+        assert data["shots"] == ["driver", "7i", "shot_3"]
+        for field in ("carry_yards", "total_yards", "lateral_drift_yards"):
+            assert len(data[field]) == 12
+            assert all(len(row) == 3 for row in data[field])
+        assert all(row[0] > row[1] for row in data["carry_yards"])
+        assert len(data["conditions"]["temperature_f"]) == 12
+
+    def test_forecast_fetched_once(self, replay):
+        """Repeated plans for one location should share one upstream call."""
+        for hours in (6, 24):
+            assert _plan(coordinates=DENVER, hours=hours, shots=[{"club": "pw"}]).status_code == 200
+        assert replay.stats()["calls"] == 1
+
+    def test_matches_single_calculation(self, replay):
+        """A cell should equal the adjusted carry of a single calculation for that hour."""
+        data = _plan(coordinates=DENVER, hours=3, shots=[{"club": "driver"}], handicap=0).json()
+        conditions = data["conditions"]
+        hour = 2
+        result = calculate_impact_breakdown(
+            ShotData(ball_speed_mph=167, launch_angle_deg=11.2, spin_rate_rpm=2600),
+            WeatherConditions(
+                wind_speed_mph=conditions["wind_speed_mph"][hour],
+                wind_direction_deg=conditions["wind_direction_deg"][hour],
+                temperature_f=conditions["temperature_f"][hour],
+                altitude_ft=data["altitude_ft"],
+                humidity_pct=conditions["humidity_pct"][hour],
+                pressure_inhg=conditions["pressure_inhg"][hour],
+            ),
+        )
+        assert data["carry_yards"][hour][0] == round(result["adjusted"]["carry_yards"], 1)
+
+    def test_relative_wind(self, replay):
+        """With a target bearing, winds should be relative to it."""
+        compass = _plan(coordinates=DENVER, hours=4, shots=[{"club": "driver"}]).json()
+        relative = _plan(
+            coordinates=DENVER, hours=4, shots=[{"club": "driver"}], target_bearing_deg=90
+        ).json()
+        for raw, converted in zip(
+            compass["conditions"]["wind_direction_deg"], relative["conditions"]["wind_direction_deg"]
+        ):
+            assert converted == (90 - raw) % 360
+
+    def test_crosswind_drift_side(self, replay, monkeypatch):
+        """A south wind should push shots right facing west and left facing east."""
+        south_wind = WeatherObservation(
+            "Denver", 15.0, 180, 70.0, 40, 29.92, "Sunny", latitude=39.74, longitude=-104.99
+        )
+        monkeypatch.setattr(
+            weather_providers, "_weather_provider", ReplayWeatherProvider([south_wind], 0, 0, 0)
+        )
+
+        west = _plan(coordinates=DENVER, hours=2, shots=[{"club": "7_iron"}],
+                     target_bearing_deg=270).json()
+        east = _plan(coordinates=DENVER, hours=2, shots=[{"club": "7_iron"}],
+                     target_bearing_deg=90).json()
+        # Facing west the south wind comes from the left (left-to-right)
+        assert west["conditions"]["wind_direction_deg"] == [90, 90]
+        assert all(row[0] > 0 for row in west["lateral_drift_yards"])
+        assert east["conditions"]["wind_direction_deg"] == [270, 270]
+        assert all(row[0] < 0 for row in east["lateral_drift_yards"])
+
+    def test_city(self, replay):
+        """A city forecast should take altitude from the city table."""
+        response = _plan(
+            location={"city": "Denver", "state": "CO"}, hours=2, shots=[{"club": "driver"}]
+        )
+        assert response.status_code == 200
+        assert response.json()["altitude_ft"] == 5280
+
+    @pytest.mark.parametrize("body", [
+        {"coordinates": DENVER, "shots": [{"ball_speed": 150}]},
+        {"coordinates": DENVER, "shots": [{"club": "putter"}]},
+        {"shots": [{"club": "driver"}]},
+        {"coordinates": DENVER, "hours": 49, "shots": [{"club": "driver"}]},
+        {"coordinates": DENVER, "shots": []},
+    ])
+    def test_validation(self, body):
+        """Incomplete shots, unknown clubs, no location and out-of-range sizes are rejected."""
+        assert _plan(**body).status_code == 422
+
+
+class TestForecastData:
+    """Tests for forecast fetching."""
+
+    def test_weatherapi_forecast(self, monkeypatch):
+        """forecast.json hours should be normalized from the current hour on."""
+        now = int(time.time() // 3600 * 3600)
+        requests = []
+
+        def upstream(request):
+            requests.append(request.url.params)
+            hours = [
+                {
+                    "time_epoch": now + 3600 * offset,
+                    "temp_f": 60.0 + offset, "wind_mph": 5.0, "wind_degree": 180,
+                    "pressure_in": 30.0, "humidity": 50, "condition": {"text": "Clear"},
+                }
+                for offset in range(-3, 30)
+            ]
+            return httpx.Response(200, json={
+                "location": {"name": "Denver", "region": "Colorado", "country": "USA",
+                             "lat": 39.74, "lon": -104.99},
+                "forecast": {"forecastday": [{"hour": hours[:24]}, {"hour": hours[24:]}]},
+            })
+
+        weather_client = WeatherClient(
+            "https://weather.test/v1", 4, 1.0, 2.0, 0, 0.001, CircuitBreaker(5, 30),
+            transport=httpx.MockTransport(upstream),
+        )
+        monkeypatch.setattr(weather_providers, "get_weather_client", lambda: weather_client)
+        provider = WeatherAPIProvider("test-key")
+
+        observations = asyncio.run(provider.forecast_by_coords(39.74, -104.99, 12))
+        assert len(observations) == 12
+        assert observations[0].temperature_f == 60.0
+        assert requests[0]["days"] == "2"
+
+    def test_passed_hours_dropped(self):
+        """Hours that passed while the forecast was cached should not be served."""
+        now = int(time.time() // 3600 * 3600)
+        forecast = {"hours": [{"time_epoch": now + 3600 * offset} for offset in range(-2, 5)]}
+        assert [h["time_epoch"] for h in weather._upcoming(forecast, 3)["hours"]] == [
+            now, now + 3600, now + 7200
+        ]
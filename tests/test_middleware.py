@@ -0,0 +1,245 @@
+"""
+Tests for the ASGI middleware stack (request context, security headers,
+authentication and rate limiting).
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY, TokenBucketRedis
+
+from app.config import settings
+from app.main import app
+from app.middleware import rate_limiting
+from app.middleware.rate_limiting import RateLimiter, RateLimitMiddleware
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+CALCULATE_BODY = {
+    "ball_speed": 150,
+    "launch_angle": 12,
+    "spin_rate": 3000,
+    "conditions_override": {
+        "wind_speed": 5,
+        "wind_direction": 0,
+        "temperature": 70,
+        "humidity": 50,
+        "altitude": 0,
+        "air_pressure": 29.92,
+    },
+}
+
+
+def _use_redis(monkeypatch, redis):
+    import app.redis_client
+
+    monkeypatch.setattr(app.redis_client, "get_redis_client", lambda: redis)
+    monkeypatch.setattr(rate_limiting, "_rate_limiter", RateLimiter())
+
+
+class TestRequestContext:
+    """Tests for request IDs and version headers."""
+
+    def test_request_id_and_version_headers(self):
+        """Every response should carry a fresh request ID and the API version."""
+        first = client.get("/api/v1/health")
+        second = client.get("/api/v1/health")
+        assert first.headers["X-API-Version"]
+        assert first.headers["X-Request-ID"] != second.headers["X-Request-ID"]
+
+    def test_headers_on_error_responses(self):
+        """Responses produced by middleware should get the context headers too."""
+        response = client.get("/api/v1/conditions?city=Denver")
+        assert response.status_code == 401
+        assert "X-Request-ID" in response.headers
+
+
+class TestSecurityHeaders:
+    """Tests for security headers."""
+
+    def test_security_headers_present(self):
+        """Responses should carry the standard security headers."""
+        response = client.get("/api/v1/health")
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "connect-src 'self'" in response.headers["Content-Security-Policy"]
+        assert "Strict-Transport-Security" not in response.headers
+
+    def test_hsts_only_over_https(self):
+        """HSTS should only be sent for HTTPS requests."""
+        response = client.get("https://testserver/api/v1/health")
+        assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+
+
+class TestAuthentication:
+    """Tests for API key authentication."""
+
+    def test_missing_key(self):
+        """API requests without a key should get MISSING_API_KEY."""
+        response = client.post("/api/v1/calculate", json=CALCULATE_BODY)
+        assert response.status_code == 401
+        assert response.json()["error"]["code"] == "MISSING_API_KEY"
+
+    def test_invalid_key(self):
+        """Unknown keys should get INVALID_API_KEY."""
+        response = client.post(
+            "/api/v1/calculate", json=CALCULATE_BODY, headers={"X-API-Key": "nope"}
+        )
+        assert response.status_code == 401
+        assert response.json()["error"]["code"] == "INVALID_API_KEY"
+
+    def test_public_paths_skip_auth(self):
+        """Public reference endpoints should not need a key."""
+        assert client.get("/api/v1/gaming/presets").status_code == 200
+
+
+class TestRateLimiting:
+    """Tests for the Redis rate limiter."""
+
+    def test_headers_on_allowed_requests(self, monkeypatch):
+        """Allowed requests should report the remaining quota."""
+        _use_redis(monkeypatch, TokenBucketRedis())
+        response = client.post("/api/v1/calculate", json=CALCULATE_BODY, headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "1000"
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+
+    def test_over_limit_returns_429(self, monkeypatch):
+        """Clients over their limit should get a 429 with Retry-After."""
+        redis = TokenBucketRedis()
+        redis.buckets["ratelimit:test_client"] = 0
+        _use_redis(monkeypatch, redis)
+        response = client.post("/api/v1/calculate", json=CALCULATE_BODY, headers=AUTH_HEADERS)
+        assert response.status_code == 429
+        assert response.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+        # One token refills in 60/1000 s
+        assert response.headers["Retry-After"] == "1"
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_redis_failure_allows_request(self, monkeypatch):
+        """Requests should go through when Redis is failing."""
+        _use_redis(monkeypatch, TokenBucketRedis(fail=True))
+        response = client.post("/api/v1/calculate", json=CALCULATE_BODY, headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+        assert rate_limiting.get_rate_limit_stats()["errors"] == 1
+
+    def test_failing_endpoint_runs_once(self, monkeypatch):
+        """An endpoint that raises should not be retried by the limiter."""
+        _use_redis(monkeypatch, TokenBucketRedis())
+        calls = []
+        failing = FastAPI()
+
+        @failing.get("/boom")
+        async def boom():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        failing.add_middleware(RateLimitMiddleware)
+        response = TestClient(failing, raise_server_exceptions=False).get("/boom")
+        assert response.status_code == 500
+        assert len(calls) == 1
+
+
+class TestTokenBucket:
+    """Tests for RateLimiter burst handling, leases and charges."""
+
+    def test_burst_then_limited(self):
+        """A client should get its burst back-to-back, then be refused."""
+        redis = TokenBucketRedis()
+        limiter = RateLimiter()
+
+        async def scenario():
+            return [(await limiter.check(redis, "free")).allowed for _ in range(12)]
+
+        assert asyncio.run(scenario()) == [True] * 10 + [False] * 2
+        assert redis.calls == 12
+
+    def test_leased_client_mostly_skips_redis(self, monkeypatch):
+        """Lease clients should spend local tokens and only call Redis per lease."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_LEASE_SIZE", 50)
+        redis = TokenBucketRedis()
+        limiter = RateLimiter()
+
+        async def scenario():
+            return [await limiter.check(redis, "enterprise") for _ in range(120)]
+
+        decisions = asyncio.run(scenario())
+        assert all(d.allowed for d in decisions)
+        assert redis.calls == 3
+        # Leased tokens are already taken from the shared bucket
+        assert redis.buckets["ratelimit:enterprise"] == 2000 - 150
+        assert decisions[-1].remaining == 2000 - 120
+        assert limiter.stats()["lease_hits"] == 117
+
+    def test_expired_lease_refunded(self, monkeypatch):
+        """Unspent tokens of an expired lease should go back to the bucket."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_LEASE_SIZE", 50)
+        monkeypatch.setattr(settings, "RATE_LIMIT_LEASE_TTL_MS", 0)
+        redis = TokenBucketRedis()
+        limiter = RateLimiter()
+
+        async def scenario():
+            await limiter.check(redis, "inrange_prod")
+            await limiter.check(redis, "inrange_prod")
+
+        asyncio.run(scenario())
+        assert redis.calls == 2
+        # Two requests admitted, 49 unspent tokens returned, one lease held
+        assert redis.buckets["ratelimit:inrange_prod"] == 2000 - 1 - 50
+
+    def test_unleased_client_ignores_lease_settings(self):
+        """Clients not listed for leases should check Redis on every request."""
+        redis = TokenBucketRedis()
+        limiter = RateLimiter()
+
+        async def scenario():
+            for _ in range(5):
+                await limiter.check(redis, "professional")
+
+        asyncio.run(scenario())
+        assert redis.calls == 5
+        assert redis.buckets["ratelimit:professional"] == 500 - 5
+
+    def test_charge_borrows_up_to_a_minute(self):
+        """Charges larger than the burst should go through, up to one minute of debt."""
+        redis = TokenBucketRedis()
+        limiter = RateLimiter()
+
+        async def scenario():
+            return [
+                await limiter.charge(redis, "standard", 900),
+                await limiter.check(redis, "standard"),
+                await limiter.charge(redis, "standard", 300),
+            ]
+
+        borrowed, request, too_much = asyncio.run(scenario())
+        assert borrowed.allowed
+        assert redis.buckets["ratelimit:standard"] == 100 - 900
+        # In debt: requests wait for the refill, larger charges are refused
+        assert not request.allowed
+        # 801 tokens at 1000/minute
+        assert request.retry_after == 49
+        assert not too_much.allowed
+
+
+class TestStreaming:
+    """Tests for responses streamed through the stack."""
+
+    def test_ndjson_batch_gets_headers(self):
+        """Streaming responses should pass through with all headers."""
+        body = {
+            "shots": [{"ball_speed": 140 + i, "launch_angle": 12, "spin_rate": 3000} for i in range(3)],
+            "conditions_override": CALCULATE_BODY["conditions_override"],
+        }
+        response = client.post(
+            "/api/v1/calculate/batch?format=ndjson", json=body, headers=AUTH_HEADERS
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "X-Request-ID" in response.headers
+        assert len(response.text.strip().splitlines()) == 3
@@ -11,9 +11,15 @@ from app.services.physics import (
     calculate_lift_coefficient,
     calculate_wind_components,
     calculate_trajectory,
+    calculate_trajectory_batch,
     calculate_impact_breakdown,
+    calculate_impact_breakdown_batch,
+    clear_breakdown_memo,
+    get_breakdown_memo_stats,
+    BATCH_VECTORIZE_MIN_SHOTS,
     STANDARD_AIR_DENSITY,
 )
+from app.config import settings
 from app.models.requests import ShotData, WeatherConditions
 
 
@@ -415,3 +421,251 @@ class TestImpactBreakdown:
 
         # Baseline should be the same regardless of conditions
         assert result1["baseline"]["carry_yards"] == result2["baseline"]["carry_yards"]
+
+
+class TestTrajectoryBatch:
+    """Tests for the vectorized batch trajectory engine."""
+
+    SHOTS = [
+        # (ball_speed, launch, spin, spin_axis, direction, density, headwind, crosswind)
+        (167, 10.9, 2686, 0, 0, STANDARD_AIR_DENSITY, 0, 0),  # Driver
+        (120, 16.3, 7097, 0, 0, STANDARD_AIR_DENSITY, 0, 0),  # 7-iron
+        (102, 24.2, 9304, 0, 0, STANDARD_AIR_DENSITY, 0, 0),  # Pitching wedge
+        (150, 12.0, 3000, -15, 2, 1.10, 6, -3),  # Draw into a quartering wind
+        (140, 14.0, 4500, 20, -3, 1.30, -8, 4),  # Fade downwind in cold air
+        (60, 45.0, 10000, 0, 0, STANDARD_AIR_DENSITY, 20, 0),  # Ballooning lob
+    ]
+
+    @staticmethod
+    def _columns(shots):
+        names = [
+            "ball_speed_mph",
+            "launch_angle_deg",
+            "spin_rate_rpm",
+            "spin_axis_deg",
+            "direction_deg",
+            "air_density",
+            "headwind_mps",
+            "crosswind_mps",
+        ]
+        return {name: [shot[i] for shot in shots] for i, name in enumerate(names)}
+
+    def _assert_matches_scalar(self, shots, results):
+        for shot, batch_result in zip(shots, results):
+            scalar_result = calculate_trajectory(*shot)
+            for key in (
+                "carry_yards",
+                "total_yards",
+                "lateral_drift_yards",
+                "apex_height_yards",
+                "landing_angle_deg",
+            ):
+                assert abs(batch_result[key] - scalar_result[key]) <= 0.1
+            assert abs(batch_result["flight_time_seconds"] - scalar_result["flight_time_seconds"]) <= 0.01
+            assert len(batch_result["trajectory_points"]) == len(scalar_result["trajectory_points"])
+
+    def test_small_batch_matches_scalar(self):
+        """Small batches should match the scalar engine shot for shot."""
+        results = calculate_trajectory_batch(**self._columns(self.SHOTS))
+        assert len(results) == len(self.SHOTS)
+        self._assert_matches_scalar(self.SHOTS, results)
+
+    def test_vectorized_batch_matches_scalar(self):
+        """Vectorized batches should match the scalar engine within tolerance."""
+        shots = self.SHOTS * (BATCH_VECTORIZE_MIN_SHOTS // len(self.SHOTS) + 1)
+        results = calculate_trajectory_batch(**self._columns(shots))
+        assert len(results) == len(shots)
+        self._assert_matches_scalar(shots, results)
+
+    def test_early_landing_shots_are_masked(self):
+        """Short shots should stop integrating while longer shots keep flying."""
+        shots = [self.SHOTS[0], self.SHOTS[2]] * BATCH_VECTORIZE_MIN_SHOTS
+        results = calculate_trajectory_batch(**self._columns(shots))
+        driver, wedge = results[0], results[1]
+        assert wedge["flight_time_seconds"] != driver["flight_time_seconds"]
+        assert wedge["carry_yards"] < driver["carry_yards"]
+
+    def test_scalar_inputs_broadcast(self):
+        """Scalar parameters should broadcast across the batch."""
+        results = calculate_trajectory_batch(
+            ball_speed_mph=[120, 150, 170],
+            launch_angle_deg=14,
+            spin_rate_rpm=3000,
+            spin_axis_deg=0,
+            direction_deg=0,
+            air_density=STANDARD_AIR_DENSITY,
+            headwind_mps=0,
+            crosswind_mps=0,
+        )
+        carries = [r["carry_yards"] for r in results]
+        assert carries == sorted(carries)
+
+    def test_skip_point_recording(self):
+        """Carry-only batches should skip trajectory points but keep results."""
+        shots = self.SHOTS * (BATCH_VECTORIZE_MIN_SHOTS // len(self.SHOTS) + 1)
+        with_points = calculate_trajectory_batch(**self._columns(shots))
+        carry_only = calculate_trajectory_batch(**self._columns(shots), record_points=False)
+        for full, lean in zip(with_points, carry_only):
+            assert lean["trajectory_points"] == []
+            assert lean["carry_yards"] == full["carry_yards"]
+
+    def test_empty_batch(self):
+        """An empty batch should return no results."""
+        assert calculate_trajectory_batch(**self._columns([])) == []
+
+
+class TestFusedImpactBreakdown:
+    """Tests for the fused (single batch) impact breakdown engine."""
+
+    SHOT = ShotData(
+        ball_speed_mph=150,
+        launch_angle_deg=12,
+        spin_rate_rpm=3000,
+        spin_axis_deg=5,
+        direction_deg=1,
+    )
+
+    CONDITIONS = [
+        WeatherConditions(),
+        WeatherConditions(wind_speed_mph=15, wind_direction_deg=45, temperature_f=90, humidity_pct=80),
+        WeatherConditions(wind_speed_mph=65, wind_direction_deg=180, temperature_f=20, altitude_ft=5000),
+        WeatherConditions(wind_speed_mph=150, wind_direction_deg=200, pressure_inhg=26),
+    ]
+
+    @pytest.mark.parametrize("api_type", ["professional", "gaming"])
+    def test_fused_matches_sequential(self, api_type):
+        """Fused and sequential engines should return identical results."""
+        for conditions in self.CONDITIONS:
+            fused = calculate_impact_breakdown(self.SHOT, conditions, api_type, engine="fused")
+            sequential = calculate_impact_breakdown(self.SHOT, conditions, api_type, engine="sequential")
+            assert fused == sequential
+
+    def test_batch_preserves_input_order(self):
+        """Batch breakdowns should come back in input order."""
+        items = [(self.SHOT, conditions) for conditions in self.CONDITIONS]
+        results = calculate_impact_breakdown_batch(items, "gaming")
+        assert len(results) == len(items)
+        for (shot, conditions), result in zip(items, results):
+            assert result == calculate_impact_breakdown(shot, conditions, "gaming", engine="sequential")
+
+    def test_unknown_engine_rejected(self):
+        """An unknown engine name should raise ValueError."""
+        with pytest.raises(ValueError):
+            calculate_impact_breakdown(self.SHOT, WeatherConditions(), engine="warp")
+
+
+class TestIntegrators:
+    """Tests for the selectable trajectory integrators."""
+
+    SHOT_ARGS = dict(
+        ball_speed_mph=167,
+        launch_angle_deg=10.9,
+        spin_rate_rpm=2686,
+        spin_axis_deg=5,
+        direction_deg=1,
+        air_density=STANDARD_AIR_DENSITY,
+        headwind_mps=4,
+        crosswind_mps=-3,
+    )
+
+    @pytest.mark.parametrize("quality", ["fast", "accurate"])
+    def test_higher_order_integrators_agree(self, quality):
+        """rk4-fixed and adaptive-rk45 should agree within reporting precision."""
+        rk4 = calculate_trajectory(**self.SHOT_ARGS, integrator="rk4-fixed", quality=quality)
+        rk45 = calculate_trajectory(**self.SHOT_ARGS, integrator="adaptive-rk45", quality=quality)
+        for key in ("carry_yards", "lateral_drift_yards", "apex_height_yards", "landing_angle_deg"):
+            assert abs(rk4[key] - rk45[key]) <= 0.1
+        assert abs(rk4["flight_time_seconds"] - rk45["flight_time_seconds"]) <= 0.01
+
+    def test_legacy_close_to_adaptive(self):
+        """The calibrated Euler default should stay within a yard or two of the accurate solution."""
+        legacy = calculate_trajectory(**self.SHOT_ARGS)
+        rk45 = calculate_trajectory(**self.SHOT_ARGS, integrator="adaptive-rk45")
+        assert abs(legacy["carry_yards"] - rk45["carry_yards"]) < 2
+
+    def test_adaptive_takes_fewer_steps(self):
+        """Adaptive steps should be far fewer than fixed 0.01 s Euler steps."""
+        legacy = calculate_trajectory(**self.SHOT_ARGS)
+        rk45 = calculate_trajectory(**self.SHOT_ARGS, integrator="adaptive-rk45", quality="fast")
+        assert legacy["integration_steps"] > 0
+        assert rk45["integration_steps"] * 10 < legacy["integration_steps"]
+
+    def test_landing_point_on_ground(self):
+        """Root-found landing should end the trajectory exactly at ground level."""
+        result = calculate_trajectory(**self.SHOT_ARGS, integrator="adaptive-rk45")
+        last = result["trajectory_points"][-1]
+        assert last["y"] == 0
+        assert last["x"] == result["carry_yards"]
+        assert result["trajectory_points"][0] == {"x": 0, "y": 0, "z": 0}
+
+    def test_unknown_integrator_rejected(self):
+        """Unknown integrator or quality names should raise ValueError."""
+        with pytest.raises(ValueError):
+            calculate_trajectory(**self.SHOT_ARGS, integrator="verlet")
+        with pytest.raises(ValueError):
+            calculate_trajectory(**self.SHOT_ARGS, integrator="rk4-fixed", quality="perfect")
+
+    def test_breakdown_reports_integration(self):
+        """Breakdowns should report integrator, quality and step count."""
+        shot = ShotData(ball_speed_mph=167, launch_angle_deg=10.9, spin_rate_rpm=2686)
+        conditions = WeatherConditions(wind_speed_mph=10, wind_direction_deg=90)
+        fused = calculate_impact_breakdown(shot, conditions, "gaming", integrator="adaptive-rk45")
+        sequential = calculate_impact_breakdown(
+            shot, conditions, "gaming", engine="sequential", integrator="adaptive-rk45"
+        )
+        assert fused == sequential
+        assert fused["integration"]["integrator"] == "adaptive-rk45"
+        assert fused["integration"]["quality"] == "fast"
+        assert fused["integration"]["steps"] > 0
+
+
+class TestBreakdownMemo:
+    """Tests for memoization of impact-breakdown sub-simulations."""
+
+    SHOT = ShotData(ball_speed_mph=132.04, launch_angle_deg=16.3, spin_rate_rpm=7004)
+
+    @pytest.fixture(autouse=True)
+    def fresh_memo(self, monkeypatch):
+        monkeypatch.setattr(settings, "PHYSICS_MEMO_ENABLED", True)
+        clear_breakdown_memo()
+        yield
+        clear_breakdown_memo()
+
+    @staticmethod
+    def counters():
+        components = get_breakdown_memo_stats()["components"]
+        return {name: (stats["hits"], stats["misses"]) for name, stats in components.items()}
+
+    def test_repeat_shot_hits_every_component(self):
+        """The same shot under the same sky should be served entirely from the memo."""
+        conditions = WeatherConditions(wind_speed_mph=8, temperature_f=60)
+        first = calculate_impact_breakdown(self.SHOT, conditions)
+        second = calculate_impact_breakdown(self.SHOT, conditions)
+        assert first == second
+        assert all(hits == 1 and misses == 1 for hits, misses in self.counters().values())
+
+    def test_only_changed_components_recomputed(self):
+        """Changing only temperature should reuse the baseline and humidity results."""
+        calculate_impact_breakdown(self.SHOT, WeatherConditions(temperature_f=60))
+        calculate_impact_breakdown(self.SHOT, WeatherConditions(temperature_f=90))
+        counters = self.counters()
+        assert counters["baseline"] == (1, 1)
+        assert counters["humidity"] == (1, 1)
+        assert counters["temperature"] == (0, 2)
+        assert counters["no_wind"] == (0, 2)
+
+    def test_nearby_inputs_share_quantized_entry(self):
+        """Inputs within one quantization step should hit the same entry."""
+        nearby = ShotData(ball_speed_mph=132.03, launch_angle_deg=16.3, spin_rate_rpm=7001)
+        first = calculate_impact_breakdown(self.SHOT, WeatherConditions())
+        second = calculate_impact_breakdown(nearby, WeatherConditions())
+        assert first == second
+        assert self.counters()["baseline"] == (1, 1)
+
+    def test_memo_matches_unmemoized_on_quantized_inputs(self, monkeypatch):
+        """A memoized result should equal a fresh run on the quantized shot."""
+        conditions = WeatherConditions(wind_speed_mph=12, wind_direction_deg=30, humidity_pct=80)
+        memoized = calculate_impact_breakdown(self.SHOT, conditions)
+        monkeypatch.setattr(settings, "PHYSICS_MEMO_ENABLED", False)
+        quantized = ShotData(ball_speed_mph=132.0, launch_angle_deg=16.3, spin_rate_rpm=7000)
+        assert memoized["baseline"] == calculate_impact_breakdown(quantized, conditions)["baseline"]
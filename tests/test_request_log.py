@@ -0,0 +1,144 @@
+"""
+Tests for the buffered admin_request_logs writer.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.main import app
+from app.services import request_log
+from app.services.request_log import REQUEST_LOG_COLUMNS, RequestLogWriter
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+
+class FakePool:
+    """Records COPY batches instead of writing them."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def acquire(self):
+        pool = self
+
+        class _Connection:
+            async def copy_records_to_table(self, table, records, columns):
+                if pool.fail:
+                    raise ConnectionError("database down")
+                assert table == "admin_request_logs"
+                assert columns == REQUEST_LOG_COLUMNS
+                pool.batches.append(list(records))
+
+        class _Acquire:
+            async def __aenter__(self):
+                return _Connection()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Fake logging workload of the database pool."""
+    fake = FakePool()
+
+    async def get_workload(name):
+        assert name == "logging"
+        return fake
+
+    monkeypatch.setattr(request_log, "get_db_workload", get_workload)
+    return fake
+
+
+def _enqueue(writer, n, status_code=200):
+    for i in range(n):
+        writer.enqueue(1, "client", f"/api/v1/calculate/{i}", "POST", status_code, 1.5, "10.0.0.1", "test")
+
+
+class TestRequestLogWriter:
+    """Tests for RequestLogWriter batching."""
+
+    def test_full_batches_written_without_waiting(self, pool):
+        """A full batch should be written immediately, the rest on the interval."""
+        writer = RequestLogWriter(max_queue=100, batch_size=3, flush_interval_ms=60_000)
+
+        async def scenario():
+            _enqueue(writer, 7)
+            await asyncio.sleep(0.01)
+            sizes = [len(b) for b in pool.batches]
+            await writer.close()
+            return sizes
+
+        assert asyncio.run(scenario()) == [3, 3]
+        assert [len(b) for b in pool.batches] == [3, 3, 1]
+        assert writer.stats()["written"] == 7
+
+    def test_partial_batch_written_after_interval(self, pool):
+        """Rows should not wait longer than the flush interval."""
+        writer = RequestLogWriter(max_queue=100, batch_size=500, flush_interval_ms=20)
+
+        async def scenario():
+            _enqueue(writer, 2)
+            await asyncio.sleep(0.1)
+
+        asyncio.run(scenario())
+        assert [len(b) for b in pool.batches] == [2]
+        assert pool.batches[0][0][:8] == (
+            1, "client", "/api/v1/calculate/0", "POST", 200, 1.5, "10.0.0.1", "test"
+        )
+
+    def test_full_queue_sheds_rows(self, pool):
+        """Rows beyond the queue bound should be dropped and counted."""
+        writer = RequestLogWriter(max_queue=5, batch_size=500, flush_interval_ms=60_000)
+
+        async def scenario():
+            _enqueue(writer, 8)
+            await writer.close()
+
+        asyncio.run(scenario())
+        assert writer.stats()["dropped"] == 3
+        assert [len(b) for b in pool.batches] == [5]
+
+    def test_write_failure_counted(self, pool):
+        """Failed batches should be counted as dropped, not retried forever."""
+        pool.fail = True
+        writer = RequestLogWriter(max_queue=100, batch_size=500, flush_interval_ms=60_000)
+
+        async def scenario():
+            _enqueue(writer, 4)
+            await writer.close()
+
+        asyncio.run(scenario())
+        assert writer.stats()["write_errors"] == 1
+        assert writer.stats()["dropped"] == 4
+
+
+class TestRequestContextLogging:
+    """Tests for what the middleware queues."""
+
+    def test_authenticated_requests_queued(self, monkeypatch):
+        """API requests should be queued with their client and status, admin paths skipped."""
+        writer = RequestLogWriter(max_queue=100, batch_size=500, flush_interval_ms=60_000)
+        monkeypatch.setattr(request_log, "_request_log_writer", writer)
+
+        client.get("/api/v1/admin/metrics", headers=AUTH_HEADERS)
+        client.get("/api/v1/gaming/presets", headers=AUTH_HEADERS)
+        assert writer.enqueued == 0
+
+        client.post(
+            "/api/v1/calculate",
+            json={},
+            headers={**AUTH_HEADERS, "X-Forwarded-For": "1.2.3.4, 5.6.7.8"},
+        )
+        assert writer.enqueued == 1
+        row = writer._buffer[0]
+        assert row[1:5] == ("test_client", "/api/v1/calculate", "POST", 422)
+        assert row[6] == "1.2.3.4"
@@ -0,0 +1,212 @@
+"""
+Tests for the content-addressed result cache.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+import app.redis_client as redis_module
+from app.config import settings
+from app.main import app
+from app.models.requests import ShotData, WeatherConditions
+from app.services import physics
+from app.services.result_cache import (
+    ResultCache,
+    etag_for,
+    etag_matches,
+    get_result_cache,
+    result_cache_key,
+)
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+TRAJECTORY_BODY = {
+    "shot": {"ball_speed_mph": 143, "launch_angle_deg": 13, "spin_rate_rpm": 4100},
+    "conditions": {"wind_speed_mph": 8, "wind_direction_deg": 120, "temperature_f": 58},
+}
+OVERRIDE = {
+    "wind_speed": 10,
+    "wind_direction": 30,
+    "temperature": 72,
+    "humidity": 50,
+    "altitude": 0,
+    "air_pressure": 29.92,
+}
+
+
+class FakeRedis:
+    """Minimal async stand-in for the get/set calls the cache makes."""
+
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+    get_result_cache().clear()
+    yield
+    get_result_cache().clear()
+
+
+class TestCacheKeys:
+    """Tests for canonical keys and ETag matching."""
+
+    def test_equivalent_inputs_share_key(self):
+        """Int/float spellings and field order should not change the key."""
+        a = ShotData(ball_speed_mph=150, launch_angle_deg=12, spin_rate_rpm=3000)
+        b = ShotData(spin_rate_rpm=3000.0, launch_angle_deg=12.0, ball_speed_mph=150.0000000001)
+        assert result_cache_key("t", "v1", shot=a) == result_cache_key("t", "v1", shot=b)
+
+    def test_any_input_changes_key(self):
+        """Namespace, fingerprint and every part should be part of the key."""
+        shot = ShotData(ball_speed_mph=150, launch_angle_deg=12, spin_rate_rpm=3000)
+        base = result_cache_key("t", "v1", shot=shot, units="imperial")
+        assert result_cache_key("g", "v1", shot=shot, units="imperial") != base
+        assert result_cache_key("t", "v2", shot=shot, units="imperial") != base
+        assert result_cache_key("t", "v1", shot=shot, units="metric") != base
+        assert result_cache_key(
+            "t", "v1", shot=shot.model_copy(update={"spin_axis_deg": 1}), units="imperial"
+        ) != base
+
+    def test_etag_matching(self):
+        """If-None-Match should use weak comparison and accept lists and '*'."""
+        etag = etag_for("ab" * 32)
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert etag_matches(etag, etag_for("ab" * 32, weak=True))
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestResultCacheLevels:
+    """Tests for L1 and Redis behavior."""
+
+    def test_redis_hit_promotes_to_l1(self, monkeypatch):
+        """Values found in Redis should be served and copied into L1."""
+        fake = FakeRedis()
+        monkeypatch.setattr(redis_module, "get_redis_client", lambda: fake)
+        writer = ResultCache(16, 60, 1024)
+        reader = ResultCache(16, 60, 1024)
+
+        asyncio.run(writer.set("k", b'{"a":1}'))
+        assert asyncio.run(reader.get("k")) == b'{"a":1}'
+        assert reader.redis_hits == 1
+        assert reader.l1.get("k") == b'{"a":1}'
+
+    def test_redis_errors_are_misses(self, monkeypatch):
+        """A failing Redis should not fail the request."""
+        monkeypatch.setattr(redis_module, "get_redis_client", lambda: FakeRedis(fail=True))
+        cache = ResultCache(16, 60, 1024)
+        asyncio.run(cache.set("k", b"1"))
+        assert cache.l1.get("k") == b"1"
+        cache.l1.clear()
+        assert asyncio.run(cache.get("k")) is None
+        assert cache.redis_errors == 2
+
+    def test_oversized_values_skipped(self):
+        """Values above the size limit should not be cached."""
+        cache = ResultCache(16, 60, 4)
+        asyncio.run(cache.set("k", b"12345"))
+        assert asyncio.run(cache.get("k")) is None
+        assert cache.oversized == 1
+
+
+class TestCachedEndpoints:
+    """Tests for cached trajectory endpoints."""
+
+    def test_trajectory_hit_is_identical(self):
+        """A repeated request should be a hit with an identical body."""
+        first = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        second = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_if_none_match_returns_304(self):
+        """Sending back the ETag should return 304 with no body."""
+        first = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        response = client.post(
+            "/api/v1/trajectory",
+            headers={**AUTH_HEADERS, "If-None-Match": first.headers["ETag"]},
+            json=TRAJECTORY_BODY,
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_engine_version_invalidates(self, monkeypatch):
+        """A new engine version should produce a new key and ETag."""
+        first = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        monkeypatch.setattr(physics, "PHYSICS_ENGINE_VERSION", "test-next")
+        second = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        assert second.headers["X-Cache"] == "MISS"
+        assert second.headers["ETag"] != first.headers["ETag"]
+
+    def test_gaming_preset_cached(self):
+        """Gaming preset requests should be served from the cache."""
+        body = {
+            "shot": {"ball_speed_mph": 150, "launch_angle_deg": 12, "spin_rate_rpm": 3000},
+            "preset": "hurricane_hero",
+        }
+        client.post("/api/v1/gaming/trajectory", headers=AUTH_HEADERS, json=body)
+        second = client.post("/api/v1/gaming/trajectory", headers=AUTH_HEADERS, json=body)
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json()["conditions_used"]["preset_name"] == "hurricane_hero"
+
+    def test_calculate_weak_etag(self):
+        """/calculate should cache physics but keep per-response IDs."""
+        body = {"ball_speed": 150, "launch_angle": 12, "spin_rate": 3000, "conditions_override": OVERRIDE}
+        first = client.post("/api/v1/calculate", headers=AUTH_HEADERS, json=body)
+        second = client.post("/api/v1/calculate", headers=AUTH_HEADERS, json=body)
+        assert first.headers["ETag"].startswith("W/")
+        assert second.json()["request_id"] != first.json()["request_id"]
+        assert second.json()["trajectory"] == first.json()["trajectory"]
+
+        response = client.post(
+            "/api/v1/calculate",
+            headers={**AUTH_HEADERS, "If-None-Match": first.headers["ETag"]},
+            json=body,
+        )
+        assert response.status_code == 304
+
+    def test_calculate_etag_covers_metadata(self):
+        """Requests differing only in echoed metadata should not 304 each other."""
+        body = {"ball_speed": 150, "launch_angle": 12, "spin_rate": 3000, "conditions_override": OVERRIDE}
+        first = client.post(
+            "/api/v1/calculate", headers=AUTH_HEADERS,
+            json={**body, "metadata": {"player_id": "p1"}},
+        )
+        response = client.post(
+            "/api/v1/calculate",
+            headers={**AUTH_HEADERS, "If-None-Match": first.headers["ETag"]},
+            json={**body, "metadata": {"player_id": "p2"}},
+        )
+        assert response.status_code == 200
+        assert response.json()["metadata"]["player_id"] == "p2"
+        assert response.headers["ETag"] != first.headers["ETag"]
+        assert response.json()["trajectory"] == first.json()["trajectory"]
+
+    def test_disabled_cache_sets_no_etag(self, monkeypatch):
+        """With the cache disabled responses should carry no ETag."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        response = client.post("/api/v1/trajectory", headers=AUTH_HEADERS, json=TRAJECTORY_BODY)
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
@@ -0,0 +1,129 @@
+"""
+Tests for the response serialization fast path.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.models.requests import ShotData, WeatherConditions
+from app.models.responses import GamingConditionsUsed
+from app.routers.gaming import build_gaming_trajectory_response
+from app.routers.trajectory import build_dual_conditions_used, build_dual_trajectory_response
+from app.services.physics import calculate_impact_breakdown
+from app.utils import serialization
+from app.utils.serialization import build_dual_results_payload, dumps_json
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+SHOTS = [
+    ShotData(ball_speed_mph=167, launch_angle_deg=10.9, spin_rate_rpm=2686),
+    ShotData(ball_speed_mph=120, launch_angle_deg=16.3, spin_rate_rpm=7097, spin_axis_deg=-6),
+    ShotData(ball_speed_mph=60, launch_angle_deg=30, spin_rate_rpm=9000, direction_deg=4),
+]
+CONDITIONS = [
+    WeatherConditions(),
+    WeatherConditions(wind_speed_mph=17.3, wind_direction_deg=213, temperature_f=41.2, altitude_ft=5280),
+    WeatherConditions(wind_speed_mph=65, wind_direction_deg=180, temperature_f=-15, humidity_pct=90),
+]
+
+WEATHER = {
+    "location": "Denver, CO",
+    "wind_speed_mph": 12.34,
+    "wind_direction_deg": 275,
+    "temperature_f": 68.9,
+    "altitude_ft": 5280.4,
+    "humidity_pct": 23,
+    "pressure_inhg": 24.8763,
+    "conditions_text": "Clear — “sunny”",
+    "fetched_at": datetime(2026, 5, 1, 14, 30, 5, 123456, tzinfo=timezone.utc),
+}
+
+GAMING_CONDITIONS = GamingConditionsUsed(
+    source="preset",
+    preset_name="hurricane_hero",
+    handicap_tier="mid",
+    player_handicap=15,
+    club="7_iron",
+    stock_carry=150,
+    wind_speed_mph=65,
+    wind_direction_deg=180,
+    temperature_f=82,
+    altitude_ft=0,
+    humidity_pct=85,
+    pressure_inhg=29.5,
+)
+
+
+def pydantic_bytes(model) -> bytes:
+    """Bytes FastAPI produces for a model returned through response_model."""
+    return JSONResponse(content=model.model_dump(mode="json")).body
+
+
+@pytest.fixture(params=[(s, c) for s in SHOTS for c in CONDITIONS])
+def physics_result(request):
+    shot, conditions = request.param
+    return calculate_impact_breakdown(shot, conditions)
+
+
+class TestFastPathEquivalence:
+    """The fast path must match the pydantic builders byte for byte."""
+
+    def test_dual_response_without_conditions(self, physics_result):
+        """Dual-unit responses without conditions should match."""
+        expected = pydantic_bytes(build_dual_trajectory_response(physics_result, units_preference="metric"))
+        assert dumps_json(build_dual_results_payload(physics_result, None, "metric")) == expected
+
+    def test_dual_response_with_conditions(self, physics_result):
+        """Dual-unit responses with real-weather conditions should match."""
+        conditions = build_dual_conditions_used(WEATHER)
+        expected = pydantic_bytes(build_dual_trajectory_response(physics_result, conditions, "imperial"))
+        assert dumps_json(build_dual_results_payload(physics_result, conditions, "imperial")) == expected
+
+    def test_gaming_response(self, physics_result):
+        """Gaming responses should match."""
+        expected = pydantic_bytes(
+            build_gaming_trajectory_response(physics_result, GAMING_CONDITIONS, "imperial")
+        )
+        assert dumps_json(build_dual_results_payload(physics_result, GAMING_CONDITIONS, "imperial")) == expected
+
+    def test_stdlib_fallback_matches(self, physics_result, monkeypatch):
+        """Without orjson the stdlib encoder should produce the same bytes."""
+        conditions = build_dual_conditions_used(WEATHER)
+        payload = build_dual_results_payload(physics_result, conditions, "imperial")
+        fast = dumps_json(payload)
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert dumps_json(payload) == fast
+
+
+class TestFastPathEndpoints:
+    """Endpoints should return identical bodies with the fast path on or off."""
+
+    @pytest.mark.parametrize("path,body", [
+        ("/api/v1/trajectory", {
+            "shot": {"ball_speed_mph": 150, "launch_angle_deg": 12, "spin_rate_rpm": 3000},
+            "conditions": {"wind_speed_mph": 12, "wind_direction_deg": 40},
+        }),
+        ("/api/v1/gaming/trajectory", {
+            "shot": {"ball_speed_mph": 150, "launch_angle_deg": 12, "spin_rate_rpm": 3000},
+            "preset": "hurricane_hero",
+        }),
+    ])
+    def test_bodies_identical(self, path, body, monkeypatch):
+        """Toggling FAST_RESPONSE_SERIALIZATION should not change the body."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        monkeypatch.setattr(settings, "FAST_RESPONSE_SERIALIZATION", False)
+        slow = client.post(path, headers=AUTH_HEADERS, json=body)
+        monkeypatch.setattr(settings, "FAST_RESPONSE_SERIALIZATION", True)
+        fast = client.post(path, headers=AUTH_HEADERS, json=body)
+
+        assert slow.status_code == fast.status_code == 200
+        assert fast.headers["content-type"] == slow.headers["content-type"]
+        assert fast.content == slow.content
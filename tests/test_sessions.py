@@ -0,0 +1,190 @@
+"""
+Tests for the /api/v1/sessions/ws launch-monitor channel.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.routers import sessions
+from app.services.sessions import get_session_stats
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+CONDITIONS = {
+    "wind_speed": 10,
+    "wind_direction": 0,
+    "temperature": 72,
+    "humidity": 50,
+    "altitude": 0,
+    "air_pressure": 29.92,
+}
+SHOT = {"ball_speed": 150, "launch_angle": 12, "spin_rate": 3000}
+
+
+def _open_session(websocket, **config):
+    ready = websocket.receive_json()
+    assert ready["type"] == "ready"
+    if config:
+        websocket.send_json({"type": "configure", **config})
+        configured = websocket.receive_json()
+        assert configured["type"] == "configured"
+    return ready
+
+
+class TestSessionAuth:
+    """Tests for session authentication."""
+
+    def test_missing_key_rejected(self):
+        """Connections without an API key should get an error and be closed."""
+        with client.websocket_connect("/api/v1/sessions/ws") as websocket:
+            message = websocket.receive_json()
+            assert message["error"]["code"] == "MISSING_API_KEY"
+            assert websocket.receive()["code"] == 1008
+
+    def test_invalid_key_rejected(self):
+        """Unknown API keys should get an error and be closed."""
+        with client.websocket_connect(
+            "/api/v1/sessions/ws", headers={"X-API-Key": "not_a_real_key"}
+        ) as websocket:
+            assert websocket.receive_json()["error"]["code"] == "INVALID_API_KEY"
+
+    def test_query_param_key_accepted(self):
+        """Clients that cannot set headers may pass the key as a query parameter."""
+        with client.websocket_connect(f"/api/v1/sessions/ws?api_key={TEST_API_KEY}") as websocket:
+            assert websocket.receive_json()["client_id"] == "test_client"
+
+
+class TestSessionShots:
+    """Tests for streaming shots over a session."""
+
+    def test_pinned_conditions_match_calculate(self):
+        """A shot using pinned conditions should match the /calculate result."""
+        single = client.post(
+            "/api/v1/calculate",
+            headers=AUTH_HEADERS,
+            json={**SHOT, "conditions_override": CONDITIONS},
+        ).json()
+
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket, conditions_override=CONDITIONS)
+            websocket.send_json({"type": "shot", "shot_id": "s1", **SHOT})
+            message = websocket.receive_json()
+
+        assert message["type"] == "result"
+        assert message["shot_id"] == "s1"
+        for key in ("conditions", "trajectory", "analysis", "impact_breakdown"):
+            assert message["result"][key] == single[key]
+
+    def test_results_in_order_with_metadata(self, monkeypatch):
+        """Results should come back in send order with session metadata merged in."""
+        monkeypatch.setattr(settings, "SESSION_MAX_PENDING_SHOTS", 1)
+
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(
+                websocket,
+                conditions_override=CONDITIONS,
+                metadata={"facility_id": "fac_1", "bay_number": 7, "session_id": "abc"},
+            )
+            for i in range(6):
+                websocket.send_json({
+                    "type": "shot", "shot_id": f"s{i}", **SHOT,
+                    "ball_speed": 120 + i, "metadata": {"player_id": f"p{i}"},
+                })
+            results = [websocket.receive_json() for _ in range(6)]
+
+            websocket.send_json({"type": "stats"})
+            stats = websocket.receive_json()["stats"]
+
+        assert [r["shot_id"] for r in results] == [f"s{i}" for i in range(6)]
+        metadata = results[3]["result"]["metadata"]
+        assert metadata["facility_id"] == "fac_1"
+        assert metadata["player_id"] == "p3"
+        assert stats["results_sent"] == 6
+        assert stats["pending"] == 0
+        assert stats["bay_number"] == 7
+        assert stats["latency_ms"]["max"] > 0
+
+    def test_shot_override_wins(self):
+        """A shot's own conditions should take precedence over pinned ones."""
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket, conditions_override=CONDITIONS)
+            websocket.send_json({
+                "type": "shot", **SHOT,
+                "conditions_override": {**CONDITIONS, "wind_speed": 25},
+            })
+            message = websocket.receive_json()
+        assert message["result"]["conditions"]["wind_speed_mph"] == 25
+
+    def test_shot_without_conditions_rejected(self):
+        """Shots before any conditions are pinned should get an error frame."""
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket)
+            websocket.send_json({"type": "shot", "shot_id": "x", **SHOT})
+            message = websocket.receive_json()
+        assert message["error"]["code"] == "CONDITIONS_REQUIRED"
+        assert message["shot_id"] == "x"
+
+    def test_invalid_frames_keep_session_open(self):
+        """Bad frames should produce errors without closing the socket."""
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket, conditions_override=CONDITIONS)
+            websocket.send_text("not json")
+            assert websocket.receive_json()["error"]["code"] == "INVALID_MESSAGE"
+            websocket.send_json({"type": "shot", "shot_id": "bad", "ball_speed": 999})
+            error = websocket.receive_json()
+            assert error["error"]["code"] == "VALIDATION_ERROR"
+            assert error["shot_id"] == "bad"
+            websocket.send_json({"type": "dance"})
+            assert websocket.receive_json()["error"]["code"] == "UNKNOWN_MESSAGE_TYPE"
+            websocket.send_json({"type": "shot", **SHOT})
+            assert websocket.receive_json()["type"] == "result"
+
+    def test_physics_failure_answers_shots(self, monkeypatch):
+        """A failing batch should get error frames and leave the session usable."""
+        monkeypatch.setattr(settings, "SESSION_MAX_PENDING_SHOTS", 1)
+        run_physics = sessions.run_physics
+        calls = []
+
+        async def flaky_run_physics(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("engine crashed")
+            return await run_physics(*args, **kwargs)
+
+        monkeypatch.setattr(sessions, "run_physics", flaky_run_physics)
+
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket, conditions_override=CONDITIONS)
+            websocket.send_json({"type": "shot", "shot_id": "s0", **SHOT})
+            error = websocket.receive_json()
+            # More shots than the queue holds: the reader must not block
+            for i in range(1, 4):
+                websocket.send_json({"type": "shot", "shot_id": f"s{i}", **SHOT})
+            results = [websocket.receive_json() for _ in range(3)]
+            websocket.send_json({"type": "stats"})
+            stats = websocket.receive_json()["stats"]
+
+        assert error["type"] == "error"
+        assert error["shot_id"] == "s0"
+        assert error["error"]["code"] == "INTERNAL_ERROR"
+        assert [r["type"] for r in results] == ["result"] * 3
+        assert stats["pending"] == 0
+
+    def test_sessions_unregister_on_close(self):
+        """Closed sessions should leave the live list and count in totals."""
+        before = get_session_stats()
+        with client.websocket_connect("/api/v1/sessions/ws", headers=AUTH_HEADERS) as websocket:
+            _open_session(websocket, conditions_override=CONDITIONS)
+            assert get_session_stats()["active"] == before["active"] + 1
+            websocket.send_json({"type": "shot", **SHOT})
+            websocket.receive_json()
+        after = get_session_stats()
+        assert after["active"] == before["active"]
+        assert after["closed"] == before["closed"] + 1
+        assert after["shots"] == before["shots"] + 1
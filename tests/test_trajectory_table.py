@@ -0,0 +1,126 @@
+"""
+Tests for the precomputed trajectory lookup table.
+"""
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.models.requests import ShotData, WeatherConditions
+from app.services import trajectory_table
+from app.services.physics import (
+    calculate_impact_breakdown,
+    calculate_trajectory,
+    clear_breakdown_memo,
+)
+from app.services.trajectory_table import (
+    TABLE_FORMAT_VERSION,
+    TrajectoryTable,
+    build_trajectory_table,
+)
+
+SMALL_GRID = {
+    "ball_speed_mph": [120.0, 130.0, 140.0],
+    "launch_angle_deg": [14.0, 16.0],
+    "spin_rate_rpm": [5000.0, 6000.0],
+    "spin_axis_deg": [0.0],
+    "direction_deg": [0.0],
+    "air_density": [1.1, 1.2],
+    "headwind_mps": [0.0],
+    "crosswind_mps": [0.0],
+}
+
+SHOT_ARGS = dict(
+    ball_speed_mph=127,
+    launch_angle_deg=15,
+    spin_rate_rpm=5400,
+    spin_axis_deg=0,
+    direction_deg=0,
+    air_density=1.15,
+    headwind_mps=0,
+    crosswind_mps=0,
+)
+
+
+@pytest.fixture(scope="module")
+def built():
+    return build_trajectory_table(SMALL_GRID)
+
+
+class TestTrajectoryTable:
+    """Tests for building and querying the lookup table."""
+
+    def test_exact_at_grid_points(self, built):
+        """Interpolation should reproduce simulated values at grid points."""
+        table, _ = built
+        args = dict(SHOT_ARGS, ball_speed_mph=130, launch_angle_deg=16, spin_rate_rpm=5000, air_density=1.2)
+        looked_up = table.lookup(**args, max_error_yards=100)
+        simulated = calculate_trajectory(**args, record_points=False)
+        for key in ("carry_yards", "total_yards", "apex_height_yards", "flight_time_seconds"):
+            assert looked_up[key] == pytest.approx(simulated[key], abs=0.051)
+
+    def test_interpolation_close_to_simulation(self, built):
+        """Inside the grid the interpolated carry should be close to full simulation."""
+        table, _ = built
+        looked_up = table.lookup(**SHOT_ARGS, max_error_yards=100)
+        simulated = calculate_trajectory(**SHOT_ARGS, record_points=False)
+        assert looked_up["carry_yards"] == pytest.approx(simulated["carry_yards"], abs=1.0)
+        assert looked_up["trajectory_points"] == []
+
+    def test_outside_grid_falls_back(self, built):
+        """Queries outside the grid or off a fixed axis should return None."""
+        table, _ = built
+        assert table.lookup(**dict(SHOT_ARGS, ball_speed_mph=180), max_error_yards=100) is None
+        assert table.lookup(**dict(SHOT_ARGS, spin_axis_deg=5), max_error_yards=100) is None
+
+    def test_error_threshold_falls_back(self, built):
+        """Cells with measured error above the threshold should return None."""
+        table, errors = built
+        assert errors.shape[-1] == 6
+        assert table.lookup(**SHOT_ARGS, max_error_yards=-1) is None
+
+    def test_save_load_roundtrip(self, built, tmp_path):
+        """A saved table should load back with identical answers."""
+        table, _ = built
+        path = str(tmp_path / "table.npz")
+        table.save(path)
+        loaded = TrajectoryTable.load(path)
+        assert loaded.lookup(**SHOT_ARGS, max_error_yards=100) == table.lookup(**SHOT_ARGS, max_error_yards=100)
+        assert loaded.metadata["format_version"] == TABLE_FORMAT_VERSION
+
+    def test_version_mismatch_rejected(self, built, tmp_path):
+        """Tables built with another format version should not load."""
+        table, _ = built
+        path = str(tmp_path / "old.npz")
+        table.save(path)
+        with np.load(path) as data:
+            contents = dict(data)
+        contents["format_version"] = np.array(TABLE_FORMAT_VERSION + 1)
+        np.savez_compressed(path, **contents)
+        with pytest.raises(ValueError):
+            TrajectoryTable.load(path)
+
+    def test_breakdown_uses_table_for_carry_only_variants(self, built, monkeypatch):
+        """With a table loaded, carry-only variants should come from interpolation."""
+        table, _ = built
+        table_all = TrajectoryTable(table.axes, table.values, np.zeros_like(table.cell_error), table.metadata)
+        monkeypatch.setattr(trajectory_table, "_trajectory_table", table_all)
+        monkeypatch.setattr(trajectory_table, "_table_load_attempted", True)
+        monkeypatch.setattr(settings, "TRAJECTORY_TABLE_MAX_ERROR_YARDS", 0.5)
+        clear_breakdown_memo()
+
+        shot = ShotData(ball_speed_mph=127, launch_angle_deg=15, spin_rate_rpm=5400)
+        conditions = WeatherConditions(wind_speed_mph=10, wind_direction_deg=0)
+        fused = calculate_impact_breakdown(shot, conditions, engine="fused")
+        sequential = calculate_impact_breakdown(shot, conditions, engine="sequential")
+
+        # Full-result variants are always simulated
+        assert fused["baseline"] == sequential["baseline"]
+        assert fused["adjusted"]["trajectory_points"] == sequential["adjusted"]["trajectory_points"]
+        # Carry-only variants came from the table
+        assert fused["integration"]["steps"] < sequential["integration"]["steps"]
+        assert fused["adjusted"]["carry_yards"] == pytest.approx(sequential["adjusted"]["carry_yards"], abs=1.0)
+        for key in ("temperature_effect_yards", "humidity_effect_yards"):
+            assert fused["impact_breakdown"][key] == pytest.approx(
+                sequential["impact_breakdown"][key], abs=1.0
+            )
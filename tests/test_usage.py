@@ -0,0 +1,150 @@
+"""
+Tests for in-process usage aggregation.
+"""
+
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+import app.database
+from app.services import usage
+from app.services.usage import UsageAggregator, UsageService
+
+
+class FakeSession:
+    """Records executed statements; optionally fails on commit."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.db.statements.append((statement, params))
+
+    async def commit(self):
+        if self.db.fail:
+            raise ConnectionError("database down")
+        self.db.commits += 1
+
+
+class FakeDatabase:
+    """Stands in for AsyncSessionLocal."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.fail = False
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _record(aggregator, n, client="bay_group", endpoint="/api/v1/calculate", status=200):
+    for i in range(n):
+        aggregator.record(client, endpoint, "POST", status, 10.0, f"{client}-{status}-{i}")
+
+
+class TestUsageAggregator:
+    """Tests for UsageAggregator."""
+
+    def test_requests_summed_per_client_endpoint_day(self, monkeypatch):
+        """Many requests should become one upserted row of deltas per key."""
+        db = FakeDatabase()
+        monkeypatch.setattr(app.database, "AsyncSessionLocal", db)
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=100)
+
+        async def scenario():
+            _record(aggregator, 3)
+            _record(aggregator, 1, status=500)
+            _record(aggregator, 2, endpoint="/api/v1/trajectory")
+            await aggregator.flush()
+
+        asyncio.run(scenario())
+        assert db.commits == 1
+        (upsert, _), (log_insert, logs) = db.statements
+        sql = str(upsert.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (client_id, endpoint, date) DO UPDATE" in sql
+        assert "api_usage.request_count + excluded.request_count" in sql
+
+        rows = upsert.compile(dialect=postgresql.dialect()).params
+        counts = sorted(v for k, v in rows.items() if k.startswith("request_count"))
+        errors = sorted(v for k, v in rows.items() if k.startswith("error_count"))
+        assert counts == [2, 4]
+        assert errors == [0, 1]
+        assert len(logs) == 6
+        assert aggregator.stats()["pending_totals"] == 0
+
+    def test_failed_flush_keeps_counts(self, monkeypatch):
+        """Deltas from a failed write should be added to the next flush."""
+        db = FakeDatabase()
+        monkeypatch.setattr(app.database, "AsyncSessionLocal", db)
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=100)
+
+        async def scenario():
+            _record(aggregator, 2)
+            db.fail = True
+            await aggregator.flush()
+            _record(aggregator, 1)
+            return dict(aggregator._totals)
+
+        totals = asyncio.run(scenario())
+        assert [v[0] for v in totals.values()] == [3]
+        assert aggregator.stats()["flush_errors"] == 1
+        assert aggregator.stats()["pending_logs"] == 3
+
+    def test_log_buffer_bounded(self, monkeypatch):
+        """Request log rows beyond the bound should be dropped, counts kept."""
+        monkeypatch.setattr(app.database, "AsyncSessionLocal", FakeDatabase())
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=2)
+
+        async def scenario():
+            _record(aggregator, 5)
+
+        asyncio.run(scenario())
+        assert aggregator.stats()["pending_logs"] == 2
+        assert aggregator.stats()["dropped_logs"] == 3
+        assert [v[0] for v in aggregator._totals.values()] == [5]
+
+    def test_close_flushes_pending(self, monkeypatch):
+        """Shutdown should write what is pending without waiting for the interval."""
+        db = FakeDatabase()
+        monkeypatch.setattr(app.database, "AsyncSessionLocal", db)
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=100)
+
+        async def scenario():
+            _record(aggregator, 2)
+            await asyncio.wait_for(aggregator.close(), 1)
+
+        asyncio.run(scenario())
+        assert db.commits == 1
+
+
+class TestTrackRequest:
+    """Tests for UsageService.track_request."""
+
+    def test_recorded_in_aggregator(self, monkeypatch):
+        """track_request should count in memory instead of writing."""
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=100)
+        monkeypatch.setattr(usage, "_usage_aggregator", aggregator)
+        session = FakeDatabase()()
+
+        async def scenario():
+            await UsageService(session).track_request(
+                "bay_group", "/api/v1/calculate", "POST", 200, 12.5, "req-1"
+            )
+
+        asyncio.run(scenario())
+        assert session.db.statements == []
+        assert aggregator.stats()["recorded"] == 1
+
+    def test_no_database(self, monkeypatch):
+        """Without a database session nothing should be recorded."""
+        aggregator = UsageAggregator(flush_seconds=3600, max_pending_logs=100)
+        monkeypatch.setattr(usage, "_usage_aggregator", aggregator)
+        asyncio.run(UsageService(None).track_request("c", "/e", "GET", 200, 1.0, "r"))
+        assert aggregator.stats()["recorded"] == 0
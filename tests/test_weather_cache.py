@@ -0,0 +1,223 @@
+"""
+Tests for the weather cache (TTL, stale-while-revalidate, stale-if-error).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import redis_client
+from tests.conftest import TEST_API_KEY
+
+from app.main import app
+from app.services import weather, weather_cache
+from app.services.weather_cache import WeatherCache, city_cache_key, coords_cache_key
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+
+class FakeClock:
+    """Replaces the time module in weather_cache; advanced by hand."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+class FakeRedis:
+    """Dict-backed GET/SET."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class FakeUpstream:
+    """Counts fetches; returns a new observation each time, or fails."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return {
+            "location": "Denver, Colorado, USA",
+            "wind_speed_mph": 10.0 + self.calls,
+            "temperature_f": 70.0,
+            "fetched_at": datetime.utcnow(),
+            "observed_at": datetime.utcnow() - timedelta(minutes=5),
+        }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen clock for cache ages, with Redis not configured."""
+    fake = FakeClock()
+    monkeypatch.setattr(weather_cache, "time", fake)
+    monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+    return fake
+
+
+def _cache():
+    return WeatherCache(100, ttl_seconds=300, stale_seconds=600, stale_if_error_seconds=3600)
+
+
+class TestCacheKeys:
+    """Tests for location normalization."""
+
+    def test_city_key_normalized(self):
+        """Case and whitespace should not split the cache."""
+        assert city_cache_key(" Las  Vegas", "NV", "US") == city_cache_key("las vegas", "nv", "us")
+        assert city_cache_key("Denver", None, "US") != city_cache_key("Denver", "CO", "US")
+
+    def test_coords_rounded(self):
+        """Nearby points should share an entry."""
+        assert coords_cache_key(39.73921, -104.99035) == coords_cache_key(39.7401, -104.9899)
+        assert coords_cache_key(39.73, -104.99) != coords_cache_key(39.76, -104.99)
+
+
+class TestWeatherCache:
+    """Tests for WeatherCache freshness windows."""
+
+    def test_fresh_entry_served_without_fetch(self, clock):
+        """Within the TTL the upstream should be called once."""
+        cache, upstream = _cache(), FakeUpstream()
+
+        async def scenario():
+            first = await cache.get("k", upstream.fetch)
+            clock.now += 299
+            return first, await cache.get("k", upstream.fetch)
+
+        first, second = asyncio.run(scenario())
+        assert upstream.calls == 1
+        assert second["wind_speed_mph"] == first["wind_speed_mph"]
+        assert 299 <= second["observation_age_seconds"] <= 301
+        assert cache.stats()["fresh_hits"] == 1
+
+    def test_stale_served_while_one_refresh_runs(self, clock):
+        """Past the TTL the old entry should be served and refreshed in the background once."""
+        cache, upstream = _cache(), FakeUpstream()
+
+        async def scenario():
+            await cache.get("k", upstream.fetch)
+            clock.now += 400
+            stale = await asyncio.gather(*(cache.get("k", upstream.fetch) for _ in range(5)))
+            await asyncio.sleep(0.01)
+            return stale, await cache.get("k", upstream.fetch)
+
+        stale, refreshed = asyncio.run(scenario())
+        assert [w["wind_speed_mph"] for w in stale] == [11.0] * 5
+        assert refreshed["wind_speed_mph"] == 12.0
+        assert upstream.calls == 2
+        assert cache.stats()["stale_hits"] == 5
+        assert cache.stats()["refreshes"] == 1
+
+    def test_concurrent_misses_coalesced(self, clock):
+        """A burst of requests for one location should make a single upstream call."""
+        cache, upstream = _cache(), FakeUpstream()
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get("k", upstream.fetch) for _ in range(10)))
+
+        results = asyncio.run(scenario())
+        assert upstream.calls == 1
+        assert {w["wind_speed_mph"] for w in results} == {11.0}
+        assert cache.stats()["upstream_coalescing"]["coalesced"] == 9
+
+    def test_stale_if_error(self, clock):
+        """An old entry should be served when the upstream fails."""
+        cache, upstream = _cache(), FakeUpstream()
+
+        async def scenario():
+            await cache.get("k", upstream.fetch)
+            clock.now += 2000
+            upstream.fail = True
+            return await cache.get("k", upstream.fetch)
+
+        assert asyncio.run(scenario())["wind_speed_mph"] == 11.0
+        assert cache.stats()["stale_if_error_hits"] == 1
+
+    def test_error_without_usable_entry_raised(self, clock):
+        """Beyond the stale-if-error window the upstream error should surface."""
+        cache, upstream = _cache(), FakeUpstream()
+
+        async def scenario():
+            await cache.get("k", upstream.fetch)
+            clock.now += 300 + 3600
+            upstream.fail = True
+            await cache.get("k", upstream.fetch)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(scenario())
+
+    def test_shared_through_redis(self, clock, monkeypatch):
+        """Another worker should get the observation from Redis, datetimes intact."""
+        redis = FakeRedis()
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: redis)
+        upstream = FakeUpstream()
+
+        async def scenario():
+            first = await _cache().get("k", upstream.fetch)
+            return first, await _cache().get("k", upstream.fetch)
+
+        first, second = asyncio.run(scenario())
+        assert upstream.calls == 1
+        assert second["observed_at"] == first["observed_at"]
+        assert isinstance(second["fetched_at"], datetime)
+
+
+class TestWeatherService:
+    """Tests for the cached weather service functions."""
+
+    def test_fetch_by_city_cached(self, clock, monkeypatch):
+        """Differently written names of one city should reach the upstream once."""
+        upstream = FakeUpstream()
+        monkeypatch.setattr(weather_cache, "_weather_cache", _cache())
+        monkeypatch.setattr(
+            weather, "_fetch_current_by_city", lambda city, state, country: upstream.fetch()
+        )
+
+        async def scenario():
+            await weather.fetch_weather_by_city("Denver", "CO")
+            await weather.fetch_weather_by_city("denver ", "co", "us")
+
+        asyncio.run(scenario())
+        assert upstream.calls == 1
+
+    def test_conditions_report_observation_age(self, clock, monkeypatch):
+        """The conditions endpoint should say how old the observation is."""
+        upstream = FakeUpstream()
+        monkeypatch.setattr(weather_cache, "_weather_cache", _cache())
+
+        async def fetch(city, state, country):
+            observation = await upstream.fetch()
+            observation.update(
+                wind_direction_deg=180,
+                altitude_ft=5280,
+                humidity_pct=30,
+                pressure_inhg=29.9,
+                conditions_text="Sunny",
+            )
+            return observation
+
+        monkeypatch.setattr(weather, "_fetch_current_by_city", fetch)
+        response = client.get(
+            "/api/v1/conditions", params={"city": "Denver", "state": "CO"}, headers=AUTH_HEADERS
+        )
+        assert response.status_code == 200
+        assert 299 <= response.json()["observation_age_seconds"] <= 301
+        assert response.json()["observed_at"] is not None
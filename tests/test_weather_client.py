@@ -0,0 +1,176 @@
+"""
+Tests for the pooled WeatherAPI.com client (retries, budget, circuit breaker).
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.weather_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    WeatherClient,
+    WeatherUnavailableError,
+)
+
+
+class FakeUpstream:
+    """httpx transport handler replaying a script of status codes."""
+
+    def __init__(self, statuses=(200,), delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.requests = 0
+        self.active = 0
+        self.peak_active = 0
+
+    async def __call__(self, request):
+        self.requests += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status, json={"q": request.url.params["q"]})
+
+
+def _client(upstream, retries=2, timeout=1.0, budget=2.0, concurrency=10, failures=3, reset=30.0):
+    return WeatherClient(
+        "https://weather.test/v1",
+        max_concurrency=concurrency,
+        timeout_seconds=timeout,
+        budget_seconds=budget,
+        retries=retries,
+        backoff_seconds=0.001,
+        breaker=CircuitBreaker(failures, reset),
+        transport=httpx.MockTransport(upstream),
+    )
+
+
+async def _get(client, q="Denver"):
+    return await client.get_json("/current.json", params={"q": q})
+
+
+class TestRetries:
+    """Tests for retrying failed attempts."""
+
+    def test_server_errors_retried(self):
+        """5xx and connection errors should be retried until an attempt succeeds."""
+        upstream = FakeUpstream([503, "down", 200])
+        client = _client(upstream)
+
+        assert asyncio.run(_get(client)) == {"q": "Denver"}
+        stats = client.stats()
+        assert (stats["attempts"], stats["retried"], stats["failures"]) == (3, 2, 0)
+        assert stats["errors"] == {"http_503": 1, "connect": 1}
+
+    def test_client_errors_not_retried(self):
+        """A 4xx should surface at once and not count against the upstream."""
+        upstream = FakeUpstream([400])
+        client = _client(upstream)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(_get(client))
+        assert upstream.requests == 1
+        assert client.stats()["breaker"]["consecutive_failures"] == 0
+
+    def test_retries_exhausted(self):
+        """A call whose every attempt fails should raise WeatherUnavailableError."""
+        upstream = FakeUpstream([500])
+        client = _client(upstream, retries=2)
+
+        with pytest.raises(WeatherUnavailableError):
+            asyncio.run(_get(client))
+        assert upstream.requests == 3
+
+    def test_slow_upstream_bounded_by_budget(self):
+        """A hanging upstream should give up after the call's budget, not per-attempt timeouts."""
+        upstream = FakeUpstream([200], delay=1.0)
+        client = _client(upstream, retries=5, timeout=0.05, budget=0.12)
+
+        async def scenario():
+            start = asyncio.get_running_loop().time()
+            with pytest.raises(WeatherUnavailableError):
+                await _get(client)
+            return asyncio.get_running_loop().time() - start
+
+        assert asyncio.run(scenario()) < 0.5
+        assert client.stats()["errors"]["timeout"] >= 2
+
+
+class TestConcurrency:
+    """Tests for bounded concurrency and connection reuse."""
+
+    def test_calls_in_flight_bounded(self):
+        """No more than max_concurrency calls should reach the upstream at once."""
+        upstream = FakeUpstream([200], delay=0.01)
+        client = _client(upstream, concurrency=2)
+
+        async def scenario():
+            await asyncio.gather(*(_get(client, str(i)) for i in range(8)))
+
+        asyncio.run(scenario())
+        assert upstream.requests == 8
+        assert upstream.peak_active == 2
+
+    def test_one_client_reused(self):
+        """Calls on one loop should share the same pooled httpx client."""
+        client = _client(FakeUpstream())
+
+        async def scenario():
+            await _get(client)
+            first = client._http
+            await _get(client)
+            return first is client._http
+
+        assert asyncio.run(scenario())
+
+
+class TestCircuitBreaker:
+    """Tests for failing fast while the upstream is down."""
+
+    def test_opens_and_fails_fast(self):
+        """After consecutive failed calls, calls should not reach the upstream."""
+        upstream = FakeUpstream([500])
+        client = _client(upstream, retries=0, failures=3)
+
+        async def scenario():
+            for _ in range(3):
+                with pytest.raises(WeatherUnavailableError):
+                    await _get(client)
+            with pytest.raises(CircuitOpenError):
+                await _get(client)
+
+        asyncio.run(scenario())
+        assert upstream.requests == 3
+        assert client.stats()["breaker"]["state"] == "open"
+        assert client.stats()["breaker"]["short_circuited"] == 1
+
+    def test_trial_call_closes_breaker(self):
+        """After the reset interval one trial call should go out and close it on success."""
+        upstream = FakeUpstream([500, 200])
+        client = _client(upstream, retries=0, failures=1, reset=0.02)
+
+        async def scenario():
+            with pytest.raises(WeatherUnavailableError):
+                await _get(client)
+            await asyncio.sleep(0.03)
+            return await _get(client)
+
+        assert asyncio.run(scenario()) == {"q": "Denver"}
+        assert client.stats()["breaker"]["state"] == "closed"
+
+    def test_half_open_allows_single_trial(self):
+        """While the trial is in flight other calls should still fail fast."""
+        breaker = CircuitBreaker(1, 0.0)
+        breaker.record_failure()
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
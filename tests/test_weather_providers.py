@@ -0,0 +1,205 @@
+"""
+Tests for the pluggable weather providers (WeatherAPI.com and replay).
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import redis_client
+from tests.conftest import TEST_API_KEY
+
+from app.config import settings
+from app.main import app
+from app.services import weather, weather_cache, weather_providers
+from app.services.weather_client import CircuitBreaker, WeatherClient, WeatherUnavailableError
+from app.services.weather_providers import (
+    ReplayWeatherProvider,
+    WeatherAPIProvider,
+    get_weather_provider,
+    parse_weatherapi_current,
+)
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+
+def _current_json(name, region, lat, lon, wind_mph=8.0, wind_degree=200):
+    """A WeatherAPI.com current.json response."""
+    return {
+        "location": {"name": name, "region": region, "country": "USA", "lat": lat, "lon": lon},
+        "current": {
+            "last_updated_epoch": 1_700_000_000,
+            "temp_f": 68.0,
+            "wind_mph": wind_mph,
+            "wind_degree": wind_degree,
+            "pressure_in": 30.01,
+            "humidity": 40,
+            "condition": {"text": "Sunny"},
+        },
+    }
+
+
+DENVER = _current_json("Denver", "Colorado", 39.74, -104.99, wind_mph=12.0)
+ATLANTA = _current_json("Atlanta", "Georgia", 33.75, -84.39, wind_mph=4.0)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Installs a provider as the configured one, with an in-process weather cache."""
+    monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+    monkeypatch.setattr(
+        weather_cache, "_weather_cache", weather_cache.WeatherCache(10, 300, 600, 3600)
+    )
+
+    def install(instance):
+        monkeypatch.setattr(weather_providers, "_weather_provider", instance)
+        return instance
+
+    return install
+
+
+class TestWeatherAPIProvider:
+    """Tests for the WeatherAPI.com provider."""
+
+    def test_normalizes_response(self):
+        """A current.json response should map onto the observation fields."""
+        observation = parse_weatherapi_current(DENVER)
+        assert observation.location == "Denver, Colorado, USA"
+        assert observation.wind_speed_mph == 12.0
+        assert observation.wind_direction_deg == 200
+        assert (observation.latitude, observation.longitude) == (39.74, -104.99)
+        assert observation.observed_at.year == 2023
+
+    def test_city_through_client(self, provider, monkeypatch):
+        """City lookups should query the upstream and take altitude from the city table."""
+        queries = []
+
+        def upstream(request):
+            queries.append(request.url.params["q"])
+            return httpx.Response(200, json=DENVER)
+
+        weather_client = WeatherClient(
+            "https://weather.test/v1", 4, 1.0, 2.0, 0, 0.001, CircuitBreaker(5, 30),
+            transport=httpx.MockTransport(upstream),
+        )
+        monkeypatch.setattr(weather_providers, "get_weather_client", lambda: weather_client)
+        provider(WeatherAPIProvider("test-key"))
+
+        result = asyncio.run(weather.fetch_weather_by_city("Denver", "CO", "US"))
+        assert queries == ["Denver,CO,US"]
+        assert result["altitude_ft"] == 5280
+        assert result["wind_speed_mph"] == 12.0
+
+    def test_requires_api_key(self, provider):
+        """Without an API key the provider should refuse to call the upstream."""
+        provider(WeatherAPIProvider(""))
+        with pytest.raises(ValueError):
+            asyncio.run(weather.fetch_weather_by_coords(39.74, -104.99))
+
+
+class TestReplayProvider:
+    """Tests for the local stand-in."""
+
+    def test_synthetic_is_deterministic_per_location(self):
+        """The same place should get the same observation; other places differ."""
+        replay_a = ReplayWeatherProvider([], 0, 0, 0, seed=3)
+        replay_b = ReplayWeatherProvider([], 0, 0, 0, seed=3)
+
+        async def scenario():
+            return (
+                await replay_a.current_by_coords(39.74, -104.99),
+                await replay_b.current_by_coords(39.74, -104.99),
+                await replay_a.current_by_coords(33.75, -84.39),
+            )
+
+        first, again, elsewhere = asyncio.run(scenario())
+        assert first.wind_speed_mph == again.wind_speed_mph
+        assert first.wind_direction_deg == again.wind_direction_deg
+        assert (first.wind_speed_mph, first.wind_direction_deg) != (
+            elsewhere.wind_speed_mph, elsewhere.wind_direction_deg
+        )
+        assert 0 <= first.wind_direction_deg < 360
+        assert first.observed_at is not None
+
+    def test_recordings(self, tmp_path):
+        """Recorded responses should be served by nearest point or by city name."""
+        path = tmp_path / "replay.jsonl"
+        path.write_text(json.dumps(DENVER) + "\n" + json.dumps(ATLANTA) + "\n")
+        replay = ReplayWeatherProvider(ReplayWeatherProvider.load_recordings(str(path)), 0, 0, 0)
+
+        async def scenario():
+            return (
+                await replay.current_by_coords(39.5, -105.2),
+                await replay.current_by_city("Atlanta", "GA", "US"),
+            )
+
+        near_denver, atlanta = asyncio.run(scenario())
+        assert near_denver.location.startswith("Denver")
+        assert atlanta.wind_speed_mph == 4.0
+        # Replayed as a current observation
+        assert atlanta.observed_at.year > 2023
+
+    def test_injected_errors(self, provider):
+        """Failures should surface like upstream failures (and fall back like them)."""
+        replay = provider(ReplayWeatherProvider([], 0, 0, error_rate=1.0))
+        with pytest.raises(WeatherUnavailableError):
+            asyncio.run(weather.fetch_weather_by_coords(39.74, -104.99))
+        assert replay.stats()["injected_errors"] == 1
+
+    def test_latency(self):
+        """Calls should take about the configured delay."""
+        replay = ReplayWeatherProvider([], latency_ms=20, latency_p99_ms=20, error_rate=0)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await replay.current_by_coords(39.74, -104.99)
+            return loop.time() - start
+
+        assert asyncio.run(scenario()) >= 0.019
+        assert replay.stats()["mean_delay_ms"] == 20
+
+
+class TestProviderSelection:
+    """Tests for WEATHER_PROVIDER."""
+
+    def test_unknown_provider(self, monkeypatch):
+        """An unknown name should be reported with the valid ones."""
+        monkeypatch.setattr(weather_providers, "_weather_provider", None)
+        monkeypatch.setattr(settings, "WEATHER_PROVIDER", "nonesuch")
+        with pytest.raises(ValueError, match="weatherapi"):
+            get_weather_provider()
+
+    def test_replay_selected(self, monkeypatch):
+        """WEATHER_PROVIDER=replay should build the stand-in from settings."""
+        monkeypatch.setattr(weather_providers, "_weather_provider", None)
+        monkeypatch.setattr(settings, "WEATHER_PROVIDER", "replay")
+        monkeypatch.setattr(settings, "WEATHER_REPLAY_ERROR_RATE", 0.25)
+        replay = get_weather_provider()
+        assert isinstance(replay, ReplayWeatherProvider)
+        assert replay.error_rate == 0.25
+
+    def test_cache_keys_per_provider(self, monkeypatch):
+        """Observations from different providers should never share a cache entry."""
+        real = weather_cache.coords_cache_key(39.74, -104.99)
+        monkeypatch.setattr(settings, "WEATHER_PROVIDER", "replay")
+        assert weather_cache.coords_cache_key(39.74, -104.99) != real
+
+    def test_location_endpoint_on_replay(self, provider):
+        """Location-based calculations should run entirely on the stand-in."""
+        replay = provider(ReplayWeatherProvider([], 0, 0, 0))
+        response = client.post(
+            "/api/v1/calculate",
+            json={
+                "ball_speed": 150, "launch_angle": 12, "spin_rate": 3000,
+                "location": {"lat": 39.74, "lng": -104.99},
+            },
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 200
+        assert response.json()["conditions"]["source"] == "real-time"
+        assert replay.stats()["calls"] == 1
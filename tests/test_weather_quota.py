@@ -0,0 +1,194 @@
+"""
+Tests for the weather upstream quota governor.
+"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app import redis_client
+from app.services import weather_cache
+from app.services.weather_cache import WeatherCache
+from app.services.weather_client import CircuitBreaker, WeatherClient
+from app.services.weather_quota import WeatherQuotaGovernor
+
+
+class FakePipeline:
+    """Queues INCR/EXPIRE and runs them on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def expire(self, key, seconds):
+        self.ops.append(("expire", key))
+
+    async def execute(self):
+        results = []
+        for op, key in self.ops:
+            if op == "incr":
+                self.redis.data[key] = self.redis.data.get(key, 0) + 1
+                results.append(self.redis.data[key])
+            else:
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    """Counters shared by every governor pointed at it (i.e. all replicas)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+
+class FakeClock:
+    """Replaces the time module in weather_cache; advanced by hand."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Shared fake Redis."""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "get_redis_client", lambda: fake)
+    return fake
+
+
+def _governor(per_minute=0, per_day=100):
+    return WeatherQuotaGovernor(
+        per_minute, per_day, soft_fraction=0.8, max_ttl_multiplier=5.0, refresh_seconds=0
+    )
+
+
+async def _record(governor, n):
+    for _ in range(n):
+        await governor.record_call()
+
+
+class TestGovernor:
+    """Tests for counting and the TTL multiplier."""
+
+    def test_multiplier_curve(self):
+        """TTLs should stretch linearly from the soft fraction to the limit."""
+        governor = _governor()
+        assert governor.multiplier_for(0.5) == 1.0
+        assert governor.multiplier_for(0.8) == 1.0
+        assert governor.multiplier_for(0.9) == pytest.approx(3.0)
+        assert governor.multiplier_for(1.0) == 5.0
+        assert governor.multiplier_for(2.0) == 5.0
+
+    def test_counts_shared_across_replicas(self, redis):
+        """Calls made by one replica should be seen by another."""
+        replica_a, replica_b = _governor(), _governor()
+
+        async def scenario():
+            await _record(replica_a, 60)
+            await _record(replica_b, 30)
+            return await replica_a.ttl_multiplier()
+
+        assert asyncio.run(scenario()) == pytest.approx(3.0)
+        assert replica_a.stats()["day_calls"] == 90
+        assert not replica_a.exhausted()
+
+    def test_minute_limit(self, redis):
+        """Either limit should drive the multiplier."""
+        governor = _governor(per_minute=10, per_day=0)
+        asyncio.run(_record(governor, 10))
+        assert governor.exhausted()
+
+    def test_counts_locally_without_redis(self, monkeypatch):
+        """Without Redis the process should still govern its own calls."""
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+        governor = _governor(per_day=10)
+        asyncio.run(_record(governor, 10))
+        assert governor.exhausted()
+
+
+class FakeUpstream:
+    """Counts fetches."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        return {"wind_speed_mph": float(self.calls), "observed_at": datetime.utcnow()}
+
+
+class TestGovernedCache:
+    """Tests for the weather cache under quota pressure."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        fake = FakeClock()
+        monkeypatch.setattr(weather_cache, "time", fake)
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+        return fake
+
+    def test_ttl_stretched_near_limit(self, clock):
+        """Near the cap an entry past the base TTL should still be fresh."""
+        governor = _governor(per_day=100)
+        cache = WeatherCache(10, 300, 600, 3600, quota=governor)
+        upstream = FakeUpstream()
+
+        async def scenario():
+            await cache.get("k", upstream.fetch)
+            await _record(governor, 90)
+            clock.now += 800  # Base TTL 300, stretched x3
+            return await cache.get("k", upstream.fetch)
+
+        assert asyncio.run(scenario())["wind_speed_mph"] == 1.0
+        assert upstream.calls == 1
+        assert cache.stats()["fresh_hits"] == 1
+
+    def test_kept_entry_served_at_limit(self, clock):
+        """At the cap, an entry past every window but still kept should be served."""
+        governor = _governor(per_day=100)
+        cache = WeatherCache(10, 300, 600, 3600, quota=governor)
+        upstream = FakeUpstream()
+
+        async def scenario():
+            await cache.get("k", upstream.fetch)
+            await _record(governor, 100)
+            clock.now += 300 * 5 + 600 + 1
+            return await cache.get("k", upstream.fetch)
+
+        assert asyncio.run(scenario())["wind_speed_mph"] == 1.0
+        assert upstream.calls == 1
+        assert cache.stats()["quota_hits"] == 1
+
+
+class TestClientCounting:
+    """Tests for what the weather client counts."""
+
+    def test_every_attempt_counted(self, monkeypatch):
+        """Retried attempts use quota too and should be counted."""
+        monkeypatch.setattr(redis_client, "get_redis_client", lambda: None)
+        statuses = [503, 200]
+
+        def upstream(request):
+            return httpx.Response(statuses.pop(0), json={})
+
+        governor = _governor()
+        client = WeatherClient(
+            "https://weather.test/v1", 4, 1.0, 2.0, 2, 0.001, CircuitBreaker(5, 30),
+            transport=httpx.MockTransport(upstream), quota=governor,
+        )
+        asyncio.run(client.get_json("/current.json", params={"q": "Denver"}))
+        assert governor.stats()["day_calls"] == 2